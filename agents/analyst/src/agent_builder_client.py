@@ -7,10 +7,22 @@ NO MOCK DATA - All responses come from real Agent Builder API.
 
 import httpx
 import os
+import sys
 import json
+from pathlib import Path
 from typing import Dict, Any, AsyncIterator, Optional
 from loguru import logger
 
+from .conversation_recording import ConversationRecorder, RecordingLibrary, replay_lines
+
+try:
+    from shared import tracing
+    from shared.serialization import loads
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[3]))
+    from shared import tracing
+    from shared.serialization import loads
+
 
 class AgentBuilderClient:
     """
@@ -20,12 +32,29 @@ class AgentBuilderClient:
     - KIBANA_URL: Your Kibana URL (e.g., https://your-cluster.kb.us-east-1.aws.found.io:9243)
     - ELASTIC_API_KEY: API key with agent_builder permissions
     - ELASTIC_AGENT_ID: Agent ID (default: "incident-investigator")
+
+    Optional (see conversation_recording.py):
+    - AGENT_BUILDER_RECORD_DIR: save every live conversation's raw SSE stream here
+    - AGENT_BUILDER_REPLAY_DIR: serve conversations from recordings instead of Kibana
+    - AGENT_BUILDER_REPLAY_SPEED: replay pacing divisor (default 1.0, 0 = no delays)
     """
     
     def __init__(self):
         self.kibana_url = os.getenv("KIBANA_URL")
         self.api_key = os.getenv("ELASTIC_API_KEY")
         self.agent_id = os.getenv("ELASTIC_AGENT_ID", "incident-investigator")
+
+        record_dir = os.getenv("AGENT_BUILDER_RECORD_DIR")
+        replay_dir = os.getenv("AGENT_BUILDER_REPLAY_DIR")
+        self.record_dir = Path(record_dir) if record_dir else None
+        self.replay = RecordingLibrary(Path(replay_dir)) if replay_dir else None
+        self.replay_speed = float(os.getenv("AGENT_BUILDER_REPLAY_SPEED", "1.0"))
+
+        if self.replay is not None:
+            # Replay never reaches Kibana, so it runs without credentials
+            logger.info(f"Agent Builder client replaying recordings from {replay_dir} at x{self.replay_speed}")
+            self.kibana_url = (self.kibana_url or "").rstrip('/')
+            return
         
         if not self.kibana_url:
             raise ValueError("KIBANA_URL environment variable not set")
@@ -77,47 +106,39 @@ class AgentBuilderClient:
             }
         }
         
-        headers = {
+        headers = tracing.inject({
             "Authorization": f"ApiKey {self.api_key}",
             "Content-Type": "application/json",
             "kbn-xsrf": "true"  # Required for Kibana API
-        }
-        
+        })
+        
+        if self.replay is not None:
+            recording = self.replay.for_incident(incident_id)
+            logger.info(f"Replaying Agent Builder conversation {recording.path.name} for incident {incident_id}")
+            async for event in self._parse_sse(replay_lines(recording, self.replay_speed)):
+                yield event
+            return
+
         logger.info(f"Starting Agent Builder conversation for incident {incident_id}")
+        recorder = ConversationRecorder(self.record_dir, incident_id, payload) if self.record_dir else None
+        complete = False
         
         try:
             async with httpx.AsyncClient(timeout=120.0) as client:
                 async with client.stream("POST", url, json=payload, headers=headers) as response:
+                    if recorder is not None:
+                        recorder.status_code = response.status_code
                     if response.status_code != 200:
                         error_text = await response.aread()
                         logger.error(f"Agent Builder API error: {response.status_code} - {error_text}")
                         raise Exception(f"Agent Builder API failed: {response.status_code}")
                     
-                    current_event = None
-                    
-                    async for line in response.aiter_lines():
-                        line = line.strip()
-                        
-                        if not line:
-                            continue
-                        
-                        if line.startswith("event:"):
-                            current_event = line.split(":", 1)[1].strip()
-                        
-                        elif line.startswith("data:"):
-                            data_str = line.split(":", 1)[1].strip()
-                            
-                            try:
-                                data = json.loads(data_str)
-                                
-                                yield {
-                                    "event": current_event,
-                                    "data": data
-                                }
-                                
-                            except json.JSONDecodeError as e:
-                                logger.warning(f"Failed to parse SSE data: {e}")
-                                continue
+                    lines = response.aiter_lines()
+                    if recorder is not None:
+                        lines = self._tee(lines, recorder)
+                    async for event in self._parse_sse(lines):
+                        yield event
+                    complete = True
         
         except httpx.RequestError as e:
             logger.error(f"Network error during Agent Builder conversation: {e}")
@@ -125,6 +146,44 @@ class AgentBuilderClient:
         except Exception as e:
             logger.error(f"Unexpected error during Agent Builder conversation: {e}")
             raise
+        finally:
+            if recorder is not None:
+                await recorder.save(complete)
+
+    @staticmethod
+    async def _tee(lines: AsyncIterator[str], recorder: ConversationRecorder) -> AsyncIterator[str]:
+        async for line in lines:
+            recorder.add(line)
+            yield line
+
+    @staticmethod
+    async def _parse_sse(lines: AsyncIterator[str]) -> AsyncIterator[Dict[str, Any]]:
+        """Turn raw SSE lines (live or replayed) into converse events."""
+        current_event = None
+        
+        async for line in lines:
+            line = line.strip()
+            
+            if not line:
+                continue
+            
+            if line.startswith("event:"):
+                current_event = line.split(":", 1)[1].strip()
+            
+            elif line.startswith("data:"):
+                data_str = line.split(":", 1)[1].strip()
+                
+                try:
+                    data = loads(data_str)
+                    
+                    yield {
+                        "event": current_event,
+                        "data": data
+                    }
+                    
+                except json.JSONDecodeError as e:
+                    logger.warning(f"Failed to parse SSE data: {e}")
+                    continue
     
     async def get_conversation_history(self, conversation_id: str) -> Dict[str, Any]:
         """
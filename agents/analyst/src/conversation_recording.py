@@ -0,0 +1,162 @@
+"""
+Recording and replay of Agent Builder conversations.
+
+With ``AGENT_BUILDER_RECORD_DIR`` set, the Agent Builder client keeps every
+raw SSE line of each live conversation together with its arrival time
+(seconds since the request was sent) and writes them to
+``<dir>/<incident_id>-<utc time>.jsonl.gz`` when the stream ends: a header
+object (incident, agent, input, status) followed by one ``[offset, line]``
+array per line. Lines are buffered in memory and written off the event loop,
+so recording adds no file I/O to the stream itself.
+
+With ``AGENT_BUILDER_REPLAY_DIR`` set, the client never calls Kibana. Each
+conversation is served from the recording of the same incident (the newest
+one), or from the next recording in the directory when there is none, at the
+original pacing divided by ``AGENT_BUILDER_REPLAY_SPEED`` (0 replays without
+any delay). Replayed lines go through the same SSE parsing as live ones, so
+the correlator sees exactly what Agent Builder sent.
+"""
+
+import asyncio
+import gzip
+import itertools
+import re
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+try:
+    from shared.serialization import dumps, loads
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[3]))
+    from shared.serialization import dumps, loads
+
+RECORDING_FORMAT = "agent-builder-sse/1"
+RECORDING_SUFFIX = ".jsonl.gz"
+
+
+@dataclass
+class Recording:
+    path: Path
+    header: Dict[str, Any]
+    # (seconds since the request was sent, raw SSE line)
+    lines: List[Tuple[float, str]]
+
+    @property
+    def incident_id(self) -> Optional[str]:
+        return self.header.get("incident_id")
+
+    @property
+    def duration(self) -> float:
+        return self.lines[-1][0] if self.lines else 0.0
+
+
+def recording_path(directory: Path, incident_id: str, recorded_at: datetime) -> Path:
+    safe_id = re.sub(r"[^\w.-]", "_", incident_id)
+    return directory / f"{safe_id}-{recorded_at.strftime('%Y%m%dT%H%M%S%fZ')}{RECORDING_SUFFIX}"
+
+
+def write_recording(path: Path, header: Dict[str, Any], lines: List[Tuple[float, str]]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "wb") as handle:
+        handle.write(dumps(header) + b"\n")
+        for entry in lines:
+            handle.write(dumps(entry) + b"\n")
+
+
+def read_recording(path: Path) -> Recording:
+    with gzip.open(path, "rb") as handle:
+        header = loads(handle.readline())
+        if header.get("format") != RECORDING_FORMAT:
+            raise ValueError(f"{path} is not an Agent Builder recording ({header.get('format')!r})")
+        lines = [(float(offset), line) for offset, line in map(loads, filter(None, handle.read().splitlines()))]
+    return Recording(path=path, header=header, lines=lines)
+
+
+class ConversationRecorder:
+    """Collects the raw lines of one live conversation; ``save`` writes them out."""
+
+    def __init__(self, directory: Path, incident_id: str, payload: Dict[str, Any]):
+        self.directory = directory
+        self.incident_id = incident_id
+        self.payload = payload
+        self.recorded_at = datetime.now(timezone.utc)
+        self.status_code: Optional[int] = None
+        self.lines: List[Tuple[float, str]] = []
+        self._started = time.monotonic()
+
+    def add(self, line: str):
+        self.lines.append((round(time.monotonic() - self._started, 4), line))
+
+    async def save(self, complete: bool) -> Optional[Path]:
+        header = {
+            "format": RECORDING_FORMAT,
+            "incident_id": self.incident_id,
+            "conversation_id": self.payload.get("conversation_id"),
+            "agent_id": self.payload.get("agent_id"),
+            "input": self.payload.get("input"),
+            "recorded_at": self.recorded_at.isoformat(),
+            "status_code": self.status_code,
+            "complete": complete,
+            "line_count": len(self.lines),
+        }
+        path = recording_path(self.directory, self.incident_id, self.recorded_at)
+        try:
+            await asyncio.to_thread(write_recording, path, header, self.lines)
+        except OSError as e:
+            # Recording is a diagnostic aid; it must never fail an investigation
+            logger.warning(f"Failed to save Agent Builder recording for {self.incident_id}: {e}")
+            return None
+        logger.info(f"Recorded Agent Builder conversation for {self.incident_id} to {path}")
+        return path
+
+
+class RecordingLibrary:
+    """Recordings in a directory, loaded once and handed out per incident."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self._loaded: Dict[Path, Recording] = {}
+        self._by_incident: Dict[str, Path] = {}
+        self._paths: List[Path] = []
+        self._cycle = None
+
+    def paths(self) -> List[Path]:
+        if not self._paths:
+            self._paths = sorted(self.directory.glob(f"*{RECORDING_SUFFIX}"))
+            if not self._paths:
+                raise FileNotFoundError(f"No Agent Builder recordings in {self.directory}")
+            # Names sort by time within an incident, so the newest recording wins
+            for path in self._paths:
+                incident_id = path.name[: -len(RECORDING_SUFFIX)].rsplit("-", 1)[0]
+                self._by_incident[incident_id] = path
+            self._cycle = itertools.cycle(self._paths)
+        return self._paths
+
+    def load(self, path: Path) -> Recording:
+        if path not in self._loaded:
+            self._loaded[path] = read_recording(path)
+        return self._loaded[path]
+
+    def for_incident(self, incident_id: str) -> Recording:
+        self.paths()
+        safe_id = re.sub(r"[^\w.-]", "_", incident_id)
+        path = self._by_incident.get(safe_id) or next(self._cycle)
+        return self.load(path)
+
+
+async def replay_lines(recording: Recording, speed: float = 1.0) -> AsyncIterator[str]:
+    """Yield the recorded lines at their original offsets divided by ``speed`` (0: no delays)."""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    for offset, line in recording.lines:
+        if speed > 0:
+            delay = started + offset / speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        yield line
@@ -6,19 +6,32 @@ NO MOCK DATA - Uses Agent Builder tools to query real Elasticsearch data.
 """
 
 import os
-import json
+import sys
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, Any, List
 from loguru import logger
-from elasticsearch import AsyncElasticsearch
 import httpx
 
 from .agent_builder_client import get_agent_builder_client
+from .thought_relay import relay_thoughts
 
+try:
+    from shared import tracing
+    from shared.es_client import create_client
+    from shared.serialization import dumps_str, json_body
+    from shared.tracing import CLIENT, TracedElasticsearch, Tracer
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[3]))
+    from shared import tracing
+    from shared.es_client import create_client
+    from shared.serialization import dumps_str, json_body
+    from shared.tracing import CLIENT, TracedElasticsearch, Tracer
 
-# Elasticsearch client
-ES_HOST = os.getenv("ES_HOST", "http://elasticsearch:9200")
-es = AsyncElasticsearch(hosts=[ES_HOST])
+
+# Elasticsearch client (pool, retries and shutdown: shared/es_client.py)
+tracer = Tracer("analyst")
+es = TracedElasticsearch(create_client("analyst"), tracer)
 
 # API Gateway URL for reporting back
 GATEWAY_URL = os.getenv("GATEWAY_URL", "http://api-gateway:8000")
@@ -26,11 +39,17 @@ RCCA_EVIDENCE_SNIPPET_MAX_CHARS = int(os.getenv("RCCA_EVIDENCE_SNIPPET_MAX_CHARS
 
 
 async def run_rca_investigation(incident_id: str, service: str, detected_at: str):
+    """Traced entry point of an investigation; see _run_rca_investigation."""
+    with tracer.span("analyst.rca_investigation", attributes={"incident_id": incident_id, "service": service}):
+        await _run_rca_investigation(incident_id, service, detected_at)
+
+
+async def _run_rca_investigation(incident_id: str, service: str, detected_at: str):
     """
     Run Root Cause Analysis investigation using Elastic Agent Builder.
     
     This function:
-    1. Streams agent conversation using Agent Builder API
+    1. Streams agent conversation using Agent Builder API, relaying it live to the API Gateway
     2. Collects all tool calls and results
     3. Logs conversation to .agent-conversations-* index
     4. Sends final RCA report back to API Gateway
@@ -65,56 +84,60 @@ async def run_rca_investigation(incident_id: str, service: str, detected_at: str
         final_message = ""
         final_confidence = 0.0
         
-        async for event in agent_client.converse(incident_id, user_query):
-            event_type = event["event"]
-            data = event["data"]
+        # Events are forwarded to the gateway as they arrive so the thought log updates live
+        with tracer.span("agent_builder.converse", CLIENT, attributes={"incident_id": incident_id}) as stream_span:
+            async for event in relay_thoughts(incident_id, agent_client.converse(incident_id, user_query), GATEWAY_URL):
+                event_type = event["event"]
+                data = event["data"]
             
-            if event_type == "reasoning":
-                step_number += 1
-                current_round["steps"].append({
-                    "step_number": step_number,
-                    "type": "reasoning",
-                    "reasoning": data.get("reasoning", ""),
-                    "timestamp": datetime.now().isoformat()
-                })
-                logger.info(f"[Reasoning] {data.get('reasoning', '')[:100]}...")
+                if event_type == "reasoning":
+                    step_number += 1
+                    current_round["steps"].append({
+                        "step_number": step_number,
+                        "type": "reasoning",
+                        "reasoning": data.get("reasoning", ""),
+                        "timestamp": datetime.now().isoformat()
+                    })
+                    logger.info(f"[Reasoning] {data.get('reasoning', '')[:100]}...")
             
-            elif event_type == "tool_call":
-                step_number += 1
-                tool_call_step = {
-                    "step_number": step_number,
-                    "type": "tool_call",
-                    "tool_id": data.get("tool_id"),
-                    "params": data.get("params", {}),
-                    "timestamp": datetime.now().isoformat()
-                }
-                current_round["steps"].append(tool_call_step)
-                logger.info(f"[Tool Call] {data.get('tool_id')} with params {data.get('params')}")
+                elif event_type == "tool_call":
+                    step_number += 1
+                    tool_call_step = {
+                        "step_number": step_number,
+                        "type": "tool_call",
+                        "tool_id": data.get("tool_id"),
+                        "params": data.get("params", {}),
+                        "timestamp": datetime.now().isoformat()
+                    }
+                    current_round["steps"].append(tool_call_step)
+                    logger.info(f"[Tool Call] {data.get('tool_id')} with params {data.get('params')}")
             
-            elif event_type == "tool_result":
-                # Find the corresponding tool_call step and add results
-                for step in reversed(current_round["steps"]):
-                    if step["type"] == "tool_call" and "results" not in step:
-                        step["results"] = data.get("results", [])
-                        step["execution_time_ms"] = data.get("execution_time_ms", 0)
-                        break
-                logger.info(f"[Tool Result] Received {len(data.get('results', []))} results")
+                elif event_type == "tool_result":
+                    # Find the corresponding tool_call step and add results
+                    for step in reversed(current_round["steps"]):
+                        if step["type"] == "tool_call" and "results" not in step:
+                            step["results"] = data.get("results", [])
+                            step["execution_time_ms"] = data.get("execution_time_ms", 0)
+                            break
+                    logger.info(f"[Tool Result] Received {len(data.get('results', []))} results")
             
-            elif event_type == "message_chunk":
-                text_chunk = data.get("text_chunk", "")
-                final_message += text_chunk
-                logger.debug(f"[Message Chunk] {text_chunk}")
+                elif event_type == "message_chunk":
+                    text_chunk = data.get("text_chunk", "")
+                    final_message += text_chunk
+                    logger.debug(f"[Message Chunk] {text_chunk}")
             
-            elif event_type == "round_complete":
-                round_data = data.get("round", {})
-                final_confidence = round_data.get("confidence", 0.85)
-                current_round["response"] = {
-                    "message": final_message,
-                    "confidence": final_confidence,
-                    "timestamp": datetime.now().isoformat()
-                }
-                conversation_rounds.append(current_round)
-                logger.info(f"[Round Complete] Confidence: {final_confidence}")
+                elif event_type == "round_complete":
+                    round_data = data.get("round", {})
+                    final_confidence = round_data.get("confidence", 0.85)
+                    current_round["response"] = {
+                        "message": final_message,
+                        "confidence": final_confidence,
+                        "timestamp": datetime.now().isoformat()
+                    }
+                    conversation_rounds.append(current_round)
+                    logger.info(f"[Round Complete] Confidence: {final_confidence}")
+            stream_span.set_attribute("agent_builder.steps", step_number)
+            stream_span.set_attribute("agent_builder.confidence", final_confidence)
         
         # Save conversation to Elasticsearch
         conversation_doc = {
@@ -167,7 +190,7 @@ def extract_rcca_from_response(
     """
     def _serialize_result_snippet(result: Any) -> str:
         """Serialize a result safely and truncate to avoid oversized documents."""
-        serialized = json.dumps(result, default=str, separators=(",", ":"))
+        serialized = dumps_str(result)
         if len(serialized) <= RCCA_EVIDENCE_SNIPPET_MAX_CHARS:
             return serialized
         return serialized[:RCCA_EVIDENCE_SNIPPET_MAX_CHARS] + "..."
@@ -216,10 +239,11 @@ async def send_report_to_gateway(incident_id: str, rcca: Dict[str, Any]):
     }
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=payload, timeout=10.0)
-            response.raise_for_status()
-            logger.info(f"Sent RCA report to API Gateway for {incident_id}")
+        with tracer.span("send_report_to_gateway", CLIENT, attributes={"incident_id": incident_id}):
+            async with httpx.AsyncClient() as client:
+                response = await client.post(url, **json_body(payload, headers=tracing.inject()), timeout=10.0)
+                response.raise_for_status()
+        logger.info(f"Sent RCA report to API Gateway for {incident_id}")
     except Exception as e:
         logger.error(f"Failed to send report to API Gateway: {e}")
 
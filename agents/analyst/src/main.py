@@ -1,9 +1,12 @@
 from fastapi import FastAPI, BackgroundTasks, HTTPException
 from pydantic import BaseModel
 from loguru import logger
-from src.correlator import run_rca_investigation
+from src.correlator import run_rca_investigation, tracer
+from shared.es_client import lifespan
+from shared.tracing import TracingMiddleware
 
-app = FastAPI(title="Analyst Agent", version="1.0.0")
+app = FastAPI(title="Analyst Agent", version="1.0.0", lifespan=lifespan)
+app.add_middleware(TracingMiddleware, tracer=tracer)
 
 class AnalyzeRequest(BaseModel):
     incident_id: str
@@ -0,0 +1,199 @@
+"""
+Live relay of Agent Builder conversation events to the API Gateway.
+
+The correlator feeds every streamed event to a ThoughtRelay, which turns it
+into a compact frame (reasoning text, tool ids and params, result counts) and
+queues it without blocking. A background task POSTs the queued frames to the
+gateway's ``/agent/events`` endpoint in batches every flush interval, so the
+thought log fills in while the investigation runs instead of after it.
+
+Message chunks arrive one token at a time; they are coalesced into a single
+``message`` frame until another kind of event arrives, the text grows past
+``chunk_chars`` or the batch is flushed, which bounds the event rate
+independently of the model's token rate.
+
+Relaying is best-effort: a slow or unreachable gateway never delays the
+investigation. At most ``max_pending`` frames are held; beyond that the
+oldest are dropped and counted.
+"""
+
+import asyncio
+import os
+import sys
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional
+
+import httpx
+from loguru import logger
+
+try:
+    from shared import tracing
+    from shared.serialization import json_body
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[3]))
+    from shared import tracing
+    from shared.serialization import json_body
+
+THOUGHT_RELAY_ENABLED = os.getenv("THOUGHT_RELAY_ENABLED", "true").lower() == "true"
+THOUGHT_RELAY_FLUSH_SECONDS = float(os.getenv("THOUGHT_RELAY_FLUSH_SECONDS", "0.5"))
+THOUGHT_RELAY_MAX_BATCH = int(os.getenv("THOUGHT_RELAY_MAX_BATCH", "50"))
+THOUGHT_RELAY_CHUNK_CHARS = int(os.getenv("THOUGHT_RELAY_CHUNK_CHARS", "400"))
+THOUGHT_RELAY_MAX_PENDING = int(os.getenv("THOUGHT_RELAY_MAX_PENDING", "500"))
+
+Sender = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def to_frame(event_type: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Compact frame for a converse event, or None for events the thought log does not show."""
+    if event_type == "reasoning":
+        return {"type": "reasoning", "text": data.get("reasoning", "")}
+    if event_type == "tool_call":
+        return {"type": "tool_call", "tool_id": data.get("tool_id"), "params": data.get("params", {})}
+    if event_type == "tool_result":
+        # Full results go into the saved conversation; the live log only needs their size
+        return {
+            "type": "tool_result",
+            "result_count": len(data.get("results", [])),
+            "execution_time_ms": data.get("execution_time_ms", 0),
+        }
+    if event_type == "round_complete":
+        return {"type": "round_complete", "confidence": data.get("round", {}).get("confidence")}
+    return None
+
+
+class ThoughtRelay:
+    """Batches an investigation's converse events and forwards them to the gateway."""
+
+    def __init__(
+        self,
+        incident_id: str,
+        sender: Sender,
+        flush_interval: float = THOUGHT_RELAY_FLUSH_SECONDS,
+        max_batch: int = THOUGHT_RELAY_MAX_BATCH,
+        chunk_chars: int = THOUGHT_RELAY_CHUNK_CHARS,
+        max_pending: int = THOUGHT_RELAY_MAX_PENDING,
+    ):
+        self.incident_id = incident_id
+        self.sender = sender
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.chunk_chars = chunk_chars
+        self._pending: Deque[Dict[str, Any]] = deque(maxlen=max_pending)
+        self._text: List[str] = []
+        self._text_len = 0
+        self._seq = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self.sent = 0
+        self.dropped = 0
+        self.failed_batches = 0
+
+    async def __aenter__(self) -> "ThoughtRelay":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def add(self, event_type: str, data: Dict[str, Any]):
+        """Queue a converse event; never blocks."""
+        if event_type == "message_chunk":
+            text = data.get("text_chunk", "")
+            self._text.append(text)
+            self._text_len += len(text)
+            if self._text_len >= self.chunk_chars:
+                self._flush_text()
+            return
+
+        frame = to_frame(event_type, data)
+        if frame is None:
+            return
+        # Keep the text that preceded this event ahead of it
+        self._flush_text()
+        self._enqueue(frame)
+
+    def _flush_text(self):
+        if not self._text:
+            return
+        self._enqueue({"type": "message", "text": "".join(self._text)})
+        self._text = []
+        self._text_len = 0
+
+    def _enqueue(self, frame: Dict[str, Any]):
+        self._seq += 1
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append({"seq": self._seq, "timestamp": datetime.now().isoformat(), **frame})
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush(include_text=False)
+
+    async def flush(self, include_text: bool = True):
+        """Send everything queued so far, in batches of at most max_batch frames."""
+        if include_text:
+            self._flush_text()
+        while self._pending:
+            count = min(self.max_batch, len(self._pending))
+            batch = [self._pending.popleft() for _ in range(count)]
+            payload = {"incident_id": self.incident_id, "agent": "analyst", "dropped": self.dropped, "events": batch}
+            try:
+                await self.sender(payload)
+                self.sent += len(batch)
+            except Exception as e:
+                # The saved conversation and final report are unaffected; just lose this batch
+                self.failed_batches += 1
+                logger.warning(f"Failed to relay {len(batch)} thought log events for {self.incident_id}: {e}")
+
+    async def close(self):
+        """Stop the background flusher and send whatever is left."""
+        if self._task is not None:
+            # Let an in-progress batch finish rather than cancelling it mid-request
+            self._closing = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+        logger.info(
+            f"Relayed {self.sent} thought log events for {self.incident_id} "
+            f"({self.dropped} dropped, {self.failed_batches} failed batches)"
+        )
+
+
+def gateway_sender(client: httpx.AsyncClient, gateway_url: str) -> Sender:
+    url = f"{gateway_url}/agent/events"
+
+    async def send(payload: Dict[str, Any]):
+        response = await client.post(url, **json_body(payload, headers=tracing.inject()), timeout=5.0)
+        response.raise_for_status()
+
+    return send
+
+
+async def relay_thoughts(
+    incident_id: str,
+    events: AsyncIterator[Dict[str, Any]],
+    gateway_url: str,
+    enabled: bool = THOUGHT_RELAY_ENABLED,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Pass converse events through unchanged while relaying them to the gateway."""
+    if not enabled:
+        async for event in events:
+            yield event
+        return
+
+    async with httpx.AsyncClient() as client:
+        async with ThoughtRelay(incident_id, gateway_sender(client, gateway_url)) as relay:
+            async for event in events:
+                relay.add(event["event"], event["data"])
+                yield event
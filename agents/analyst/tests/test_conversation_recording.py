@@ -0,0 +1,94 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from agents.analyst.src import agent_builder_client
+from agents.analyst.src.agent_builder_client import AgentBuilderClient
+from agents.analyst.src.conversation_recording import RecordingLibrary, read_recording, replay_lines, write_recording
+
+SSE_BODY = (
+    'event: reasoning\ndata: {"reasoning": "Checking deployments"}\n\n'
+    'event: tool_call\ndata: {"tool_id": "esql", "params": {"query": "FROM logs-*"}}\n\n'
+    'event: message_chunk\ndata: {"text_chunk": "Bad deploy"}\n\n'
+    'event: round_complete\ndata: {"round": {"confidence": 0.9}}\n\n'
+)
+
+
+def _collect(client, incident_id):
+    async def scenario():
+        return [event async for event in client.converse(incident_id, "Investigate service 'auth-service'")]
+
+    return asyncio.run(scenario())
+
+
+def _record(monkeypatch, record_dir):
+    real_client = httpx.AsyncClient
+
+    def mock_client(*args, **kwargs):
+        kwargs["transport"] = httpx.MockTransport(lambda request: httpx.Response(200, text=SSE_BODY))
+        return real_client(*args, **kwargs)
+
+    monkeypatch.setenv("KIBANA_URL", "http://kibana.local")
+    monkeypatch.setenv("ELASTIC_API_KEY", "key")
+    monkeypatch.setenv("AGENT_BUILDER_RECORD_DIR", str(record_dir))
+    monkeypatch.setattr(agent_builder_client.httpx, "AsyncClient", mock_client)
+    events = _collect(AgentBuilderClient(), "INC-REC1")
+    monkeypatch.undo()
+    return events
+
+
+def test_live_conversations_are_recorded_with_their_raw_lines(monkeypatch, tmp_path):
+    events = _record(monkeypatch, tmp_path)
+
+    assert [event["event"] for event in events] == ["reasoning", "tool_call", "message_chunk", "round_complete"]
+    [path] = list(tmp_path.glob("INC-REC1-*.jsonl.gz"))
+    recording = read_recording(path)
+    assert recording.incident_id == "INC-REC1"
+    assert recording.header["complete"] is True
+    assert recording.header["status_code"] == 200
+    assert "key" not in str(recording.header)
+    assert [line for _, line in recording.lines] == SSE_BODY.split("\n")[:-1]
+    offsets = [offset for offset, _ in recording.lines]
+    assert offsets == sorted(offsets)
+
+
+def test_replay_serves_the_recorded_events_without_kibana(monkeypatch, tmp_path):
+    recorded = _record(monkeypatch, tmp_path)
+
+    monkeypatch.delenv("KIBANA_URL", raising=False)
+    monkeypatch.delenv("ELASTIC_API_KEY", raising=False)
+    monkeypatch.setenv("AGENT_BUILDER_REPLAY_DIR", str(tmp_path))
+    monkeypatch.setenv("AGENT_BUILDER_REPLAY_SPEED", "0")
+    client = AgentBuilderClient()
+
+    assert _collect(client, "INC-REC1") == recorded
+    # Incidents without a recording of their own get the next one in the directory
+    assert _collect(client, "INC-OTHER") == recorded
+
+
+def test_replay_keeps_the_recorded_pacing_scaled_by_speed(tmp_path):
+    write_recording(
+        tmp_path / "INC-P-20260101T000000000000Z.jsonl.gz",
+        {"format": "agent-builder-sse/1", "incident_id": "INC-P"},
+        [(0.0, "event: reasoning"), (0.0, 'data: {"reasoning": "r"}'), (0.4, "event: round_complete"),
+         (0.4, 'data: {"round": {}}')],
+    )
+    recording = RecordingLibrary(tmp_path).for_incident("INC-P")
+
+    async def elapsed(speed):
+        started = time.monotonic()
+        lines = [line async for line in replay_lines(recording, speed)]
+        return time.monotonic() - started, lines
+
+    slow, lines = asyncio.run(elapsed(2.0))
+    fast, _ = asyncio.run(elapsed(0))
+    assert len(lines) == 4
+    assert 0.18 <= slow < 0.4
+    assert fast < 0.05
@@ -0,0 +1,74 @@
+import asyncio
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from agents.analyst.src.thought_relay import ThoughtRelay
+
+
+def _run_relay(events, **kwargs):
+    batches = []
+
+    async def sender(payload):
+        batches.append(payload)
+
+    async def scenario():
+        async with ThoughtRelay("INC-1", sender, flush_interval=60, **kwargs) as relay:
+            for event_type, data in events:
+                relay.add(event_type, data)
+                await asyncio.sleep(0)
+        return relay
+
+    relay = asyncio.run(scenario())
+    return relay, batches
+
+
+def test_message_chunks_are_coalesced_between_other_events():
+    events = [("message_chunk", {"text_chunk": t}) for t in ("The ", "deploy ", "broke it")]
+    events.insert(2, ("tool_call", {"tool_id": "esql", "params": {"query": "FROM logs-*"}}))
+    events.append(("tool_result", {"results": [{"a": 1}, {"a": 2}], "execution_time_ms": 12}))
+
+    relay, batches = _run_relay(events)
+
+    frames = [frame for batch in batches for frame in batch["events"]]
+    assert [(f["type"], f.get("text")) for f in frames] == [
+        ("message", "The deploy "),
+        ("tool_call", None),
+        ("message", "broke it"),
+        ("tool_result", None),
+    ]
+    assert frames[3]["result_count"] == 2
+    assert [f["seq"] for f in frames] == [1, 2, 3, 4]
+    assert relay.sent == 4
+
+
+def test_long_text_and_full_batches_are_flushed_early():
+    events = [("message_chunk", {"text_chunk": "abcde"})] * 8 + [("reasoning", {"reasoning": "r"})] * 4
+
+    relay, batches = _run_relay(events, chunk_chars=10, max_batch=3)
+
+    assert all(len(batch["events"]) <= 3 for batch in batches)
+    frames = [frame for batch in batches for frame in batch["events"]]
+    assert [f["text"] for f in frames if f["type"] == "message"] == ["abcdeabcde"] * 4
+    assert len(frames) == 8
+
+
+def test_gateway_failures_do_not_interrupt_the_investigation():
+    async def failing_sender(payload):
+        raise ConnectionError("gateway down")
+
+    async def scenario():
+        relay = ThoughtRelay("INC-1", failing_sender, flush_interval=60, max_pending=2)
+        async with relay:
+            for n in range(3):
+                relay.add("reasoning", {"reasoning": str(n)})
+        return relay
+
+    relay = asyncio.run(scenario())
+
+    assert relay.dropped == 1
+    assert relay.failed_batches == 1
+    assert relay.sent == 0
@@ -1,9 +1,12 @@
 from fastapi import FastAPI, BackgroundTasks
 from pydantic import BaseModel
 from loguru import logger
-from src.runbook_search import resolve_incident
+from src.runbook_search import resolve_incident, tracer
+from shared.es_client import lifespan
+from shared.tracing import TracingMiddleware
 
-app = FastAPI(title="Resolver Agent", version="1.0.0")
+app = FastAPI(title="Resolver Agent", version="1.0.0", lifespan=lifespan)
+app.add_middleware(TracingMiddleware, tracer=tracer)
 
 class ResolveRequest(BaseModel):
     incident_id: str
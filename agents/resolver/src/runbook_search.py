@@ -1,16 +1,40 @@
 import os
+import sys
 import json
 import hashlib
 import httpx
-from elasticsearch import AsyncElasticsearch
+from pathlib import Path
 from loguru import logger
 
-ES_HOST = os.getenv("ES_HOST", "http://elasticsearch:9200")
+try:
+    from shared import tracing
+    from shared.es_client import create_client
+    from shared.esql import EsqlQueryLibrary
+    from shared.serialization import json_body
+    from shared.tracing import CLIENT, TracedElasticsearch, Tracer
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[3]))
+    from shared import tracing
+    from shared.es_client import create_client
+    from shared.esql import EsqlQueryLibrary
+    from shared.serialization import json_body
+    from shared.tracing import CLIENT, TracedElasticsearch, Tracer
+
 API_GATEWAY_URL = os.getenv("API_GATEWAY_URL", "http://api-gateway:8000")
 
-es = AsyncElasticsearch(hosts=[ES_HOST])
+tracer = Tracer("resolver")
+
+es = TracedElasticsearch(create_client("resolver"), tracer)
+
+# Templates from tools/esql, validated once at startup
+esql = EsqlQueryLibrary(client_factory=lambda: es).load()
 
 async def resolve_incident(incident_id: str, rcca_context: dict):
+    with tracer.span("resolver.resolve_incident", attributes={"incident_id": incident_id}):
+        await _resolve_incident(incident_id, rcca_context)
+
+
+async def _resolve_incident(incident_id: str, rcca_context: dict):
     # Support both old and new data contracts
     hypotheses = rcca_context.get("hypotheses", [])
     root_cause = rcca_context.get("root_cause", "")
@@ -47,26 +71,13 @@ async def search_runbooks(query_text: str):
     1. ES|QL for structured/exact matching.
     2. Multi-match search for broader recall.
     """
-    # Basic sanitization for ES|QL
-    safe_query = query_text.replace('"', '\\"')
-    
-    esql_query = f"""
-    FROM "runbooks-knowledge"
-    | WHERE MATCH(content, "{safe_query}") OR MATCH(title, "{safe_query}")
-    | LIMIT 5 
-    | KEEP title, url, content, runbook_id
-    """
-    
     results_map = {} # Using a map to de-duplicate results
     
-    # 1. ES|QL Attempt
+    # 1. ES|QL Attempt (query text is bound as a param, no escaping needed)
     try:
-        resp = await es.esql.query(query=esql_query, format="json")
-        if resp.get("values"):
-            cols = [c["name"] for c in resp["columns"]]
-            for row in resp["values"]:
-                item = dict(zip(cols, row))
-                results_map[item["runbook_id"]] = item
+        result = await esql.query("search_runbooks", {"query": query_text}, run_async=True)
+        for item in result.records():
+            results_map[item["runbook_id"]] = item
     except Exception as e:
         logger.error(f"ES|QL search failed: {e}")
 
@@ -95,6 +106,7 @@ async def search_runbooks(query_text: str):
 
 def generate_action_id(incident_id: str, action: dict, sequence: int) -> str:
     """Generate a deterministic action ID for auditability across systems."""
+    # Stays on the stdlib encoding: changing the canonical form would change every action ID
     canonical_action = json.dumps(action, sort_keys=True, default=str)
     digest_input = f"{incident_id}|{sequence}|{canonical_action}".encode("utf-8")
     digest = hashlib.sha256(digest_input).hexdigest()[:16].upper()
@@ -155,13 +167,14 @@ def synthesize_actions(incident_id, runbooks, hypothesis):
 
 async def submit_proposals(incident_id, actions):
     try:
-        async with httpx.AsyncClient() as client:
-            payload = {
-                "incident_id": incident_id,
-                "agent": "resolver",
-                "proposals": actions
-            }
-            # Posting to API Gateway agent reporting endpoint
-            await client.post(f"{API_GATEWAY_URL}/agent/report", json=payload)
+        with tracer.span("submit_proposals", CLIENT, attributes={"incident_id": incident_id, "proposals": len(actions)}):
+            async with httpx.AsyncClient() as client:
+                payload = {
+                    "incident_id": incident_id,
+                    "agent": "resolver",
+                    "proposals": actions
+                }
+                # Posting to API Gateway agent reporting endpoint
+                await client.post(f"{API_GATEWAY_URL}/agent/report", **json_body(payload, headers=tracing.inject()))
     except Exception as e:
         logger.error(f"Failed to submit proposals: {e}")
@@ -1,24 +1,35 @@
 import os
+import sys
 import httpx
-from elasticsearch import AsyncElasticsearch
+from pathlib import Path
+from typing import Mapping
 from loguru import logger
-import json
 from datetime import datetime
 
-ES_HOST = os.getenv("ES_HOST", "http://elasticsearch:9200")
+try:
+    from shared import tracing
+    from shared.es_client import create_client
+    from shared.esql import EsqlQueryLibrary
+    from shared.serialization import json_body
+    from shared.tracing import CLIENT, TracedElasticsearch, Tracer
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[3]))
+    from shared import tracing
+    from shared.es_client import create_client
+    from shared.esql import EsqlQueryLibrary
+    from shared.serialization import json_body
+    from shared.tracing import CLIENT, TracedElasticsearch, Tracer
+
 API_GATEWAY_URL = os.getenv("API_GATEWAY_URL", "http://api-gateway:8000")
 
-es = AsyncElasticsearch(hosts=[ES_HOST])
+tracer = Tracer("sentinel")
+
+# Detection polls are not traced; ES calls show up only inside an incident's trace
+es = TracedElasticsearch(create_client("sentinel"), tracer)
 
-# In a real app, load this from the tools/esql/detect_anomalies.json file
-ANOMALY_QUERY_TEMPLATE = """
-FROM metrics-system 
-| WHERE service.name == "{service_name}" AND @timestamp > NOW() - {time_window} 
-| STATS error_rate = AVG(CAST(error_count AS DOUBLE)) / COUNT(*), p99_latency = PERCENTILE(latency, 99) BY service.name 
-| WHERE error_rate > {error_threshold} OR p99_latency > {latency_threshold}
-| LOOKUP lookup-services ON service.name
-| KEEP service.name, error_rate, p99_latency, team, criticality
-"""
+# Templates from tools/esql, validated once at startup
+esql = EsqlQueryLibrary(client_factory=lambda: es).load()
+ANOMALY_QUERY = esql.get("detect_anomalies")
 
 SERVICES_TO_MONITOR = ["payment-service", "auth-service", "cart-service"]
 
@@ -32,41 +43,30 @@ async def run_anomaly_detection_cycle():
 async def check_service(service_name: str):
     logger.debug(f"Checking service: {service_name}")
     
-    # Fill params
-    query = ANOMALY_QUERY_TEMPLATE.format(
-        service_name=service_name,
-        time_window="15m",
-        error_threshold=0.05,
-        latency_threshold=1000
-    )
-    
     try:
-        # Execute ES|QL
-        # Note: ES|QL API in python client might be under `es.esql.query` or direct transport
-        # For 8.11+, use es.esql.query
-        resp = await es.esql.query(query=query, format="json")
+        # Execute ES|QL with the arguments bound as query params; the async API
+        # keeps wide-window aggregations from tying up a connection or timing out.
+        # It answers in columnar JSON, which is plenty for one aggregated row.
+        result = await esql.query(ANOMALY_QUERY, {
+            "service_name": service_name,
+            "time_window": "15m",
+            "error_threshold": 0.05,
+            "latency_threshold": 1000,
+        }, run_async=True, columnar=True)
         
-        # Parse results
-        # ES|QL JSON response format: columns, values (list of lists)
-        columns = resp.get("columns", [])
-        values = resp.get("values", [])
-        
-        if values:
-            logger.warning(f"Anomaly detected for {service_name}! Data: {values}")
-            await report_incident(service_name, columns, values[0])
+        if result.num_rows:
+            anomaly = result.first()
+            logger.warning(f"Anomaly detected for {service_name}! Data: {dict(anomaly)}")
+            await report_incident(service_name, anomaly)
             
     except Exception as e:
         logger.error(f"Failed to query ES for {service_name}: {e}")
 
-async def report_incident(service, columns, row):
+async def report_incident(service, data: Mapping):
     """
     Constructs incident payload and calls API Gateway.
-    Row is a list of values corresponding to columns.
+    Data is a mapping of column name to value (a lazy row view of the result).
     """
-    # Map columns to dict
-    col_names = [c["name"] for c in columns]
-    data = dict(zip(col_names, row))
-    
     payload = {
         "source": "sentinel",
         "service": service,
@@ -84,8 +84,15 @@ async def report_incident(service, columns, row):
     }
     
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(f"{API_GATEWAY_URL}/api/datapulse/v1/incidents", json=payload)
+        # Root of the incident's trace: its trace id is derived from the correlation_id
+        with tracer.span(
+            "sentinel.report_incident", CLIENT, correlation_id=payload["correlation_id"], attributes={"service": service}
+        ) as span:
+            async with httpx.AsyncClient() as client:
+                resp = await client.post(
+                    f"{API_GATEWAY_URL}/api/datapulse/v1/incidents", **json_body(payload, headers=tracing.inject())
+                )
+                span.set_attribute("http.status_code", resp.status_code)
             if resp.status_code == 201:
                 logger.info(f"Incident reported successfully: {resp.json().get('incident_id')}")
             else:
@@ -2,6 +2,7 @@ import asyncio
 from fastapi import FastAPI, BackgroundTasks
 from loguru import logger
 from src.detector import run_anomaly_detection_cycle
+from shared.es_client import close_clients
 import os
 
 app = FastAPI(title="Sentinel Agent", version="1.0.0")
@@ -12,6 +13,10 @@ async def startup_event():
     # Start the continuous detection loop in background
     asyncio.create_task(continuous_monitoring())
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await close_clients()
+
 @app.get("/healthz")
 async def health():
     return {"status": "ok"}
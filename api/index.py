@@ -4,4 +4,7 @@ import sys
 # Add project root to sys.path so 'backend' can be resolved
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+# Every cold start imports the gateway: create clients and integrations on first use instead
+os.environ.setdefault("GATEWAY_LAZY_INIT", "true")
+
 from backend.api_gateway.src.main import app
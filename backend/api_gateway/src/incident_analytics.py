@@ -0,0 +1,186 @@
+"""
+Server-side incident analytics.
+
+One search with ``size: 0`` returns everything a dashboard needs: incident
+counts by service, severity and status, a date histogram, and time-to-RCA /
+time-to-resolution statistics, computed by Elasticsearch aggregations over the
+``time_to_rca_seconds`` and ``time_to_resolution_seconds`` fields the gateway
+stores as incidents progress. Results are cached for a short TTL per query,
+and concurrent identical requests share one search.
+"""
+import asyncio
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+_SPAN = re.compile(r"^(\d+)([mhdw])$")
+_SPAN_SECONDS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+MAX_BUCKETS = 500
+PERCENTS = (50.0, 90.0, 99.0)
+DURATION_FIELDS = ("time_to_rca_seconds", "time_to_resolution_seconds")
+
+
+def span_seconds(value: str, name: str) -> int:
+    match = _SPAN.match(value or "")
+    if not match or int(match.group(1)) < 1:
+        raise ValueError(f"{name} must look like 30m, 12h, 7d or 2w")
+    return int(match.group(1)) * _SPAN_SECONDS[match.group(2)]
+
+
+def fixed_interval(interval: str) -> str:
+    """The interval as a date_histogram fixed_interval, which has no week unit."""
+    count, unit = _SPAN.match(interval).groups()
+    return f"{int(count) * 7}d" if unit == "w" else interval
+
+
+def build_analytics_query(
+    window: str = "7d",
+    interval: str = "1d",
+    service: Optional[str] = None,
+    severity: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Search body for the analytics aggregations; raises ValueError on bad parameters."""
+    if span_seconds(window, "window") // span_seconds(interval, "interval") > MAX_BUCKETS:
+        raise ValueError(f"window/interval would produce more than {MAX_BUCKETS} buckets")
+
+    # Rounding `now` to the minute keeps the request cacheable by Elasticsearch as well
+    filters = [{"range": {"created_at": {"gte": f"now-{window}/m", "lte": "now/m"}}}]
+    if service:
+        filters.append({"term": {"service": service}})
+    if severity:
+        filters.append({"term": {"severity": severity}})
+
+    durations = {}
+    for field in DURATION_FIELDS:
+        durations[f"{field}_stats"] = {"stats": {"field": field}}
+        durations[f"{field}_percentiles"] = {"percentiles": {"field": field, "percents": list(PERCENTS)}}
+
+    return {
+        "size": 0,
+        "track_total_hits": True,
+        "query": {"bool": {"filter": filters}},
+        "aggs": {
+            "by_service": {
+                "terms": {"field": "service", "size": 50},
+                "aggs": {"time_to_resolution": {"avg": {"field": "time_to_resolution_seconds"}}},
+            },
+            "by_severity": {"terms": {"field": "severity", "size": 10}},
+            "by_status": {"terms": {"field": "status", "size": 10}},
+            "over_time": {
+                "date_histogram": {"field": "created_at", "fixed_interval": fixed_interval(interval), "min_doc_count": 0},
+                "aggs": {"by_severity": {"terms": {"field": "severity", "size": 10}}},
+            },
+            **durations,
+        },
+    }
+
+
+def _counts(agg: Dict[str, Any]) -> Dict[str, int]:
+    return {bucket["key"]: bucket["doc_count"] for bucket in agg.get("buckets", [])}
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 1) if value is not None else None
+
+
+def _duration_summary(aggs: Dict[str, Any], field: str) -> Dict[str, Any]:
+    stats = aggs.get(f"{field}_stats", {})
+    percentiles = aggs.get(f"{field}_percentiles", {}).get("values", {})
+    summary = {
+        "count": stats.get("count", 0),
+        "mean": _round(stats.get("avg")),
+        "min": _round(stats.get("min")),
+        "max": _round(stats.get("max")),
+    }
+    for percent in PERCENTS:
+        summary[f"p{int(percent)}"] = _round(percentiles.get(str(percent)))
+    return summary
+
+
+def parse_analytics_response(resp: Dict[str, Any]) -> Dict[str, Any]:
+    aggs = resp.get("aggregations", {})
+    total_hits = resp.get("hits", {}).get("total", {})
+    return {
+        "total": total_hits.get("value", 0) if isinstance(total_hits, dict) else int(total_hits),
+        "by_service": [
+            {
+                "service": bucket["key"],
+                "count": bucket["doc_count"],
+                "mean_time_to_resolution_seconds": _round(bucket.get("time_to_resolution", {}).get("value")),
+            }
+            for bucket in aggs.get("by_service", {}).get("buckets", [])
+        ],
+        "by_severity": _counts(aggs.get("by_severity", {})),
+        "by_status": _counts(aggs.get("by_status", {})),
+        "over_time": [
+            {
+                "timestamp": bucket.get("key_as_string", bucket["key"]),
+                "count": bucket["doc_count"],
+                "by_severity": _counts(bucket.get("by_severity", {})),
+            }
+            for bucket in aggs.get("over_time", {}).get("buckets", [])
+        ],
+        "time_to_rca_seconds": _duration_summary(aggs, "time_to_rca_seconds"),
+        "time_to_resolution_seconds": _duration_summary(aggs, "time_to_resolution_seconds"),
+    }
+
+
+class AnalyticsCache:
+    """Short-TTL result cache keyed by query; concurrent misses for a key share one load."""
+
+    def __init__(self, ttl: float = 15.0, max_entries: int = 128, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_load(self, key: Tuple, loader: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Returns (value, cached)."""
+        entry = self._entries.get(key)
+        if entry is not None and self.clock() - entry[0] < self.ttl:
+            self.hits += 1
+            return entry[1], True
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.hits += 1
+            try:
+                return await asyncio.shield(pending), True
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The request loading it was cancelled, not this one: load it here instead
+                self.hits -= 1
+                return await self.get_or_load(key, loader)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark retrieved so an uncontended failure is not reported twice
+            future.exception()
+            raise
+        except BaseException:
+            # Cancelled: waiters must not wait forever on a result that will never come
+            future.cancel()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        future.set_result(value)
+        self._entries[key] = (self.clock(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value, False
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "ttl_seconds": self.ttl}
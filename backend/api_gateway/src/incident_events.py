@@ -0,0 +1,181 @@
+"""
+In-process pub/sub for live incident updates.
+
+The gateway publishes an event whenever it creates an incident, records an
+agent report or moves an action, and the SSE endpoint streams them to
+dashboards instead of having each one poll Elasticsearch. Events get
+monotonically increasing ids and the most recent ones are kept in a ring
+buffer, so a reconnecting client sends ``Last-Event-ID`` and receives what it
+missed. Every subscriber has a bounded buffer; a subscriber that falls that
+far behind is disconnected rather than slowing down publishers or growing
+memory, and resumes from its last event id when it reconnects.
+
+The bus is per process: with several gateway replicas, a client sees the
+events of the replica it is connected to. Ids restart with the process, so
+the gateway starts them from the process start time in milliseconds: ids from
+an earlier process then predate the history and the client is told to reload,
+as it is for an id the bus has not reached.
+"""
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set
+
+from loguru import logger
+
+try:
+    from shared.serialization import dumps_str
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), "../../.."))
+    from shared.serialization import dumps_str
+
+
+@dataclass
+class IncidentEvent:
+    id: int
+    type: str
+    incident_id: str
+    data: Dict[str, Any]
+    timestamp: float = field(default_factory=time.time)
+
+    def to_sse(self) -> str:
+        payload = dumps_str({"incident_id": self.incident_id, "timestamp": self.timestamp, **self.data})
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+class Subscription:
+    """One client's view of the bus: replayed history followed by live events."""
+
+    def __init__(self, bus: "IncidentEventBus", buffer_size: int, incident_id: Optional[str]):
+        self._bus = bus
+        self.incident_id = incident_id
+        self.queue: "asyncio.Queue[IncidentEvent]" = asyncio.Queue(maxsize=buffer_size)
+        self.dropped = False
+        self._closed = asyncio.Event()
+
+    def wants(self, event: IncidentEvent) -> bool:
+        return self.incident_id is None or event.incident_id == self.incident_id
+
+    def offer(self, event: IncidentEvent) -> bool:
+        """Queue an event without blocking; False once the subscriber has fallen too far behind."""
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self.dropped = True
+            self._closed.set()
+            return False
+
+    def close(self):
+        self._closed.set()
+        self._bus.unsubscribe(self)
+
+    async def next(self, timeout: Optional[float] = None) -> Optional[IncidentEvent]:
+        """The next event, or None on timeout (so callers can send keep-alives) or close."""
+        if not self.queue.empty():
+            return self.queue.get_nowait()
+        if self._closed.is_set():
+            return None
+
+        get = asyncio.ensure_future(self.queue.get())
+        closed = asyncio.ensure_future(self._closed.wait())
+        try:
+            await asyncio.wait({get, closed}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            closed.cancel()
+            if not get.done():
+                get.cancel()
+        if get.done() and not get.cancelled():
+            return get.result()
+        return None
+
+    @property
+    def closed(self) -> bool:
+        return self._closed.is_set() and self.queue.empty()
+
+
+class IncidentEventBus:
+    """Fan-out of incident events to subscribers with bounded buffers and replay."""
+
+    def __init__(self, history_size: int = 1000, buffer_size: int = 100, first_id: int = 1):
+        self.buffer_size = buffer_size
+        self._history: Deque[IncidentEvent] = deque(maxlen=history_size)
+        self._subscribers: Set[Subscription] = set()
+        self._next_id = first_id
+        self.published = 0
+        self.dropped_subscribers = 0
+
+    @property
+    def last_event_id(self) -> int:
+        return self._next_id - 1
+
+    def publish(self, event_type: str, incident_id: str, data: Optional[Dict[str, Any]] = None) -> IncidentEvent:
+        event = IncidentEvent(self._next_id, event_type, incident_id, data or {})
+        self._next_id += 1
+        self._history.append(event)
+        self.published += 1
+
+        for subscription in list(self._subscribers):
+            if subscription.wants(event) and not subscription.offer(event):
+                self.dropped_subscribers += 1
+                self._subscribers.discard(subscription)
+                logger.warning(f"Dropped slow incident stream subscriber after {self.buffer_size} queued events")
+        return event
+
+    def subscribe(self, last_event_id: Optional[int] = None, incident_id: Optional[str] = None) -> Subscription:
+        """Register a subscriber; events after last_event_id still in history are queued first.
+
+        If the requested id has already left the history, was never issued by
+        this process, or the backlog would not fit the subscriber's buffer, a
+        ``stream.reset`` event tells the client to reload its state instead.
+        """
+        subscription = Subscription(self, self.buffer_size, incident_id)
+        backlog: List[IncidentEvent] = []
+        if last_event_id is not None and last_event_id > self.last_event_id:
+            # Issued by an earlier gateway process (or a replica further ahead)
+            backlog = [self._reset_event("unknown_event_id")]
+        elif last_event_id is not None and last_event_id < self.last_event_id:
+            oldest = self._history[0].id if self._history else self._next_id
+            backlog = [e for e in self._history if e.id > last_event_id and subscription.wants(e)]
+            if last_event_id < oldest - 1:
+                backlog = [self._reset_event("history_expired")]
+            elif len(backlog) >= self.buffer_size:
+                backlog = [self._reset_event("backlog_too_large")]
+
+        # Replay and registration happen without yielding, so no event falls in between
+        for event in backlog:
+            subscription.offer(event)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def _reset_event(self, reason: str) -> IncidentEvent:
+        # Carries the current id so a client that reloads can resume from here
+        return IncidentEvent(self.last_event_id, "stream.reset", "", {"reason": reason})
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+
+    async def stream(self, subscription: Subscription, keepalive_seconds: float = 15.0) -> AsyncIterator[str]:
+        """Server-sent events for a subscription, with comment keep-alives while idle."""
+        try:
+            yield f"retry: 3000\n: connected, last event id {self.last_event_id}\n\n"
+            while not subscription.closed:
+                event = await subscription.next(timeout=keepalive_seconds)
+                if event is not None:
+                    yield event.to_sse()
+                elif not subscription.closed:
+                    yield ": keepalive\n\n"
+        finally:
+            subscription.close()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped_subscribers": self.dropped_subscribers,
+            "last_event_id": self.last_event_id,
+            "history": len(self._history),
+        }
@@ -0,0 +1,267 @@
+"""
+Index templates, ILM policies and write aliases for the gateway's indices.
+
+Incidents and audit events are written through a write alias
+(``.incidents-datapulse``, ``.audit-datapulse``) backed by numbered indices
+(``-000001``, ``-000002``, ...) that ILM rolls over by primary shard size or
+age, so no single index grows without bound. The templates map every field
+the gateway writes explicitly: identifiers and enums as ``keyword``,
+timestamps as ``date``, and large blobs (the analyst's ``full_analysis``, tool
+output snippets) are kept in ``_source`` without being indexed. Unmapped
+strings default to ``keyword`` instead of the dynamic ``text`` + ``.keyword``
+pair.
+
+The aliases are named by ``INDEX_INCIDENTS_ALIAS`` and ``INDEX_AUDIT_ALIAS``.
+``INDEX_INCIDENTS`` / ``INDEX_AUDIT`` used to name the concrete index
+(``.incidents-datapulse-000001``); they are still read, and such a value is
+mapped to its alias with a warning rather than colliding with the index.
+
+Run ``python index_bootstrap.py`` to install everything by hand; the gateway
+also calls ``ensure_indices`` at startup. Every step is idempotent.
+"""
+import asyncio
+import os
+import re
+import sys
+from typing import Any, Dict, List
+
+from loguru import logger
+
+_NUMBERED_INDEX = re.compile(r"^(.+)-\d{6}$")
+
+
+def alias_setting(name: str, legacy_name: str, default: str) -> str:
+    """The write alias from ``name``, or from the legacy variable that named the concrete index."""
+    value = os.getenv(name)
+    if value:
+        return value
+    value = os.getenv(legacy_name)
+    if not value:
+        return default
+    match = _NUMBERED_INDEX.match(value)
+    if match:
+        logger.warning(
+            f"{legacy_name}={value} names a concrete index; writing through its alias {match.group(1)} "
+            f"instead (set {name} to silence this)"
+        )
+        return match.group(1)
+    return value
+
+
+INCIDENTS_ALIAS = alias_setting("INDEX_INCIDENTS_ALIAS", "INDEX_INCIDENTS", ".incidents-datapulse")
+AUDIT_ALIAS = alias_setting("INDEX_AUDIT_ALIAS", "INDEX_AUDIT", ".audit-datapulse")
+
+ROLLOVER_MAX_PRIMARY_SHARD_SIZE = os.getenv("INDEX_ROLLOVER_MAX_PRIMARY_SHARD_SIZE", "25gb")
+ROLLOVER_MAX_AGE = os.getenv("INDEX_ROLLOVER_MAX_AGE", "30d")
+NUMBER_OF_REPLICAS = int(os.getenv("INDEX_NUMBER_OF_REPLICAS", "1"))
+
+# Unmapped strings become keywords rather than text with a .keyword sub-field
+_STRINGS_AS_KEYWORDS = [
+    {
+        "strings_as_keywords": {
+            "match_mapping_type": "string",
+            "mapping": {"type": "keyword", "ignore_above": 1024},
+        }
+    }
+]
+
+_STORED_TEXT = {"type": "text", "index": False}
+_UNINDEXED_OBJECT = {"type": "object", "enabled": False}
+
+_ACTION_PROPERTIES = {
+    "action_id": {"type": "keyword"},
+    "incident_id": {"type": "keyword"},
+    "state": {"type": "keyword"},
+    "status": {"type": "keyword"},
+    "title": {"type": "text"},
+    "action_type": {"type": "keyword"},
+    "description": _STORED_TEXT,
+    "estimated_time": {"type": "keyword"},
+    "requires_approval": {"type": "boolean"},
+    "risk_score": {"type": "float"},
+    "created_at": {"type": "date"},
+    "updated_at": {"type": "date"},
+    "approved_at": {"type": "date"},
+    "approved_by": {"type": "keyword"},
+    "last_actor": {"type": "keyword"},
+    "url": {"type": "keyword", "index": False},
+}
+
+_TRANSITION_PROPERTIES = {
+    "incident_id": {"type": "keyword"},
+    "action_id": {"type": "keyword"},
+    "from_state": {"type": "keyword"},
+    "to_state": {"type": "keyword"},
+    "actor": {"type": "keyword"},
+    "source": {"type": "keyword"},
+    "reason": {"type": "text"},
+    "timestamp": {"type": "date"},
+}
+
+INCIDENT_MAPPINGS: Dict[str, Any] = {
+    "dynamic_templates": _STRINGS_AS_KEYWORDS,
+    "properties": {
+        "incident_id": {"type": "keyword"},
+        "correlation_id": {"type": "keyword"},
+        "source": {"type": "keyword"},
+        "service": {"type": "keyword"},
+        "severity": {"type": "keyword"},
+        "status": {"type": "keyword"},
+        "title": {"type": "text"},
+        "detected_at": {"type": "date"},
+        "created_at": {"type": "date"},
+        "rca_completed_at": {"type": "date"},
+        "resolved_at": {"type": "date"},
+        "time_to_rca_seconds": {"type": "float"},
+        "time_to_resolution_seconds": {"type": "float"},
+        "metrics": {
+            "properties": {
+                "error_rate": {"type": "float"},
+                "p99_latency_ms": {"type": "float"},
+            }
+        },
+        "evidence": {
+            "properties": {
+                "type": {"type": "keyword"},
+                "ref": {"type": "keyword"},
+                "text": {"type": "text"},
+                "snippet": _STORED_TEXT,
+            }
+        },
+        "timeline": {
+            "properties": {
+                "timestamp": {"type": "date"},
+                "event": {"type": "text"},
+            }
+        },
+        "analyst_report": {
+            "properties": {
+                "root_cause": {"type": "text"},
+                "full_analysis": _STORED_TEXT,
+                "confidence": {"type": "float"},
+                "evidence": _UNINDEXED_OBJECT,
+                "tool_calls_count": {"type": "integer"},
+                "timestamp": {"type": "date"},
+            }
+        },
+        "resolver_proposals": {"properties": _ACTION_PROPERTIES},
+        "actions": {"properties": _ACTION_PROPERTIES},
+        "action_history": {"properties": _TRANSITION_PROPERTIES},
+        "slack_message": {
+            "properties": {
+                "channel": {"type": "keyword"},
+                "ts": {"type": "keyword"},
+            }
+        },
+        "jira_ticket": {"type": "keyword"},
+    },
+}
+
+AUDIT_MAPPINGS: Dict[str, Any] = {
+    "dynamic_templates": _STRINGS_AS_KEYWORDS,
+    "properties": {
+        "event_type": {"type": "keyword"},
+        **_TRANSITION_PROPERTIES,
+        "decision": {"type": "keyword"},
+        "recorded_at": {"type": "date"},
+    },
+}
+
+
+def rollover_policy() -> Dict[str, Any]:
+    return {
+        "phases": {
+            "hot": {
+                "actions": {
+                    "rollover": {
+                        "max_primary_shard_size": ROLLOVER_MAX_PRIMARY_SHARD_SIZE,
+                        "max_age": ROLLOVER_MAX_AGE,
+                    }
+                }
+            }
+        }
+    }
+
+
+# alias -> (template name, ILM policy name, mappings)
+MANAGED_INDICES = {
+    INCIDENTS_ALIAS: ("incidents_datapulse_template", "incidents_policy", INCIDENT_MAPPINGS),
+    AUDIT_ALIAS: ("audit_datapulse_template", "audit_policy", AUDIT_MAPPINGS),
+}
+
+
+def index_pattern(alias: str) -> str:
+    return f"{alias}-*"
+
+
+def first_index(alias: str) -> str:
+    return f"{alias}-000001"
+
+
+def index_template(alias: str, policy: str, mappings: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "index_patterns": [index_pattern(alias)],
+        "priority": 200,
+        "template": {
+            "settings": {
+                "index": {
+                    "number_of_shards": 1,
+                    "number_of_replicas": NUMBER_OF_REPLICAS,
+                    "lifecycle": {"name": policy, "rollover_alias": alias},
+                }
+            },
+            "mappings": mappings,
+        },
+    }
+
+
+async def ensure_alias(es, alias: str, policy: str):
+    """Point the write alias at a managed index, adopting a legacy -000001 index if present."""
+    if await es.indices.exists_alias(name=alias):
+        return
+
+    legacy = first_index(alias)
+    if await es.indices.exists(index=legacy):
+        # Indices created before the templates were installed: attach the alias and ILM in place
+        await es.indices.put_settings(
+            index=legacy,
+            settings={"index": {"lifecycle": {"name": policy, "rollover_alias": alias}}},
+        )
+        await es.indices.update_aliases(
+            actions=[{"add": {"index": legacy, "alias": alias, "is_write_index": True}}]
+        )
+        # Its mappings were dynamic, so start writing to a templated index straight away
+        await es.indices.rollover(alias=alias)
+        logger.info(f"Attached write alias {alias} to existing index {legacy} and rolled it over")
+        return
+
+    await es.indices.create(index=legacy, aliases={alias: {"is_write_index": True}})
+    logger.info(f"Created {legacy} behind write alias {alias}")
+
+
+async def ensure_indices(es) -> List[str]:
+    """Install ILM policies and index templates, then bootstrap the write aliases."""
+    for alias, (template_name, policy, mappings) in MANAGED_INDICES.items():
+        await es.ilm.put_lifecycle(name=policy, policy=rollover_policy())
+        await es.indices.put_index_template(name=template_name, **index_template(alias, policy, mappings))
+        await ensure_alias(es, alias, policy)
+    return list(MANAGED_INDICES)
+
+
+async def _main():
+    try:
+        from shared.es_client import create_client
+    except ImportError:
+        sys.path.append(os.path.join(os.path.dirname(__file__), "../../.."))
+        from shared.es_client import create_client
+
+    es = create_client("index-bootstrap", hosts=[os.getenv("ES_HOST", "http://localhost:9200")])
+    try:
+        aliases = await ensure_indices(es)
+        print(f"Index templates, ILM policies and write aliases ready: {', '.join(aliases)}")
+    finally:
+        await es.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,199 @@
+"""
+Concurrent integration fan-out with per-integration circuit breakers.
+
+Each registered integration (Slack, Jira, ...) is dispatched concurrently with
+its own timeout. Repeated failures open the integration's circuit so further
+calls fail fast until a half-open probe succeeds.
+"""
+import asyncio
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from loguru import logger
+
+
+class CircuitState(str, Enum):
+    closed = "closed"
+    open = "open"
+    half_open = "half_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe."""
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CircuitState.closed
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        if self.state == CircuitState.closed:
+            return True
+
+        if self.state == CircuitState.open:
+            if time.monotonic() - (self.opened_at or 0.0) < self.recovery_timeout:
+                return False
+            self.state = CircuitState.half_open
+            logger.info(f"Circuit for {self.name} half-open, probing recovery")
+
+        # Half-open: let exactly one probe through until it reports back
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self):
+        if self.state != CircuitState.closed:
+            logger.info(f"Circuit for {self.name} closed after successful probe")
+        self.state = CircuitState.closed
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == CircuitState.half_open or self.consecutive_failures >= self.failure_threshold:
+            if self.state != CircuitState.open:
+                logger.warning(
+                    f"Circuit for {self.name} opened after {self.consecutive_failures} consecutive failures"
+                )
+            self.state = CircuitState.open
+            self.opened_at = time.monotonic()
+
+
+class IntegrationStats:
+    """Success/latency counters for a single integration."""
+
+    def __init__(self, latency_window: int = 500):
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.short_circuited = 0
+        self.latencies_ms: Deque[float] = deque(maxlen=latency_window)
+
+    def record_latency(self, latency_ms: float):
+        self.latencies_ms.append(latency_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies_ms)
+        completed = self.successes + self.failures + self.timeouts
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "short_circuited": self.short_circuited,
+            "success_rate": round(self.successes / completed, 4) if completed else None,
+            "latency_ms": {
+                "avg": round(sum(latencies) / len(latencies), 2) if latencies else None,
+                "p95": round(latencies[int(0.95 * (len(latencies) - 1))], 2) if latencies else None,
+                "max": round(latencies[-1], 2) if latencies else None,
+            },
+        }
+
+
+class _Integration:
+    def __init__(self, name: str, handler: Callable[[Dict[str, Any]], Awaitable[Any]], timeout: float,
+                 breaker: CircuitBreaker):
+        self.name = name
+        self.handler = handler
+        self.timeout = timeout
+        self.breaker = breaker
+        self.stats = IntegrationStats()
+
+
+class IntegrationDispatcher:
+    """Dispatch a payload to all registered integrations concurrently."""
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 observer: Optional[Callable[[str, str, float], None]] = None):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        # Called with (integration, outcome, seconds) after every call, e.g. to feed metrics
+        self.observer = observer
+        self._integrations: Dict[str, _Integration] = {}
+
+    def register(self, name: str, handler: Callable[[Dict[str, Any]], Awaitable[Any]], timeout: float = 10.0):
+        """Register an integration handler. Handlers signal failure by raising."""
+        self._integrations[name] = _Integration(
+            name,
+            handler,
+            timeout,
+            CircuitBreaker(name, self.failure_threshold, self.recovery_timeout),
+        )
+
+    async def dispatch(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Run every integration concurrently; returns name -> result (None on failure)."""
+        names = list(self._integrations)
+        results = await asyncio.gather(*(self._call(self._integrations[name], payload) for name in names))
+        return dict(zip(names, results))
+
+    async def _call(self, integration: _Integration, payload: Dict[str, Any]) -> Any:
+        stats = integration.stats
+        stats.calls += 1
+
+        if not integration.breaker.allow_request():
+            stats.short_circuited += 1
+            self._observe(integration.name, "short_circuited", 0.0)
+            logger.warning(f"Skipping {integration.name}: circuit is {integration.breaker.state.value}")
+            return None
+
+        started = time.perf_counter()
+        outcome = "failure"
+        try:
+            result = await asyncio.wait_for(integration.handler(payload), timeout=integration.timeout)
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            stats.timeouts += 1
+            integration.breaker.record_failure()
+            logger.error(f"{integration.name} integration timed out after {integration.timeout}s")
+            return None
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            # Reports back a cancelled half-open probe, which would otherwise block every later one
+            integration.breaker.record_failure()
+            raise
+        except Exception as e:
+            stats.failures += 1
+            integration.breaker.record_failure()
+            logger.error(f"{integration.name} integration failed: {e}")
+            return None
+        else:
+            outcome = "success"
+        finally:
+            elapsed = time.perf_counter() - started
+            stats.record_latency(elapsed * 1000)
+            self._observe(integration.name, outcome, elapsed)
+
+        stats.successes += 1
+        integration.breaker.record_success()
+        return result
+
+    def _observe(self, name: str, outcome: str, seconds: float):
+        if self.observer is None:
+            return
+        try:
+            self.observer(name, outcome, seconds)
+        except Exception as e:
+            logger.debug(f"Integration observer failed for {name}: {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            name: {
+                "circuit": {
+                    "state": integration.breaker.state.value,
+                    "consecutive_failures": integration.breaker.consecutive_failures,
+                },
+                "timeout_seconds": integration.timeout,
+                **integration.stats.snapshot(),
+            }
+            for name, integration in self._integrations.items()
+        }
@@ -0,0 +1,68 @@
+"""
+Deferred construction of the gateway's heavy clients.
+
+On a serverless platform every cold start imports the gateway module before
+the first request can be served. With ``GATEWAY_LAZY_INIT`` set (the Vercel
+entry point in ``api/index.py`` does this) the Elasticsearch client - and the
+``elasticsearch`` package with its HTTP stacks - and the integration adapters
+are only created when a request first needs them, so requests that do not
+(health checks, validation errors) never pay for them.
+
+Clients are cached per event loop: a warm invocation running on the same loop
+reuses the client and its pooled connections, while an invocation on a new
+loop (some runtimes start one per request) gets a fresh client instead of one
+bound to a closed loop.
+"""
+import asyncio
+import os
+from typing import Any, Callable, Dict, Optional
+
+LAZY_INIT = os.getenv("GATEWAY_LAZY_INIT", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class LazyClient:
+    """Proxy that builds its target with factory() on first attribute access, once per event loop."""
+
+    def __init__(self, factory: Callable[[], Any], name: str = "client"):
+        self._factory = factory
+        self._name = name
+        self._instances: Dict[Optional[asyncio.AbstractEventLoop], Any] = {}
+        self.created = 0
+
+    def get(self) -> Any:
+        loop = _current_loop()
+        instance = self._instances.get(loop)
+        if instance is None:
+            # Forget clients of loops that have since closed; their connections are gone anyway
+            for stale in [key for key in self._instances if key is not None and key.is_closed()]:
+                del self._instances[stale]
+            instance = self._factory()
+            self._instances[loop] = instance
+            self.created += 1
+        return instance
+
+    @property
+    def initialized(self) -> bool:
+        return bool(self._instances)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.get(), name)
+
+    async def aclose(self):
+        """Close the instance created on the running loop, if any."""
+        instance = self._instances.pop(_current_loop(), None)
+        closer = getattr(instance, "aclose", None) or getattr(instance, "close", None)
+        if closer is not None:
+            result = closer()
+            if asyncio.iscoroutine(result):
+                await result
+
+    def __repr__(self) -> str:
+        return f"<LazyClient {self._name} initialized={self.initialized}>"
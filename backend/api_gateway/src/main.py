@@ -1,55 +1,186 @@
 import os
 import asyncio
+import functools
+import time
 import uuid
 import hashlib
 import hmac
+import importlib
 import json
+import sys
 from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
+from collections import OrderedDict
 from contextlib import suppress
 from contextlib import asynccontextmanager
 from enum import Enum
 
-from fastapi import FastAPI, HTTPException, Request, BackgroundTasks, Header
+from fastapi import FastAPI, HTTPException, Request, BackgroundTasks, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-try:
-    from elasticsearch import AsyncElasticsearch, NotFoundError
-except ImportError:
-    # Compatibility fallback for tests/stubs where NotFoundError may not exist
-    from elasticsearch import AsyncElasticsearch
-
-    class NotFoundError(Exception):
-        pass
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from loguru import logger
 import httpx
 
-# Use the new package structure
 try:
-    from jira_adapter.jira_adapter import JiraAdapter
-    from slack_adapter.slack_adapter import SlackAdapter
+    from .lazy_init import LAZY_INIT, LazyClient
 except ImportError:
-    # Fallback for local development if not installed as package
-    import sys
-    sys.path.append(os.path.join(os.path.dirname(__file__), "../../../integrations/mcp-adapters"))
-    sys.path.append(os.path.join(os.path.dirname(__file__), "../../../integrations/workflows"))
-    from jira_adapter.jira_adapter import JiraAdapter
-    from slack_adapter.slack_adapter import SlackAdapter
+    from lazy_init import LAZY_INIT, LazyClient
 
 try:
-    from workflow_adapter import get_workflow_adapter
+    from workflow_adapter import get_workflow_tracker, get_remediation_scheduler
 except ImportError:
-    import sys
     sys.path.append(os.path.join(os.path.dirname(__file__), "../../../integrations/workflows"))
-    from workflow_adapter import get_workflow_adapter
+    from workflow_adapter import get_workflow_tracker, get_remediation_scheduler
+
+try:
+    from shared import tracing
+    from shared.es_client import add_latency_hook, close_clients, create_client
+    from shared.serialization import FastJSONResponse, json_body
+    from shared.tracing import CLIENT, TracedElasticsearch, Tracer, TracingMiddleware
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(__file__), "../../.."))
+    from shared import tracing
+    from shared.es_client import add_latency_hook, close_clients, create_client
+    from shared.serialization import FastJSONResponse, json_body
+    from shared.tracing import CLIENT, TracedElasticsearch, Tracer, TracingMiddleware
+
+try:
+    from .integration_fanout import IntegrationDispatcher
+except ImportError:
+    from integration_fanout import IntegrationDispatcher
+
+try:
+    from .incident_analytics import AnalyticsCache, build_analytics_query, parse_analytics_response
+except ImportError:
+    from incident_analytics import AnalyticsCache, build_analytics_query, parse_analytics_response
+
+try:
+    from .incident_events import IncidentEventBus
+except ImportError:
+    from incident_events import IncidentEventBus
+
+try:
+    from .slack_interactions import QueueFull, SlackInteraction, SlackInteractionQueue, parse_interaction
+except ImportError:
+    from slack_interactions import QueueFull, SlackInteraction, SlackInteractionQueue, parse_interaction
+
+try:
+    from .index_bootstrap import AUDIT_ALIAS, INCIDENTS_ALIAS, ensure_indices
+except ImportError:
+    from index_bootstrap import AUDIT_ALIAS, INCIDENTS_ALIAS, ensure_indices
+
+try:
+    from .prometheus_metrics import (
+        CONTENT_TYPE as METRICS_CONTENT_TYPE,
+        CachedValue,
+        MetricsRegistry,
+        RequestMetricsMiddleware,
+        es_latency_hook,
+    )
+except ImportError:
+    from prometheus_metrics import (
+        CONTENT_TYPE as METRICS_CONTENT_TYPE,
+        CachedValue,
+        MetricsRegistry,
+        RequestMetricsMiddleware,
+        es_latency_hook,
+    )
+
+# --- Tracing (off unless TRACE_EXPORT_PATH is set; see shared/tracing.py) ---
+tracer = Tracer("api-gateway")
+
+# --- Metrics ---
+METRICS = MetricsRegistry()
+HTTP_REQUEST_DURATION = METRICS.histogram(
+    "datapulse_http_request_duration_seconds",
+    "HTTP request latency by route template, method and status",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_FLIGHT = METRICS.gauge(
+    "datapulse_http_requests_in_flight", "HTTP requests currently being served"
+)
+ES_REQUEST_DURATION = METRICS.histogram(
+    "datapulse_es_request_duration_seconds", "Elasticsearch call latency by client operation", ["operation"]
+)
+ES_REQUEST_ERRORS = METRICS.counter(
+    "datapulse_es_request_errors_total", "Failed Elasticsearch calls by operation and error type",
+    ["operation", "error"],
+)
+add_latency_hook(es_latency_hook(ES_REQUEST_DURATION, ES_REQUEST_ERRORS, service="api-gateway"))
+ES_UP = METRICS.gauge("datapulse_es_up", "1 if the last incident count refresh reached Elasticsearch")
+BACKGROUND_TASKS = METRICS.counter(
+    "datapulse_background_tasks_total", "Completed background tasks by task and outcome", ["task", "outcome"]
+)
+BACKGROUND_TASK_DURATION = METRICS.histogram(
+    "datapulse_background_task_duration_seconds", "Background task run time", ["task"]
+)
+BACKGROUND_TASKS_IN_FLIGHT = METRICS.gauge(
+    "datapulse_background_tasks_in_flight", "Background tasks currently running", ["task"]
+)
+INTEGRATION_CALLS = METRICS.counter(
+    "datapulse_integration_calls_total", "Integration dispatches by integration and outcome",
+    ["integration", "outcome"],
+)
+INTEGRATION_DURATION = METRICS.histogram(
+    "datapulse_integration_duration_seconds", "Integration call latency", ["integration"]
+)
+INTEGRATION_CIRCUIT_OPEN = METRICS.gauge(
+    "datapulse_integration_circuit_open", "1 while the integration's circuit breaker is not closed",
+    ["integration"],
+)
+INCIDENTS_CREATED = METRICS.counter("datapulse_incidents_created_total", "Incidents created by this gateway")
+INCIDENTS = METRICS.gauge("datapulse_incidents", "Incidents stored in Elasticsearch by status", ["status"])
+WORKFLOWS_IN_FLIGHT = METRICS.gauge("datapulse_workflows_in_flight", "Remediation workflows being tracked")
+INCIDENT_STREAM_SUBSCRIBERS = METRICS.gauge(
+    "datapulse_incident_stream_subscribers", "Clients connected to the live incident stream"
+)
+REMEDIATIONS_QUEUED = METRICS.gauge("datapulse_remediations_queued", "Remediations waiting for an execution slot")
+SLACK_ACK_DURATION = METRICS.histogram(
+    "datapulse_slack_ack_duration_seconds", "Time to answer Slack interactive callbacks", ["status"]
+)
+SLACK_INTERACTIONS = METRICS.counter(
+    "datapulse_slack_interactions_total", "Slack interactions processed by outcome", ["outcome"]
+)
+SLACK_INTERACTION_QUEUE_WAIT = METRICS.histogram(
+    "datapulse_slack_interaction_queue_wait_seconds", "Time Slack interactions wait for a worker"
+)
+SLACK_INTERACTION_DURATION = METRICS.histogram(
+    "datapulse_slack_interaction_duration_seconds", "Slack interaction processing time after the ack", ["outcome"]
+)
+SLACK_INTERACTIONS_QUEUED = METRICS.gauge(
+    "datapulse_slack_interactions_queued", "Acknowledged Slack interactions waiting to be processed"
+)
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     validate_slack_webhook_configuration()
+    # Serverless cold starts skip the bootstrap; run index_bootstrap from the setup script instead.
+    # Writes to the aliases pass require_alias, so a missing alias fails them rather than
+    # letting Elasticsearch auto-create a concrete index under the alias' name.
+    if os.getenv("BOOTSTRAP_INDICES", "false" if LAZY_INIT else "true").strip().lower() in {"1", "true", "yes", "on"}:
+        try:
+            await ensure_indices(es)
+        except Exception as e:
+            logger.error(f"Index bootstrap failed, continuing with existing indices: {e}")
     yield
-
-
-app = FastAPI(title="DataPulse API Gateway", version="1.0.0", lifespan=lifespan)
+    if _slack_interactions is not None:
+        await _slack_interactions.aclose()
+    if _slack_adapter is not None:
+        await _slack_adapter.flush_pending_updates()
+    if _jira_adapter is not None:
+        await _jira_adapter.aclose()
+    await get_workflow_tracker().aclose()
+    await agent_http.aclose()
+    await close_clients()
+
+
+app = FastAPI(
+    title="DataPulse API Gateway",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
 
 # Add CORS middleware
 app.add_middleware(
@@ -59,23 +190,79 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(
+    RequestMetricsMiddleware, latency=HTTP_REQUEST_DURATION, in_flight=HTTP_REQUESTS_IN_FLIGHT
+)
+# Continues the trace context sent by the Sentinel and agents; health and metrics probes are not traced
+app.add_middleware(TracingMiddleware, tracer=tracer)
 
 ES_HOST = os.getenv("ES_HOST", "http://elasticsearch:9200")
-es = AsyncElasticsearch(hosts=[ES_HOST])
+
+
+class NotFoundError(Exception):
+    """Stand-in until create_es_client imports elasticsearch.NotFoundError (no client, no 404s)"""
+
+
+def create_es_client():
+    """Import the client library and build the Elasticsearch client (see shared/es_client.py)"""
+    global NotFoundError
+    try:
+        from elasticsearch import NotFoundError
+    except ImportError:
+        # Compatibility fallback for tests/stubs where NotFoundError may not exist
+        pass
+    return create_client("api-gateway")
+
+
+# Lazy mode defers the elasticsearch import and client to the first request that needs it
+es = TracedElasticsearch(LazyClient(create_es_client, "elasticsearch") if LAZY_INIT else create_es_client(), tracer)
+# Reused for analyst/resolver calls so warm invocations keep their connections
+agent_http = LazyClient(lambda: httpx.AsyncClient(timeout=30.0), "agent-http")
+
+# Incident counts are an aggregation, so scrapes reuse the last result for this long
+METRICS_INCIDENT_COUNT_TTL_SECONDS = float(os.getenv("METRICS_INCIDENT_COUNT_TTL_SECONDS", "30"))
 
 # Service URLs
 ANALYST_URL = os.getenv("ANALYST_URL", "http://analyst:8000")
 RESOLVER_URL = os.getenv("RESOLVER_URL", "http://resolver:8000")
 
-# Indexing Configuration
-INDEX_INCIDENTS = os.getenv("INDEX_INCIDENTS", ".incidents-datapulse-000001")
-INDEX_AUDIT = os.getenv("INDEX_AUDIT", ".audit-datapulse-000001")
+# Indexing Configuration: write aliases over ILM-rolled indices (see index_bootstrap)
+INDEX_INCIDENTS = INCIDENTS_ALIAS
+INDEX_AUDIT = AUDIT_ALIAS
+
+# Recently seen incident -> concrete index, so reads are realtime GETs and updates reach
+# the index the incident was written to rather than the alias' current write index
+INCIDENT_INDEX_CACHE_SIZE = int(os.getenv("INCIDENT_INDEX_CACHE_SIZE", "10000"))
+_incident_indices: "OrderedDict[str, str]" = OrderedDict()
+
+# Live incident updates pushed to dashboards over SSE (see incident_events)
+incident_events = IncidentEventBus(
+    history_size=int(os.getenv("INCIDENT_STREAM_HISTORY", "1000")),
+    buffer_size=int(os.getenv("INCIDENT_STREAM_BUFFER", "100")),
+    # Ids keep increasing across restarts, so stale Last-Event-IDs are recognised
+    first_id=int(time.time() * 1000),
+)
+INCIDENT_STREAM_KEEPALIVE_SECONDS = float(os.getenv("INCIDENT_STREAM_KEEPALIVE_SECONDS", "15"))
+# Upper bound on frames per /agent/events request (agents batch their thought logs)
+AGENT_EVENT_BATCH_MAX = int(os.getenv("AGENT_EVENT_BATCH_MAX", "200"))
+
+# Dashboards poll the same analytics queries; serve repeats from memory for a few seconds
+_analytics_cache = AnalyticsCache(ttl=float(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "15")))
 
 ALLOWED_SORT_FIELDS = {"created_at", "detected_at", "severity", "status", "service"}
 
 # Lazy load integrations
 _slack_adapter = None
 _jira_adapter = None
+_integration_dispatcher = None
+_slack_interactions = None
+# Background workers do not survive a serverless response; apply interactions inline there
+SLACK_INTERACTIONS_INLINE = os.getenv(
+    "SLACK_INTERACTIONS_INLINE", "true" if LAZY_INIT else "false"
+).strip().lower() in {"1", "true", "yes", "on"}
+
+# Strong references to fire-and-forget tasks so they are not garbage-collected
+_background_tasks: set = set()
 
 
 def _env_flag_is_true(name: str) -> bool:
@@ -130,10 +317,21 @@ def get_auto_approval_config() -> Dict[str, Any]:
     }
 
 
+def import_integration(module: str, name: str):
+    """Import an integration adapter class on first use, keeping it off the cold-start path"""
+    try:
+        return getattr(importlib.import_module(module), name)
+    except ImportError:
+        # Fallback for local development if not installed as package
+        sys.path.append(os.path.join(os.path.dirname(__file__), "../../../integrations/mcp-adapters"))
+        return getattr(importlib.import_module(module), name)
+
+
 def get_slack_adapter():
     global _slack_adapter
     if _slack_adapter is None:
         try:
+            SlackAdapter = import_integration("slack_adapter.slack_adapter", "SlackAdapter")
             _slack_adapter = SlackAdapter()
         except Exception as e:
             logger.warning(f"Slack adapter not available: {e}")
@@ -144,12 +342,101 @@ def get_jira_adapter():
     global _jira_adapter
     if _jira_adapter is None:
         try:
-            _jira_adapter = JiraAdapter()
+            JiraAdapter = import_integration("jira_adapter.jira_adapter", "JiraAdapter")
+            JiraBatcher = import_integration("jira_adapter.jira_batcher", "JiraBatcher")
+            # Batch creates and coalesce comments so incident storms stay under rate limits
+            _jira_adapter = JiraBatcher(JiraAdapter())
         except Exception as e:
             logger.warning(f"Jira adapter not available: {e}")
     return _jira_adapter
 
 
+def run_in_background(coro) -> asyncio.Task:
+    """Schedule a fire-and-forget coroutine while holding a strong reference to it"""
+    name = getattr(coro, "__qualname__", "task")
+    started = time.perf_counter()
+    BACKGROUND_TASKS_IN_FLIGHT.inc(task=name)
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+    def record(done: asyncio.Task):
+        BACKGROUND_TASKS_IN_FLIGHT.dec(task=name)
+        BACKGROUND_TASK_DURATION.observe(time.perf_counter() - started, task=name)
+        outcome = "cancelled" if done.cancelled() else "failure" if done.exception() else "success"
+        BACKGROUND_TASKS.inc(task=name, outcome=outcome)
+
+    task.add_done_callback(record)
+    return task
+
+
+def instrumented_task(func):
+    """Count and time an async function run as a FastAPI background task"""
+    name = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        BACKGROUND_TASKS_IN_FLIGHT.inc(task=name)
+        outcome = "failure"
+        try:
+            result = await func(*args, **kwargs)
+            outcome = "success"
+            return result
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            BACKGROUND_TASKS_IN_FLIGHT.dec(task=name)
+            BACKGROUND_TASK_DURATION.observe(time.perf_counter() - started, task=name)
+            BACKGROUND_TASKS.inc(task=name, outcome=outcome)
+
+    return wrapper
+
+
+def observe_integration(name: str, outcome: str, seconds: float):
+    INTEGRATION_CALLS.inc(integration=name, outcome=outcome)
+    if outcome != "short_circuited":
+        INTEGRATION_DURATION.observe(seconds, integration=name)
+
+
+def get_integration_dispatcher() -> IntegrationDispatcher:
+    global _integration_dispatcher
+    if _integration_dispatcher is None:
+        _integration_dispatcher = IntegrationDispatcher(
+            failure_threshold=int(os.getenv("INTEGRATION_BREAKER_FAILURE_THRESHOLD", "5")),
+            recovery_timeout=float(os.getenv("INTEGRATION_BREAKER_RECOVERY_SECONDS", "30")),
+            observer=observe_integration,
+        )
+        _integration_dispatcher.register(
+            "slack", notify_slack, timeout=float(os.getenv("SLACK_DISPATCH_TIMEOUT_SECONDS", "5"))
+        )
+        _integration_dispatcher.register(
+            "jira", notify_jira, timeout=float(os.getenv("JIRA_DISPATCH_TIMEOUT_SECONDS", "10"))
+        )
+    return _integration_dispatcher
+
+
+def get_slack_interactions() -> SlackInteractionQueue:
+    global _slack_interactions
+    if _slack_interactions is None:
+        _slack_interactions = SlackInteractionQueue(
+            process_slack_interaction,
+            workers=int(os.getenv("SLACK_INTERACTION_WORKERS", "2")),
+            max_queue=int(os.getenv("SLACK_INTERACTION_QUEUE_SIZE", "1000")),
+            dedupe_ttl=float(os.getenv("SLACK_INTERACTION_DEDUPE_SECONDS", "3600")),
+            claim=claim_slack_interaction,
+            observer=observe_slack_interaction,
+        )
+    return _slack_interactions
+
+
+def observe_slack_interaction(outcome: str, queue_wait: float, seconds: float):
+    SLACK_INTERACTIONS.inc(outcome=outcome)
+    SLACK_INTERACTION_QUEUE_WAIT.observe(queue_wait)
+    SLACK_INTERACTION_DURATION.observe(seconds, outcome=outcome)
+
+
 # --- Models ---
 class MetricData(BaseModel):
     error_rate: float
@@ -181,6 +468,13 @@ class AgentReport(BaseModel):
     proposals: Optional[List[Dict[str, Any]]] = None
 
 
+class AgentEventBatch(BaseModel):
+    incident_id: str
+    agent: str
+    dropped: int = 0
+    events: List[Dict[str, Any]] = Field(max_length=AGENT_EVENT_BATCH_MAX)
+
+
 class ActionState(str, Enum):
     proposed = "proposed"
     approved = "approved"
@@ -189,6 +483,10 @@ class ActionState(str, Enum):
     failed = "failed"
 
 
+# Slack button verbs and the action state each one requests
+SLACK_DECISIONS = {"approve": ActionState.approved, "reject": ActionState.rejected}
+
+
 ALLOWED_ACTION_TRANSITIONS = {
     ActionState.proposed: {ActionState.approved, ActionState.rejected},
     ActionState.approved: {ActionState.executed, ActionState.failed},
@@ -212,6 +510,19 @@ def serialize_incident(incident_doc: Dict[str, Any], fallback_id: Optional[str]
     return normalized
 
 
+def seconds_since(timestamp: Optional[str], now: datetime) -> Optional[float]:
+    """Seconds from an ISO timestamp to now, or None if it is missing or unparseable"""
+    if not timestamp:
+        return None
+    try:
+        started = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if started.tzinfo is None:
+        started = started.replace(tzinfo=timezone.utc)
+    return round((now - started).total_seconds(), 3)
+
+
 def _find_action(proposals: List[Dict[str, Any]], action_id: str) -> Optional[Dict[str, Any]]:
     for proposal in proposals:
         if proposal.get("action_id") == action_id:
@@ -229,13 +540,18 @@ async def create_incident(req: CreateIncidentRequest, background_tasks: Backgrou
     doc["status"] = "open"
     doc["created_at"] = datetime.now(timezone.utc).isoformat()
     doc["timeline"] = [{"timestamp": doc["created_at"], "event": "Incident Detected by Sentinel"}]
+    tracing.current_span().set_attribute("incident_id", incident_id)
     
     # 1. Save to ES
     try:
-        await es.index(index=INDEX_INCIDENTS, id=incident_id, document=doc)
+        resp = await es.index(index=INDEX_INCIDENTS, id=incident_id, document=doc, require_alias=True)
+        remember_incident_index(incident_id, resp.get("_index"))
         logger.bind(correlation_id=req.correlation_id, incident_id=incident_id).info(
             f"Created incident {incident_id} in {INDEX_INCIDENTS}"
         )
+        INCIDENTS_CREATED.inc()
+        record_incident_created(doc["status"])
+        incident_events.publish("incident.created", incident_id, {"incident": doc})
     except Exception as e:
         error_payload = {
             "code": "INCIDENT_PERSISTENCE_FAILED",
@@ -245,6 +561,8 @@ async def create_incident(req: CreateIncidentRequest, background_tasks: Backgrou
             "index": INDEX_INCIDENTS,
             "exception_type": type(e).__name__,
         }
+        if getattr(e, "status_code", None) == 404:
+            error_payload["message"] = f"Write alias {INDEX_INCIDENTS} is missing; run index_bootstrap"
         logger.bind(correlation_id=req.correlation_id, incident_id=incident_id).error(
             "Incident persistence failed",
             error_payload={**error_payload, "exception": str(e)},
@@ -262,11 +580,8 @@ async def create_incident(req: CreateIncidentRequest, background_tasks: Backgrou
 
 @app.get("/api/datapulse/v1/incidents/{incident_id}")
 async def get_incident(incident_id: str):
-    try:
-        resp = await es.get(index=INDEX_INCIDENTS, id=incident_id)
-        return serialize_incident(resp["_source"], fallback_id=resp.get("_id"))
-    except Exception:
-        raise HTTPException(status_code=404, detail="Incident not found")
+    # Stored documents are plain JSON already, so skip FastAPI's jsonable_encoder pass
+    return FastJSONResponse(await get_incident_or_404(incident_id))
 
 
 @app.get("/api/datapulse/v1/incidents")
@@ -292,9 +607,9 @@ async def list_incidents(
 
     filters = []
     if severity:
-        filters.append({"term": {"severity.keyword": severity}})
+        filters.append({"term": {"severity": severity}})
     if status:
-        filters.append({"term": {"status.keyword": status}})
+        filters.append({"term": {"status": status}})
 
     query = {"bool": {"filter": filters}} if filters else {"match_all": {}}
     start = (page - 1) * page_size
@@ -320,23 +635,80 @@ async def list_incidents(
         for hit in hits.get("hits", [])
     ]
 
-    return {
+    return FastJSONResponse({
         "page": page,
         "page_size": page_size,
         "total": total,
         "records": records,
+    })
+
+
+@app.get("/api/datapulse/v1/stream/incidents")
+async def stream_incidents(
+    incident_id: Optional[str] = None,
+    last_event_id: Optional[int] = None,
+    last_event_id_header: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+):
+    """Server-sent incident events; reconnecting clients resume after Last-Event-ID"""
+    resume_from = last_event_id
+    if last_event_id_header:
+        try:
+            resume_from = int(last_event_id_header)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Last-Event-ID must be an integer")
+
+    subscription = incident_events.subscribe(last_event_id=resume_from, incident_id=incident_id)
+    return StreamingResponse(
+        incident_events.stream(subscription, keepalive_seconds=INCIDENT_STREAM_KEEPALIVE_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/api/datapulse/v1/analytics/incidents")
+async def incident_analytics(
+    window: str = "7d",
+    interval: str = "1d",
+    service: Optional[str] = None,
+    severity: Optional[str] = None,
+):
+    """Incident counts, trends and time-to-RCA/resolution, aggregated in Elasticsearch"""
+    try:
+        body = build_analytics_query(window, interval, service, severity)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def load() -> Dict[str, Any]:
+        resp = await es.search(index=INDEX_INCIDENTS, **body)
+        return {"generated_at": datetime.now(timezone.utc).isoformat(), **parse_analytics_response(resp)}
+
+    try:
+        result, cached = await _analytics_cache.get_or_load((window, interval, service, severity), load)
+    except Exception as e:
+        logger.error(f"Failed to compute incident analytics: {e}")
+        raise HTTPException(status_code=500, detail="Failed to compute incident analytics")
+
+    return {
+        "window": window,
+        "interval": interval,
+        "filters": {"service": service, "severity": severity},
+        "cached": cached,
+        **result,
     }
 
 
 @app.post("/agent/report")
 async def receive_report(report: AgentReport, background_tasks: BackgroundTasks):
     logger.info(f"Received report from {report.agent} for {report.incident_id}")
+    tracing.current_span().set_attribute("incident_id", report.incident_id)
     
     # 1. Update Incident in ES
     update_doc = {}
+    auto_approved_actions = []
     
     if report.agent == "analyst":
         update_doc["analyst_report"] = report.rcca
+        update_doc.update(await rca_timing(report.incident_id))
     elif report.agent == "resolver":
         normalized_actions = build_actions_from_proposals(report.incident_id, report.proposals or [])
         auto_approved_actions = auto_approve_actions(normalized_actions)
@@ -346,10 +718,15 @@ async def receive_report(report: AgentReport, background_tasks: BackgroundTasks)
             update_doc["action_history"] = auto_approved_actions
     
     try:
-        await es.update(index=INDEX_INCIDENTS, id=report.incident_id, doc=update_doc)
+        await update_incident(report.incident_id, update_doc)
         logger.info(f"Updated incident {report.incident_id} with {report.agent} report")
+        incident_events.publish("incident.updated", report.incident_id, {"source": report.agent, "changes": update_doc})
+        schedule_slack_incident_update(report.incident_id)
     except Exception as e:
         logger.error(f"Failed to update incident: {e}")
+    else:
+        if auto_approved_actions:
+            await submit_auto_approved_actions(report.incident_id, normalized_actions)
 
     # 2. Orchestration Logic
     if report.agent == "analyst":
@@ -361,6 +738,18 @@ async def receive_report(report: AgentReport, background_tasks: BackgroundTasks)
     return {"status": "processed"}
 
 
+@app.post("/agent/events")
+async def receive_agent_events(batch: AgentEventBatch):
+    """Live thought log frames from an agent, fanned out to incident stream subscribers"""
+    if batch.events:
+        incident_events.publish(
+            "agent.events",
+            batch.incident_id,
+            {"agent": batch.agent, "dropped": batch.dropped, "events": batch.events},
+        )
+    return {"status": "accepted", "events": len(batch.events)}
+
+
 @app.get("/api/datapulse/v1/incidents/{incident_id}/actions")
 async def get_incident_actions(incident_id: str):
     incident = await get_incident_or_404(incident_id)
@@ -413,9 +802,16 @@ async def reject_action(incident_id: str, action_id: str, req: ActionTransitionR
     )
 
 
+@app.get("/api/datapulse/v1/remediations/queue")
+async def get_remediation_queue():
+    """Running and queued remediation workflows, in execution order"""
+    return get_remediation_scheduler().snapshot()
+
+
 @app.post("/api/datapulse/v1/webhook/integrations/slack")
 async def slack_webhook(request: Request, x_slack_signature: Optional[str] = Header(None)):
     """Handle Slack interactive button callbacks"""
+    received = time.perf_counter()
     body = await request.body()
     
     # Validate Slack signature
@@ -432,41 +828,98 @@ async def slack_webhook(request: Request, x_slack_signature: Optional[str] = Hea
     actions = payload.get("actions", [])
     if not actions:
         return {"status": "no_action"}
-    
-    action_value = actions[0].get("value", "")
-    parts = action_value.split("|")
-    
-    if len(parts) >= 3:
-        action_type, incident_id, action_id = parts[0], parts[1], parts[2]
-
-        if not action_id:
-            logger.warning(f"Received Slack action callback without action_id for incident {incident_id}")
-            return {"status": "invalid_action"}
-
-        actor = payload.get("user", {}).get("username") or payload.get("user", {}).get("name") or "slack-user"
-        
-        if action_type == "approve":
-            logger.info(f"Received approve for action {action_id} incident {incident_id}")
-            await transition_action(
-                incident_id=incident_id,
-                action_id=action_id,
-                to_state=ActionState.approved,
-                actor=actor,
-                source="slack_webhook",
-            )
-            await persist_action_decision(incident_id, action_id, "approved", payload)
-        elif action_type == "reject":
-            logger.info(f"Received reject for action {action_id} incident {incident_id}")
-            await transition_action(
-                incident_id=incident_id,
-                action_id=action_id,
-                to_state=ActionState.rejected,
-                actor=actor,
-                source="slack_webhook",
-            )
-            await persist_action_decision(incident_id, action_id, "rejected", payload)
 
-    return {"status": "processed"}
+    interaction = parse_interaction(payload)
+    if interaction is None or interaction.action_type not in SLACK_DECISIONS:
+        return {"status": "processed"}
+
+    if not interaction.action_id:
+        logger.warning(f"Received Slack action callback without action_id for incident {interaction.incident_id}")
+        return {"status": "invalid_action"}
+
+    # Acknowledge within Slack's 3s window; the transition runs on the interaction workers.
+    # Serverless invocations are frozen after responding, so there it is applied before answering.
+    try:
+        if SLACK_INTERACTIONS_INLINE:
+            accepted = await get_slack_interactions().process(interaction)
+        else:
+            accepted = get_slack_interactions().submit(interaction)
+    except QueueFull as e:
+        logger.error(f"Rejecting Slack {interaction.action_type} for {interaction.action_id}, Slack will retry: {e}")
+        SLACK_ACK_DURATION.observe(time.perf_counter() - received, status="queue_full")
+        raise HTTPException(status_code=503, detail="Interaction queue full")
+
+    status = "accepted" if accepted else "duplicate"
+    retry = request.headers.get("X-Slack-Retry-Num")
+    logger.info(
+        f"{'Applied' if SLACK_INTERACTIONS_INLINE else 'Queued'} {interaction.action_type} for action {interaction.action_id} incident {interaction.incident_id} "
+        f"({status}{f', Slack retry {retry}' if retry else ''})"
+    )
+    SLACK_ACK_DURATION.observe(time.perf_counter() - received, status=status)
+    return {"status": status}
+
+
+async def process_slack_interaction(interaction: SlackInteraction):
+    """Apply an acknowledged Slack approve/reject to the action and record the decision.
+
+    Slack already got its 200, so the outcome goes back to the clicking user
+    through the interaction's response_url.
+    """
+    decision = SLACK_DECISIONS[interaction.action_type]
+    target = f"{interaction.action_id} on {interaction.incident_id}"
+    try:
+        await transition_action(
+            incident_id=interaction.incident_id,
+            action_id=interaction.action_id,
+            to_state=decision,
+            actor=interaction.actor,
+            source="slack_webhook",
+        )
+    except HTTPException as e:
+        await respond_to_slack_interaction(interaction, f"Could not {interaction.action_type} {target}: {e.detail}")
+        raise
+    except Exception:
+        await respond_to_slack_interaction(
+            interaction, f"Could not {interaction.action_type} {target} due to an internal error, please try again"
+        )
+        raise
+    await persist_action_decision(interaction.incident_id, interaction.action_id, decision.value, interaction.payload)
+    await respond_to_slack_interaction(interaction, f"{target} {decision.value} by {interaction.actor}")
+
+
+async def respond_to_slack_interaction(interaction: SlackInteraction, text: str):
+    response_url = interaction.payload.get("response_url")
+    slack = get_slack_adapter()
+    if not response_url or not slack:
+        return
+    with tracer.span("slack.respond_to_interaction", CLIENT, attributes={"incident_id": interaction.incident_id}):
+        await slack.respond_to_interaction(response_url, text)
+
+
+async def claim_slack_interaction(interaction: SlackInteraction) -> bool:
+    """Record the interaction key once across gateway replicas; False if another one already did"""
+    try:
+        await es.index(
+            index=INDEX_AUDIT,
+            id=f"slack-interaction-{interaction.key}",
+            op_type="create",
+            require_alias=True,
+            document={
+                "event_type": "slack_interaction",
+                "incident_id": interaction.incident_id,
+                "action_id": interaction.action_id,
+                "decision": interaction.action_type,
+                "actor": interaction.actor,
+                "recorded_at": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+    except Exception as e:
+        if getattr(e, "status_code", None) == 409:
+            logger.info(f"Slack interaction {interaction.key} already processed, skipping")
+            return False
+        # The in-process de-duplication still applies; do not drop the decision
+        logger.warning(f"Could not record Slack interaction {interaction.key}: {e}")
+    return True
 
 
 async def persist_action_decision(incident_id: str, action_id: str, decision: str, payload: Dict[str, Any]):
@@ -487,6 +940,7 @@ async def persist_action_decision(incident_id: str, action_id: str, decision: st
             index=INDEX_AUDIT,
             id=f"{incident_id}:{action_id}",
             document=decision_doc,
+            require_alias=True,
         )
         logger.info(
             f"Persisted {decision} decision for incident={incident_id} action={action_id}"
@@ -530,32 +984,72 @@ def verify_slack_signature(body: bytes, signature: str, headers: Dict[str, str])
 
 # --- Helpers ---
 
+@instrumented_task
 async def notify_integrations(incident: Dict[str, Any]):
-    """Send notifications to Slack and create Jira ticket"""
-    slack = get_slack_adapter()
-    jira = get_jira_adapter()
-    
-    if slack:
-        try:
-            await slack.send_incident_alert(incident)
-        except Exception as e:
-            logger.error(f"Slack notification failed: {e}")
-    
-    if jira:
+    """Fan out the incident to Slack, Jira and other integrations concurrently"""
+    results = await get_integration_dispatcher().dispatch(incident)
+
+    update_doc = {}
+    if results.get("slack"):
+        # Persist the living message reference so updates survive restarts
+        update_doc["slack_message"] = results["slack"]
+    if results.get("jira"):
+        update_doc["jira_ticket"] = results["jira"]
+
+    if update_doc:
         try:
-            ticket_key = await jira.create_incident_ticket(incident)
-            if ticket_key:
-                # Update incident with Jira ticket key
-                await es.update(
-                    index=INDEX_INCIDENTS,
-                    id=incident["incident_id"],
-                    doc={"jira_ticket": ticket_key}
-                )
-                logger.info(f"Attached Jira ticket {ticket_key} to {incident['incident_id']}")
+            await update_incident(incident["incident_id"], update_doc)
+            logger.info(f"Attached integration references {sorted(update_doc)} to {incident['incident_id']}")
+            incident_events.publish(
+                "incident.updated", incident["incident_id"], {"source": "integrations", "changes": update_doc}
+            )
         except Exception as e:
-            logger.error(f"Jira ticket creation failed: {e}")
+            logger.error(f"Failed to attach integration references to {incident['incident_id']}: {e}")
+
+
+async def notify_slack(incident: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    slack = get_slack_adapter()
+    if not slack:
+        return None
+    with tracer.span("slack.send_incident_alert", CLIENT, attributes={"incident_id": incident.get("incident_id")}):
+        # Raises SlackDeliveryError when the post fails, so the circuit breaker sees failures
+        return await slack.send_incident_alert(incident)
+
+
+async def notify_jira(incident: Dict[str, Any]) -> Optional[str]:
+    jira = get_jira_adapter()
+    if not jira:
+        return None
+    with tracer.span("jira.create_incident_ticket", CLIENT, attributes={"incident_id": incident.get("incident_id")}):
+        ticket_key = await jira.create_incident_ticket(incident)
+        if not ticket_key:
+            # The adapter swallows errors; surface them so the circuit breaker sees failures
+            raise RuntimeError("Jira ticket creation returned no issue key")
+    return ticket_key
+
+
+def schedule_slack_incident_update(incident_id: str):
+    """Re-render the incident's living Slack message once the debounce window closes"""
+    slack = get_slack_adapter()
+    if not slack or not slack.can_update_messages:
+        return
+
+    async def load_incident() -> Dict[str, Any]:
+        return await get_incident_or_404(incident_id)
+
+    slack.schedule_incident_update(incident_id, load_incident)
 
 
+async def comment_on_jira_ticket(ticket_key: str, comment: str):
+    """Queue a Jira comment; comments to the same ticket are coalesced by the batcher"""
+    jira = get_jira_adapter()
+    if not jira:
+        return
+    with tracer.span("jira.add_comment", CLIENT, attributes={"jira.issue": ticket_key}):
+        await jira.add_comment(ticket_key, comment)
+
+
+@instrumented_task
 async def send_action_approvals(incident_id: str, proposals: List[Dict[str, Any]]):
     """Send action approval requests to Slack"""
     slack = get_slack_adapter()
@@ -565,7 +1059,12 @@ async def send_action_approvals(incident_id: str, proposals: List[Dict[str, Any]
     for proposal in proposals:
         if proposal.get("requires_approval"):
             try:
-                await slack.send_action_approval_request(incident_id, proposal)
+                with tracer.span(
+                    "slack.send_action_approval_request",
+                    CLIENT,
+                    attributes={"incident_id": incident_id, "action_id": proposal.get("action_id")},
+                ):
+                    await slack.send_action_approval_request(incident_id, proposal)
             except Exception as e:
                 logger.error(f"Failed to send approval request: {e}")
 
@@ -584,6 +1083,7 @@ def build_actions_from_proposals(incident_id: str, proposals: List[Dict[str, Any
             "description": proposal.get("description"),
             "estimated_time": proposal.get("estimated_time"),
             "requires_approval": proposal.get("requires_approval", False),
+            "risk_score": proposal.get("risk_score"),
             "created_at": now,
             "updated_at": now,
             "last_actor": "resolver-agent",
@@ -627,21 +1127,107 @@ def auto_approve_actions(actions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return history_events
 
 
-async def get_incident_or_404(incident_id: str) -> Dict[str, Any]:
+def remember_incident_index(incident_id: str, index: Optional[str]):
+    if not index:
+        return
+    _incident_indices[incident_id] = index
+    _incident_indices.move_to_end(incident_id)
+    while len(_incident_indices) > INCIDENT_INDEX_CACHE_SIZE:
+        _incident_indices.popitem(last=False)
+
+
+async def _current_write_index() -> Optional[str]:
+    resp = await es.indices.get_alias(name=INDEX_INCIDENTS)
+    for index, info in resp.items():
+        if info.get("aliases", {}).get(INDEX_INCIDENTS, {}).get("is_write_index"):
+            return index
+    return None
+
+
+async def fetch_incident(incident_id: str) -> Optional[Dict[str, Any]]:
+    """Find an incident behind the alias; returns the hit (_index, _id, _source) or None.
+
+    A GET by id needs a concrete index once the alias has rolled over, so the
+    index is taken from the cache or an ids query. Documents not yet visible
+    to search (created within the refresh interval) are tried with a realtime
+    GET on the current write index.
+    """
+    index = _incident_indices.get(incident_id)
+    if index:
+        try:
+            return await es.get(index=index, id=incident_id)
+        except NotFoundError:
+            _incident_indices.pop(incident_id, None)
+
+    resp = await es.search(
+        index=INDEX_INCIDENTS, query={"ids": {"values": [incident_id]}}, size=1, seq_no_primary_term=True
+    )
+    hits = resp.get("hits", {}).get("hits", [])
+    if hits:
+        remember_incident_index(incident_id, hits[0].get("_index"))
+        return hits[0]
+
+    write_index = await _current_write_index()
+    if write_index and write_index != index:
+        try:
+            hit = await es.get(index=write_index, id=incident_id)
+        except NotFoundError:
+            return None
+        remember_incident_index(incident_id, write_index)
+        return hit
+    return None
+
+
+async def update_incident(incident_id: str, doc: Dict[str, Any]):
+    """Partially update an incident in the index it lives in"""
+    index = _incident_indices.get(incident_id)
+    if index is None:
+        hit = await fetch_incident(incident_id)
+        if hit is None:
+            raise LookupError(f"Incident {incident_id} not found")
+        index = hit["_index"]
+    await es.update(index=index, id=incident_id, doc=doc)
+
+
+async def rca_timing(incident_id: str) -> Dict[str, Any]:
+    """RCA completion time and time-to-RCA, stored on the incident for analytics"""
+    now = datetime.now(timezone.utc)
+    timing: Dict[str, Any] = {"rca_completed_at": now.isoformat()}
+    try:
+        hit = await fetch_incident(incident_id)
+    except Exception as e:
+        logger.warning(f"Could not load {incident_id} to compute time to RCA: {e}")
+        return timing
+    if hit is not None:
+        time_to_rca = seconds_since(hit["_source"].get("created_at"), now)
+        if time_to_rca is not None:
+            timing["time_to_rca_seconds"] = time_to_rca
+    return timing
+
+
+async def fetch_incident_or_404(incident_id: str) -> Dict[str, Any]:
+    """The incident's search hit (with _index, _seq_no and _primary_term), or a 404"""
     try:
-        resp = await es.get(index=INDEX_INCIDENTS, id=incident_id)
-        return serialize_incident(resp["_source"], fallback_id=resp.get("_id"))
+        hit = await fetch_incident(incident_id)
     except NotFoundError:
-        logger.bind(incident_id=incident_id).warning("Incident not found in Elasticsearch")
-        raise HTTPException(status_code=404, detail=f"Incident {incident_id} not found")
+        hit = None
     except Exception as e:
         logger.error(f"Error retrieving incident {incident_id}: {e}")
         raise HTTPException(status_code=500, detail="Internal server error retrieving incident")
+    if hit is None:
+        logger.bind(incident_id=incident_id).warning("Incident not found in Elasticsearch")
+        raise HTTPException(status_code=404, detail="Incident not found")
+    return hit
 
 
-@app.get("/api/datapulse/v1/incidents/{incident_id}")
-async def get_incident(incident_id: str):
-    return await get_incident_or_404(incident_id)
+async def get_incident_or_404(incident_id: str) -> Dict[str, Any]:
+    hit = await fetch_incident_or_404(incident_id)
+    return serialize_incident(hit["_source"], fallback_id=hit.get("_id"))
+
+
+# Concurrent transitions of one incident (Slack workers, workflow completions) rewrite the
+# same actions/action_history arrays; a write that lost the race re-reads and re-applies
+ACTION_TRANSITION_CONFLICT_RETRIES = 5
 
 
 async def transition_action(
@@ -652,75 +1238,106 @@ async def transition_action(
     source: str,
     reason: Optional[str] = None,
 ) -> Dict[str, Any]:
-    incident = await get_incident_or_404(incident_id)
-    actions = incident.get("actions", [])
-    action = next((item for item in actions if item.get("action_id") == action_id), None)
-    if not action:
-        # Fallback to resolver_proposals if actions list is legacy
-        proposals = incident.get("resolver_proposals") or []
-        proposal = _find_action(proposals, action_id)
-        if proposal:
-             # Migrating legacy proposal to actions
-             actions = build_actions_from_proposals(incident_id, proposals)
-             action = next((item for item in actions if item.get("action_id") == action_id), None)
-        
+    for attempt in range(ACTION_TRANSITION_CONFLICT_RETRIES + 1):
+        hit = await fetch_incident_or_404(incident_id)
+        incident = serialize_incident(hit["_source"], fallback_id=hit.get("_id"))
+        actions = incident.get("actions", [])
+        action = next((item for item in actions if item.get("action_id") == action_id), None)
         if not action:
-            raise HTTPException(status_code=404, detail="Action not found")
-
-    current_state = ActionState(action.get("state", ActionState.proposed.value))
-    allowed_states = ALLOWED_ACTION_TRANSITIONS.get(current_state, set())
-    if to_state not in allowed_states:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid transition from {current_state.value} to {to_state.value}",
-        )
+            # Fallback to resolver_proposals if actions list is legacy
+            proposals = incident.get("resolver_proposals") or []
+            proposal = _find_action(proposals, action_id)
+            if proposal:
+                 # Migrating legacy proposal to actions
+                 actions = build_actions_from_proposals(incident_id, proposals)
+                 action = next((item for item in actions if item.get("action_id") == action_id), None)
+    
+            if not action:
+                raise HTTPException(status_code=404, detail="Action not found")
+
+        current_state = ActionState(action.get("state", ActionState.proposed.value))
+        allowed_states = ALLOWED_ACTION_TRANSITIONS.get(current_state, set())
+        if to_state not in allowed_states:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid transition from {current_state.value} to {to_state.value}",
+            )
 
-    now = datetime.now(timezone.utc).isoformat()
-    event = {
-        "incident_id": incident_id,
-        "action_id": action_id,
-        "from_state": current_state.value,
-        "to_state": to_state.value,
-        "actor": actor,
-        "source": source,
-        "reason": reason,
-        "timestamp": now,
-    }
+        now = datetime.now(timezone.utc).isoformat()
+        event = {
+            "incident_id": incident_id,
+            "action_id": action_id,
+            "from_state": current_state.value,
+            "to_state": to_state.value,
+            "actor": actor,
+            "source": source,
+            "reason": reason,
+            "timestamp": now,
+        }
 
-    for candidate in actions:
-        if candidate.get("action_id") == action_id:
-            candidate["state"] = to_state.value
-            candidate["updated_at"] = now
-            candidate["last_actor"] = actor
+        for candidate in actions:
+            if candidate.get("action_id") == action_id:
+                candidate["state"] = to_state.value
+                candidate["updated_at"] = now
+                candidate["last_actor"] = actor
+                break
+
+        history = incident.get("action_history", [])
+        history.append(event)
+
+        # Also update the legacy resolver_proposals to keep them in sync if they exist
+        resolver_proposals = incident.get("resolver_proposals") or []
+        for p in resolver_proposals:
+            if p.get("action_id") == action_id:
+                p["status"] = to_state.value
+                p["approved_by"] = actor if to_state == ActionState.approved else p.get("approved_by")
+                p["approved_at"] = now if to_state == ActionState.approved else p.get("approved_at")
+
+        update_doc = {
+            "actions": actions,
+            "action_history": history,
+            "resolver_proposals": resolver_proposals,
+        }
+        if to_state == ActionState.executed and not incident.get("resolved_at"):
+            # The first successfully executed remediation resolves the incident
+            update_doc["status"] = "resolved"
+            update_doc["resolved_at"] = now
+            time_to_resolution = seconds_since(incident.get("created_at"), datetime.fromisoformat(now))
+            if time_to_resolution is not None:
+                update_doc["time_to_resolution_seconds"] = time_to_resolution
+
+        guard = {}
+        if hit.get("_seq_no") is not None and hit.get("_primary_term") is not None:
+            guard = {"if_seq_no": hit["_seq_no"], "if_primary_term": hit["_primary_term"]}
+        try:
+            await es.update(index=hit["_index"], id=incident_id, doc=update_doc, **guard)
             break
+        except Exception as e:
+            if getattr(e, "status_code", None) != 409 or not guard:
+                raise
+            if attempt == ACTION_TRANSITION_CONFLICT_RETRIES:
+                raise HTTPException(status_code=409, detail="Incident was modified concurrently, retry the transition")
+            logger.info(f"Incident {incident_id} changed during transition of {action_id}, re-reading")
 
-    history = incident.get("action_history", [])
-    history.append(event)
-
-    # Also update the legacy resolver_proposals to keep them in sync if they exist
-    resolver_proposals = incident.get("resolver_proposals") or []
-    for p in resolver_proposals:
-        if p.get("action_id") == action_id:
-            p["status"] = to_state.value
-            p["approved_by"] = actor if to_state == ActionState.approved else p.get("approved_by")
-            p["approved_at"] = now if to_state == ActionState.approved else p.get("approved_at")
-
-    await es.update(
-        index=INDEX_INCIDENTS,
-        id=incident_id,
-        doc={
-            "actions": actions, 
-            "action_history": history,
-            "resolver_proposals": resolver_proposals
-        },
-    )
+    incident_events.publish("action.transition", incident_id, {"transition": event, "changes": update_doc})
     await write_audit_event(event)
-
-    # Trigger automation workflow if moved to approved state
+    schedule_slack_incident_update(incident_id)
+    if incident.get("jira_ticket"):
+        run_in_background(comment_on_jira_ticket(
+            incident["jira_ticket"],
+            f"Action {action_id} moved from {current_state.value} to {to_state.value} by {actor} ({source})",
+        ))
+
+    # Queue the automation workflow if moved to approved state. The scheduler serializes
+    # conflicting remediations per service, and the action is driven to executed/failed
+    # when its workflow finishes.
     if to_state == ActionState.approved:
-        workflow = get_workflow_adapter()
-        # Non-blocking trigger
-        asyncio.create_task(workflow.trigger_remediation(incident_id, action))
+        get_remediation_scheduler().submit(
+            incident_id,
+            incident.get("service"),
+            action,
+            on_complete=complete_action_execution,
+        )
 
     return {
         "status": to_state.value,
@@ -732,6 +1349,39 @@ async def transition_action(
     }
 
 
+async def submit_auto_approved_actions(incident_id: str, actions: List[Dict[str, Any]]):
+    """Queue the workflows of policy-approved actions, as transition_action does for manual approvals"""
+    try:
+        hit = await fetch_incident(incident_id)
+    except Exception as e:
+        logger.error(f"Could not load {incident_id} to run its auto-approved actions: {e}")
+        return
+    service = (hit or {}).get("_source", {}).get("service")
+    for action in actions:
+        if action.get("state") == ActionState.approved.value:
+            get_remediation_scheduler().submit(incident_id, service, action, on_complete=complete_action_execution)
+
+
+async def complete_action_execution(incident_id: str, action: Dict[str, Any], outcome: Dict[str, Any]):
+    """Move an approved action to its terminal state once its workflow finishes"""
+    to_state = ActionState.executed if outcome["succeeded"] else ActionState.failed
+    reason = f"Workflow {outcome.get('execution_id') or 'run'} finished with status {outcome['status']}"
+    if outcome.get("error"):
+        reason = f"{reason}: {outcome['error']}"
+
+    try:
+        await transition_action(
+            incident_id=incident_id,
+            action_id=action["action_id"],
+            to_state=to_state,
+            actor="workflow-engine",
+            source="workflow_tracker",
+            reason=reason,
+        )
+    except HTTPException as e:
+        logger.error(f"Could not record workflow outcome for {incident_id}/{action['action_id']}: {e.detail}")
+
+
 async def write_audit_event(event: Dict[str, Any]):
     doc_id = f"{event['incident_id']}-{event['action_id']}-{event['timestamp']}"
     await es.index(
@@ -741,28 +1391,31 @@ async def write_audit_event(event: Dict[str, Any]):
             "event_type": "action_state_transition",
             **event,
         },
+        require_alias=True,
     )
 
 
+@instrumented_task
 async def trigger_analyst(incident_id, service, detected_at):
     try:
-        async with httpx.AsyncClient() as client:
-            await client.post(f"{ANALYST_URL}/run", json={
+        with tracer.span("trigger_analyst", CLIENT, attributes={"incident_id": incident_id}):
+            await agent_http.post(f"{ANALYST_URL}/run", **json_body({
                 "incident_id": incident_id,
                 "service": service,
                 "detected_at": detected_at
-            }, timeout=30.0)
+            }, headers=tracing.inject()))
     except Exception as e:
         logger.error(f"Failed to trigger analyst: {e}")
 
 
+@instrumented_task
 async def trigger_resolver(incident_id, rcca_context):
     try:
-        async with httpx.AsyncClient() as client:
-            await client.post(f"{RESOLVER_URL}/run", json={
+        with tracer.span("trigger_resolver", CLIENT, attributes={"incident_id": incident_id}):
+            await agent_http.post(f"{RESOLVER_URL}/run", **json_body({
                 "incident_id": incident_id,
                 "rcca_context": rcca_context
-            }, timeout=30.0)
+            }, headers=tracing.inject()))
     except Exception as e:
         logger.error(f"Failed to trigger resolver: {e}")
 
@@ -786,19 +1439,68 @@ async def readiness():
     return {"status": "ready", "es_connected": True}
 
 
-@app.get("/metrics")
-async def metrics():
-    """Real-time metrics endpoint for DataPulse monitoring"""
+async def load_incident_counts() -> Dict[str, int]:
+    resp = await es.search(
+        index=INDEX_INCIDENTS,
+        size=0,
+        aggs={"by_status": {"terms": {"field": "status", "size": 20}}},
+        track_total_hits=True,
+    )
+    buckets = resp.get("aggregations", {}).get("by_status", {}).get("buckets", [])
+    return {bucket["key"]: bucket["doc_count"] for bucket in buckets}
+
+
+_incident_counts = CachedValue(load_incident_counts, ttl=METRICS_INCIDENT_COUNT_TTL_SECONDS)
+
+
+def record_incident_created(status: str):
+    """Keep the cached counts current between refreshes instead of re-querying"""
+    if _incident_counts.value is not None:
+        _incident_counts.value[status] = _incident_counts.value.get(status, 0) + 1
+
+
+@METRICS.on_collect
+async def collect_incident_counts():
     try:
-        count_resp = await es.count(index=INDEX_INCIDENTS)
-        total_incidents = count_resp.get("count", 0)
-        return {
-            "incidents_total": total_incidents,
-            "agents_status": "healthy",
-            "active_agents": 3,
-            "es_connected": True,
-            "last_captured": datetime.now(timezone.utc).isoformat()
-        }
+        counts = await _incident_counts.get()
     except Exception as e:
-        logger.error(f"Metrics collection failed: {e}")
-        return {"incidents_total": -1, "es_connected": False}
+        logger.error(f"Incident count refresh failed: {e}")
+        ES_UP.set(0)
+        return
+    ES_UP.set(1)
+    INCIDENTS.clear()
+    for status, count in counts.items():
+        INCIDENTS.set(count, status=status)
+
+
+@METRICS.on_collect
+def collect_runtime_state():
+    for name, snapshot in get_integration_dispatcher().snapshot().items():
+        INTEGRATION_CIRCUIT_OPEN.set(0 if snapshot["circuit"]["state"] == "closed" else 1, integration=name)
+    WORKFLOWS_IN_FLIGHT.set(get_workflow_tracker().snapshot()["in_flight"])
+    REMEDIATIONS_QUEUED.set(len(get_remediation_scheduler().snapshot()["queued"]))
+    INCIDENT_STREAM_SUBSCRIBERS.set(incident_events.snapshot()["subscribers"])
+    SLACK_INTERACTIONS_QUEUED.set(get_slack_interactions().depth)
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics for the gateway, in text exposition format"""
+    return Response(content=await METRICS.collect(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/metrics/workflows")
+async def workflow_metrics():
+    """Remediation workflow execution counts and trigger-to-terminal latency"""
+    return {"workflows": get_workflow_tracker().snapshot()}
+
+
+@app.get("/metrics/integrations")
+async def integration_metrics():
+    """Per-integration success, latency and circuit breaker state"""
+    jira = get_jira_adapter()
+    return {
+        "integrations": get_integration_dispatcher().snapshot(),
+        "jira_batching": jira.stats() if jira else None,
+        "slack_interactions": get_slack_interactions().snapshot(),
+    }
@@ -0,0 +1,275 @@
+"""
+Prometheus text-format metrics for the API gateway.
+
+A small in-process registry of counters, gauges and histograms rendered in the
+Prometheus exposition format (0.0.4). Request latency is recorded by HTTP
+middleware, Elasticsearch calls by a latency hook on the shared client, and values
+that are expensive to compute (incident counts) are cached between scrapes.
+"""
+import asyncio
+import inspect
+import math
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[Any], extra: Tuple[Tuple[str, Any], ...] = ()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self.samples(),
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterable[str]:
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def clear(self):
+        self._values.clear()
+
+    def samples(self) -> Iterable[str]:
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label key -> (per-bucket counts, sum, count)
+        self._series: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[0][index] += 1
+                break
+        series[1] += value
+        series[2] += 1
+
+    def count(self, **labels) -> int:
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def samples(self) -> Iterable[str]:
+        for key, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, (("le", _format_value(bound)),))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+class MetricsRegistry:
+    """Named metrics plus callbacks that refresh derived values before each scrape."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Any]] = []
+
+    def _register(self, metric: _Metric) -> Any:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def on_collect(self, callback: Callable[[], Any]):
+        """Run callback (sync or async) at the start of every scrape."""
+        self._collectors.append(callback)
+        return callback
+
+    async def collect(self) -> str:
+        for callback in self._collectors:
+            result = callback()
+            if inspect.isawaitable(result):
+                await result
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class CachedValue:
+    """An async-loaded value reused for ttl seconds; concurrent refreshes share one load."""
+
+    def __init__(self, loader: Callable[[], Awaitable[Any]], ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.loader = loader
+        self.ttl = ttl
+        self.clock = clock
+        self.value: Any = None
+        self.loaded_at: Optional[float] = None
+        self._refresh: Optional[asyncio.Task] = None
+
+    def is_fresh(self) -> bool:
+        return self.loaded_at is not None and self.clock() - self.loaded_at < self.ttl
+
+    async def get(self) -> Any:
+        if self.is_fresh():
+            return self.value
+        if self._refresh is None:
+            refresh = asyncio.ensure_future(self.loader())
+            # Settled by the load itself, so a cancelled waiter cannot start a second one
+            refresh.add_done_callback(self._refreshed)
+            self._refresh = refresh
+        return await asyncio.shield(self._refresh)
+
+    def _refreshed(self, refresh: asyncio.Future):
+        self._refresh = None
+        if not refresh.cancelled() and refresh.exception() is None:
+            self.value = refresh.result()
+            self.loaded_at = self.clock()
+
+
+def es_latency_hook(latency: Histogram, errors: Counter, service: Optional[str] = None):
+    """Latency hook for shared/es_client.py recording Elasticsearch calls.
+
+    Records each API call's latency under its operation name (``search``,
+    ``indices.get_alias``, ...) and counts failures by exception type; calls
+    of other services' clients in the same process are ignored when
+    ``service`` is given.
+    """
+
+    def observe(client_service: str, operation: str, seconds: float, error: Optional[BaseException]):
+        if service is not None and client_service != service:
+            return
+        if error is not None:
+            errors.inc(operation=operation, error=type(error).__name__)
+        latency.observe(seconds, operation=operation)
+
+    return observe
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware recording request latency per route template, method and status.
+
+    Routes are labelled by their path template (``/incidents/{incident_id}``),
+    never the raw path, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app, latency: Histogram, in_flight: Gauge):
+        self.app = app
+        self.latency = latency
+        self.in_flight = in_flight
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        self.in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.in_flight.dec()
+            route = scope.get("route")
+            self.latency.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status["code"]),
+            )
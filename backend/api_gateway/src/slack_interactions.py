@@ -0,0 +1,224 @@
+"""
+Acknowledge-first processing of Slack interactive callbacks.
+
+Slack expects an HTTP 200 within three seconds and retries the callback
+otherwise, so the webhook only verifies the signature, parses the payload
+and enqueues it here; a small pool of workers runs the (Elasticsearch-bound)
+action transition afterwards.
+
+Each interaction carries an idempotency key derived from Slack's action
+payload (the clicking user, the button value and the click's ``action_ts``),
+which stays the same when Slack retries a delivery. Keys are remembered for
+``dedupe_ttl`` seconds and a repeated key is acknowledged but not processed
+again. An optional ``claim`` hook lets the caller extend this across gateway
+replicas (e.g. with a create-only document keyed by the same value).
+
+The queue is bounded: when it is full the webhook should answer with an
+error so Slack retries later, rather than acknowledge work it cannot hold.
+
+Where nothing may run after the response is sent (serverless functions are
+frozen once they answer), ``process`` applies an interaction inline instead,
+with the same de-duplication and bookkeeping.
+"""
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+
+
+@dataclass
+class SlackInteraction:
+    key: str
+    action_type: str
+    incident_id: str
+    action_id: str
+    actor: str
+    payload: Dict[str, Any]
+    received_at: float = field(default_factory=time.monotonic)
+
+
+def interaction_key(payload: Dict[str, Any]) -> str:
+    """Stable id for one button click; identical across Slack's delivery retries."""
+    action = (payload.get("actions") or [{}])[0]
+    parts = [
+        payload.get("user", {}).get("id") or "",
+        action.get("action_id") or "",
+        action.get("value") or "",
+        # Unique per click; trigger_id is the fallback for payloads without it
+        action.get("action_ts") or payload.get("trigger_id") or "",
+    ]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:32]
+
+
+def parse_interaction(payload: Dict[str, Any]) -> Optional[SlackInteraction]:
+    """The approve/reject request encoded in a block action, or None if there is none.
+
+    Button values look like ``approve|INC-XXX|ACTION-YYY``.
+    """
+    actions = payload.get("actions", [])
+    if not actions:
+        return None
+    parts = (actions[0].get("value") or "").split("|")
+    if len(parts) < 3:
+        return None
+
+    user = payload.get("user", {})
+    return SlackInteraction(
+        key=interaction_key(payload),
+        action_type=parts[0],
+        incident_id=parts[1],
+        action_id=parts[2],
+        actor=user.get("username") or user.get("name") or "slack-user",
+        payload=payload,
+    )
+
+
+class QueueFull(Exception):
+    """The interaction queue is at capacity; the caller should ask Slack to retry."""
+
+
+Handler = Callable[[SlackInteraction], Awaitable[None]]
+Observer = Callable[[str, float, float], None]
+
+
+class SlackInteractionQueue:
+    """Bounded queue of Slack interactions drained by background workers, with de-duplication."""
+
+    def __init__(
+        self,
+        handler: Handler,
+        workers: int = 2,
+        max_queue: int = 1000,
+        dedupe_ttl: float = 3600.0,
+        claim: Optional[Callable[[SlackInteraction], Awaitable[bool]]] = None,
+        observer: Optional[Observer] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.handler = handler
+        self.workers = workers
+        self.max_queue = max_queue
+        self.dedupe_ttl = dedupe_ttl
+        self.claim = claim
+        self.observer = observer
+        self.clock = clock
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+        self.accepted = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.outcomes: Dict[str, int] = {}
+
+    def _ensure_started(self):
+        # Started on first use: the queue and workers must belong to the serving event loop
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._tasks = []
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._work()))
+
+    def _expire_seen(self):
+        now = self.clock()
+        while self._seen and now - next(iter(self._seen.values())) >= self.dedupe_ttl:
+            self._seen.popitem(last=False)
+
+    def _is_duplicate(self, interaction: SlackInteraction) -> bool:
+        self._expire_seen()
+        if interaction.key in self._seen:
+            self.duplicates += 1
+            return True
+        return False
+
+    def submit(self, interaction: SlackInteraction) -> bool:
+        """Enqueue without waiting. False for a duplicate; raises QueueFull at capacity."""
+        self._ensure_started()
+        if self._is_duplicate(interaction):
+            return False
+        if self._queue.full():
+            self.rejected += 1
+            raise QueueFull(f"{self.max_queue} Slack interactions already queued")
+        self._seen[interaction.key] = self.clock()
+        self._queue.put_nowait(interaction)
+        self.accepted += 1
+        return True
+
+    async def process(self, interaction: SlackInteraction) -> bool:
+        """Apply the interaction before returning, bypassing the workers. False for a duplicate."""
+        if self._is_duplicate(interaction):
+            return False
+        self._seen[interaction.key] = self.clock()
+        self.accepted += 1
+        await self._process(interaction)
+        return True
+
+    async def _work(self):
+        while True:
+            interaction = await self._queue.get()
+            try:
+                await self._process(interaction)
+            finally:
+                self._queue.task_done()
+
+    async def _process(self, interaction: SlackInteraction):
+        started = time.monotonic()
+        outcome = "processed"
+        try:
+            if self.claim is not None and not await self.claim(interaction):
+                outcome = "duplicate"
+            else:
+                await self.handler(interaction)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            outcome = "failed"
+            logger.error(
+                f"Slack interaction {interaction.action_type} for "
+                f"{interaction.incident_id}/{interaction.action_id} failed: {e}"
+            )
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        if self.observer is not None:
+            finished = time.monotonic()
+            # Queue wait and handler time, both measured after the webhook already answered
+            self.observer(outcome, started - interaction.received_at, finished - started)
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def drain(self, timeout: Optional[float] = None):
+        """Wait for queued interactions to finish (used on shutdown and in tests)."""
+        if self._queue is not None:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+
+    async def aclose(self, timeout: float = 10.0):
+        """Give the workers up to timeout seconds to finish the queue, then stop them."""
+        try:
+            if self._tasks:
+                await self.drain(timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Stopping Slack interaction workers with {self.depth} interactions still queued")
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "accepted": self.accepted,
+            "duplicates": self.duplicates,
+            "rejected_queue_full": self.rejected,
+            "queued": self.depth,
+            "outcomes": dict(self.outcomes),
+        }
@@ -1,14 +1,9 @@
+import asyncio
 import importlib
 import unittest
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from fastapi.testclient import TestClient
-try:
-    from elasticsearch import NotFoundError
-except ImportError:
-    class NotFoundError(Exception):
-        def __init__(self, message=None, meta=None, body=None):
-            super().__init__(message)
 
 
 class ApproveActionContractTests(unittest.TestCase):
@@ -20,18 +15,30 @@ class ApproveActionContractTests(unittest.TestCase):
 
     def setUp(self):
         self.client = TestClient(self.app)
+        self.main._incident_indices.clear()
 
-    def test_approve_action_success_contract(self):
-        es_mock = AsyncMock()
-        es_mock.get.return_value = {
-            "_source": {
-                "incident_id": "INC-123",
-                "resolver_proposals": [
-                    {"action_id": "ACT-1", "title": "Rollback", "requires_approval": True}
-                ],
-                "action_approvals": [],
+    @staticmethod
+    def _search_hits(*sources):
+        return {
+            "hits": {
+                "hits": [
+                    {"_index": ".incidents-datapulse-000001", "_id": source["incident_id"], "_source": source}
+                    for source in sources
+                ]
             }
         }
+
+    def test_approve_action_success_contract(self):
+        es_mock = AsyncMock()
+        es_mock.search.return_value = self._search_hits({
+            "incident_id": "INC-123",
+            "resolver_proposals": [
+                {"action_id": "ACT-1", "title": "Rollback", "requires_approval": True}
+            ],
+            "action_approvals": [],
+        })
+        # Later reads hit the index the incident was found in
+        es_mock.get.return_value = es_mock.search.return_value["hits"]["hits"][0]
         es_mock.update.return_value = {"result": "updated"}
 
         with patch.object(self.main, "es", es_mock):
@@ -50,7 +57,8 @@ class ApproveActionContractTests(unittest.TestCase):
 
     def test_approve_action_incident_not_found_contract(self):
         es_mock = AsyncMock()
-        es_mock.get.side_effect = NotFoundError(message="missing", meta=None, body=None)
+        es_mock.search.return_value = self._search_hits()
+        es_mock.indices.get_alias.return_value = {}
 
         with patch.object(self.main, "es", es_mock):
             response = self.client.post(
@@ -62,12 +70,10 @@ class ApproveActionContractTests(unittest.TestCase):
 
     def test_approve_action_action_not_found_contract(self):
         es_mock = AsyncMock()
-        es_mock.get.return_value = {
-            "_source": {
-                "incident_id": "INC-123",
-                "resolver_proposals": [{"action_id": "ACT-2", "title": "Scale up"}],
-            }
-        }
+        es_mock.search.return_value = self._search_hits({
+            "incident_id": "INC-123",
+            "resolver_proposals": [{"action_id": "ACT-2", "title": "Scale up"}],
+        })
 
         with patch.object(self.main, "es", es_mock):
             response = self.client.post(
@@ -77,6 +83,71 @@ class ApproveActionContractTests(unittest.TestCase):
         self.assertEqual(response.status_code, 404)
         self.assertEqual(response.json()["detail"], "Action not found")
 
+    def test_auto_approved_actions_are_queued_for_execution(self):
+        es_mock = AsyncMock()
+        es_mock.search.return_value = self._search_hits({"incident_id": "INC-9", "service": "cart-service"})
+        es_mock.get.return_value = es_mock.search.return_value["hits"]["hits"][0]
+        es_mock.update.return_value = {"result": "updated"}
+        scheduler = MagicMock()
+        proposals = [
+            {"action_id": "ACT-1", "action_type": "scale_out", "risk_score": 0.1, "requires_approval": False},
+            {"action_id": "ACT-2", "action_type": "rollback", "risk_score": 0.1, "requires_approval": True},
+        ]
+
+        with patch.object(self.main, "es", es_mock), \
+                patch.object(self.main, "get_remediation_scheduler", return_value=scheduler), \
+                patch.object(self.main, "send_action_approvals", AsyncMock()), \
+                patch.dict("os.environ", {"ENABLE_AUTO_APPROVAL": "true"}):
+            response = self.client.post(
+                "/agent/report", json={"incident_id": "INC-9", "agent": "resolver", "proposals": proposals}
+            )
+
+        self.assertEqual(response.status_code, 200)
+        scheduler.submit.assert_called_once()
+        incident_id, service, action = scheduler.submit.call_args.args
+        self.assertEqual((incident_id, service, action["action_id"]), ("INC-9", "cart-service", "ACT-1"))
+        self.assertEqual(action["state"], "approved")
+
+    def test_transition_reapplies_on_top_of_a_concurrent_update(self):
+        class VersionConflict(Exception):
+            status_code = 409
+
+        def incident_hit(seq_no, other_state, history):
+            return {
+                "_index": ".incidents-datapulse-000001",
+                "_id": "INC-9",
+                "_seq_no": seq_no,
+                "_primary_term": 1,
+                "_source": {
+                    "incident_id": "INC-9",
+                    "actions": [
+                        {"action_id": "ACT-1", "state": "proposed"},
+                        {"action_id": "ACT-2", "state": other_state},
+                    ],
+                    "action_history": history,
+                },
+            }
+
+        es_mock = AsyncMock()
+        es_mock.search.return_value = {"hits": {"hits": [incident_hit(1, "proposed", [])]}}
+        # ACT-2 was rejected between our read and our write
+        es_mock.get.return_value = incident_hit(2, "rejected", [{"action_id": "ACT-2", "to_state": "rejected"}])
+        es_mock.update.side_effect = [VersionConflict(), {"result": "updated"}]
+
+        with patch.object(self.main, "es", es_mock), patch.object(self.main, "get_slack_adapter", return_value=None):
+            result = asyncio.run(
+                self.main.transition_action("INC-9", "ACT-1", self.main.ActionState.rejected, "bob", "slack")
+            )
+
+        self.assertEqual(result["state"], "rejected")
+        self.assertEqual(es_mock.update.await_count, 2)
+        first, retry = es_mock.update.await_args_list
+        self.assertEqual(first.kwargs["if_seq_no"], 1)
+        self.assertEqual(retry.kwargs["if_seq_no"], 2)
+        # The retry is built from the re-read document, so the concurrent change is kept
+        doc = retry.kwargs["doc"]
+        self.assertEqual([action["state"] for action in doc["actions"]], ["rejected", "rejected"])
+        self.assertEqual([event["action_id"] for event in doc["action_history"]], ["ACT-2", "ACT-1"])
 
 if __name__ == "__main__":
     unittest.main()
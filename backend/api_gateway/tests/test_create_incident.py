@@ -8,8 +8,9 @@ from fastapi.testclient import TestClient
 
 
 class _FakeAsyncElasticsearch:
-    def __init__(self, hosts=None):
+    def __init__(self, hosts=None, **options):
         self.hosts = hosts or []
+        self.options = options
 
     async def index(self, *args, **kwargs):
         return {"result": "created"}
@@ -57,6 +58,28 @@ class CreateIncidentFailureContractTest(unittest.TestCase):
         mocked_notify.assert_not_awaited()
         mocked_trigger.assert_not_awaited()
 
+    def test_missing_write_alias_fails_instead_of_creating_an_index(self):
+        class AliasMissing(Exception):
+            status_code = 404
+
+        payload = {
+            "source": "sentinel",
+            "service": "payments",
+            "detected_at": "2026-01-01T00:00:00Z",
+            "severity": "critical",
+            "metrics": {"error_rate": 0.42, "p99_latency_ms": 1200},
+            "evidence": [{"type": "log", "text": "upstream timeout"}],
+            "correlation_id": "corr-alias",
+        }
+
+        with patch.object(main.es, "index", AsyncMock(side_effect=AliasMissing("no such index")), create=True) as mocked_index, \
+             patch.object(main, "notify_integrations", AsyncMock()):
+            response = self.client.post("/api/datapulse/v1/incidents", json=payload)
+
+        self.assertTrue(mocked_index.await_args.kwargs["require_alias"])
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("index_bootstrap", response.json()["detail"]["message"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,79 @@
+import asyncio
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.fake_elasticsearch import ConflictError, FakeElasticsearch  # noqa: E402
+
+
+class FakeElasticsearchTests(unittest.TestCase):
+    def test_search_filters_sorts_and_pages_like_the_gateway_expects(self):
+        es = FakeElasticsearch()
+        es.seed(".incidents-datapulse", [
+            {"incident_id": f"INC-{n}", "severity": "critical" if n % 2 else "low", "created_at": f"2026-01-0{n}"}
+            for n in range(1, 6)
+        ])
+
+        async def scenario():
+            page = await es.search(
+                index=".incidents-datapulse",
+                query={"bool": {"filter": [{"term": {"severity": "critical"}}]}},
+                sort=[{"created_at": {"order": "desc", "missing": "_last"}}],
+                from_=0,
+                size=2,
+            )
+            by_id = await es.search(index=".incidents-datapulse", query={"ids": {"values": ["INC-2"]}}, size=1)
+            await es.update(index=".incidents-datapulse-000001", id="INC-2", doc={"severity": "critical"})
+            after_update = await es.search(
+                index=".incidents-datapulse", query={"bool": {"filter": [{"term": {"severity": "critical"}}]}}
+            )
+            await es.index(index=".audit-datapulse", id="key", document={}, op_type="create")
+            with self.assertRaises(ConflictError):
+                await es.index(index=".audit-datapulse", id="key", document={}, op_type="create")
+            return page, by_id, after_update
+
+        page, by_id, after_update = asyncio.run(scenario())
+        self.assertEqual(page["hits"]["total"]["value"], 3)
+        self.assertEqual([hit["_id"] for hit in page["hits"]["hits"]], ["INC-5", "INC-3"])
+        self.assertEqual(by_id["hits"]["hits"][0]["_index"], ".incidents-datapulse-000001")
+        self.assertEqual(after_update["hits"]["total"]["value"], 4)
+
+        # Callers get copies, never the stored documents
+        page["hits"]["hits"][0]["_source"]["severity"] = "mutated"
+        self.assertEqual(asyncio.run(es.get(index=".incidents-datapulse", id="INC-5"))["_source"]["severity"], "critical")
+
+
+class GatewayLoadBenchmarkSmokeTest(unittest.TestCase):
+    def test_every_scenario_runs_against_the_current_gateway(self):
+        # Separate interpreter: the benchmark replaces gateway globals for the whole process
+        result = subprocess.run(
+            [
+                sys.executable, "benchmarks/gateway_load.py", "--json",
+                "--requests", "6", "--warmup", "0", "--repeat", "1", "--concurrency", "3",
+                "--dataset", "10", "--es-latency-ms", "0", "--es-jitter-ms", "0",
+            ],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        results = json.loads(result.stdout)["results"]
+        self.assertEqual(
+            set(results),
+            {"create_incident", "list_incidents", "get_incident", "receive_report", "approve_action", "slack_webhook"},
+        )
+        for name, row in results.items():
+            self.assertEqual(row["errors"], 0, f"{name}: {row['error_statuses']}")
+            self.assertEqual(row["requests"], 6)
+            self.assertGreater(row["es_calls_per_request"], 0, name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import asyncio
+import importlib
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from backend.api_gateway.src.incident_analytics import (
+    AnalyticsCache,
+    build_analytics_query,
+    parse_analytics_response,
+)
+
+SEARCH_RESPONSE = {
+    "hits": {"total": {"value": 3, "relation": "eq"}},
+    "aggregations": {
+        "by_service": {"buckets": [
+            {"key": "payment-service", "doc_count": 2, "time_to_resolution": {"value": 600.0}},
+            {"key": "auth-service", "doc_count": 1, "time_to_resolution": {"value": None}},
+        ]},
+        "by_severity": {"buckets": [{"key": "high", "doc_count": 2}, {"key": "medium", "doc_count": 1}]},
+        "by_status": {"buckets": [{"key": "open", "doc_count": 2}, {"key": "resolved", "doc_count": 1}]},
+        "over_time": {"buckets": [
+            {"key": 1, "key_as_string": "2026-01-01T00:00:00.000Z", "doc_count": 3,
+             "by_severity": {"buckets": [{"key": "high", "doc_count": 2}]}},
+        ]},
+        "time_to_rca_seconds_stats": {"count": 3, "min": 20.0, "max": 95.5, "avg": 50.25},
+        "time_to_rca_seconds_percentiles": {"values": {"50.0": 40.0, "90.0": 90.0, "99.0": 95.0}},
+        "time_to_resolution_seconds_stats": {"count": 0, "min": None, "max": None, "avg": None},
+        "time_to_resolution_seconds_percentiles": {"values": {"50.0": None, "90.0": None, "99.0": None}},
+    },
+}
+
+
+class AnalyticsQueryTests(unittest.TestCase):
+    def test_query_filters_and_aggregates_in_one_search(self):
+        body = build_analytics_query("24h", "1h", service="payment-service")
+
+        self.assertEqual(body["size"], 0)
+        filters = body["query"]["bool"]["filter"]
+        self.assertEqual(filters[0]["range"]["created_at"]["gte"], "now-24h/m")
+        self.assertIn({"term": {"service": "payment-service"}}, filters)
+        self.assertEqual(body["aggs"]["over_time"]["date_histogram"]["fixed_interval"], "1h")
+        self.assertEqual(body["aggs"]["time_to_rca_seconds_percentiles"]["percentiles"]["field"],
+                         "time_to_rca_seconds")
+
+    def test_week_intervals_are_sent_in_days(self):
+        body = build_analytics_query("12w", "2w")
+
+        self.assertEqual(body["aggs"]["over_time"]["date_histogram"]["fixed_interval"], "14d")
+        self.assertEqual(body["query"]["bool"]["filter"][0]["range"]["created_at"]["gte"], "now-12w/m")
+
+    def test_invalid_spans_and_too_many_buckets_are_rejected(self):
+        for window, interval in (("7 days", "1d"), ("7d", "0h"), ("365d", "1m")):
+            with self.assertRaises(ValueError):
+                build_analytics_query(window, interval)
+
+    def test_response_is_flattened_for_dashboards(self):
+        result = parse_analytics_response(SEARCH_RESPONSE)
+
+        self.assertEqual(result["total"], 3)
+        self.assertEqual(result["by_service"][0], {
+            "service": "payment-service", "count": 2, "mean_time_to_resolution_seconds": 600.0,
+        })
+        self.assertEqual(result["by_status"], {"open": 2, "resolved": 1})
+        self.assertEqual(result["over_time"][0]["by_severity"], {"high": 2})
+        self.assertEqual(result["time_to_rca_seconds"], {
+            "count": 3, "mean": 50.2, "min": 20.0, "max": 95.5, "p50": 40.0, "p90": 90.0, "p99": 95.0,
+        })
+        self.assertIsNone(result["time_to_resolution_seconds"]["p50"])
+
+
+class AnalyticsCacheTests(unittest.TestCase):
+    def test_repeats_are_served_from_cache_until_ttl(self):
+        now = [0.0]
+        loads = []
+        cache = AnalyticsCache(ttl=15, clock=lambda: now[0])
+
+        async def loader():
+            loads.append(now[0])
+            await asyncio.sleep(0.01)
+            return {"total": len(loads)}
+
+        async def scenario():
+            first, second = await asyncio.gather(cache.get_or_load(("7d",), loader), cache.get_or_load(("7d",), loader))
+            now[0] = 10.0
+            third = await cache.get_or_load(("7d",), loader)
+            other = await cache.get_or_load(("24h",), loader)
+            now[0] = 16.0
+            expired = await cache.get_or_load(("7d",), loader)
+            return first, second, third, other, expired
+
+        first, second, third, other, expired = asyncio.run(scenario())
+
+        self.assertEqual(first, ({"total": 1}, False))
+        self.assertEqual(second, ({"total": 1}, True))
+        self.assertEqual(third, ({"total": 1}, True))
+        self.assertEqual(other, ({"total": 2}, False))
+        self.assertEqual(expired, ({"total": 3}, False))
+
+
+    def test_waiters_load_themselves_when_the_leading_request_is_cancelled(self):
+        cache = AnalyticsCache(ttl=15)
+        loads = []
+
+        async def loader():
+            loads.append(1)
+            await asyncio.sleep(0.05)
+            return {"total": len(loads)}
+
+        async def scenario():
+            leader = asyncio.create_task(cache.get_or_load(("7d",), loader))
+            await asyncio.sleep(0)
+            waiter = asyncio.create_task(cache.get_or_load(("7d",), loader))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await asyncio.wait_for(waiter, 1)
+
+        self.assertEqual(asyncio.run(scenario()), ({"total": 2}, False))
+        self.assertEqual(cache.snapshot()["misses"], 2)
+
+
+class AnalyticsEndpointTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with patch("elasticsearch.AsyncElasticsearch", return_value=MagicMock()):
+            cls.main = importlib.import_module("backend.api_gateway.src.main")
+
+    def setUp(self):
+        self.client = TestClient(self.main.app)
+        self.main._analytics_cache = type(self.main._analytics_cache)(ttl=15)
+
+    def test_endpoint_returns_aggregates_and_caches_by_query(self):
+        es_mock = AsyncMock()
+        es_mock.search.return_value = SEARCH_RESPONSE
+
+        with patch.object(self.main, "es", es_mock):
+            first = self.client.get("/api/datapulse/v1/analytics/incidents", params={"window": "1d", "interval": "1h"})
+            second = self.client.get("/api/datapulse/v1/analytics/incidents", params={"window": "1d", "interval": "1h"})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertFalse(first.json()["cached"])
+        self.assertTrue(second.json()["cached"])
+        self.assertEqual(second.json()["by_severity"], {"high": 2, "medium": 1})
+        self.assertEqual(es_mock.search.await_count, 1)
+        self.assertEqual(es_mock.search.await_args.kwargs["index"], self.main.INDEX_INCIDENTS)
+
+    def test_bad_parameters_are_a_client_error(self):
+        response = self.client.get("/api/datapulse/v1/analytics/incidents", params={"interval": "soon"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_time_to_resolution_is_measured_from_creation(self):
+        now = self.main.datetime(2026, 1, 1, 0, 10, tzinfo=self.main.timezone.utc)
+
+        self.assertEqual(self.main.seconds_since("2026-01-01T00:00:00+00:00", now), 600.0)
+        self.assertEqual(self.main.seconds_since("2026-01-01T00:05:00Z", now), 300.0)
+        self.assertIsNone(self.main.seconds_since("yesterday", now))
+        self.assertIsNone(self.main.seconds_since(None, now))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+import asyncio
+import importlib
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from backend.api_gateway.src.incident_events import IncidentEventBus
+
+
+def _drain(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+class IncidentEventBusTests(unittest.TestCase):
+    def test_subscribers_receive_events_for_their_incident(self):
+        bus = IncidentEventBus()
+
+        async def scenario():
+            everything = bus.subscribe()
+            one = bus.subscribe(incident_id="INC-2")
+            bus.publish("incident.created", "INC-1", {"incident": {"service": "payments"}})
+            bus.publish("incident.created", "INC-2")
+            return _drain(everything), _drain(one)
+
+        everything, one = asyncio.run(scenario())
+
+        self.assertEqual([e.id for e in everything], [1, 2])
+        self.assertEqual([e.incident_id for e in one], ["INC-2"])
+        self.assertIn("id: 1\nevent: incident.created\ndata: ", everything[0].to_sse())
+        self.assertEqual(json.loads(everything[0].to_sse().split("data: ")[1])["incident"], {"service": "payments"})
+
+    def test_reconnecting_client_resumes_after_last_event_id(self):
+        bus = IncidentEventBus(history_size=10)
+        for n in range(5):
+            bus.publish("incident.updated", f"INC-{n}")
+
+        async def scenario():
+            return _drain(bus.subscribe(last_event_id=3)), _drain(bus.subscribe(last_event_id=5))
+
+        resumed, current = asyncio.run(scenario())
+
+        self.assertEqual([e.id for e in resumed], [4, 5])
+        self.assertEqual(current, [])
+
+    def test_expired_history_tells_the_client_to_reload(self):
+        bus = IncidentEventBus(history_size=3)
+        for n in range(6):
+            bus.publish("incident.updated", "INC-1")
+
+        async def scenario():
+            return _drain(bus.subscribe(last_event_id=1))
+
+        events = asyncio.run(scenario())
+
+        self.assertEqual([(e.type, e.id) for e in events], [("stream.reset", 6)])
+
+    def test_ids_from_another_process_tell_the_client_to_reload(self):
+        restarted = IncidentEventBus(first_id=1000)
+        restarted.publish("incident.updated", "INC-1")
+
+        async def scenario():
+            return _drain(restarted.subscribe(last_event_id=2000)), _drain(restarted.subscribe(last_event_id=5))
+
+        ahead, before = asyncio.run(scenario())
+
+        self.assertEqual([(e.type, e.id) for e in ahead], [("stream.reset", 1000)])
+        self.assertEqual(ahead[0].data, {"reason": "unknown_event_id"})
+        self.assertEqual([(e.type, e.data) for e in before], [("stream.reset", {"reason": "history_expired"})])
+
+    def test_slow_consumer_is_dropped_without_blocking_publishers(self):
+        bus = IncidentEventBus(buffer_size=2)
+
+        async def scenario():
+            slow = bus.subscribe()
+            fast = bus.subscribe()
+            for n in range(3):
+                bus.publish("incident.updated", "INC-1")
+                _drain(fast)
+            return slow, fast
+
+        slow, fast = asyncio.run(scenario())
+
+        self.assertTrue(slow.dropped)
+        self.assertFalse(fast.dropped)
+        self.assertEqual(bus.snapshot()["subscribers"], 1)
+        self.assertEqual(bus.snapshot()["dropped_subscribers"], 1)
+        # Already queued events are still delivered before the stream ends
+        self.assertEqual([e.id for e in _drain(slow)], [1, 2])
+
+    def test_stream_emits_events_and_keepalives_then_unsubscribes(self):
+        bus = IncidentEventBus()
+
+        async def scenario():
+            subscription = bus.subscribe()
+            stream = bus.stream(subscription, keepalive_seconds=0.01)
+            chunks = [await stream.__anext__(), await stream.__anext__()]
+            bus.publish("action.transition", "INC-1", {"transition": {"to_state": "approved"}})
+            chunks.append(await stream.__anext__())
+            await stream.aclose()
+            return chunks
+
+        hello, keepalive, event = asyncio.run(scenario())
+
+        self.assertTrue(hello.startswith("retry: 3000\n"))
+        self.assertEqual(keepalive, ": keepalive\n\n")
+        self.assertTrue(event.startswith("id: 1\nevent: action.transition\n"))
+        self.assertEqual(bus.snapshot()["subscribers"], 0)
+
+
+class AgentEventsEndpointTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with patch("elasticsearch.AsyncElasticsearch", return_value=MagicMock()):
+            cls.main = importlib.import_module("backend.api_gateway.src.main")
+
+    def setUp(self):
+        self.client = TestClient(self.main.app)
+        self.main.incident_events = IncidentEventBus()
+
+    def test_batch_is_published_as_one_stream_event(self):
+        frames = [{"seq": 1, "type": "reasoning", "text": "checking deploys"}, {"seq": 2, "type": "message", "text": "Root"}]
+
+        subscription = self.main.incident_events.subscribe(incident_id="INC-1")
+
+        response = self.client.post("/agent/events", json={"incident_id": "INC-1", "agent": "analyst", "events": frames})
+
+        events = _drain(subscription)
+
+        self.assertEqual(response.json(), {"status": "accepted", "events": 2})
+        self.assertEqual([e.type for e in events], ["agent.events"])
+        self.assertEqual(events[0].data["events"], frames)
+
+    def test_oversized_batches_are_rejected(self):
+        frames = [{"seq": n, "type": "message", "text": "x"} for n in range(self.main.AGENT_EVENT_BATCH_MAX + 1)]
+
+        response = self.client.post("/agent/events", json={"incident_id": "INC-1", "agent": "analyst", "events": frames})
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(self.main.incident_events.published, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from backend.api_gateway.src.index_bootstrap import (
+    INCIDENT_MAPPINGS,
+    INCIDENTS_ALIAS,
+    alias_setting,
+    ensure_indices,
+    index_template,
+)
+
+
+class _FakeIndices:
+    def __init__(self, existing=(), aliases=()):
+        self.existing = set(existing)
+        self.aliases = set(aliases)
+        self.calls = []
+
+    async def exists_alias(self, name):
+        return name in self.aliases
+
+    async def exists(self, index):
+        return index in self.existing
+
+    async def put_index_template(self, name, **body):
+        self.calls.append(("put_index_template", name, body))
+
+    async def create(self, index, aliases):
+        self.calls.append(("create", index, aliases))
+
+    async def put_settings(self, index, settings):
+        self.calls.append(("put_settings", index, settings))
+
+    async def update_aliases(self, actions):
+        self.calls.append(("update_aliases", actions))
+
+    async def rollover(self, alias):
+        self.calls.append(("rollover", alias))
+
+
+class _FakeIlm:
+    def __init__(self):
+        self.policies = {}
+
+    async def put_lifecycle(self, name, policy):
+        self.policies[name] = policy
+
+
+class _FakeES:
+    def __init__(self, **indices):
+        self.indices = _FakeIndices(**indices)
+        self.ilm = _FakeIlm()
+
+    def ops(self, name):
+        return [call for call in self.indices.calls if call[0] == name]
+
+
+class IndexBootstrapTests(unittest.TestCase):
+    def test_fresh_cluster_gets_templates_policies_and_write_aliases(self):
+        es = _FakeES()
+
+        aliases = asyncio.run(ensure_indices(es))
+
+        self.assertIn(INCIDENTS_ALIAS, aliases)
+        self.assertEqual(set(es.ilm.policies), {"incidents_policy", "audit_policy"})
+        rollover = es.ilm.policies["incidents_policy"]["phases"]["hot"]["actions"]["rollover"]
+        self.assertIn("max_primary_shard_size", rollover)
+        self.assertIn("max_age", rollover)
+
+        created = {index: aliases for _, index, aliases in es.ops("create")}
+        self.assertEqual(created[f"{INCIDENTS_ALIAS}-000001"], {INCIDENTS_ALIAS: {"is_write_index": True}})
+        self.assertEqual(len(es.ops("put_index_template")), 2)
+
+    def test_existing_alias_is_left_alone(self):
+        es = _FakeES(aliases=[INCIDENTS_ALIAS], existing=[f"{INCIDENTS_ALIAS}-000001"])
+
+        asyncio.run(ensure_indices(es))
+
+        created = [index for _, index, _ in es.ops("create")]
+        self.assertNotIn(f"{INCIDENTS_ALIAS}-000001", created)
+        self.assertEqual(es.ops("rollover"), [])
+
+    def test_legacy_fixed_index_is_adopted_and_rolled_over(self):
+        legacy = f"{INCIDENTS_ALIAS}-000001"
+        es = _FakeES(existing=[legacy])
+
+        asyncio.run(ensure_indices(es))
+
+        self.assertEqual(
+            es.ops("update_aliases")[0][1],
+            [{"add": {"index": legacy, "alias": INCIDENTS_ALIAS, "is_write_index": True}}],
+        )
+        self.assertEqual(es.ops("put_settings")[0][2]["index"]["lifecycle"]["rollover_alias"], INCIDENTS_ALIAS)
+        self.assertIn(("rollover", INCIDENTS_ALIAS), es.indices.calls)
+
+    def test_mappings_are_explicit_and_blobs_are_not_indexed(self):
+        template = index_template(INCIDENTS_ALIAS, "incidents_policy", INCIDENT_MAPPINGS)
+        properties = template["template"]["mappings"]["properties"]
+
+        self.assertEqual(template["index_patterns"], [f"{INCIDENTS_ALIAS}-*"])
+        self.assertEqual(template["template"]["settings"]["index"]["lifecycle"]["rollover_alias"], INCIDENTS_ALIAS)
+        for field in ("severity", "status", "service", "incident_id"):
+            self.assertEqual(properties[field], {"type": "keyword"})
+        self.assertEqual(properties["created_at"], {"type": "date"})
+        self.assertIs(properties["analyst_report"]["properties"]["full_analysis"]["index"], False)
+        dynamic = template["template"]["mappings"]["dynamic_templates"][0]["strings_as_keywords"]
+        self.assertEqual(dynamic["mapping"]["type"], "keyword")
+
+    def test_legacy_concrete_index_setting_maps_to_its_alias(self):
+        cases = [
+            ({"INDEX_INCIDENTS": ".incidents-datapulse-000001"}, ".incidents-datapulse"),
+            ({"INDEX_INCIDENTS": "incidents-prod"}, "incidents-prod"),
+            ({"INDEX_INCIDENTS": "x-000001", "INDEX_INCIDENTS_ALIAS": "incidents"}, "incidents"),
+            ({}, ".incidents-datapulse"),
+        ]
+        for env, expected in cases:
+            with patch.dict("os.environ", env, clear=True):
+                self.assertEqual(
+                    alias_setting("INDEX_INCIDENTS_ALIAS", "INDEX_INCIDENTS", ".incidents-datapulse"), expected
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
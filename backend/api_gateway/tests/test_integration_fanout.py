@@ -0,0 +1,170 @@
+import asyncio
+import importlib
+import sys
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import httpx
+
+from backend.api_gateway.src.integration_fanout import (
+    CircuitBreaker,
+    CircuitState,
+    IntegrationDispatcher,
+)
+
+
+class IntegrationDispatcherTests(unittest.TestCase):
+    def test_slow_integration_does_not_delay_others(self):
+        dispatcher = IntegrationDispatcher()
+        finished = {}
+
+        async def slow(_incident):
+            await asyncio.sleep(0.2)
+            finished["slow"] = time.perf_counter()
+            return "slow"
+
+        async def fast(_incident):
+            finished["fast"] = time.perf_counter()
+            return "fast"
+
+        dispatcher.register("slow", slow, timeout=1.0)
+        dispatcher.register("fast", fast, timeout=1.0)
+
+        started = time.perf_counter()
+        results = asyncio.run(dispatcher.dispatch({"incident_id": "INC-1"}))
+
+        self.assertEqual(results, {"slow": "slow", "fast": "fast"})
+        self.assertLess(finished["fast"] - started, 0.1)
+
+    def test_timeout_counts_as_failure(self):
+        dispatcher = IntegrationDispatcher()
+
+        async def hangs(_incident):
+            await asyncio.sleep(1)
+
+        dispatcher.register("jira", hangs, timeout=0.01)
+        results = asyncio.run(dispatcher.dispatch({}))
+
+        self.assertEqual(results, {"jira": None})
+        snapshot = dispatcher.snapshot()["jira"]
+        self.assertEqual(snapshot["timeouts"], 1)
+        self.assertEqual(snapshot["circuit"]["consecutive_failures"], 1)
+
+    def test_open_circuit_fails_fast(self):
+        dispatcher = IntegrationDispatcher(failure_threshold=2, recovery_timeout=60)
+        calls = []
+
+        async def broken(_incident):
+            calls.append(1)
+            raise RuntimeError("jira down")
+
+        dispatcher.register("jira", broken)
+
+        async def scenario():
+            for _ in range(5):
+                await dispatcher.dispatch({})
+
+        asyncio.run(scenario())
+
+        snapshot = dispatcher.snapshot()["jira"]
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(snapshot["short_circuited"], 3)
+        self.assertEqual(snapshot["circuit"]["state"], "open")
+
+    def test_rejected_slack_posts_open_the_slack_circuit(self):
+        with patch("elasticsearch.AsyncElasticsearch", return_value=MagicMock()):
+            main = importlib.import_module("backend.api_gateway.src.main")
+        SlackAdapter = main.import_integration("slack_adapter.slack_adapter", "SlackAdapter")
+        adapter_module = sys.modules[SlackAdapter.__module__]
+        with patch.dict("os.environ", {"SLACK_BOT_TOKEN": "xoxb-test", "SLACK_WEBHOOK_URL": ""}):
+            slack = SlackAdapter()
+
+        real_client = httpx.AsyncClient
+        posts = []
+
+        def rejecting_client(*args, **kwargs):
+            def reject(request):
+                posts.append(request.url.path)
+                return httpx.Response(200, json={"ok": False, "error": "channel_not_found"})
+
+            kwargs["transport"] = httpx.MockTransport(reject)
+            return real_client(*args, **kwargs)
+
+        dispatcher = IntegrationDispatcher(failure_threshold=2, recovery_timeout=60)
+        dispatcher.register("slack", main.notify_slack)
+        incident = {"incident_id": "INC-1", "service": "payments", "severity": "critical"}
+
+        async def scenario():
+            for _ in range(4):
+                await dispatcher.dispatch(incident)
+
+        with patch.object(main, "get_slack_adapter", return_value=slack), \
+                patch.object(adapter_module.httpx, "AsyncClient", rejecting_client):
+            asyncio.run(scenario())
+
+        snapshot = dispatcher.snapshot()["slack"]
+        self.assertEqual(posts, ["/api/chat.postMessage"] * 2)
+        self.assertEqual((snapshot["successes"], snapshot["failures"], snapshot["short_circuited"]), (0, 2, 2))
+        self.assertEqual(snapshot["circuit"]["state"], "open")
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def test_half_open_allows_single_probe_and_closes_on_success(self):
+        breaker = CircuitBreaker("slack", failure_threshold=1, recovery_timeout=10)
+        breaker.record_failure()
+        self.assertFalse(breaker.allow_request())
+
+        with patch("backend.api_gateway.src.integration_fanout.time.monotonic",
+                   return_value=breaker.opened_at + 11):
+            self.assertTrue(breaker.allow_request())
+            self.assertEqual(breaker.state, CircuitState.half_open)
+            self.assertFalse(breaker.allow_request())
+
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitState.closed)
+        self.assertTrue(breaker.allow_request())
+
+    def test_failed_probe_reopens_circuit(self):
+        breaker = CircuitBreaker("slack", failure_threshold=3, recovery_timeout=10)
+        for _ in range(3):
+            breaker.record_failure()
+
+        with patch("backend.api_gateway.src.integration_fanout.time.monotonic",
+                   return_value=breaker.opened_at + 11):
+            self.assertTrue(breaker.allow_request())
+            breaker.record_failure()
+            self.assertEqual(breaker.state, CircuitState.open)
+            self.assertFalse(breaker.allow_request())
+
+    def test_cancelled_probe_does_not_block_later_probes(self):
+        dispatcher = IntegrationDispatcher(failure_threshold=1, recovery_timeout=10)
+        started = []
+
+        async def slack(payload):
+            started.append(payload)
+            await asyncio.sleep(1)
+
+        dispatcher.register("slack", slack, timeout=5)
+        breaker = dispatcher._integrations["slack"].breaker
+        breaker.record_failure()
+        # Past the recovery timeout, so the next call is the half-open probe
+        breaker.opened_at -= 11
+
+        async def scenario():
+            probe = asyncio.create_task(dispatcher.dispatch({"n": 1}))
+            await asyncio.sleep(0.01)
+            probe.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await probe
+
+        asyncio.run(scenario())
+
+        self.assertEqual(started, [{"n": 1}])
+        self.assertEqual(breaker.state, CircuitState.open)
+        breaker.opened_at -= 11
+        self.assertTrue(breaker.allow_request())
+
+
+if __name__ == "__main__":
+    unittest.main()
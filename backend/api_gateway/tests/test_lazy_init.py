@@ -0,0 +1,71 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+from backend.api_gateway.src.lazy_init import LazyClient
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+class _Client:
+    closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+class LazyClientTests(unittest.TestCase):
+    def test_client_is_built_on_first_use_and_reused_within_a_loop(self):
+        lazy = LazyClient(_Client)
+        self.assertFalse(lazy.initialized)
+
+        async def invocation():
+            return lazy.get(), lazy.get(), lazy.closed
+
+        first, again, _ = asyncio.run(invocation())
+        second, _, _ = asyncio.run(invocation())
+
+        self.assertIs(first, again)
+        # A new event loop gets its own client instead of one bound to a closed loop
+        self.assertIsNot(first, second)
+        self.assertEqual(lazy.created, 2)
+        self.assertEqual(len(lazy._instances), 1)
+
+    def test_aclose_closes_the_running_loops_client(self):
+        lazy = LazyClient(_Client)
+
+        async def invocation():
+            client = lazy.get()
+            await lazy.aclose()
+            return client
+
+        self.assertTrue(asyncio.run(invocation()).closed)
+        self.assertFalse(lazy.initialized)
+
+
+class LazyGatewayImportTests(unittest.TestCase):
+    def test_lazy_mode_defers_elasticsearch_and_integrations(self):
+        script = (
+            "import json, sys\n"
+            "import backend.api_gateway.src.main as main\n"
+            "before = {m: m in sys.modules for m in ('elasticsearch', 'jira_adapter', 'slack_adapter')}\n"
+            "main.es.transport\n"
+            "print(json.dumps({'before': before, 'after': 'elasticsearch' in sys.modules}))\n"
+        )
+        env = dict(os.environ, GATEWAY_LAZY_INIT="true")
+        result = subprocess.run(
+            [sys.executable, "-c", script], cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=60
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        modules = json.loads(result.stdout.strip().splitlines()[-1])
+        self.assertEqual(modules["before"], {"elasticsearch": False, "jira_adapter": False, "slack_adapter": False})
+        self.assertTrue(modules["after"])
+
+
+if __name__ == "__main__":
+    unittest.main()
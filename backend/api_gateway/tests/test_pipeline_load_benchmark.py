@@ -0,0 +1,37 @@
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+class PipelineLoadBenchmarkSmokeTest(unittest.TestCase):
+    def test_incidents_flow_from_sentinel_to_proposals(self):
+        # Separate interpreter: the harness binds ports and replaces gateway and agent globals
+        result = subprocess.run(
+            [
+                sys.executable, "benchmarks/pipeline_load.py", "--json",
+                "--incidents", "3", "--rate", "20", "--agent-speed", "20",
+                "--es-latency-ms", "0", "--es-jitter-ms", "0", "--sink-latency-ms", "0",
+                "--timeout", "30", "--drain-seconds", "0.5",
+            ],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        summary = json.loads(result.stdout)
+        self.assertEqual(summary["injected"], 3)
+        self.assertEqual(summary["completed"], 3)
+        stages = summary["stages"]
+        for stage in ("detect -> created", "agent builder stream", "RCA -> proposals stored", "detect -> proposals"):
+            self.assertEqual(stages[stage]["count"], 3, stage)
+        self.assertGreater(stages["created -> slack alert"]["count"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
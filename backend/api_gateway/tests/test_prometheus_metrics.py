@@ -0,0 +1,181 @@
+import asyncio
+import unittest
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from backend.api_gateway.src.integration_fanout import IntegrationDispatcher
+from backend.api_gateway.src.prometheus_metrics import (
+    CachedValue,
+    MetricsRegistry,
+    RequestMetricsMiddleware,
+    es_latency_hook,
+)
+from shared.es_client import ClientSettings, ManagedElasticsearch, add_latency_hook, remove_latency_hook
+
+
+class MetricsRegistryTests(unittest.TestCase):
+    def test_renders_prometheus_text_format(self):
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ["route"])
+        latency = registry.histogram("latency_seconds", "Latency", ["route"], buckets=(0.1, 1.0))
+
+        requests.inc(route='/a"b')
+        requests.inc(2, route='/a"b')
+        latency.observe(0.05, route="/a")
+        latency.observe(0.5, route="/a")
+        latency.observe(5, route="/a")
+
+        text = asyncio.run(registry.collect())
+
+        self.assertIn("# TYPE requests_total counter", text)
+        self.assertIn('requests_total{route="/a\\"b"} 3', text)
+        self.assertIn('latency_seconds_bucket{route="/a",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{route="/a",le="1"} 2', text)
+        self.assertIn('latency_seconds_bucket{route="/a",le="+Inf"} 3', text)
+        self.assertIn('latency_seconds_count{route="/a"} 3', text)
+        self.assertIn('latency_seconds_sum{route="/a"} 5.55', text)
+
+        with self.assertRaises(ValueError):
+            requests.inc(status="200")
+
+    def test_collect_callbacks_refresh_gauges_before_render(self):
+        registry = MetricsRegistry()
+        depth = registry.gauge("queue_depth", "Queue depth")
+
+        @registry.on_collect
+        async def refresh():
+            depth.set(7)
+
+        self.assertIn("queue_depth 7", asyncio.run(registry.collect()))
+
+
+class CachedValueTests(unittest.TestCase):
+    def test_value_is_reused_until_ttl_and_refreshes_are_shared(self):
+        now = [0.0]
+        loads = []
+
+        async def loader():
+            loads.append(now[0])
+            await asyncio.sleep(0.01)
+            return len(loads)
+
+        cached = CachedValue(loader, ttl=30, clock=lambda: now[0])
+
+        async def scenario():
+            first = await asyncio.gather(cached.get(), cached.get())
+            now[0] = 10.0
+            second = await cached.get()
+            now[0] = 31.0
+            third = await cached.get()
+            return first, second, third
+
+        first, second, third = asyncio.run(scenario())
+
+        self.assertEqual(first, [1, 1])
+        self.assertEqual(second, 1)
+        self.assertEqual(third, 2)
+        self.assertEqual(loads, [0.0, 31.0])
+
+    def test_cancelled_waiter_does_not_start_a_second_load(self):
+        loads = []
+
+        async def loader():
+            loads.append(1)
+            await asyncio.sleep(0.05)
+            return len(loads)
+
+        cached = CachedValue(loader, ttl=30)
+
+        async def scenario():
+            scrape = asyncio.ensure_future(cached.get())
+            await asyncio.sleep(0.01)
+            # The scraper disconnects mid-refresh; the next scrape joins the running load
+            scrape.cancel()
+            await asyncio.sleep(0)
+            return await cached.get()
+
+        self.assertEqual(asyncio.run(scenario()), 1)
+        self.assertEqual(loads, [1])
+
+
+class InstrumentationTests(unittest.TestCase):
+    def test_es_calls_are_timed_and_errors_counted_per_operation(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("es_seconds", "ES latency", ["operation"])
+        errors = registry.counter("es_errors_total", "ES errors", ["operation", "error"])
+
+        class Client:
+            hosts = ["http://es:9200"]
+
+            def search(self, **kwargs):
+                async def run():
+                    return {"hits": {}}
+                return run()
+
+            async def get(self, **kwargs):
+                raise LookupError("missing")
+
+        es = ManagedElasticsearch(Client(), "api-gateway", ClientSettings(slow_request_ms=0))
+        other = ManagedElasticsearch(Client(), "analyst", ClientSettings(slow_request_ms=0))
+        hook = es_latency_hook(latency, errors, service="api-gateway")
+        add_latency_hook(hook)
+        self.addCleanup(remove_latency_hook, hook)
+
+        async def scenario():
+            await es.search(index="x")
+            await other.search(index="x")
+            with self.assertRaises(LookupError):
+                await es.get(index="x", id="1")
+
+        asyncio.run(scenario())
+
+        self.assertEqual(es.hosts, ["http://es:9200"])
+        self.assertEqual(latency.count(operation="search"), 1)
+        self.assertEqual(latency.count(operation="get"), 1)
+        self.assertEqual(errors.value(operation="get", error="LookupError"), 1)
+
+    def test_middleware_labels_requests_by_route_template(self):
+        registry = MetricsRegistry()
+        latency = registry.histogram("http_seconds", "HTTP latency", ["method", "route", "status"])
+        in_flight = registry.gauge("http_in_flight", "In flight")
+
+        app = FastAPI()
+        app.add_middleware(RequestMetricsMiddleware, latency=latency, in_flight=in_flight)
+
+        @app.get("/incidents/{incident_id}")
+        async def get_incident(incident_id: str):
+            if incident_id == "missing":
+                raise HTTPException(status_code=404)
+            return {"incident_id": incident_id}
+
+        client = TestClient(app)
+        client.get("/incidents/INC-1")
+        client.get("/incidents/INC-2")
+        client.get("/incidents/missing")
+        client.get("/nope")
+
+        self.assertEqual(latency.count(method="GET", route="/incidents/{incident_id}", status="200"), 2)
+        self.assertEqual(latency.count(method="GET", route="/incidents/{incident_id}", status="404"), 1)
+        self.assertEqual(latency.count(method="GET", route="unmatched", status="404"), 1)
+        self.assertEqual(in_flight.value(), 0)
+
+    def test_dispatcher_reports_integration_outcomes(self):
+        observed = []
+        dispatcher = IntegrationDispatcher(observer=lambda *args: observed.append(args[:2]))
+
+        async def ok(_incident):
+            return "ok"
+
+        async def broken(_incident):
+            raise RuntimeError("down")
+
+        dispatcher.register("slack", ok)
+        dispatcher.register("jira", broken)
+        asyncio.run(dispatcher.dispatch({"incident_id": "INC-1"}))
+
+        self.assertEqual(sorted(observed), [("jira", "failure"), ("slack", "success")])
+
+
+if __name__ == "__main__":
+    unittest.main()
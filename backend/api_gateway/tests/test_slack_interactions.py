@@ -0,0 +1,187 @@
+import asyncio
+import importlib
+import json
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from backend.api_gateway.src.slack_interactions import (
+    QueueFull,
+    SlackInteractionQueue,
+    interaction_key,
+    parse_interaction,
+)
+
+
+def _payload(value="approve|INC-1|ACT-1", action_ts="1700000000.000100"):
+    return {
+        "type": "block_actions",
+        "user": {"id": "U1", "username": "oncall"},
+        "trigger_id": "T-1",
+        "actions": [{"action_id": "approve_action", "value": value, "action_ts": action_ts}],
+    }
+
+
+class SlackInteractionParsingTests(unittest.TestCase):
+    def test_retries_share_a_key_and_new_clicks_do_not(self):
+        self.assertEqual(interaction_key(_payload()), interaction_key(_payload()))
+        self.assertNotEqual(interaction_key(_payload()), interaction_key(_payload(action_ts="1700000001.000100")))
+
+        interaction = parse_interaction(_payload())
+        self.assertEqual(
+            (interaction.action_type, interaction.incident_id, interaction.action_id, interaction.actor),
+            ("approve", "INC-1", "ACT-1", "oncall"),
+        )
+        self.assertIsNone(parse_interaction(_payload(value="approve")))
+
+
+class SlackInteractionQueueTests(unittest.TestCase):
+    def test_interactions_are_processed_once_by_workers(self):
+        handled = []
+        observed = []
+
+        async def handler(interaction):
+            await asyncio.sleep(0.01)
+            if interaction.action_id == "ACT-2":
+                raise RuntimeError("es unavailable")
+            handled.append(interaction.action_id)
+
+        queue = SlackInteractionQueue(handler, observer=lambda *args: observed.append(args))
+
+        async def scenario():
+            first = queue.submit(parse_interaction(_payload()))
+            retry = queue.submit(parse_interaction(_payload()))
+            queue.submit(parse_interaction(_payload(value="reject|INC-1|ACT-2")))
+            await queue.drain(timeout=1)
+            await queue.aclose()
+            return first, retry
+
+        first, retry = asyncio.run(scenario())
+
+        self.assertEqual((first, retry), (True, False))
+        self.assertEqual(handled, ["ACT-1"])
+        self.assertEqual(queue.snapshot()["outcomes"], {"processed": 1, "failed": 1})
+        self.assertEqual(queue.snapshot()["duplicates"], 1)
+        self.assertEqual(sorted(outcome for outcome, _, _ in observed), ["failed", "processed"])
+        self.assertTrue(all(seconds >= 0.01 for _, _, seconds in observed))
+
+    def test_keys_expire_and_a_full_queue_is_refused(self):
+        now = [0.0]
+        queue = SlackInteractionQueue(AsyncMock(), workers=0, max_queue=1, dedupe_ttl=60, clock=lambda: now[0])
+
+        async def scenario():
+            queue.submit(parse_interaction(_payload()))
+            with self.assertRaises(QueueFull):
+                queue.submit(parse_interaction(_payload(action_ts="2")))
+            now[0] = 61.0
+            queue._queue.get_nowait()
+            return queue.submit(parse_interaction(_payload()))
+
+        self.assertTrue(asyncio.run(scenario()))
+        self.assertEqual(queue.snapshot()["rejected_queue_full"], 1)
+
+    def test_inline_processing_finishes_before_returning(self):
+        handler = AsyncMock()
+        queue = SlackInteractionQueue(handler, workers=0)
+
+        async def scenario():
+            first = await queue.process(parse_interaction(_payload()))
+            retry = await queue.process(parse_interaction(_payload()))
+            return first, retry
+
+        self.assertEqual(asyncio.run(scenario()), (True, False))
+        handler.assert_awaited_once()
+        self.assertEqual(queue.snapshot()["outcomes"], {"processed": 1})
+        self.assertEqual(queue.snapshot()["duplicates"], 1)
+
+    def test_claim_hook_skips_interactions_seen_by_another_replica(self):
+        handler = AsyncMock()
+        queue = SlackInteractionQueue(handler, claim=AsyncMock(return_value=False))
+
+        async def scenario():
+            queue.submit(parse_interaction(_payload()))
+            await queue.drain(timeout=1)
+            await queue.aclose()
+
+        asyncio.run(scenario())
+
+        handler.assert_not_awaited()
+        self.assertEqual(queue.snapshot()["outcomes"], {"duplicate": 1})
+
+
+class SlackWebhookAckTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with patch("elasticsearch.AsyncElasticsearch", return_value=MagicMock()):
+            cls.main = importlib.import_module("backend.api_gateway.src.main")
+
+    def setUp(self):
+        self.queue = SlackInteractionQueue(AsyncMock(), workers=0)
+        for patcher in (
+            patch.object(self.main, "_slack_interactions", self.queue),
+            patch.dict("os.environ", {"BOOTSTRAP_INDICES": "false"}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # One event loop for all requests of a test, as in a running server
+        self.client = TestClient(self.main.app).__enter__()
+        self.addCleanup(self.client.__exit__, None, None, None)
+
+    def _post(self, payload, **headers):
+        with patch.object(self.main, "verify_slack_signature", return_value=True):
+            return self.client.post(
+                "/api/datapulse/v1/webhook/integrations/slack",
+                data={"payload": json.dumps(payload)},
+                headers=headers,
+            )
+
+    def test_webhook_acknowledges_without_touching_elasticsearch(self):
+        es_mock = AsyncMock()
+        with patch.object(self.main, "es", es_mock):
+            first = self._post(_payload())
+            retry = self._post(_payload(), **{"X-Slack-Retry-Num": "1"})
+
+        self.assertEqual(first.json(), {"status": "accepted"})
+        self.assertEqual(retry.json(), {"status": "duplicate"})
+        self.assertEqual(es_mock.mock_calls, [])
+        self.assertEqual(self.queue.snapshot()["accepted"], 1)
+
+    def test_full_queue_asks_slack_to_retry(self):
+        self.queue.max_queue = 1
+
+        first = self._post(_payload())
+        second = self._post(_payload(action_ts="1700000002.000100"))
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 503)
+
+    def test_interaction_is_applied_by_the_worker_handler(self):
+        interaction = parse_interaction(_payload(value="reject|INC-1|ACT-1"))
+        with patch.object(self.main, "transition_action", AsyncMock()) as transition, \
+                patch.object(self.main, "persist_action_decision", AsyncMock()) as persist:
+            asyncio.run(self.main.process_slack_interaction(interaction))
+
+        self.assertEqual(transition.await_args.kwargs["to_state"], self.main.ActionState.rejected)
+        self.assertEqual(persist.await_args.args[:3], ("INC-1", "ACT-1", "rejected"))
+
+    def test_failed_decision_is_reported_to_the_clicking_user(self):
+        payload = _payload(value="approve|INC-1|ACT-1")
+        payload["response_url"] = "https://hooks.slack.com/actions/T1/1/abc"
+        slack = MagicMock(respond_to_interaction=AsyncMock(return_value=True))
+        rejected = self.main.HTTPException(status_code=400, detail="Invalid transition: executed -> approved")
+        with patch.object(self.main, "get_slack_adapter", return_value=slack), \
+                patch.object(self.main, "transition_action", AsyncMock(side_effect=rejected)), \
+                patch.object(self.main, "persist_action_decision", AsyncMock()) as persist:
+            with self.assertRaises(self.main.HTTPException):
+                asyncio.run(self.main.process_slack_interaction(parse_interaction(payload)))
+
+        persist.assert_not_awaited()
+        slack.respond_to_interaction.assert_awaited_once_with(
+            "https://hooks.slack.com/actions/T1/1/abc",
+            "Could not approve ACT-1 on INC-1: Invalid transition: executed -> approved",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,268 @@
+"""
+In-process stand-in for the async Elasticsearch client, for benchmarks.
+
+Covers the calls the gateway and agents make (index, get, search, update,
+indices.get_alias, ping, and ES|QL through perform_request) with ES-like
+responses. Each alias has a single
+write index (``<alias>-000001``). The fake adds configurable latency so
+request timings include a realistic wait on the datastore without a cluster
+in the loop. Documents cross the boundary as JSON, as they would over HTTP, so
+callers can never share or mutate stored state. A parsed copy is kept for
+matching and search results are cached until the next write, so the fake's
+own CPU time stays small next to the gateway's.
+
+Search supports what the services send: ``ids``, ``match_all``, ``term``,
+``multi_match`` (any query word in any field) and ``bool.filter`` of those, a
+single-field sort, ``from_``/``size`` and ``track_total_hits``. Aggregations
+come back empty. ES|QL queries, sync or async, are answered by an optional
+``esql`` callable returning row dicts; without one they return no rows.
+"""
+import asyncio
+import itertools
+import random
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from shared.serialization import dumps, loads
+
+
+class ConflictError(Exception):
+    """Raised for ``op_type="create"`` on an existing id, with the status code the gateway checks."""
+
+    status_code = 409
+
+
+class Latency:
+    """Per-call delay: base milliseconds plus uniform jitter, with per-operation overrides."""
+
+    def __init__(
+        self,
+        base_ms: float = 2.0,
+        jitter_ms: float = 1.0,
+        per_operation: Optional[Dict[str, float]] = None,
+        seed: int = 0,
+    ):
+        self.base_ms = base_ms
+        self.jitter_ms = jitter_ms
+        self.per_operation = dict(per_operation or {})
+        self._random = random.Random(seed)
+
+    def delay(self, operation: str) -> float:
+        base = self.per_operation.get(operation, self.base_ms)
+        return max(0.0, base + self._random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+
+    def describe(self) -> Dict[str, Any]:
+        return {"base_ms": self.base_ms, "jitter_ms": self.jitter_ms, "per_operation": self.per_operation}
+
+
+def _matches(source: Dict[str, Any], doc_id: str, query: Optional[Dict[str, Any]]) -> bool:
+    if not query or "match_all" in query:
+        return True
+    if "ids" in query:
+        return doc_id in query["ids"].get("values", [])
+    if "term" in query:
+        field, value = next(iter(query["term"].items()))
+        if isinstance(value, dict):
+            value = value.get("value")
+        return source.get(field) == value
+    if "multi_match" in query:
+        words = set(re.findall(r"\w{3,}", query["multi_match"]["query"].lower()))
+        fields = [name.split("^")[0] for name in query["multi_match"].get("fields", [])] or list(source)
+        text = " ".join(str(source.get(name, "")) for name in fields).lower()
+        return any(word in text for word in words)
+    if "bool" in query:
+        clauses = query["bool"].get("filter", []) + query["bool"].get("must", [])
+        return all(_matches(source, doc_id, clause) for clause in clauses)
+    raise NotImplementedError(f"Unsupported query in fake Elasticsearch: {sorted(query)}")
+
+
+class _FakeIndices:
+    def __init__(self, es: "FakeElasticsearch"):
+        self._es = es
+
+    async def get_alias(self, name: str, **_: Any) -> Dict[str, Any]:
+        await self._es._wait("indices.get_alias")
+        index = self._es.write_index(name)
+        return {index: {"aliases": {name: {"is_write_index": True}}}}
+
+
+class FakeElasticsearch:
+    """Dictionary-backed async client; raise ``not_found`` for missing documents."""
+
+    def __init__(
+        self,
+        latency: Optional[Latency] = None,
+        not_found: Type[Exception] = KeyError,
+        esql: Optional[Callable[[str, List[Any]], List[Dict[str, Any]]]] = None,
+    ):
+        self.latency = latency or Latency(0.0, 0.0)
+        self.not_found = not_found
+        self.esql = esql
+        self._ids = itertools.count(1)
+        # (write index, id) -> sequence number of the document's last write, for if_seq_no checks
+        self._seq_nos: Dict[Tuple[str, str], int] = {}
+        self._next_seq_no = itertools.count()
+        self.indices = _FakeIndices(self)
+        self.calls: Dict[str, int] = {}
+        # id -> (stored JSON handed out to callers, parsed copy used only for matching and sorting)
+        self._docs: Dict[str, Dict[str, Tuple[bytes, Dict[str, Any]]]] = {}
+        # (index, query, sort) -> matching ids in order; dropped whenever the index is written
+        self._results: Dict[Tuple[str, bytes, bytes], List[str]] = {}
+
+    @staticmethod
+    def write_index(name: str) -> str:
+        return name if name.endswith("-000001") else f"{name}-000001"
+
+    async def _wait(self, operation: str):
+        self.calls[operation] = self.calls.get(operation, 0) + 1
+        delay = self.latency.delay(operation)
+        # A zero delay still yields, like any awaited network call
+        await asyncio.sleep(delay)
+
+    def _store(self, index: str) -> Dict[str, Tuple[bytes, Dict[str, Any]]]:
+        return self._docs.setdefault(self.write_index(index), {})
+
+    def _written(self, index: str):
+        index = self.write_index(index)
+        for key in [key for key in self._results if key[0] == index]:
+            del self._results[key]
+
+    def _matching_ids(self, index: str, query: Optional[Dict[str, Any]], sort: Optional[List[Dict[str, Any]]]):
+        key = (self.write_index(index), dumps(query, sort_keys=True), dumps(sort, sort_keys=True))
+        if key in self._results:
+            return self._results[key]
+
+        store = self._store(index)
+        matched = [doc_id for doc_id, (_, source) in store.items() if _matches(source, doc_id, query)]
+        if sort:
+            field, spec = next(iter(sort[0].items()))
+            descending = (spec.get("order") if isinstance(spec, dict) else spec) == "desc"
+            present = [doc_id for doc_id in matched if store[doc_id][1].get(field) is not None]
+            missing = [doc_id for doc_id in matched if store[doc_id][1].get(field) is None]
+            present.sort(key=lambda doc_id: store[doc_id][1][field], reverse=descending)
+            matched = present + missing
+        self._results[key] = matched
+        return matched
+
+    def seed(self, index: str, documents: Iterable[Dict[str, Any]], id_field: str = "incident_id") -> int:
+        """Load documents without latency; returns how many were stored."""
+        store = self._store(index)
+        count = 0
+        for document in documents:
+            store[document[id_field]] = self._entry(document)
+            self._bump(index, document[id_field])
+            count += 1
+        self._written(index)
+        return count
+
+    def count_documents(self, index: str) -> int:
+        return len(self._store(index))
+
+    def _bump(self, index: str, doc_id: str):
+        self._seq_nos[(self.write_index(index), doc_id)] = next(self._next_seq_no)
+
+    def _hit(self, index: str, doc_id: str, raw: bytes) -> Dict[str, Any]:
+        return {
+            "_index": self.write_index(index),
+            "_id": doc_id,
+            "_seq_no": self._seq_nos.get((self.write_index(index), doc_id), 0),
+            "_primary_term": 1,
+            "_source": loads(raw),
+        }
+
+    @staticmethod
+    def _entry(document: Dict[str, Any]) -> Tuple[bytes, Dict[str, Any]]:
+        raw = dumps(document)
+        return raw, loads(raw)
+
+    async def index(
+        self, index: str, document: Dict[str, Any], id: Optional[str] = None, op_type: Optional[str] = None, **_: Any
+    ) -> Dict[str, Any]:
+        await self._wait("index")
+        store = self._store(index)
+        id = id or f"doc-{next(self._ids)}"
+        if op_type == "create" and id in store:
+            raise ConflictError(f"version conflict, document already exists ({id})")
+        result = "updated" if id in store else "created"
+        store[id] = self._entry(document)
+        self._bump(index, id)
+        self._written(index)
+        return {"_index": self.write_index(index), "_id": id, "result": result}
+
+    async def get(self, index: str, id: str, **_: Any) -> Dict[str, Any]:
+        await self._wait("get")
+        entry = self._store(index).get(id)
+        if entry is None:
+            raise self.not_found(f"{index}/{id} not found")
+        return {**self._hit(index, id, entry[0]), "found": True}
+
+    async def update(
+        self, index: str, id: str, doc: Dict[str, Any], if_seq_no: Optional[int] = None, **_: Any
+    ) -> Dict[str, Any]:
+        await self._wait("update")
+        store = self._store(index)
+        entry = store.get(id)
+        if entry is None:
+            raise self.not_found(f"{index}/{id} not found")
+        if if_seq_no is not None and if_seq_no != self._seq_nos.get((self.write_index(index), id), 0):
+            raise ConflictError(f"version conflict, document {id} changed since seq_no {if_seq_no}")
+        store[id] = self._entry({**entry[1], **doc})
+        self._bump(index, id)
+        self._written(index)
+        return {"_index": self.write_index(index), "_id": id, "result": "updated"}
+
+    async def search(
+        self,
+        index: str,
+        query: Optional[Dict[str, Any]] = None,
+        from_: int = 0,
+        size: int = 10,
+        sort: Optional[List[Dict[str, Any]]] = None,
+        **_: Any,
+    ) -> Dict[str, Any]:
+        await self._wait("search")
+        store = self._store(index)
+        if query and set(query) == {"ids"}:
+            # The gateway's lookup by incident id; a direct read like ES's own ids query
+            matched = [doc_id for doc_id in query["ids"].get("values", []) if doc_id in store]
+        else:
+            matched = self._matching_ids(index, query, sort)
+
+        page = matched[from_:from_ + size]
+        return {
+            "took": 1,
+            "timed_out": False,
+            "hits": {
+                "total": {"value": len(matched), "relation": "eq"},
+                "hits": [self._hit(index, doc_id, store[doc_id][0]) for doc_id in page],
+            },
+            "aggregations": {},
+        }
+
+    async def perform_request(
+        self, method: str, path: str, params: Optional[Dict[str, Any]] = None, body: Any = None, **_: Any
+    ) -> Dict[str, Any]:
+        """The ES|QL endpoints used by shared.esql; async queries complete on submit."""
+        if method == "DELETE" and path.startswith("/_query/async/"):
+            await self._wait("esql.delete")
+            return {}
+        if method != "POST" or path not in ("/_query", "/_query/async"):
+            raise NotImplementedError(f"Unsupported request in fake Elasticsearch: {method} {path}")
+
+        await self._wait("esql")
+        body = body or {}
+        rows = self.esql(body.get("query", ""), body.get("params") or []) if self.esql else []
+        names = list(rows[0]) if rows else []
+        columns = [{"name": name, "type": "keyword"} for name in names]
+        if body.get("columnar"):
+            values = [[row.get(name) for row in rows] for name in names]
+        else:
+            values = [[row.get(name) for name in names] for row in rows]
+        return {"columns": columns, "values": values, "is_running": False}
+
+    async def ping(self, **_: Any) -> bool:
+        await self._wait("ping")
+        return True
+
+    async def close(self):
+        pass
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Gateway cold-start benchmark: eager vs lazy initialization.
+
+Each run starts a fresh interpreter, as a serverless cold start does, imports
+the gateway through the Vercel entry point (api/index.py) and serves requests
+in-process over ASGI:
+
+    import          importing api/index.py (the gateway module and its dependencies)
+    first health    first GET /healthz, which needs no Elasticsearch
+    first data      first GET /api/datapulse/v1/incidents, which creates the ES client
+    warm data       the same request again, reusing the client
+
+ES_HOST points at a closed local port and retries are off, so data requests
+fail fast with a 500 after the client has been built and a connection
+attempted; what is measured
+is the gateway's own start-up work, not Elasticsearch.
+
+Usage:
+    python benchmarks/gateway_cold_start.py
+    python benchmarks/gateway_cold_start.py --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+CHILD = r"""
+import asyncio, json, sys, time
+
+started = time.perf_counter()
+sys.path.insert(0, "api")
+import index
+imported = time.perf_counter()
+
+import httpx
+
+async def main():
+    transport = httpx.ASGITransport(app=index.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://gateway") as client:
+        timings = {}
+        for label, path in (("first_health", "/healthz"),
+                            ("first_data", "/api/datapulse/v1/incidents"),
+                            ("warm_data", "/api/datapulse/v1/incidents")):
+            t = time.perf_counter()
+            await client.get(path)
+            timings[label] = (time.perf_counter() - t) * 1000
+        return timings
+
+timings = asyncio.run(main())
+timings["import"] = (imported - started) * 1000
+print(json.dumps(timings))
+"""
+
+PHASES = ("import", "first_health", "first_data", "warm_data")
+
+
+def run_once(lazy: bool) -> Dict[str, float]:
+    env = dict(
+        os.environ,
+        GATEWAY_LAZY_INIT="true" if lazy else "false",
+        ES_HOST="http://127.0.0.1:9",
+        ES_MAX_RETRIES="0",
+        BOOTSTRAP_INDICES="false",
+        LOGURU_LEVEL="CRITICAL",
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"benchmark child failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(runs: List[Dict[str, float]]) -> Dict[str, float]:
+    summary = {phase: statistics.median(run[phase] for run in runs) for phase in PHASES}
+    summary["cold_total"] = statistics.median(run["import"] + run["first_data"] for run in runs)
+    return summary
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure gateway import and first-request latency")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per mode (default: 5)")
+    args = parser.parse_args()
+
+    results = {}
+    for mode, lazy in (("eager", False), ("lazy", True)):
+        results[mode] = summarize([run_once(lazy) for _ in range(args.runs)])
+
+    print(f"median of {args.runs} cold starts, milliseconds")
+    print(f"{'phase':<14} {'eager':>9} {'lazy':>9} {'change':>8}")
+    for phase in (*PHASES, "cold_total"):
+        eager, lazy = results["eager"][phase], results["lazy"][phase]
+        print(f"{phase:<14} {eager:>9.1f} {lazy:>9.1f} {(lazy - eager) / eager * 100:>7.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,572 @@
+#!/usr/bin/env python3
+"""
+Gateway load benchmark against an in-process Elasticsearch stand-in.
+
+Drives the gateway's hot endpoints at a fixed concurrency with the ASGI app
+called directly in-process and Elasticsearch replaced by
+benchmarks/fake_elasticsearch.py, which adds configurable latency per call:
+
+    create_incident   POST /api/datapulse/v1/incidents
+    list_incidents    GET  /api/datapulse/v1/incidents (filters and pages over a seeded dataset)
+    get_incident      GET  /api/datapulse/v1/incidents/{id}
+    receive_report    POST /agent/report (alternating analyst and resolver reports)
+    approve_action    POST /api/datapulse/v1/incidents/{id}/actions/{action}/approve
+    slack_webhook     POST /api/datapulse/v1/webhook/integrations/slack (signed approve clicks)
+
+A request counts as finished when its last response chunk is sent, as a
+client over HTTP would see it; background work it started (agent triggers,
+Slack interaction workers) keeps running and is reported separately as the
+time to settle after the last response. Agent HTTP calls get an immediate 202,
+the Slack and Jira adapters and the remediation scheduler are disabled, and
+logging is off unless --verbose.
+
+Each scenario runs --repeat times against a fresh fake and every figure is
+the median over the runs. Per scenario it reports requests/sec, latency
+percentiles and Elasticsearch calls per request. Results can be saved as a baseline and later runs compared
+against it; --compare exits with status 1 when p95 latency or throughput
+regress by more than --tolerance. Baselines are only comparable on the same
+machine with the same options.
+
+Usage:
+    python benchmarks/gateway_load.py
+    python benchmarks/gateway_load.py --requests 2000 --concurrency 64 --es-latency-ms 5
+    python benchmarks/gateway_load.py --scenarios list_incidents,slack_webhook --es-op-latency search=8
+    python benchmarks/gateway_load.py --save-baseline
+    python benchmarks/gateway_load.py --compare
+"""
+
+import argparse
+import asyncio
+import gc
+import hashlib
+import hmac
+import importlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.fake_elasticsearch import FakeElasticsearch, Latency  # noqa: E402
+from shared.es_client import ClientSettings, ManagedElasticsearch  # noqa: E402
+from shared.serialization import dumps  # noqa: E402
+
+DEFAULT_BASELINE = REPO_ROOT / "benchmarks" / "baselines" / "gateway_load.json"
+SIGNING_SECRET = "gateway-load-benchmark"
+INCIDENTS = ".incidents-datapulse"
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+SERVICES = ("payments", "checkout", "search", "auth", "inventory", "notifications")
+SEVERITIES = ("critical", "high", "medium", "low")
+
+
+# --- Gateway under test ---
+
+class RecordingScheduler:
+    """Remediation scheduler stand-in: accepts approved actions without running workflows."""
+
+    def __init__(self):
+        self.submitted = 0
+
+    def submit(self, *args: Any, **kwargs: Any) -> bool:
+        self.submitted += 1
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"running": [], "queued": [], "submitted": self.submitted}
+
+
+def load_gateway(verbose: bool = False):
+    """Import the gateway configured for benchmarking, with integrations and agents stubbed out."""
+    os.environ["GATEWAY_LAZY_INIT"] = "true"
+    os.environ["BOOTSTRAP_INDICES"] = "false"
+    os.environ["SLACK_SIGNING_SECRET"] = SIGNING_SECRET
+    os.environ["INDEX_INCIDENTS_ALIAS"] = INCIDENTS
+
+    if not verbose:
+        from loguru import logger
+
+        logger.remove()
+
+    import httpx
+
+    main = importlib.import_module("backend.api_gateway.src.main")
+    main.agent_http = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(202, json={"status": "accepted"}))
+    )
+    main.get_slack_adapter = lambda: None
+    main.get_jira_adapter = lambda: None
+    scheduler = RecordingScheduler()
+    main.get_remediation_scheduler = lambda: scheduler
+    return main
+
+
+def install_fake_es(main, fake: FakeElasticsearch):
+    """Point the gateway at a fresh fake behind the shared client proxy (retries, latency hooks)."""
+    fake.not_found = main.NotFoundError
+    main.es = ManagedElasticsearch(fake, "api-gateway", ClientSettings(slow_request_ms=0))
+    main._incident_indices.clear()
+
+
+class ASGIDriver:
+    """Calls the ASGI app directly; a request completes when its final body chunk is sent."""
+
+    def __init__(self, app):
+        self.app = app
+        self._running: set = set()
+
+    async def request(
+        self, method: str, path: str, body: bytes = b"", headers: Sequence[Tuple[bytes, bytes]] = ()
+    ) -> Tuple[int, bytes]:
+        responded = asyncio.get_running_loop().create_future()
+        status = 0
+        chunks: List[bytes] = []
+        path, _, query = path.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [(b"host", b"gateway"), (b"content-length", str(len(body)).encode()), *headers],
+            "client": ("127.0.0.1", 40000),
+            "server": ("gateway", 80),
+        }
+        delivered = False
+
+        async def receive():
+            nonlocal delivered
+            if not delivered:
+                delivered = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await responded
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body") and not responded.done():
+                    responded.set_result(None)
+
+        task = asyncio.create_task(self.app(scope, receive, send))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+        await asyncio.wait({task, responded}, return_when=asyncio.FIRST_COMPLETED)
+        if not responded.done():
+            task.result()  # re-raises what the app raised
+            raise RuntimeError(f"{method} {path} finished without a response")
+        return status, b"".join(chunks)
+
+    async def settle(self):
+        """Wait for background tasks still running inside requests that already responded."""
+        await asyncio.gather(*list(self._running), return_exceptions=True)
+
+
+# --- Workload ---
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    body: bytes = b""
+    headers: Sequence[Tuple[bytes, bytes]] = ()
+    expect: int = 200
+
+
+def json_request(method: str, path: str, payload: Any, expect: int = 200) -> Request:
+    return Request(method, path, dumps(payload), ((b"content-type", b"application/json"),), expect)
+
+
+def incident_document(n: int, actions: int = 0) -> Dict[str, Any]:
+    created = (START + timedelta(seconds=n)).isoformat()
+    incident_id = f"INC-B{n:07d}"
+    doc = {
+        "incident_id": incident_id,
+        "source": "sentinel",
+        "service": SERVICES[n % len(SERVICES)],
+        "severity": SEVERITIES[n % len(SEVERITIES)],
+        "status": "open" if n % 5 else "resolved",
+        "detected_at": created,
+        "created_at": created,
+        "correlation_id": f"bench-{n}",
+        "metrics": {"error_rate": 0.42, "p99_latency_ms": 1850.0},
+        "evidence": [{"type": "log", "text": f"upstream timeout calling payments-db (attempt {i})"} for i in range(3)],
+        "timeline": [{"timestamp": created, "event": "Incident Detected by Sentinel"}],
+    }
+    if actions:
+        doc["actions"] = [
+            {
+                "action_id": f"ACT-{k:03d}",
+                "incident_id": incident_id,
+                "state": "proposed",
+                "title": "Roll back the latest deployment",
+                "action_type": "rollback",
+                "requires_approval": True,
+                "risk_score": 0.6,
+            }
+            for k in range(1, actions + 1)
+        ]
+        doc["action_history"] = []
+    return doc
+
+
+def create_incident(fake: FakeElasticsearch, count: int, dataset: int) -> List[Request]:
+    return [
+        json_request("POST", "/api/datapulse/v1/incidents", {
+            "source": "sentinel",
+            "service": SERVICES[n % len(SERVICES)],
+            "detected_at": (START + timedelta(seconds=n)).isoformat(),
+            "severity": SEVERITIES[n % len(SEVERITIES)],
+            "metrics": {"error_rate": 0.42, "p99_latency_ms": 1850.0},
+            "evidence": [{"type": "log", "text": "upstream timeout calling payments-db"}] * 3,
+            "correlation_id": f"bench-{n}",
+        }, expect=201)
+        for n in range(count)
+    ]
+
+
+def list_incidents(fake: FakeElasticsearch, count: int, dataset: int) -> List[Request]:
+    fake.seed(INCIDENTS, (incident_document(n) for n in range(dataset)))
+    queries = ["", "&severity=critical", "&status=open", "&severity=high&status=open", "&sort_order=asc"]
+    pages = max(1, min(5, dataset // 20))
+    return [
+        Request("GET", f"/api/datapulse/v1/incidents?page={n % pages + 1}&page_size=20{queries[n % len(queries)]}")
+        for n in range(count)
+    ]
+
+
+def get_incident(fake: FakeElasticsearch, count: int, dataset: int) -> List[Request]:
+    fake.seed(INCIDENTS, (incident_document(n, actions=2) for n in range(dataset)))
+    return [Request("GET", f"/api/datapulse/v1/incidents/INC-B{n % dataset:07d}") for n in range(count)]
+
+
+def receive_report(fake: FakeElasticsearch, count: int, dataset: int) -> List[Request]:
+    fake.seed(INCIDENTS, (incident_document(n) for n in range(count)))
+    requests = []
+    for n in range(count):
+        incident_id = f"INC-B{n:07d}"
+        if n % 2 == 0:
+            report = {
+                "incident_id": incident_id,
+                "agent": "analyst",
+                "rcca": {
+                    "root_cause": "Connection pool exhaustion after deploy v2.4.1",
+                    "confidence": 0.91,
+                    "full_analysis": "The error rate rose within two minutes of the rollout. " * 20,
+                    "evidence": [{"type": "tool_result", "tool_id": "custom.error_spike_by_deploy"}] * 5,
+                },
+            }
+        else:
+            report = {
+                "incident_id": incident_id,
+                "agent": "resolver",
+                "proposals": [
+                    {"action_id": f"ACT-{k:03d}", "title": "Roll back payments-api", "action_type": "rollback",
+                     "requires_approval": True, "risk_score": 0.6}
+                    for k in range(1, 4)
+                ],
+            }
+        requests.append(json_request("POST", "/agent/report", report))
+    return requests
+
+
+def approve_action(fake: FakeElasticsearch, count: int, dataset: int) -> List[Request]:
+    # Every approval needs an action still in the proposed state
+    fake.seed(INCIDENTS, (incident_document(n, actions=1) for n in range(count)))
+    return [
+        json_request(
+            "POST",
+            f"/api/datapulse/v1/incidents/INC-B{n:07d}/actions/ACT-001/approve",
+            {"actor": "oncall", "source": "ui"},
+        )
+        for n in range(count)
+    ]
+
+
+def slack_request(payload: Dict[str, Any]) -> Request:
+    body = urlencode({"payload": json.dumps(payload)}).encode()
+    timestamp = str(int(time.time()))
+    digest = hmac.new(SIGNING_SECRET.encode(), f"v0:{timestamp}:".encode() + body, hashlib.sha256).hexdigest()
+    return Request("POST", "/api/datapulse/v1/webhook/integrations/slack", body, (
+        (b"content-type", b"application/x-www-form-urlencoded"),
+        (b"x-slack-request-timestamp", timestamp.encode()),
+        (b"x-slack-signature", f"v0={digest}".encode()),
+    ))
+
+
+def slack_webhook(fake: FakeElasticsearch, count: int, dataset: int) -> List[Request]:
+    fake.seed(INCIDENTS, (incident_document(n, actions=1) for n in range(count)))
+    return [
+        slack_request({
+            "type": "block_actions",
+            "user": {"id": f"U{n % 40:03d}", "username": "oncall"},
+            "trigger_id": f"T-{n}",
+            "actions": [{
+                "action_id": "approve_action",
+                "value": f"approve|INC-B{n:07d}|ACT-001",
+                "action_ts": f"{1767225600 + n}.000100",
+            }],
+        })
+        for n in range(count)
+    ]
+
+
+SCENARIOS: Dict[str, Callable[[FakeElasticsearch, int, int], List[Request]]] = {
+    "create_incident": create_incident,
+    "list_incidents": list_incidents,
+    "get_incident": get_incident,
+    "receive_report": receive_report,
+    "approve_action": approve_action,
+    "slack_webhook": slack_webhook,
+}
+
+
+# --- Measurement ---
+
+@dataclass
+class ScenarioResult:
+    latencies: List[float] = field(default_factory=list)
+    errors: Dict[str, int] = field(default_factory=dict)
+    wall: float = 0.0
+    settle: float = 0.0
+    es_calls: int = 0
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        count = len(ordered)
+        return {
+            "requests": count,
+            "errors": sum(self.errors.values()),
+            "error_statuses": dict(self.errors),
+            "rps": count / self.wall if self.wall else 0.0,
+            "mean_ms": statistics.fmean(ordered) * 1000 if ordered else 0.0,
+            "p50_ms": percentile(ordered, 50) * 1000,
+            "p95_ms": percentile(ordered, 95) * 1000,
+            "p99_ms": percentile(ordered, 99) * 1000,
+            "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+            "settle_ms": self.settle * 1000,
+            "es_calls_per_request": self.es_calls / count if count else 0.0,
+        }
+
+
+def median_summary(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Median of every figure over repeated runs; errors are totalled instead."""
+    merged = {key: statistics.median(run[key] for run in runs) for key in runs[0] if key != "error_statuses"}
+    merged["requests"] = sum(run["requests"] for run in runs)
+    merged["errors"] = sum(run["errors"] for run in runs)
+    merged["error_statuses"] = {}
+    for run in runs:
+        for status, count in run["error_statuses"].items():
+            merged["error_statuses"][status] = merged["error_statuses"].get(status, 0) + count
+    return merged
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+async def drive(driver: ASGIDriver, requests: List[Request], concurrency: int, result: Optional[ScenarioResult]):
+    pending = iter(requests)
+
+    async def worker():
+        for request in pending:
+            started = time.perf_counter()
+            status, _ = await driver.request(request.method, request.path, request.body, request.headers)
+            if result is None:
+                continue
+            result.latencies.append(time.perf_counter() - started)
+            if status != request.expect:
+                result.errors[str(status)] = result.errors.get(str(status), 0) + 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def settle(main, driver: ASGIDriver):
+    await driver.settle()
+    if main._slack_interactions is not None:
+        await main._slack_interactions.drain()
+
+
+async def run_scenario(main, name: str, args: argparse.Namespace) -> Dict[str, Any]:
+    fake = FakeElasticsearch(Latency(args.es_latency_ms, args.es_jitter_ms, args.es_op_latency, seed=args.seed))
+    install_fake_es(main, fake)
+    requests = SCENARIOS[name](fake, args.warmup + args.requests, args.dataset)
+    driver = ASGIDriver(main.app)
+
+    await drive(driver, requests[:args.warmup], args.concurrency, None)
+    await settle(main, driver)
+
+    result = ScenarioResult()
+    fake.calls.clear()
+    gc.collect()
+    started = time.perf_counter()
+    await drive(driver, requests[args.warmup:], args.concurrency, result)
+    responded = time.perf_counter()
+    await settle(main, driver)
+    result.wall = responded - started
+    result.settle = time.perf_counter() - responded
+    result.es_calls = sum(fake.calls.values())
+    if main._slack_interactions is not None:
+        # Start the next run with empty de-duplication state; it replays the same interactions
+        await main._slack_interactions.aclose()
+        main._slack_interactions = None
+    return result.summary()
+
+
+async def run(args: argparse.Namespace, names: List[str]) -> Dict[str, Dict[str, Any]]:
+    main = load_gateway(args.verbose)
+    results = {}
+    try:
+        for name in names:
+            runs = [await run_scenario(main, name, args) for _ in range(args.repeat)]
+            results[name] = median_summary(runs)
+    finally:
+        if main._slack_interactions is not None:
+            await main._slack_interactions.aclose()
+        await main.agent_http.aclose()
+    return results
+
+
+# --- Reporting and baselines ---
+
+def run_config(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "dataset": args.dataset,
+        "warmup": args.warmup,
+        "repeat": args.repeat,
+        "es_latency": Latency(args.es_latency_ms, args.es_jitter_ms, args.es_op_latency).describe(),
+    }
+
+
+def print_results(results: Dict[str, Dict[str, Any]]):
+    print(f"{'scenario':<16} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+          f"{'settle ms':>10} {'es/req':>7} {'errors':>7}")
+    for name, row in results.items():
+        print(f"{name:<16} {row['rps']:>9.1f} {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f} "
+              f"{row['max_ms']:>8.2f} {row['settle_ms']:>10.1f} {row['es_calls_per_request']:>7.2f} {row['errors']:>7}")
+        if row["errors"]:
+            print(f"{'':<16} unexpected statuses: {row['error_statuses']}")
+
+
+def save_baseline(path: Path, config: Dict[str, Any], results: Dict[str, Dict[str, Any]]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    baseline = {
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "config": config,
+        "results": results,
+    }
+    path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+    print(f"\nBaseline saved to {path}")
+
+
+def compare_baseline(path: Path, config: Dict[str, Any], results: Dict[str, Dict[str, Any]], tolerance: float) -> bool:
+    """Print the change against a saved baseline; False if any scenario regressed beyond tolerance."""
+    baseline = json.loads(path.read_text())
+    print(f"\nCompared with {path} (recorded {baseline.get('recorded_at', 'unknown')})")
+    if baseline.get("config") != config:
+        print("[WARN] Baseline was recorded with different options; the comparison is not like for like")
+
+    ok = True
+    print(f"{'scenario':<16} {'req/s':>16} {'p95 ms':>18} {'verdict':>10}")
+    for name, row in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            print(f"{name:<16} {'(not in baseline)':>16}")
+            continue
+        rps_change = row["rps"] / before["rps"] - 1 if before["rps"] else 0.0
+        p95_change = row["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        regressed = rps_change < -tolerance or p95_change > tolerance or row["errors"] > before["errors"]
+        ok = ok and not regressed
+        print(f"{name:<16} {row['rps']:>8.1f} ({rps_change:>+5.0%}) {row['p95_ms']:>9.2f} ({p95_change:>+5.0%}) "
+              f"{'REGRESSED' if regressed else 'ok':>10}")
+    return ok
+
+
+def parse_op_latency(values: List[str]) -> Dict[str, float]:
+    overrides = {}
+    for value in values:
+        operation, _, millis = value.partition("=")
+        if not millis:
+            raise argparse.ArgumentTypeError(f"expected OPERATION=MS, got {value!r}")
+        overrides[operation] = float(millis)
+    return overrides
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load-test gateway endpoints against a fake Elasticsearch")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--requests", type=int, default=1000, help="measured requests per scenario (default: 1000)")
+    parser.add_argument("--concurrency", type=int, default=32, help="requests in flight (default: 32)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario, medians reported (default: 3)")
+    parser.add_argument("--warmup", type=int, default=50, help="unmeasured requests per scenario (default: 50)")
+    parser.add_argument("--dataset", type=int, default=1000, help="incidents seeded for read scenarios (default: 1000)")
+    parser.add_argument("--es-latency-ms", type=float, default=2.0, help="fake ES latency per call (default: 2.0)")
+    parser.add_argument("--es-jitter-ms", type=float, default=1.0, help="uniform +/- jitter on it (default: 1.0)")
+    parser.add_argument("--es-op-latency", action="append", default=[], metavar="OPERATION=MS",
+                        help="latency for one operation, e.g. search=8 (repeatable)")
+    parser.add_argument("--seed", type=int, default=0, help="jitter random seed (default: 0)")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, type=Path, metavar="PATH",
+                        help=f"write results as a baseline (default path: {DEFAULT_BASELINE.relative_to(REPO_ROOT)})")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, type=Path, metavar="PATH",
+                        help="compare with a saved baseline and exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed p95 increase / throughput drop before --compare fails (default: 0.25)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON instead of a table")
+    parser.add_argument("--verbose", action="store_true", help="keep gateway logging on")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    try:
+        args.es_op_latency = parse_op_latency(args.es_op_latency)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    results = asyncio.run(run(args, names))
+    config = run_config(args)
+    if args.json:
+        print(json.dumps({"config": config, "results": results}, indent=2))
+    else:
+        print(f"{args.repeat} x {args.requests} requests per scenario, concurrency {args.concurrency}, "
+              f"fake ES {args.es_latency_ms}±{args.es_jitter_ms} ms per call")
+        print_results(results)
+
+    if args.save_baseline:
+        save_baseline(args.save_baseline, config, results)
+    if args.compare:
+        if not args.compare.exists():
+            print(f"[ERROR] No baseline at {args.compare}; record one with --save-baseline")
+            return 2
+        if not compare_baseline(args.compare, config, results, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
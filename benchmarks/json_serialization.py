@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+JSON serialization benchmark: stdlib json vs the shared encoder (orjson).
+
+Times the encode/decode paths that large documents take through the system
+on realistic payloads: an incident with a full analyst report and actions, a
+saved Agent Builder conversation, and a page of the incident list. For each
+payload it compares
+
+    encode       json.dumps(default=str)          vs shared.serialization.dumps
+    decode       json.loads                       vs shared.serialization.loads
+    es-request   the client's default serializer  vs use_fast_json serializers
+    api-response jsonable_encoder + JSONResponse  vs FastJSONResponse
+
+Usage:
+    python benchmarks/json_serialization.py
+    python benchmarks/json_serialization.py --repeat 7 --evidence 200
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import timeit
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from shared import serialization  # noqa: E402
+from shared.serialization import dumps, es_serializers, loads  # noqa: E402
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def incident_document(n: int, evidence: int) -> Dict[str, Any]:
+    detected = START + timedelta(minutes=n)
+    return {
+        "incident_id": f"INC-{n:08X}",
+        "service": f"service-{n % 12}",
+        "severity": ("critical", "high", "medium")[n % 3],
+        "status": "open",
+        "created_at": detected.isoformat(),
+        "metrics": {"error_rate": 0.42, "p99_latency_ms": 1850.5, "throughput_rpm": 12400},
+        "evidence": [
+            {"type": "log", "text": f"upstream timeout calling payments-db after 30000ms (attempt {i})"}
+            for i in range(5)
+        ],
+        "analyst_report": {
+            "root_cause": "Connection pool exhaustion after deploy v2.4.1 " * 8,
+            "full_analysis": "The error rate rose within two minutes of the rollout. " * 80,
+            "confidence": 0.91,
+            "tool_calls_count": 6,
+            "evidence": [
+                {
+                    "type": "tool_result",
+                    "tool_id": "custom.error_spike_by_deploy",
+                    "execution_time_ms": 140 + i,
+                    "snippet": json.dumps({"service": f"service-{n % 12}", "errors": i * 7, "version": "v2.4.1"}),
+                }
+                for i in range(evidence)
+            ],
+            "timestamp": (detected + timedelta(seconds=95)).isoformat(),
+        },
+        "actions": [
+            {
+                "action_id": f"ACT-{n:04X}{i:02d}",
+                "title": "Roll back payments-api to v2.4.0",
+                "state": "proposed",
+                "requires_approval": True,
+                "risk": "medium",
+                "parameters": {"deployment": "payments-api", "target_version": "v2.4.0", "replicas": 6},
+            }
+            for i in range(4)
+        ],
+        "action_history": [
+            {"action_id": f"ACT-{n:04X}00", "from_state": "proposed", "to_state": "approved",
+             "actor": "oncall", "timestamp": (detected + timedelta(minutes=4)).isoformat()}
+        ],
+    }
+
+
+def conversation_document(steps: int) -> Dict[str, Any]:
+    return {
+        "conversation_id": "conv-INC-00000001",
+        "agent_id": "incident-investigator",
+        "incident_id": "INC-00000001",
+        "rounds": [{
+            "round_number": 1,
+            "input": {"message": "Investigate incident INC-00000001 for service 'payments'", "timestamp": START},
+            "steps": [
+                {
+                    "step_number": i,
+                    "type": "tool_call",
+                    "tool_id": "custom.logs_around_detection",
+                    "params": {"service": "payments", "window": "15m"},
+                    "timestamp": START + timedelta(seconds=i),
+                    "execution_time_ms": 120,
+                    "results": [
+                        {"@timestamp": (START + timedelta(seconds=r)).isoformat(), "level": "error",
+                         "message": "upstream connect error or disconnect/reset before headers", "count": r}
+                        for r in range(25)
+                    ],
+                }
+                for i in range(steps)
+            ],
+            "response": {"message": "Root cause: connection pool exhaustion. " * 40, "confidence": 0.91},
+        }],
+        "created_at": START,
+        "completed_at": START + timedelta(minutes=2),
+    }
+
+
+def payloads(evidence: int, steps: int) -> List[Tuple[str, Any]]:
+    incident = incident_document(1, evidence)
+    page = {"page": 1, "page_size": 50, "total": 1200,
+            "records": [incident_document(n, evidence // 4) for n in range(50)]}
+    return [
+        ("incident", incident),
+        ("conversation", conversation_document(steps)),
+        ("incident list (50)", page),
+    ]
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    """Best per-call time in microseconds."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def run(repeat: int, evidence: int, steps: int) -> List[Dict[str, Any]]:
+    from elasticsearch.serializer import JsonSerializer
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from shared.serialization import FastJSONResponse
+
+    stdlib_es = JsonSerializer()
+    fast_es = es_serializers()[JsonSerializer.mimetype]
+
+    rows = []
+    for name, doc in payloads(evidence, steps):
+        encoded = json.dumps(doc, default=str).encode()
+        # Responses and Elasticsearch only ever see plain JSON types
+        plain = json.loads(encoded)
+        cases = [
+            ("encode", lambda: json.dumps(doc, default=str), lambda: dumps(doc)),
+            ("decode", lambda: json.loads(encoded), lambda: loads(encoded)),
+            ("es-request", lambda: stdlib_es.dumps(plain), lambda: fast_es.dumps(plain)),
+            ("api-response", lambda: JSONResponse(jsonable_encoder(plain)).body, lambda: FastJSONResponse(plain).body),
+        ]
+        for path, before, after in cases:
+            before_us = best_of(before, repeat)
+            after_us = best_of(after, repeat)
+            rows.append({
+                "payload": name,
+                "bytes": len(encoded),
+                "path": path,
+                "before_us": before_us,
+                "after_us": after_us,
+                "speedup": before_us / after_us,
+            })
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare stdlib JSON with the shared fast encoder")
+    parser.add_argument("--repeat", type=int, default=5, help="timing rounds per case, best is kept (default: 5)")
+    parser.add_argument("--evidence", type=int, default=60, help="evidence items per analyst report (default: 60)")
+    parser.add_argument("--steps", type=int, default=20, help="tool-call steps per conversation (default: 20)")
+    args = parser.parse_args()
+
+    if serialization.orjson is None:
+        print("[WARN] orjson is not installed; the shared encoder is using the standard library")
+
+    rows = run(args.repeat, args.evidence, args.steps)
+    print(f"{'payload':<20} {'bytes':>9} {'path':<13} {'stdlib us':>11} {'fast us':>10} {'speedup':>8}")
+    for row in rows:
+        print(f"{row['payload']:<20} {row['bytes']:>9} {row['path']:<13} "
+              f"{row['before_us']:>11.1f} {row['after_us']:>10.1f} {row['speedup']:>7.1f}x")
+    print(f"\ngeometric mean speedup: {statistics.geometric_mean(r['speedup'] for r in rows):.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""
+Local stand-ins for the pipeline's external services, for benchmarks.
+
+``AgentBuilderStub`` serves the Agent Builder converse endpoint
+(``POST /api/agent_builder/converse/async``) as server-sent events. What it
+streams comes from a provider given the request payload, returning
+``(delay_seconds, event, data)`` steps; ``scripted_conversation`` builds
+them from canned investigations paced like a model run (time to first
+event, tool latency, token streaming), so the Analyst sees realistic
+conversation shapes without Kibana. ``recorded_provider`` serves
+conversations captured by the Analyst's recording mode instead (see
+agents/analyst/src/conversation_recording.py), data lines byte for byte.
+
+``IntegrationSink`` answers the Slack Web API / webhook and Jira REST calls
+the adapters make with success responses, after an optional delay, and
+records when each request arrived and which incidents it mentioned.
+"""
+import asyncio
+import itertools
+import re
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from agents.analyst.src.conversation_recording import Recording, RecordingLibrary
+from shared.serialization import dumps_str, loads
+
+INCIDENT_ID = re.compile(r"INC-[0-9A-Z]+")
+
+# data is a dict to serialize, or an already serialized SSE data line
+Step = Tuple[float, str, Any]
+StreamProvider = Callable[[Dict[str, Any]], List[Step]]
+
+
+# --- Agent Builder ---
+
+CONVERSATIONS: Dict[str, Dict[str, Any]] = {
+    "deploy_regression": {
+        "confidence": 0.91,
+        "tools": [
+            ("check_recent_deployments", {"window": "1h"}, [
+                {"service": "{service}", "version": "v2.4.1", "deployed_at": "10 minutes before detection"},
+                {"service": "{service}", "version": "v2.4.0", "deployed_at": "3 days before detection"},
+            ]),
+            ("correlate_error_logs", {"window": "15m"}, [
+                {"message": "NullPointerException in CheckoutHandler.apply", "count": 1843, "version": "v2.4.1"},
+                {"message": "upstream returned 500", "count": 912, "version": "v2.4.1"},
+            ]),
+        ],
+        "analysis": (
+            "Root cause: the deploy of {service} v2.4.1 introduced a regression. Errors start within two "
+            "minutes of the rollout and are confined to pods running the new version, while v2.4.0 pods "
+            "stay healthy. Recommended: roll back to v2.4.0 and add a canary gate for this handler."
+        ),
+    },
+    "connection_pool": {
+        "confidence": 0.84,
+        "tools": [
+            ("correlate_error_logs", {"window": "15m"}, [
+                {"message": "timeout acquiring connection from pool after 30000ms", "count": 2210},
+                {"message": "database connection refused", "count": 118},
+            ]),
+            ("detect_anomalies", {"time_window": "15m"}, [
+                {"metric": "db.pool.active", "value": 50, "limit": 50},
+                {"metric": "p99_latency_ms", "value": 4810},
+            ]),
+            ("check_recent_deployments", {"window": "6h"}, []),
+        ],
+        "analysis": (
+            "Root cause: {service} exhausted its database connection pool. Every connection is in use, "
+            "requests wait for the 30s acquire timeout and fail, and no deployment happened in the window. "
+            "Recommended: raise the pool size and look for long-running transactions holding connections."
+        ),
+    },
+    "traffic_spike": {
+        "confidence": 0.77,
+        "tools": [
+            ("detect_anomalies", {"time_window": "15m"}, [
+                {"metric": "cpu.utilization", "value": 0.97},
+                {"metric": "requests_per_second", "value": 5400, "baseline": 1800},
+            ]),
+        ],
+        "analysis": (
+            "Root cause: a traffic spike saturated {service}. CPU load sits at 97% with three times the "
+            "usual request rate and latency follows the load curve. Recommended: scale out and review "
+            "autoscaling thresholds."
+        ),
+    },
+}
+
+
+@dataclass
+class Pacing:
+    """Delays of a scripted conversation, in seconds; speed divides all of them."""
+
+    first_event: float = 0.4
+    step: float = 0.15
+    tool: float = 0.25
+    chunk: float = 0.02
+    chunk_chars: int = 40
+    speed: float = 1.0
+
+
+def scripted_conversation(name: str, incident_id: str, service: str, pacing: Pacing) -> List[Step]:
+    script = CONVERSATIONS[name]
+    scale = 1.0 / pacing.speed
+    steps: List[Step] = [(pacing.first_event * scale, "reasoning", {
+        "reasoning": f"Investigating {incident_id}: checking deployments, error logs and metrics for {service}."
+    })]
+    for tool_id, params, results in script["tools"]:
+        steps.append((pacing.step * scale, "tool_call", {
+            "tool_id": f"custom.{tool_id}", "params": {"service": service, **params},
+        }))
+        rows = [{key: str(value).format(service=service) for key, value in row.items()} for row in results]
+        steps.append((pacing.tool * scale, "tool_result", {
+            "results": rows, "execution_time_ms": int(pacing.tool * 1000),
+        }))
+        steps.append((pacing.step * scale, "reasoning", {"reasoning": f"{tool_id} returned {len(rows)} rows."}))
+
+    analysis = script["analysis"].format(service=service)
+    for start in range(0, len(analysis), pacing.chunk_chars):
+        steps.append((pacing.chunk * scale, "message_chunk", {"text_chunk": analysis[start:start + pacing.chunk_chars]}))
+    steps.append((pacing.chunk * scale, "round_complete", {"round": {"confidence": script["confidence"]}}))
+    return steps
+
+
+def scripted_provider(pacing: Pacing) -> StreamProvider:
+    """Pick a canned investigation per incident (stable for a given id) and pace it."""
+    names = sorted(CONVERSATIONS)
+
+    def provide(payload: Dict[str, Any]) -> List[Step]:
+        incident_id = payload.get("context", {}).get("incident_id") or "INC-UNKNOWN"
+        match = re.search(r"service '([^']+)'", payload.get("input", ""))
+        name = names[zlib.crc32(incident_id.encode()) % len(names)]
+        return scripted_conversation(name, incident_id, match.group(1) if match else "unknown", pacing)
+
+    return provide
+
+
+def recorded_steps(recording: Recording, speed: float = 1.0) -> List[Step]:
+    """The recorded events with their original gaps divided by ``speed`` (0: no delays)."""
+    steps: List[Step] = []
+    event, previous = None, 0.0
+    for offset, line in recording.lines:
+        line = line.strip()
+        if line.startswith("event:"):
+            event = line.split(":", 1)[1].strip()
+        elif line.startswith("data:"):
+            delay = (offset - previous) / speed if speed > 0 else 0.0
+            steps.append((delay, event, line.split(":", 1)[1].strip()))
+            previous = offset
+    return steps
+
+
+def recorded_provider(directory: Path, speed: float = 1.0) -> StreamProvider:
+    """Serve recordings: the incident's own when there is one, otherwise the next in the directory."""
+    library = RecordingLibrary(directory)
+    library.paths()  # fail at startup, not on the first conversation, when there is nothing to replay
+
+    def provide(payload: Dict[str, Any]) -> List[Step]:
+        incident_id = payload.get("context", {}).get("incident_id") or "INC-UNKNOWN"
+        return recorded_steps(library.for_incident(incident_id), speed)
+
+    return provide
+
+
+def to_sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {data if isinstance(data, str) else dumps_str(data)}\n\n"
+
+
+class AgentBuilderStub:
+    """Converse endpoint streaming whatever the provider returns; records start/end per incident."""
+
+    def __init__(self, provider: StreamProvider):
+        self.provider = provider
+        self.started: Dict[str, float] = {}
+        self.finished: Dict[str, float] = {}
+        self.app = FastAPI(title="Agent Builder stand-in")
+        self.app.add_api_route("/api/agent_builder/converse/async", self.converse, methods=["POST"])
+
+    async def converse(self, request: Request):
+        payload = loads(await request.body())
+        incident_id = payload.get("context", {}).get("incident_id") or payload.get("conversation_id", "")
+        self.started.setdefault(incident_id, time.time())
+        steps = self.provider(payload)
+
+        async def stream():
+            for delay, event, data in steps:
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                yield to_sse(event, data)
+            self.finished[incident_id] = time.time()
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+# --- Slack and Jira ---
+
+@dataclass
+class SinkRequest:
+    received_at: float
+    kind: str
+    incident_ids: List[str] = field(default_factory=list)
+
+
+class IntegrationSink:
+    """Accepts Slack (``kind="slack"``) or Jira (``kind="jira"``) API calls and records them."""
+
+    def __init__(self, kind: str, latency: float = 0.0):
+        self.kind = kind
+        self.latency = latency
+        self.requests: List[SinkRequest] = []
+        self._ids = itertools.count(1)
+        self.app = FastAPI(title=f"{kind} sink")
+        self.app.add_api_route("/{path:path}", self.handle, methods=["POST", "PUT", "GET"])
+
+    def first(self, kind: str) -> Dict[str, float]:
+        """Arrival time of the first request of this kind per incident id."""
+        times: Dict[str, float] = {}
+        for request in self.requests:
+            if request.kind == kind:
+                for incident_id in request.incident_ids:
+                    times.setdefault(incident_id, request.received_at)
+        return times
+
+    async def handle(self, path: str, request: Request) -> Response:
+        received_at = time.time()
+        body = (await request.body()).decode("utf-8", errors="replace")
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        kind, response = self._slack(path, body) if self.kind == "slack" else self._jira(request.method, path, body)
+        self.requests.append(SinkRequest(received_at, kind, sorted(set(INCIDENT_ID.findall(body)))))
+        return response
+
+    def _slack(self, path: str, body: str) -> Tuple[str, Response]:
+        if path.endswith("chat.postMessage"):
+            kind = "approval_request" if "approve|" in body else "message"
+            channel = (loads(body) if body else {}).get("channel", "C0LOCAL")
+            return kind, JSONResponse({"ok": True, "channel": channel, "ts": f"{int(time.time())}.{next(self._ids):06d}"})
+        if path.endswith("chat.update"):
+            return "update", JSONResponse({"ok": True})
+        # Incoming webhook
+        return "approval_request" if "approve|" in body else "message", Response("ok")
+
+    def _jira(self, method: str, path: str, body: str) -> Tuple[str, Response]:
+        if method == "POST" and path.endswith("issue/bulk"):
+            count = len((loads(body) if body else {}).get("issueUpdates", []))
+            issues = [self._issue() for _ in range(count)]
+            return "ticket", JSONResponse({"issues": issues, "errors": []}, status_code=201)
+        if method == "POST" and path.endswith("/issue"):
+            return "ticket", JSONResponse(self._issue(), status_code=201)
+        if path.endswith("/comment"):
+            return "comment", JSONResponse({"id": str(next(self._ids))}, status_code=201)
+        return "update", Response(status_code=204)
+
+    def _issue(self) -> Dict[str, str]:
+        number = next(self._ids)
+        return {"id": str(10000 + number), "key": f"OPS-{number}"}
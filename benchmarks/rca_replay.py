@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Offline replay of recorded Agent Builder conversations through the Analyst.
+
+Runs ``run_rca_investigation`` once per recording (captured with
+AGENT_BUILDER_RECORD_DIR, see agents/analyst/src/conversation_recording.py)
+with the Agent Builder client in replay mode, the in-process fake
+Elasticsearch and a mock gateway transport that accepts the thought relay
+and the final report. Nothing leaves the process, so the same real payloads
+can be replayed as often as needed:
+
+    investigation   the whole run_rca_investigation, stream included
+    extract         extract_rcca_from_response on the rounds that investigation built,
+                    repeated --extract-repeat times per recording
+
+``--speed 0`` (the default) replays without the recorded delays, which is
+what profiling wants; ``--speed 1`` keeps the original pacing. ``--profile``
+runs everything under cProfile and prints the top functions.
+
+Usage:
+    python benchmarks/rca_replay.py recordings/
+    python benchmarks/rca_replay.py recordings/ --repeat 20 --json
+    python benchmarks/rca_replay.py recordings/ --profile --top 30 --profile-out rca.prof
+"""
+
+import argparse
+import asyncio
+import cProfile
+import json
+import os
+import pstats
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+import httpx  # noqa: E402
+
+from benchmarks.fake_elasticsearch import FakeElasticsearch  # noqa: E402
+from benchmarks.gateway_load import percentile  # noqa: E402
+from shared.serialization import loads  # noqa: E402
+
+SERVICE = re.compile(r"service '([^']+)'")
+
+
+class GatewayStandIn:
+    """Mock transport for the Analyst's gateway calls; keeps the reports it receives."""
+
+    def __init__(self):
+        self.reports: Dict[str, Dict[str, Any]] = {}
+        self.event_batches = 0
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/agent/report":
+            report = loads(request.content)
+            self.reports[report["incident_id"]] = report["rcca"]
+            return httpx.Response(200, json={"status": "ok"})
+        if request.url.path == "/agent/events":
+            self.event_batches += 1
+            return httpx.Response(202, json={"accepted": True})
+        return httpx.Response(404)
+
+
+def load_analyst(recordings: Path, speed: float, gateway: GatewayStandIn):
+    """Import the correlator in replay mode, with its gateway calls going to the stand-in."""
+    os.environ.update({
+        "AGENT_BUILDER_REPLAY_DIR": str(recordings),
+        "AGENT_BUILDER_REPLAY_SPEED": str(speed),
+        "GATEWAY_URL": "http://gateway.local",
+        "ES_HOST": "http://127.0.0.1:9",  # never contacted, replaced by the fake below
+    })
+    real_client = httpx.AsyncClient
+
+    def client(*args, **kwargs):
+        kwargs["transport"] = httpx.MockTransport(gateway.handle)
+        return real_client(*args, **kwargs)
+
+    httpx.AsyncClient = client
+
+    from agents.analyst.src import correlator
+
+    correlator.es = FakeElasticsearch()
+    return correlator
+
+
+async def replay(correlator, recordings: List, repeat: int) -> Dict[str, Any]:
+    rounds_by_incident: Dict[str, tuple] = {}
+    original_extract = correlator.extract_rcca_from_response
+
+    def capture(message, confidence, rounds):
+        rounds_by_incident[current] = (message, confidence, rounds)
+        return original_extract(message, confidence, rounds)
+
+    correlator.extract_rcca_from_response = capture
+    durations: Dict[str, List[float]] = {}
+    try:
+        for _ in range(repeat):
+            for recording in recordings:
+                current = recording.incident_id
+                match = SERVICE.search(recording.header.get("input") or "")
+                started = time.perf_counter()
+                await correlator.run_rca_investigation(
+                    current, match.group(1) if match else "unknown", recording.header.get("recorded_at", "")
+                )
+                durations.setdefault(current, []).append(time.perf_counter() - started)
+    finally:
+        correlator.extract_rcca_from_response = original_extract
+    return {"durations": durations, "rounds": rounds_by_incident}
+
+
+def time_extract(correlator, rounds_by_incident: Dict[str, tuple], repeat: int) -> Dict[str, float]:
+    per_call = {}
+    for incident_id, (message, confidence, rounds) in rounds_by_incident.items():
+        started = time.perf_counter()
+        for _ in range(repeat):
+            correlator.extract_rcca_from_response(message, confidence, rounds)
+        per_call[incident_id] = (time.perf_counter() - started) / repeat
+    return per_call
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded Agent Builder conversations through the Analyst")
+    parser.add_argument("recordings", type=Path, help="directory of recordings (AGENT_BUILDER_RECORD_DIR)")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="divide the recorded pacing by this factor; 0 replays without delays (default: 0)")
+    parser.add_argument("--repeat", type=int, default=5, help="investigations per recording (default: 5)")
+    parser.add_argument("--extract-repeat", type=int, default=1000,
+                        help="extract_rcca_from_response calls per recording (default: 1000)")
+    parser.add_argument("--profile", action="store_true", help="run under cProfile and print the top functions")
+    parser.add_argument("--top", type=int, default=25, help="functions to print with --profile (default: 25)")
+    parser.add_argument("--profile-out", type=Path, help="also write the cProfile stats to this file")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    parser.add_argument("--verbose", action="store_true", help="keep Analyst logging on")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        from loguru import logger
+
+        # Per-event log lines would dominate both the timings and the profile
+        logger.remove()
+
+    from agents.analyst.src.conversation_recording import RecordingLibrary
+
+    library = RecordingLibrary(args.recordings)
+    recordings = [library.load(path) for path in library.paths()]
+    gateway = GatewayStandIn()
+    correlator = load_analyst(args.recordings, args.speed, gateway)
+
+    profiler = cProfile.Profile() if args.profile or args.profile_out else None
+    if profiler:
+        profiler.enable()
+    replayed = asyncio.run(replay(correlator, recordings, args.repeat))
+    extract = time_extract(correlator, replayed["rounds"], args.extract_repeat)
+    if profiler:
+        profiler.disable()
+
+    rows = []
+    for recording in recordings:
+        incident_id = recording.incident_id
+        samples = sorted(replayed["durations"].get(incident_id, []))
+        report = gateway.reports.get(incident_id, {})
+        rows.append({
+            "recording": recording.path.name,
+            "incident_id": incident_id,
+            "lines": len(recording.lines),
+            "recorded_seconds": recording.duration,
+            "investigation_p50_ms": percentile(samples, 50) * 1000 if samples else None,
+            "investigation_max_ms": samples[-1] * 1000 if samples else None,
+            "extract_us": extract[incident_id] * 1e6 if incident_id in extract else None,
+            "evidence": len(report.get("evidence", [])),
+            "confidence": report.get("confidence"),
+            "error": report.get("error"),
+        })
+    all_samples = sorted(d for samples in replayed["durations"].values() for d in samples)
+    summary = {
+        "recordings": len(recordings),
+        "investigations": len(all_samples),
+        "speed": args.speed,
+        "investigation_mean_ms": statistics.fmean(all_samples) * 1000 if all_samples else None,
+        "relay_batches": gateway.event_batches,
+        "failed": sum(1 for row in rows if row["error"]),
+        "results": rows,
+    }
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"{summary['recordings']} recordings x{args.repeat} at speed {args.speed}: "
+              f"{summary['investigations']} investigations, mean {summary['investigation_mean_ms']:.2f} ms, "
+              f"{summary['failed']} failed\n")
+        print(f"{'recording':<44} {'lines':>6} {'p50 ms':>9} {'max ms':>9} {'extract us':>11} {'evidence':>9}")
+        for row in rows:
+            print(f"{row['recording']:<44} {row['lines']:>6} {row['investigation_p50_ms']:>9.2f} "
+                  f"{row['investigation_max_ms']:>9.2f} {row['extract_us'] or 0:>11.1f} {row['evidence']:>9}"
+                  + (f"  error: {row['error']}" if row["error"] else ""))
+
+    if profiler:
+        if args.profile_out:
+            profiler.dump_stats(args.profile_out)
+        if args.profile:
+            print()
+            pstats.Stats(profiler, stream=sys.stdout).sort_stats("cumulative").print_stats(args.top)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
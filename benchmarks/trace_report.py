@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Offline summary of pipeline traces exported by shared/tracing.py.
+
+Reads the OTLP/JSON lines files written to TRACE_EXPORT_PATH (one per
+service, or one shared file) and prints:
+
+    spans      count, p50/p95/max duration and errors per service and span name
+    traces     end-to-end time per trace (first span start to last span end),
+               keyed by correlation_id, with the slowest ones broken down
+               span by span in start order, indented by depth
+
+Usage:
+    python benchmarks/trace_report.py /var/log/datapulse/traces-*.jsonl
+    python benchmarks/trace_report.py traces.jsonl --slowest 5
+    python benchmarks/trace_report.py traces.jsonl --json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.gateway_load import percentile  # noqa: E402
+from shared.serialization import loads  # noqa: E402
+from shared.tracing import STATUS_ERROR  # noqa: E402
+
+
+def read_spans(paths: List[Path]) -> List[Dict[str, Any]]:
+    spans = []
+    for path in paths:
+        with open(path, "rb") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                for resource in loads(line).get("resourceSpans", []):
+                    service = next(
+                        (item["value"].get("stringValue") for item in resource.get("resource", {}).get("attributes", [])
+                         if item["key"] == "service.name"),
+                        "unknown",
+                    )
+                    for scope in resource.get("scopeSpans", []):
+                        for span in scope.get("spans", []):
+                            attributes = {item["key"]: next(iter(item["value"].values()), None)
+                                          for item in span.get("attributes", [])}
+                            spans.append({
+                                "trace_id": span["traceId"],
+                                "span_id": span["spanId"],
+                                "parent_id": span.get("parentSpanId"),
+                                "service": service,
+                                "name": span["name"],
+                                "start": int(span["startTimeUnixNano"]),
+                                "end": int(span["endTimeUnixNano"]),
+                                "error": span.get("status", {}).get("code") == STATUS_ERROR,
+                                "attributes": attributes,
+                            })
+    return spans
+
+
+def span_stats(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for span in spans:
+        groups.setdefault((span["service"], span["name"]), []).append(span)
+    rows = []
+    for (service, name), members in groups.items():
+        durations = sorted((span["end"] - span["start"]) / 1e6 for span in members)
+        rows.append({
+            "service": service,
+            "name": name,
+            "count": len(members),
+            "p50_ms": percentile(durations, 50),
+            "p95_ms": percentile(durations, 95),
+            "max_ms": durations[-1],
+            "errors": sum(span["error"] for span in members),
+        })
+    return sorted(rows, key=lambda row: (row["service"], -row["p50_ms"]))
+
+
+def trace_summaries(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    traces: Dict[str, List[Dict[str, Any]]] = {}
+    for span in spans:
+        traces.setdefault(span["trace_id"], []).append(span)
+    summaries = []
+    for trace_id, members in traces.items():
+        members.sort(key=lambda span: span["start"])
+        attributes = [span["attributes"] for span in members]
+        summaries.append({
+            "trace_id": trace_id,
+            "correlation_id": next((a["correlation_id"] for a in attributes if a.get("correlation_id")), None),
+            "incident_id": next((a["incident_id"] for a in attributes if a.get("incident_id")), None),
+            "services": sorted({span["service"] for span in members}),
+            "spans": len(members),
+            "errors": sum(span["error"] for span in members),
+            "duration_ms": (max(span["end"] for span in members) - members[0]["start"]) / 1e6,
+            "members": members,
+        })
+    return sorted(summaries, key=lambda summary: summary["duration_ms"], reverse=True)
+
+
+def print_breakdown(summary: Dict[str, Any]):
+    members = summary["members"]
+    by_id = {span["span_id"]: span for span in members}
+    origin = members[0]["start"]
+
+    def depth(span):
+        level = 0
+        while span.get("parent_id") in by_id and level < 50:
+            span = by_id[span["parent_id"]]
+            level += 1
+        return level
+
+    print(f"\n{summary['correlation_id'] or summary['trace_id']} ({summary['incident_id'] or '-'}): "
+          f"{summary['duration_ms']:.1f} ms, {summary['spans']} spans")
+    for span in members:
+        label = "  " * depth(span) + f"{span['service']}: {span['name']}"
+        print(f"  {label:<70} +{(span['start'] - origin) / 1e6:>9.1f} ms {(span['end'] - span['start']) / 1e6:>9.1f} ms"
+              + ("  ERROR" if span["error"] else ""))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Summarize exported pipeline traces")
+    parser.add_argument("files", nargs="+", type=Path, help="OTLP/JSON lines files (TRACE_EXPORT_PATH)")
+    parser.add_argument("--slowest", type=int, default=3, help="traces to break down span by span (default: 3)")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    spans = read_spans(args.files)
+    if not spans:
+        print("no spans found", file=sys.stderr)
+        return 1
+    stats = span_stats(spans)
+    traces = trace_summaries(spans)
+    durations = sorted(summary["duration_ms"] for summary in traces)
+
+    if args.json:
+        print(json.dumps({
+            "spans": stats,
+            "traces": [{key: value for key, value in summary.items() if key != "members"} for summary in traces],
+        }, indent=2))
+        return 0
+
+    print(f"{len(spans)} spans in {len(traces)} traces; end to end p50 {percentile(durations, 50):.1f} ms, "
+          f"p95 {percentile(durations, 95):.1f} ms, max {durations[-1]:.1f} ms\n")
+    print(f"{'service':<12} {'span':<48} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9} {'errors':>7}")
+    for row in stats:
+        print(f"{row['service']:<12} {row['name'][:48]:<48} {row['count']:>6} {row['p50_ms']:>9.1f} "
+              f"{row['p95_ms']:>9.1f} {row['max_ms']:>9.1f} {row['errors']:>7}")
+    for summary in traces[:args.slowest]:
+        print_breakdown(summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
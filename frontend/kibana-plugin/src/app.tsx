@@ -1,4 +1,4 @@
-import React, { useCallback, useEffect, useMemo, useState } from 'react';
+import React, { useCallback, useEffect, useMemo, useRef, useState } from 'react';
 import {
   EuiBadge,
   EuiBasicTable,
@@ -232,10 +232,45 @@ export const DataPulseApp = () => {
 
   useEffect(() => {
     refreshData();
-    const interval = setInterval(fetchIncidents, 30000);
+    // Slow poll as a safety net; live changes arrive over the incident stream below
+    const interval = setInterval(fetchIncidents, 120000);
     return () => clearInterval(interval);
   }, [fetchIncidents, refreshData]);
 
+  const fetchIncidentsRef = useRef(fetchIncidents);
+  fetchIncidentsRef.current = fetchIncidents;
+
+  useEffect(() => {
+    if (typeof EventSource === 'undefined') return undefined;
+    // EventSource reconnects on its own and resumes with Last-Event-ID
+    const source = new EventSource(`${API_BASE}/api/datapulse/v1/stream/incidents`);
+
+    const applyChanges = (event: Event) => {
+      const payload = JSON.parse((event as MessageEvent).data);
+      const changes = payload.changes || {};
+      setIncidents((current) =>
+        current.map((item) => (item.incident_id === payload.incident_id ? { ...item, ...changes } : item)),
+      );
+      setIncident((current) =>
+        current && current.incident_id === payload.incident_id ? { ...current, ...changes } : current,
+      );
+    };
+
+    source.addEventListener('incident.created', (event) => {
+      const payload = JSON.parse((event as MessageEvent).data);
+      setIncidents((current) => [
+        payload.incident,
+        ...current.filter((item) => item.incident_id !== payload.incident_id),
+      ]);
+    });
+    source.addEventListener('incident.updated', applyChanges);
+    source.addEventListener('action.transition', applyChanges);
+    // Missed more events than the gateway keeps: reload everything once
+    source.addEventListener('stream.reset', () => fetchIncidentsRef.current());
+
+    return () => source.close();
+  }, []);
+
   const filteredIncidents = useMemo(() => {
     const term = searchValue.trim().toLowerCase();
     if (!term) return incidents;
@@ -0,0 +1,124 @@
+"""ES|QL-backed plugin tools for the MCP server.
+
+A plugin tool can declare an ES|QL query instead of a static response, either
+inline in the tools/esql format or by referencing a tools/esql template id.
+Binding, execution and caching come from the shared ES|QL library: arguments
+are passed as ES|QL query parameters, results are cached per tool TTL
+bucket, and large results are capped and returned in chunks. Results stay
+column-oriented (Arrow when pyarrow is installed) until a chunk is rendered.
+"""
+
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+try:
+    from shared.es_client import create_client
+    from shared.esql import ESQL_TOOLS_DIR, ColumnarResult, EsqlQueryLibrary, EsqlTemplate
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+    from shared.es_client import create_client
+    from shared.esql import ESQL_TOOLS_DIR, ColumnarResult, EsqlQueryLibrary, EsqlTemplate
+
+DEFAULT_CACHE_TTL_SECONDS = float(os.getenv("MCP_ESQL_CACHE_TTL_SECONDS", "30"))
+DEFAULT_MAX_ROWS = int(os.getenv("MCP_ESQL_MAX_ROWS", "500"))
+RESULT_CHUNK_ROWS = int(os.getenv("MCP_ESQL_CHUNK_ROWS", "100"))
+
+_TEMPLATE_ID = re.compile(r"^[\w-]+$")
+
+
+@dataclass
+class EsqlToolSpec(EsqlTemplate):
+    """An ES|QL template plus the plugin tool's cache and row settings."""
+
+    cache_ttl: float = DEFAULT_CACHE_TTL_SECONDS
+    max_rows: int = DEFAULT_MAX_ROWS
+
+    def __post_init__(self):
+        super().__post_init__()
+        if self.max_rows < 1:
+            raise ValueError("maxRows must be at least 1")
+
+
+def load_esql_spec(tool: dict[str, Any], esql_dir: Path = ESQL_TOOLS_DIR) -> Optional[EsqlToolSpec]:
+    """Build the ES|QL spec for a manifest tool entry, or None for static tools.
+
+    Accepts the tools/esql format inline (``"type": "esql"`` with a
+    ``configuration``) or a template id from the tools/esql directory
+    (``"esqlTool": "check_recent_deployments"``).
+    """
+    template_id = tool.get("esqlTool")
+    if template_id:
+        if not _TEMPLATE_ID.match(str(template_id)):
+            raise ValueError(f"Invalid ES|QL template id: {template_id}")
+        definition = json.loads((Path(esql_dir) / f"{template_id}.json").read_text(encoding="utf-8"))
+    elif tool.get("type") == "esql":
+        definition = {"configuration": tool.get("configuration", {})}
+    else:
+        return None
+
+    return EsqlToolSpec.from_definition(
+        definition,
+        cache_ttl=float(tool.get("cacheTtlSeconds", DEFAULT_CACHE_TTL_SECONDS)),
+        max_rows=int(tool.get("maxRows", DEFAULT_MAX_ROWS)),
+    )
+
+
+_es_client = None
+
+
+def get_es_client():
+    """Shared async Elasticsearch client for all ES|QL tools (ES_HOST/ES_API_KEY, see shared/es_client.py)."""
+    global _es_client
+    if _es_client is None:
+        _es_client = create_client("mcp-server")
+    return _es_client
+
+
+async def close_es_client():
+    global _es_client
+    if _es_client is not None:
+        await _es_client.close()
+        _es_client = None
+
+
+class EsqlToolExecutor:
+    """Runs ES|QL plugin tools through the shared query library."""
+
+    def __init__(self, client_factory: Callable[[], Any] = get_es_client, chunk_rows: int = RESULT_CHUNK_ROWS):
+        self.library = EsqlQueryLibrary(client_factory=client_factory)
+        self.chunk_rows = chunk_rows
+
+    async def execute(self, tool_name: str, spec: EsqlToolSpec, arguments: dict[str, Any]) -> tuple[ColumnarResult, str]:
+        """Run the tool; returns the result and where it came from."""
+        result = await self.library.query(
+            spec,
+            arguments,
+            max_rows=spec.max_rows,
+            bucket_seconds=spec.cache_ttl,
+            columnar=True,
+        )
+        return result, result.source
+
+    def render(self, tool_name: str, result: ColumnarResult, source: str) -> Iterator[str]:
+        """Yield a summary block followed by the rows in fixed-size JSON chunks."""
+        yield json.dumps({
+            "tool": tool_name,
+            "columns": result.columns,
+            "row_count": result.num_rows,
+            "truncated": result.truncated,
+            "chunks": -(-result.num_rows // self.chunk_rows),
+            "source": source,
+            "took_ms": result.took_ms,
+        })
+        for start in range(0, result.num_rows, self.chunk_rows):
+            yield json.dumps(result.slice(start, self.chunk_rows).to_records(), default=str)
+
+    def snapshot(self) -> dict[str, Any]:
+        snapshot = self.library.snapshot()
+        snapshot.pop("templates", None)
+        return snapshot
@@ -1,3 +1,4 @@
 from .jira_adapter import JiraAdapter
+from .jira_batcher import JiraBatcher
 
-__all__ = ["JiraAdapter"]
+__all__ = ["JiraAdapter", "JiraBatcher"]
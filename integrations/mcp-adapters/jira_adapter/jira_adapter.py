@@ -4,7 +4,20 @@ Jira Integration Adapter for DataPulse
 import os
 import httpx
 from loguru import logger
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+
+def adf_document(text: str) -> Dict[str, Any]:
+    """Wrap plain text in the Atlassian Document Format that API v3 requires; blank lines split paragraphs"""
+    paragraphs = [part.strip() for part in text.split("\n\n") if part.strip()]
+    return {
+        "type": "doc",
+        "version": 1,
+        "content": [
+            {"type": "paragraph", "content": [{"type": "text", "text": paragraph}]}
+            for paragraph in paragraphs
+        ],
+    }
 
 
 class JiraAdapter:
@@ -13,9 +26,90 @@ class JiraAdapter:
         self.email = os.getenv("JIRA_EMAIL", "")
         self.api_token = os.getenv("JIRA_API_TOKEN", "")
         self.project_key = os.getenv("JIRA_PROJECT_KEY", "OPS")
+        self.max_connections = int(os.getenv("JIRA_MAX_CONNECTIONS", "10"))
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the pooled HTTP client, creating it on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                auth=(self.email, self.api_token),
+                timeout=15.0,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the pooled HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def create_incident_ticket(self, incident: Dict[str, Any]) -> str:
         """Create a Jira ticket for an incident"""
+        return await self.create_issue(self.build_issue_payload(incident))
+
+    async def create_issue(self, payload: Dict[str, Any]) -> Optional[str]:
+        """Create a single issue from a prepared payload"""
+        try:
+            response = await self._get_client().post(
+                f"{self.base_url}/rest/api/3/issue",
+                json=payload,
+            )
+
+            if response.status_code == 201:
+                data = response.json()
+                ticket_key = data.get("key")
+                logger.info(f"Created Jira ticket: {ticket_key}")
+                return ticket_key
+            else:
+                logger.error(f"Failed to create Jira ticket: {response.status_code} {response.text}")
+                return None
+        except Exception as e:
+            logger.error(f"Error creating Jira ticket: {e}")
+            return None
+
+    async def create_issues_bulk(self, payloads: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Create several issues in one call via the bulk endpoint.
+
+        Returns the issue keys in payload order, with None for elements Jira rejected.
+        """
+        try:
+            response = await self._get_client().post(
+                f"{self.base_url}/rest/api/3/issue/bulk",
+                json={"issueUpdates": payloads},
+            )
+            if response.status_code not in (200, 201):
+                logger.error(f"Failed to bulk create Jira tickets: {response.status_code} {response.text}")
+                return [None] * len(payloads)
+
+            data = response.json()
+        except Exception as e:
+            logger.error(f"Error bulk creating Jira tickets: {e}")
+            return [None] * len(payloads)
+
+        failed = {error.get("failedElementNumber") for error in data.get("errors", [])}
+        for error in data.get("errors", []):
+            logger.error(f"Jira rejected bulk element {error.get('failedElementNumber')}: {error.get('elementErrors')}")
+
+        # Jira returns created issues in request order, skipping failed elements
+        created = iter(data.get("issues", []))
+        keys = []
+        for idx in range(len(payloads)):
+            if idx in failed:
+                keys.append(None)
+                continue
+            issue = next(created, None)
+            keys.append(issue.get("key") if issue else None)
+
+        logger.info(f"Bulk created {sum(1 for key in keys if key)}/{len(payloads)} Jira tickets")
+        return keys
+
+    def build_issue_payload(self, incident: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the issue-create payload for an incident"""
         
         # Map severity to Jira priority
         priority_map = {
@@ -46,7 +140,7 @@ class JiraAdapter:
 *Status:* Investigating
         """.strip()
         
-        payload = {
+        return {
             "fields": {
                 "project": {"key": self.project_key},
                 "summary": f"[DataPulse] {incident['service']} - {incident.get('severity', 'medium').upper()} incident",
@@ -56,67 +150,40 @@ class JiraAdapter:
             }
         }
         
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/rest/api/3/issue",
-                    json=payload,
-                    auth=(self.email, self.api_token),
-                    timeout=15.0
-                )
-                
-                if response.status_code == 201:
-                    data = response.json()
-                    ticket_key = data.get("key")
-                    logger.info(f"Created Jira ticket: {ticket_key}")
-                    return ticket_key
-                else:
-                    logger.error(f"Failed to create Jira ticket: {response.status_code} {response.text}")
-                    return None
-        except Exception as e:
-            logger.error(f"Error creating Jira ticket: {e}")
-            return None
-    
     async def update_ticket(self, ticket_key: str, update: Dict[str, Any]):
         """Update existing Jira ticket"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.put(
-                    f"{self.base_url}/rest/api/3/issue/{ticket_key}",
-                    json={"fields": update},
-                    auth=(self.email, self.api_token),
-                    timeout=15.0
-                )
+            response = await self._get_client().put(
+                f"{self.base_url}/rest/api/3/issue/{ticket_key}",
+                json={"fields": update},
+            )
                 
-                if response.status_code == 204:
-                    logger.info(f"Updated Jira ticket: {ticket_key}")
-                    return True
-                else:
-                    logger.error(f"Failed to update Jira ticket: {response.status_code}")
-                    return False
+            if response.status_code == 204:
+                logger.info(f"Updated Jira ticket: {ticket_key}")
+                return True
+            else:
+                logger.error(f"Failed to update Jira ticket: {response.status_code}")
+                return False
         except Exception as e:
             logger.error(f"Error updating Jira ticket: {e}")
             return False
     
     async def add_comment(self, ticket_key: str, comment: str):
         """Add comment to Jira ticket"""
-        payload = {"body": comment}
+        payload = {"body": adf_document(comment)}
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/rest/api/3/issue/{ticket_key}/comment",
-                    json=payload,
-                    auth=(self.email, self.api_token),
-                    timeout=15.0
-                )
+            response = await self._get_client().post(
+                f"{self.base_url}/rest/api/3/issue/{ticket_key}/comment",
+                json=payload,
+            )
                 
-                if response.status_code == 201:
-                    logger.info(f"Added comment to {ticket_key}")
-                    return True
-                else:
-                    logger.error(f"Failed to add comment: {response.status_code}")
-                    return False
+            if response.status_code == 201:
+                logger.info(f"Added comment to {ticket_key}")
+                return True
+            else:
+                logger.error(f"Failed to add comment: {response.status_code}")
+                return False
         except Exception as e:
             logger.error(f"Error adding comment: {e}")
             return False
@@ -0,0 +1,163 @@
+"""
+Jira request batching for incident storms.
+
+Issue creations arriving within a short window are sent through the bulk
+issue-create endpoint, and comments/field updates queued for the same ticket
+are coalesced into a single API call.
+
+Flushes run in their own tasks, so a caller that times out or is cancelled
+never interrupts a batch it shares with other callers: every queued request
+is still sent and every waiter resolved.
+"""
+import os
+import asyncio
+from loguru import logger
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from .jira_adapter import JiraAdapter
+
+# Jira Cloud accepts at most 50 issues per bulk create request
+JIRA_BULK_CREATE_LIMIT = 50
+
+
+class JiraBatcher:
+    """Drop-in front for JiraAdapter that batches and coalesces API calls."""
+
+    def __init__(self, adapter: Optional[JiraAdapter] = None):
+        self.adapter = adapter or JiraAdapter()
+        self.window_seconds = float(os.getenv("JIRA_BATCH_WINDOW_SECONDS", "0.5"))
+        self.max_batch_size = min(
+            int(os.getenv("JIRA_BATCH_MAX_SIZE", str(JIRA_BULK_CREATE_LIMIT))),
+            JIRA_BULK_CREATE_LIMIT,
+        )
+
+        self._pending_creates: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        # ticket_key -> queued comments / merged field updates and their waiters
+        self._pending_comments: Dict[str, List[Tuple[str, asyncio.Future]]] = {}
+        self._pending_updates: Dict[str, Tuple[Dict[str, Any], List[asyncio.Future]]] = {}
+
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        # Running flushes; strong references so they are not garbage-collected
+        self._flushes: Set[asyncio.Task] = set()
+
+        self.operations = 0
+        self.api_calls = 0
+
+    async def create_incident_ticket(self, incident: Dict[str, Any]) -> Optional[str]:
+        """Queue an incident ticket; resolves to the issue key once its batch is sent"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending_creates.append((self.adapter.build_issue_payload(incident), future))
+        self.operations += 1
+
+        if len(self._pending_creates) >= self.max_batch_size:
+            self._start_flush()
+        else:
+            self._schedule_flush()
+        return await asyncio.shield(future)
+
+    async def add_comment(self, ticket_key: str, comment: str) -> bool:
+        """Queue a comment; comments for the same ticket are posted together"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending_comments.setdefault(ticket_key, []).append((comment, future))
+        self.operations += 1
+        self._schedule_flush()
+        return await asyncio.shield(future)
+
+    async def update_ticket(self, ticket_key: str, update: Dict[str, Any]) -> bool:
+        """Queue a field update; later values win when updates are merged"""
+        future = asyncio.get_running_loop().create_future()
+        fields, waiters = self._pending_updates.setdefault(ticket_key, ({}, []))
+        fields.update(update)
+        waiters.append(future)
+        self.operations += 1
+        self._schedule_flush()
+        return await asyncio.shield(future)
+
+    def _schedule_flush(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+
+    def _start_flush(self) -> asyncio.Task:
+        task = asyncio.create_task(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+        return task
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(self.window_seconds)
+        await asyncio.shield(self._start_flush())
+
+    async def flush(self):
+        """Send everything queued so far"""
+        async with self._flush_lock:
+            creates, self._pending_creates = self._pending_creates, []
+            comments, self._pending_comments = self._pending_comments, {}
+            updates, self._pending_updates = self._pending_updates, {}
+
+            await asyncio.gather(
+                *(self._send_creates(creates[i:i + self.max_batch_size])
+                  for i in range(0, len(creates), self.max_batch_size)),
+                *(self._send_comments(key, queued) for key, queued in comments.items()),
+                *(self._send_update(key, fields, waiters) for key, (fields, waiters) in updates.items()),
+            )
+
+    async def aclose(self):
+        """Flush queued work and release the pooled client"""
+        if self._flush_task is not None and not self._flush_task.done():
+            # Only stops the window timer; a flush it already started runs on in its own task
+            self._flush_task.cancel()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        await self.flush()
+        await self.adapter.aclose()
+
+    async def _send_creates(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        if not batch:
+            return
+        self.api_calls += 1
+        payloads = [payload for payload, _ in batch]
+        keys: List[Optional[str]] = [None] * len(batch)
+        try:
+            if len(payloads) == 1:
+                keys = [await self.adapter.create_issue(payloads[0])]
+            else:
+                keys = await self.adapter.create_issues_bulk(payloads)
+        except Exception as e:
+            logger.error(f"Jira batch create failed: {e}")
+        finally:
+            # Cancelled included: nobody may be left waiting on this batch
+            for (_, future), key in zip(batch, keys):
+                if not future.done():
+                    future.set_result(key)
+
+    async def _send_comments(self, ticket_key: str, queued: List[Tuple[str, asyncio.Future]]):
+        self.api_calls += 1
+        combined = "\n\n".join(comment for comment, _ in queued)
+        ok = False
+        try:
+            ok = await self.adapter.add_comment(ticket_key, combined)
+        finally:
+            for _, future in queued:
+                if not future.done():
+                    future.set_result(ok)
+
+    async def _send_update(self, ticket_key: str, fields: Dict[str, Any], waiters: List[asyncio.Future]):
+        self.api_calls += 1
+        ok = False
+        try:
+            ok = await self.adapter.update_ticket(ticket_key, fields)
+        finally:
+            for future in waiters:
+                if not future.done():
+                    future.set_result(ok)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "operations": self.operations,
+            "api_calls": self.api_calls,
+            "api_calls_saved": max(self.operations - self.api_calls, 0),
+            "queued": len(self._pending_creates)
+            + sum(len(queued) for queued in self._pending_comments.values())
+            + sum(len(waiters) for _, waiters in self._pending_updates.values()),
+        }
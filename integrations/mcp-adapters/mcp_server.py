@@ -1,18 +1,24 @@
 """DataPulse MCP Server with plugin support.
 
 Exposes built-in Slack/Jira tools via the Model Context Protocol (MCP) and can
-load extra tools from lightweight JSON plugin manifests.
+load extra tools from lightweight JSON plugin manifests. Manifests are watched
+and hot-reloaded; connected clients get a tools/list_changed notification.
+Plugin tools either return static text or run a cached ES|QL query.
+
+Serves a single client over stdio by default, or many clients over HTTP/SSE
+with ``--transport sse``. Tool calls on a session run concurrently, bounded by
+per-tool concurrency limits and timeouts.
 """
 
+import argparse
 import asyncio
-import json
 import os
-from dataclasses import dataclass
+import weakref
 from pathlib import Path
-from typing import Any
 
 from mcp.server.models import InitializationOptions
-from mcp.server import Notification, Server
+from mcp.server import NotificationOptions, Server
+from mcp.server.session import ServerSession
 from mcp.server.stdio import stdio_server
 import mcp.types as types
 from loguru import logger
@@ -22,132 +28,118 @@ import sys
 sys.path.append(os.path.dirname(__file__))
 from slack_adapter.slack_adapter import SlackAdapter
 from jira_adapter.jira_adapter import JiraAdapter
+from plugin_registry import PluginRegistry, PluginTool
+from esql_tools import EsqlToolExecutor, close_es_client
+from mcp_session import serve_session
+from tool_runtime import ToolRuntime
 
 # Initialize adapters
 slack = SlackAdapter()
 jira = JiraAdapter()
+esql_executor = EsqlToolExecutor()
+tool_runtime = ToolRuntime()
 
 
-@dataclass
-class PluginTool:
-    """Runtime representation of a plugin tool manifest entry."""
+PLUGIN_DIR = Path(os.getenv("MCP_PLUGIN_DIR", Path(__file__).parent / "plugins"))
+PLUGIN_RELOAD_INTERVAL = float(os.getenv("MCP_PLUGIN_RELOAD_INTERVAL_SECONDS", "2"))
+MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "stdio")
+MCP_HTTP_HOST = os.getenv("MCP_HTTP_HOST", "0.0.0.0")
+MCP_HTTP_PORT = int(os.getenv("MCP_HTTP_PORT", "8765"))
+
+BUILT_IN_TOOLS = [
+    types.Tool(
+        name="send_slack_alert",
+        description="Send an incident alert to the #incident-alerts Slack channel.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "incident_id": {"type": "string"},
+                "service": {"type": "string"},
+                "severity": {"type": "string"},
+                "error_rate": {"type": "number"},
+            },
+            "required": ["incident_id", "service", "severity"],
+        },
+    ),
+    types.Tool(
+        name="create_jira_ticket",
+        description="Create a Jira ticket for an ongoing incident.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "incident_id": {"type": "string"},
+                "service": {"type": "string"},
+                "summary": {"type": "string"},
+            },
+            "required": ["incident_id", "service", "summary"],
+        },
+    ),
+]
+BUILT_IN_TOOL_NAMES = {tool.name for tool in BUILT_IN_TOOLS}
 
-    plugin_id: str
-    name: str
-    description: str
-    input_schema: dict[str, Any]
-    response_text: str
 
+def _build_plugin_tool(plugin_tool: PluginTool) -> types.Tool:
+    return types.Tool(
+        name=plugin_tool.name,
+        description=plugin_tool.description,
+        inputSchema=plugin_tool.input_schema,
+    )
 
-PLUGIN_DIR = Path(os.getenv("MCP_PLUGIN_DIR", Path(__file__).parent / "plugins"))
 
+registry = PluginRegistry(PLUGIN_DIR, tool_factory=_build_plugin_tool, static_tools=BUILT_IN_TOOLS)
+if not PLUGIN_DIR.exists():
+    logger.info(f"MCP plugin directory does not exist: {PLUGIN_DIR}")
+registry.refresh()
 
-def _normalize_tool_name(tool_name: str) -> str:
-    return tool_name.strip().lower().replace(" ", "_")
+# Sessions that have talked to us; notified when the tool set changes
+_sessions: "weakref.WeakSet[ServerSession]" = weakref.WeakSet()
 
 
-def load_plugin_tools() -> dict[str, PluginTool]:
-    """Load plugin tools from JSON manifests in the plugins directory."""
-    plugin_tools: dict[str, PluginTool] = {}
+def _remember_session():
+    try:
+        _sessions.add(server.request_context.session)
+    except LookupError:
+        pass
 
-    if not PLUGIN_DIR.exists():
-        logger.info(f"MCP plugin directory does not exist: {PLUGIN_DIR}")
-        return plugin_tools
 
-    for manifest_path in sorted(PLUGIN_DIR.glob("*.json")):
+async def notify_tools_changed():
+    for session in list(_sessions):
         try:
-            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            await session.send_tool_list_changed()
         except Exception as exc:
-            logger.warning(f"Skipping unreadable plugin manifest {manifest_path.name}: {exc}")
-            continue
-
-        plugin_id = manifest.get("plugin_id") or manifest_path.stem
-        tools = manifest.get("tools", [])
-
-        if not isinstance(tools, list) or not tools:
-            logger.warning(f"Plugin {plugin_id} has no tools and was skipped")
-            continue
-
-        for tool in tools:
-            tool_name = tool.get("name")
-            if not tool_name:
-                logger.warning(f"Plugin {plugin_id} has a tool with missing name")
-                continue
-
-            normalized_name = _normalize_tool_name(tool_name)
-            scoped_name = f"{plugin_id}.{normalized_name}"
-
-            plugin_tools[scoped_name] = PluginTool(
-                plugin_id=plugin_id,
-                name=scoped_name,
-                description=tool.get("description", f"{plugin_id} tool: {normalized_name}"),
-                input_schema=tool.get("inputSchema", {"type": "object", "properties": {}}),
-                response_text=tool.get(
-                    "responseText",
-                    f"Plugin tool {scoped_name} executed successfully.",
-                ),
-            )
+            logger.debug(f"Dropping MCP session after failed notification: {exc}")
+            _sessions.discard(session)
 
-    logger.info(f"Loaded {len(plugin_tools)} plugin tools from {PLUGIN_DIR}")
-    return plugin_tools
 
-
-PLUGIN_TOOLS = load_plugin_tools()
+registry.add_listener(notify_tools_changed)
 
 server = Server("datapulse-tools")
 
 @server.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
     """List available incident response tools."""
-    built_in_tools = [
-        types.Tool(
-            name="send_slack_alert",
-            description="Send an incident alert to the #incident-alerts Slack channel.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "incident_id": {"type": "string"},
-                    "service": {"type": "string"},
-                    "severity": {"type": "string"},
-                    "error_rate": {"type": "number"},
-                },
-                "required": ["incident_id", "service", "severity"],
-            },
-        ),
-        types.Tool(
-            name="create_jira_ticket",
-            description="Create a Jira ticket for an ongoing incident.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "incident_id": {"type": "string"},
-                    "service": {"type": "string"},
-                    "summary": {"type": "string"},
-                },
-                "required": ["incident_id", "service", "summary"],
-            },
-        ),
-    ]
-
-    plugin_tools = [
-        types.Tool(
-            name=plugin_tool.name,
-            description=plugin_tool.description,
-            inputSchema=plugin_tool.input_schema,
-        )
-        for plugin_tool in PLUGIN_TOOLS.values()
-    ]
-
-    return built_in_tools + plugin_tools
+    _remember_session()
+    return registry.tool_list
 
 @server.call_tool()
 async def handle_call_tool(
     name: str, arguments: dict | None
 ) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
     """Handle tool execution requests."""
-    if not arguments:
+    _remember_session()
+    plugin_tool = registry.get(name)
+    if plugin_tool is None and name not in BUILT_IN_TOOL_NAMES:
+        raise ValueError(f"Unknown tool: {name}")
+    if not arguments and (plugin_tool is None or plugin_tool.esql is None):
         raise ValueError("Missing arguments")
 
+    return await tool_runtime.run(name, lambda: _dispatch_tool(name, arguments or {}, plugin_tool))
+
+
+async def _dispatch_tool(
+    name: str, arguments: dict, plugin_tool: PluginTool | None
+) -> list[types.TextContent | types.ImageContent | types.EmbeddedResource]:
+    """Run a tool once it has a concurrency slot."""
     if name == "send_slack_alert":
         logger.info(f"MCP Call: send_slack_alert for {arguments['incident_id']}")
         await slack.send_incident_alert(arguments)
@@ -158,29 +150,98 @@ async def handle_call_tool(
         key = await jira.create_incident_ticket(arguments)
         return [types.TextContent(type="text", text=f"Jira ticket created: {key}")]
 
-    elif name in PLUGIN_TOOLS:
-        plugin_tool = PLUGIN_TOOLS[name]
+    elif plugin_tool is not None and plugin_tool.esql is not None:
+        logger.info(f"MCP Call: ES|QL plugin tool {name} from plugin {plugin_tool.plugin_id}")
+        result, source = await esql_executor.execute(name, plugin_tool.esql, arguments)
+        logger.info(
+            f"ES|QL tool {name}: {result.num_rows} rows from {source}"
+            f"{' (truncated)' if result.truncated else ''}"
+        )
+        return [
+            types.TextContent(type="text", text=chunk)
+            for chunk in esql_executor.render(name, result, source)
+        ]
+
+    elif plugin_tool is not None:
         logger.info(f"MCP Call: plugin tool {name} from plugin {plugin_tool.plugin_id}")
         return [types.TextContent(type="text", text=plugin_tool.response_text)]
 
     else:
         raise ValueError(f"Unknown tool: {name}")
 
-async def main():
-    # Run the server using stdin/stdout streams
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="datapulse-tools",
-                server_version="1.0.0",
-                capabilities=server.get_capabilities(
-                    notification_options=Notification.EMPTY,
-                    experimental_capabilities={},
-                ),
-            ),
-        )
+def _initialization_options() -> InitializationOptions:
+    return InitializationOptions(
+        server_name="datapulse-tools",
+        server_version="1.0.0",
+        capabilities=server.get_capabilities(
+            notification_options=NotificationOptions(tools_changed=True),
+            experimental_capabilities={},
+        ),
+    )
+
+
+def build_http_app():
+    """Starlette app serving MCP over SSE plus tool metrics."""
+    from mcp.server.sse import SseServerTransport
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse, Response
+    from starlette.routing import Mount, Route
+
+    sse = SseServerTransport("/messages/")
+
+    async def handle_sse(request):
+        async with sse.connect_sse(request.scope, request.receive, request._send) as (read_stream, write_stream):
+            await serve_session(server, read_stream, write_stream, _initialization_options())
+        return Response()
+
+    async def tool_metrics(_request):
+        return JSONResponse({
+            "sessions": len(_sessions),
+            "registry_version": registry.version,
+            "tools": tool_runtime.snapshot(),
+            "esql": esql_executor.snapshot(),
+        })
+
+    async def health(_request):
+        return JSONResponse({"status": "ok"})
+
+    return Starlette(routes=[
+        Route("/sse", endpoint=handle_sse),
+        Mount("/messages/", app=sse.handle_post_message),
+        Route("/metrics/tools", endpoint=tool_metrics),
+        Route("/health", endpoint=health),
+    ])
+
+
+async def main(transport: str = MCP_TRANSPORT):
+    watcher = None
+    if PLUGIN_RELOAD_INTERVAL > 0:
+        watcher = asyncio.create_task(registry.watch(PLUGIN_RELOAD_INTERVAL))
+
+    try:
+        if transport == "sse":
+            import uvicorn
+
+            logger.info(f"Serving MCP over SSE on {MCP_HTTP_HOST}:{MCP_HTTP_PORT}")
+            config = uvicorn.Config(
+                build_http_app(),
+                host=MCP_HTTP_HOST,
+                port=MCP_HTTP_PORT,
+                log_level="info",
+                # Open SSE streams would otherwise hold shutdown indefinitely
+                timeout_graceful_shutdown=5,
+            )
+            await uvicorn.Server(config).serve()
+        else:
+            # Run the server using stdin/stdout streams
+            async with stdio_server() as (read_stream, write_stream):
+                await serve_session(server, read_stream, write_stream, _initialization_options())
+    finally:
+        if watcher:
+            watcher.cancel()
+        await close_es_client()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="DataPulse MCP server")
+    parser.add_argument("--transport", choices=["stdio", "sse"], default=MCP_TRANSPORT)
+    asyncio.run(main(parser.parse_args().transport))
@@ -0,0 +1,65 @@
+"""Concurrent request handling for MCP sessions.
+
+``Server.run`` in mcp 1.2 awaits each request before reading the next one, so a
+slow tool call blocks everything else on that session. ``serve_session`` runs
+each request in its own task instead.
+"""
+
+import anyio
+import mcp.types as types
+from loguru import logger
+from mcp.server.lowlevel.server import request_ctx
+from mcp.server.models import InitializationOptions
+from mcp.server.session import ServerSession
+from mcp.shared.context import RequestContext
+from mcp.shared.exceptions import McpError
+from mcp.shared.session import RequestResponder
+
+
+async def _handle_request(server, session: ServerSession, message: RequestResponder):
+    req = message.request.root
+    handler = server.request_handlers.get(type(req))
+    if handler is None:
+        await message.respond(types.ErrorData(code=types.METHOD_NOT_FOUND, message="Method not found"))
+        return
+
+    token = request_ctx.set(RequestContext(message.request_id, message.request_meta, session))
+    try:
+        response = await handler(req)
+    except McpError as err:
+        response = err.error
+    except Exception as err:
+        response = types.ErrorData(code=0, message=str(err), data=None)
+    finally:
+        request_ctx.reset(token)
+
+    try:
+        await message.respond(response)
+    except (anyio.BrokenResourceError, anyio.ClosedResourceError):
+        logger.debug(f"MCP client went away before request {message.request_id} completed")
+
+
+async def serve_session(
+    server,
+    read_stream,
+    write_stream,
+    initialization_options: InitializationOptions,
+):
+    """Equivalent of ``Server.run`` that handles requests concurrently."""
+    async with ServerSession(read_stream, write_stream, initialization_options) as session:
+        async with anyio.create_task_group() as tg:
+            async for message in session.incoming_messages:
+                if isinstance(message, RequestResponder):
+                    tg.start_soon(_handle_request, server, session, message)
+                elif isinstance(message, types.ClientNotification):
+                    handler = server.notification_handlers.get(type(message.root))
+                    if handler is None:
+                        continue
+                    try:
+                        await handler(message.root)
+                    except Exception as err:
+                        logger.error(f"Uncaught exception in notification handler: {err}")
+                elif isinstance(message, Exception):
+                    logger.warning(f"MCP transport error: {message}")
+            # Client disconnected: abandon its in-flight calls
+            tg.cancel_scope.cancel()
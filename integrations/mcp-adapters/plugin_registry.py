@@ -0,0 +1,211 @@
+"""Hot-reloading registry for MCP plugin tool manifests.
+
+Manifests in the plugin directory are re-scanned on an interval. Only files
+whose mtime/size changed are re-read, and only files whose content hash changed
+are re-parsed. The prebuilt tool listing is replaced atomically, so listing
+tools never rebuilds anything per request.
+"""
+
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from loguru import logger
+
+from esql_tools import ESQL_TOOLS_DIR, EsqlToolSpec, load_esql_spec
+
+
+@dataclass
+class PluginTool:
+    """Runtime representation of a plugin tool manifest entry."""
+
+    plugin_id: str
+    name: str
+    description: str
+    input_schema: dict[str, Any]
+    response_text: str
+    esql: Optional[EsqlToolSpec] = None
+
+
+@dataclass
+class _ManifestState:
+    mtime_ns: int
+    size: int
+    content_hash: str
+    tools: dict[str, PluginTool]
+
+
+def _normalize_tool_name(tool_name: str) -> str:
+    return tool_name.strip().lower().replace(" ", "_")
+
+
+def parse_manifest(
+    manifest: dict[str, Any],
+    default_plugin_id: str,
+    esql_dir: Path = ESQL_TOOLS_DIR,
+) -> dict[str, PluginTool]:
+    """Turn a plugin manifest into scoped PluginTool entries."""
+    plugin_tools: dict[str, PluginTool] = {}
+    plugin_id = manifest.get("plugin_id") or default_plugin_id
+    tools = manifest.get("tools", [])
+
+    if not isinstance(tools, list) or not tools:
+        logger.warning(f"Plugin {plugin_id} has no tools and was skipped")
+        return plugin_tools
+
+    for tool in tools:
+        tool_name = tool.get("name")
+        if not tool_name:
+            logger.warning(f"Plugin {plugin_id} has a tool with missing name")
+            continue
+
+        normalized_name = _normalize_tool_name(tool_name)
+        scoped_name = f"{plugin_id}.{normalized_name}"
+
+        try:
+            esql = load_esql_spec(tool, esql_dir)
+        except (OSError, ValueError) as exc:
+            logger.warning(f"Plugin {plugin_id} tool {normalized_name} has an invalid ES|QL definition: {exc}")
+            continue
+
+        default_schema = esql.input_schema() if esql else {"type": "object", "properties": {}}
+        default_description = (esql and esql.description) or f"{plugin_id} tool: {normalized_name}"
+
+        plugin_tools[scoped_name] = PluginTool(
+            plugin_id=plugin_id,
+            name=scoped_name,
+            description=tool.get("description", default_description),
+            input_schema=tool.get("inputSchema", default_schema),
+            response_text=tool.get(
+                "responseText",
+                f"Plugin tool {scoped_name} executed successfully.",
+            ),
+            esql=esql,
+        )
+
+    return plugin_tools
+
+
+class PluginRegistry:
+    """Plugin tools keyed by scoped name, with a cached tool listing."""
+
+    def __init__(
+        self,
+        plugin_dir: Path,
+        tool_factory: Callable[[PluginTool], Any],
+        static_tools: Iterable[Any] = (),
+        esql_dir: Path = ESQL_TOOLS_DIR,
+    ):
+        self.plugin_dir = Path(plugin_dir)
+        self.esql_dir = Path(esql_dir)
+        self._tool_factory = tool_factory
+        self._static_tools = list(static_tools)
+        self._manifests: dict[Path, _ManifestState] = {}
+        self._listeners: list[Callable[[], Awaitable[None]]] = []
+
+        # Replaced (never mutated) on reload so readers always see a consistent snapshot
+        self._tools: dict[str, PluginTool] = {}
+        self._tool_list: list[Any] = list(self._static_tools)
+        self.version = 0
+
+    @property
+    def tools(self) -> dict[str, PluginTool]:
+        return self._tools
+
+    @property
+    def tool_list(self) -> list[Any]:
+        """Prebuilt listing of built-in and plugin tools."""
+        return self._tool_list
+
+    def get(self, name: str) -> PluginTool | None:
+        return self._tools.get(name)
+
+    def add_listener(self, listener: Callable[[], Awaitable[None]]):
+        """Register a coroutine called after the tool set changes."""
+        self._listeners.append(listener)
+
+    def refresh(self) -> bool:
+        """Re-scan the plugin directory. Returns True if the tool set changed."""
+        if not self.plugin_dir.exists():
+            if self._manifests:
+                logger.warning(f"MCP plugin directory disappeared: {self.plugin_dir}")
+                self._manifests = {}
+                self._rebuild()
+                return True
+            return False
+
+        changed = False
+        seen: set[Path] = set()
+
+        for manifest_path in sorted(self.plugin_dir.glob("*.json")):
+            seen.add(manifest_path)
+            try:
+                stat = manifest_path.stat()
+            except OSError:
+                continue
+
+            previous = self._manifests.get(manifest_path)
+            if previous and previous.mtime_ns == stat.st_mtime_ns and previous.size == stat.st_size:
+                continue
+
+            try:
+                raw = manifest_path.read_bytes()
+            except OSError as exc:
+                logger.warning(f"Skipping unreadable plugin manifest {manifest_path.name}: {exc}")
+                continue
+
+            content_hash = hashlib.sha256(raw).hexdigest()
+            if previous and previous.content_hash == content_hash:
+                # Touched but not modified: remember the new stat, keep the parsed tools
+                previous.mtime_ns, previous.size = stat.st_mtime_ns, stat.st_size
+                continue
+
+            try:
+                tools = parse_manifest(json.loads(raw), manifest_path.stem, self.esql_dir)
+            except Exception as exc:
+                logger.warning(f"Skipping unreadable plugin manifest {manifest_path.name}: {exc}")
+                tools = {}
+
+            self._manifests[manifest_path] = _ManifestState(stat.st_mtime_ns, stat.st_size, content_hash, tools)
+            logger.info(f"{'Reloaded' if previous else 'Loaded'} plugin manifest {manifest_path.name}")
+            changed = True
+
+        for removed in set(self._manifests) - seen:
+            del self._manifests[removed]
+            logger.info(f"Unloaded plugin manifest {removed.name}")
+            changed = True
+
+        if changed:
+            self._rebuild()
+        return changed
+
+    def _rebuild(self):
+        tools: dict[str, PluginTool] = {}
+        for manifest_path in sorted(self._manifests):
+            tools.update(self._manifests[manifest_path].tools)
+
+        tool_list = self._static_tools + [self._tool_factory(tool) for tool in tools.values()]
+
+        self._tools, self._tool_list = tools, tool_list
+        self.version += 1
+        logger.info(f"Loaded {len(tools)} plugin tools from {self.plugin_dir} (registry v{self.version})")
+
+    async def watch(self, interval: float):
+        """Poll the plugin directory and notify listeners when tools change."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                changed = self.refresh()
+            except Exception as exc:
+                logger.error(f"Plugin registry refresh failed: {exc}")
+                continue
+            if not changed:
+                continue
+            for listener in list(self._listeners):
+                try:
+                    await listener()
+                except Exception as exc:
+                    logger.warning(f"Tools-changed listener failed: {exc}")
@@ -1,3 +1,3 @@
-from .slack_adapter import SlackAdapter
+from .slack_adapter import SlackAdapter, SlackDeliveryError
 
-__all__ = ["SlackAdapter"]
+__all__ = ["SlackAdapter", "SlackDeliveryError"]
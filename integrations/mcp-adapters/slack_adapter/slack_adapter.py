@@ -2,9 +2,17 @@
 Slack Integration Adapter for DataPulse
 """
 import os
+import asyncio
 import httpx
+from collections import OrderedDict
 from loguru import logger
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+
+SLACK_RESPONSE_URL_PREFIX = "https://hooks.slack.com/"
+
+
+class SlackDeliveryError(Exception):
+    """Slack did not accept a message (HTTP failure or an API error response)"""
 
 
 class SlackAdapter:
@@ -12,12 +20,111 @@ class SlackAdapter:
         self.webhook_url = os.getenv("SLACK_WEBHOOK_URL", "")
         self.bot_token = os.getenv("SLACK_BOT_TOKEN", "")
         self.channel = os.getenv("SLACK_CHANNEL", "#incident-alerts")
+        # Overridable for local stand-ins of the Web API (load tests, sandboxes)
+        self.api_base_url = os.getenv("SLACK_API_BASE_URL", "https://slack.com/api").rstrip("/")
+        self.update_debounce_seconds = float(os.getenv("SLACK_UPDATE_DEBOUNCE_SECONDS", "2.0"))
+        self.message_ref_cache_size = int(os.getenv("SLACK_MESSAGE_REF_CACHE_SIZE", "1000"))
+
+        # incident_id -> {"channel": ..., "ts": ...} of the living incident message, most recent last.
+        # Only a cache: the ref is also stored on the incident as slack_message.
+        self._message_refs: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        # incident_id -> loader returning the latest incident snapshot to render
+        self._pending_updates: Dict[str, Callable[[], Awaitable[Optional[Dict[str, Any]]]]] = {}
+        # incident_id -> task closing the currently open debounce window
+        self._debounce_windows: Dict[str, asyncio.Task] = {}
+        # Strong references so scheduled flushes are not garbage-collected mid-flight
+        self._background_tasks: set = set()
     
-    async def send_incident_alert(self, incident: Dict[str, Any]):
-        """Send incident alert to Slack channel"""
+    async def send_incident_alert(self, incident: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        """Send incident alert to Slack channel.
+
+        Returns the message reference ({"channel", "ts"}) when posted through the
+        Slack API so later state changes can update the same message in place.
+        Webhook posts cannot be edited and return None. Raises SlackDeliveryError
+        when the message was not posted.
+        """
         blocks = self._build_incident_blocks(incident)
         
-        await self._post_message(self.channel, blocks)
+        message_ref = await self._post_message(self.channel, blocks)
+        if message_ref:
+            self._remember_message_ref(incident["incident_id"], message_ref)
+        return message_ref
+
+    def _remember_message_ref(self, incident_id: str, message_ref: Dict[str, str]):
+        self._message_refs[incident_id] = message_ref
+        self._message_refs.move_to_end(incident_id)
+        while len(self._message_refs) > self.message_ref_cache_size:
+            self._message_refs.popitem(last=False)
+
+    @property
+    def can_update_messages(self) -> bool:
+        """In-place updates need chat.update, which is only available with a bot token"""
+        return bool(self.bot_token)
+
+    async def update_incident_message(self, incident: Dict[str, Any]) -> bool:
+        """Re-render the living incident message with the latest incident state"""
+        incident_id = incident.get("incident_id")
+        if not incident_id:
+            return False
+
+        message_ref = self._message_refs.get(incident_id) or incident.get("slack_message")
+        if not message_ref or not message_ref.get("ts"):
+            logger.debug(f"No Slack message to update for incident {incident_id}")
+            return False
+        if not self.can_update_messages:
+            logger.debug("Slack in-place updates require SLACK_BOT_TOKEN, skipping")
+            return False
+
+        self._remember_message_ref(incident_id, message_ref)
+        blocks = self._build_incident_blocks(incident)
+        return await self._update_via_api(message_ref["channel"], message_ref["ts"], blocks)
+
+    def schedule_incident_update(
+        self,
+        incident_id: str,
+        load_incident: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+    ):
+        """Coalesce rapid state changes into one chat.update per debounce window.
+
+        Only the most recent loader is kept. It is awaited when the window closes,
+        so the message always renders the latest stored incident state.
+        """
+        self._pending_updates[incident_id] = load_incident
+        if incident_id in self._debounce_windows:
+            return
+
+        task = asyncio.create_task(self._flush_after_debounce(incident_id))
+        self._debounce_windows[incident_id] = task
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def flush_pending_updates(self):
+        """Flush all scheduled updates immediately (used on shutdown)"""
+        windows = list(self._debounce_windows.values())
+        for task in windows:
+            task.cancel()
+        await asyncio.gather(*windows, return_exceptions=True)
+        for incident_id in list(self._pending_updates):
+            await self._flush_incident_update(incident_id)
+
+    async def _flush_after_debounce(self, incident_id: str):
+        try:
+            await asyncio.sleep(self.update_debounce_seconds)
+        finally:
+            # Close the window first so changes arriving during the flush open a new one
+            self._debounce_windows.pop(incident_id, None)
+        await self._flush_incident_update(incident_id)
+
+    async def _flush_incident_update(self, incident_id: str):
+        load_incident = self._pending_updates.pop(incident_id, None)
+        if load_incident is None:
+            return
+        try:
+            incident = await load_incident()
+            if incident:
+                await self.update_incident_message(incident)
+        except Exception as e:
+            logger.error(f"Failed to update Slack message for {incident_id}: {e}")
     
     async def send_action_approval_request(self, incident_id: str, action: Dict[str, Any]):
         """Send action approval request with interactive buttons"""
@@ -32,8 +139,29 @@ class SlackAdapter:
 
         await self._post_message(self.channel, blocks)
     
+    async def respond_to_interaction(self, response_url: str, text: str) -> bool:
+        """Reply only to the user who clicked a button, through the interaction's response_url"""
+        if not response_url.startswith(SLACK_RESPONSE_URL_PREFIX):
+            # The URL comes from the callback payload; never post anywhere but Slack
+            logger.warning(f"Ignoring Slack response_url outside {SLACK_RESPONSE_URL_PREFIX}")
+            return False
+        try:
+            async with httpx.AsyncClient() as client:
+                response = await client.post(
+                    response_url,
+                    json={"response_type": "ephemeral", "replace_original": False, "text": text},
+                    timeout=10.0
+                )
+        except Exception as e:
+            logger.error(f"Failed to respond to Slack interaction: {e}")
+            return False
+        if response.status_code != 200:
+            logger.error(f"Slack interaction response error: {response.status_code}")
+            return False
+        return True
+
     def _build_incident_blocks(self, incident: Dict[str, Any]) -> List[Dict]:
-        """Build Slack Block Kit blocks for incident alert"""
+        """Build Slack Block Kit blocks for the living incident message"""
         severity_prefix = {"critical": "[CRITICAL]", "high": "[HIGH]", "medium": "[MEDIUM]"}. get(
             incident.get("severity", "medium"), "[INFO]"
         )
@@ -54,19 +182,43 @@ class SlackAdapter:
                     {"type": "mrkdwn", "text": f"*Incident ID:*\n{incident['incident_id']}"},
                     {"type": "mrkdwn", "text": f"*Severity:*\n{incident['severity'].upper()}"},
                     {"type": "mrkdwn", "text": f"*Error Rate:*\n{metrics.get('error_rate', 0):.2%}"},
-                    {"type": "mrkdwn", "text": f"*P99 Latency:*\n{metrics.get('p99_latency_ms', 0):.0f}ms"}
-                ]
-            },
-            {
-                "type": "context",
-                "elements": [
-                    {
-                        "type": "mrkdwn",
-                        "text": f"Detected by Sentinel at {incident.get('detected_at', 'N/A')}"
-                    }
+                    {"type": "mrkdwn", "text": f"*P99 Latency:*\n{metrics.get('p99_latency_ms', 0):.0f}ms"},
+                    {"type": "mrkdwn", "text": f"*Status:*\n{incident.get('status', 'open').upper()}"}
                 ]
             }
         ]
+
+        report = incident.get("analyst_report")
+        if report:
+            root_cause = (report.get("root_cause") or "N/A")[:300]
+            blocks.append({
+                "type": "section",
+                "text": {
+                    "type": "mrkdwn",
+                    "text": f"*Root Cause ({float(report.get('confidence') or 0):.0%} confidence):*\n{root_cause}"
+                }
+            })
+
+        actions = incident.get("actions") or []
+        if actions:
+            lines = [
+                f"- {action.get('title') or action.get('action_type', 'Unknown')}: *{action.get('state', 'proposed')}*"
+                for action in actions
+            ]
+            blocks.append({
+                "type": "section",
+                "text": {"type": "mrkdwn", "text": "*Actions:*\n" + "\n".join(lines)}
+            })
+
+        blocks.append({
+            "type": "context",
+            "elements": [
+                {
+                    "type": "mrkdwn",
+                    "text": f"Detected by Sentinel at {incident.get('detected_at', 'N/A')}"
+                }
+            ]
+        })
         
         return blocks
     
@@ -108,14 +260,16 @@ class SlackAdapter:
         
         return blocks
     
-    async def _post_message(self, channel: str, blocks: List[Dict]):
-        """Post message to Slack using webhook or bot token"""
-        if self.webhook_url:
+    async def _post_message(self, channel: str, blocks: List[Dict]) -> Optional[Dict[str, str]]:
+        """Post message to Slack using bot token or webhook"""
+        # Prefer the API: only API posts return a ts that can be updated in place
+        if self.bot_token:
+            return await self._post_via_api(channel, blocks)
+        elif self.webhook_url:
             await self._post_via_webhook(blocks)
-        elif self.bot_token:
-            await self._post_via_api(channel, blocks)
         else:
             logger.warning("No Slack credentials configured")
+        return None
     
     async def _post_via_webhook(self, blocks: List[Dict]):
         """Post using webhook URL"""
@@ -126,27 +280,49 @@ class SlackAdapter:
                     json={"blocks": blocks},
                     timeout=10.0
                 )
-                if response.status_code == 200:
-                    logger.info("Slack message sent via webhook")
-                else:
-                    logger.error(f"Slack webhook error: {response.status_code}")
         except Exception as e:
             logger.error(f"Failed to send Slack message: {e}")
+            raise SlackDeliveryError(f"Slack webhook request failed: {e}") from e
+        if response.status_code != 200:
+            logger.error(f"Slack webhook error: {response.status_code}")
+            raise SlackDeliveryError(f"Slack webhook error: {response.status_code}")
+        logger.info("Slack message sent via webhook")
     
-    async def _post_via_api(self, channel: str, blocks: List[Dict]):
+    async def _post_via_api(self, channel: str, blocks: List[Dict]) -> Dict[str, str]:
         """Post using Slack API"""
         try:
             async with httpx.AsyncClient() as client:
                 response = await client.post(
-                    "https://slack.com/api/chat.postMessage",
+                    f"{self.api_base_url}/chat.postMessage",
                     json={"channel": channel, "blocks": blocks},
                     headers={"Authorization": f"Bearer {self.bot_token}"},
                     timeout=10.0
                 )
                 data = response.json()
-                if data.get("ok"):
-                    logger.info("Slack message sent via API")
-                else:
-                    logger.error(f"Slack API error: {data.get('error')}")
         except Exception as e:
             logger.error(f"Failed to send Slack message: {e}")
+            raise SlackDeliveryError(f"Slack API request failed: {e}") from e
+        if not data.get("ok"):
+            logger.error(f"Slack API error: {data.get('error')}")
+            raise SlackDeliveryError(f"Slack API error: {data.get('error')}")
+        logger.info("Slack message sent via API")
+        return {"channel": data.get("channel", channel), "ts": data.get("ts")}
+
+    async def _update_via_api(self, channel: str, ts: str, blocks: List[Dict]) -> bool:
+        """Update an existing message using Slack API chat.update"""
+        try:
+            async with httpx.AsyncClient() as client:
+                response = await client.post(
+                    f"{self.api_base_url}/chat.update",
+                    json={"channel": channel, "ts": ts, "blocks": blocks},
+                    headers={"Authorization": f"Bearer {self.bot_token}"},
+                    timeout=10.0
+                )
+                data = response.json()
+                if data.get("ok"):
+                    logger.info(f"Slack message {ts} updated via API")
+                    return True
+                logger.error(f"Slack API update error: {data.get('error')}")
+        except Exception as e:
+            logger.error(f"Failed to update Slack message: {e}")
+        return False
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from esql_tools import EsqlToolExecutor, EsqlToolSpec, load_esql_spec  # noqa: E402
+from plugin_registry import parse_manifest  # noqa: E402
+
+ESQL_DIR = Path(__file__).resolve().parents[3] / "tools" / "esql"
+
+
+class FakeES:
+    """Client without the esql namespace, like elasticsearch-py 8.11."""
+
+    def __init__(self, rows, delay=0.0):
+        self.rows = rows
+        self.delay = delay
+        self.requests = []
+
+    async def perform_request(self, method, path, params=None, headers=None, body=None):
+        self.requests.append(body)
+        await asyncio.sleep(self.delay)
+        values = [list(column) for column in zip(*self.rows)] if body.get("columnar") else self.rows
+        return {"columns": [{"name": "service.name"}, {"name": "count"}], "values": values}
+
+
+def test_template_reference_binds_params_and_inlines_durations():
+    spec = load_esql_spec({"esqlTool": "check_recent_deployments"}, ESQL_DIR)
+
+    assert spec.input_schema()["required"] == ["service_name"]
+    query, params = spec.bind(spec.normalize_arguments({"service_name": 'pay"ment'}))
+
+    assert 'service.name == ?service_name' in query
+    assert "NOW() - 1 hours" in query
+    assert params == [{"service_name": 'pay"ment'}]
+
+
+def test_invalid_duration_and_missing_argument_are_rejected():
+    spec = load_esql_spec({"esqlTool": "detect_anomalies"}, ESQL_DIR)
+
+    with pytest.raises(ValueError, match="Missing required argument"):
+        spec.normalize_arguments({})
+    with pytest.raises(ValueError, match="Invalid duration"):
+        spec.bind(spec.normalize_arguments({"service_name": "x", "time_window": "1h | DROP x"}))
+
+
+def test_manifest_with_undeclared_placeholder_is_skipped():
+    tools = parse_manifest({
+        "plugin_id": "ops",
+        "tools": [
+            {"name": "broken", "type": "esql", "configuration": {"query": "FROM x | WHERE a == ${b}", "params": {}}},
+            {"name": "static"},
+        ],
+    }, "ops", ESQL_DIR)
+
+    assert list(tools) == ["ops.static"]
+
+
+def test_results_are_cached_by_normalized_arguments_and_capped():
+    es = FakeES([["payment", n] for n in range(7)])
+    executor = EsqlToolExecutor(client_factory=lambda: es, chunk_rows=2)
+    # Pin the clock so both calls land in the same cache bucket
+    executor.library.clock = lambda: 1000.0
+    spec = EsqlToolSpec(
+        query='FROM logs | WHERE service.name == "${service_name}" AND latency > ${threshold}',
+        params={"service_name": {"type": "string"}, "threshold": {"type": "number", "default": 500}},
+        max_rows=5,
+    )
+
+    async def scenario():
+        first = await executor.execute("ops.errors", spec, {"service_name": "payment"})
+        second = await executor.execute("ops.errors", spec, {"service_name": "payment", "threshold": "500"})
+        return first, second
+
+    (result, source), (_, second_source) = asyncio.run(scenario())
+
+    assert (source, second_source) == ("elasticsearch", "cache")
+    assert len(es.requests) == 1
+    assert es.requests[-1]["query"].endswith("| LIMIT 6")
+    assert result.truncated and result.num_rows == 5
+
+    chunks = list(executor.render("ops.errors", result, source))
+    assert json.loads(chunks[0])["chunks"] == 3
+    assert [len(json.loads(chunk)) for chunk in chunks[1:]] == [2, 2, 1]
+    assert json.loads(chunks[-1]) == [{"service.name": "payment", "count": 4}]
+
+
+def test_concurrent_identical_calls_share_one_query():
+    es = FakeES([["payment", 1]], delay=0.05)
+    executor = EsqlToolExecutor(client_factory=lambda: es)
+    spec = EsqlToolSpec(query="FROM logs", params={}, cache_ttl=0)
+
+    async def scenario():
+        return await asyncio.gather(*(executor.execute("ops.all", spec, {}) for _ in range(4)))
+
+    results = asyncio.run(scenario())
+
+    assert len(es.requests) == 1
+    assert sorted(source for _, source in results) == ["coalesced"] * 3 + ["elasticsearch"]
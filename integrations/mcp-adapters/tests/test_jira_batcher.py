@@ -0,0 +1,119 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from jira_adapter import JiraAdapter, JiraBatcher  # noqa: E402
+
+
+def _incident(n):
+    return {
+        "incident_id": f"INC-{n}",
+        "service": "payment-service",
+        "severity": "high",
+        "metrics": {"error_rate": 0.1, "p99_latency_ms": 800},
+        "evidence": [],
+    }
+
+
+def _batcher(monkeypatch, handler):
+    monkeypatch.setenv("JIRA_BASE_URL", "https://jira.example.com")
+    monkeypatch.setenv("JIRA_BATCH_WINDOW_SECONDS", "0.01")
+    adapter = JiraAdapter()
+    adapter._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return JiraBatcher(adapter)
+
+
+def test_creates_within_window_use_one_bulk_call(monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        body = json.loads(request.content)
+        assert request.url.path == "/rest/api/3/issue/bulk"
+        assert len(body["issueUpdates"]) == 3
+        return httpx.Response(201, json={
+            "issues": [{"key": "OPS-1"}, {"key": "OPS-3"}],
+            "errors": [{"failedElementNumber": 1, "elementErrors": {"errors": {"priority": "invalid"}}}],
+        })
+
+    batcher = _batcher(monkeypatch, handler)
+
+    async def scenario():
+        return await asyncio.gather(*(batcher.create_incident_ticket(_incident(n)) for n in range(3)))
+
+    keys = asyncio.run(scenario())
+
+    assert keys == ["OPS-1", None, "OPS-3"]
+    assert len(requests) == 1
+    assert batcher.stats()["api_calls_saved"] == 2
+
+
+def test_comments_to_same_ticket_are_coalesced(monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(201, json={})
+
+    batcher = _batcher(monkeypatch, handler)
+
+    async def scenario():
+        return await asyncio.gather(
+            batcher.add_comment("OPS-7", "Action ACT-1 approved"),
+            batcher.add_comment("OPS-7", "Action ACT-2 rejected"),
+            batcher.add_comment("OPS-8", "Action ACT-3 approved"),
+        )
+
+    results = asyncio.run(scenario())
+
+    assert results == [True, True, True]
+    assert len(requests) == 2
+    ops7 = next(r for r in requests if r.url.path.endswith("/OPS-7/comment"))
+    assert json.loads(ops7.content)["body"] == {
+        "type": "doc",
+        "version": 1,
+        "content": [
+            {"type": "paragraph", "content": [{"type": "text", "text": "Action ACT-1 approved"}]},
+            {"type": "paragraph", "content": [{"type": "text", "text": "Action ACT-2 rejected"}]},
+        ],
+    }
+    assert batcher.stats() == {"operations": 3, "api_calls": 2, "api_calls_saved": 1, "queued": 0}
+
+
+def test_caller_timeout_does_not_interrupt_a_full_batch(monkeypatch):
+    monkeypatch.setenv("JIRA_BATCH_MAX_SIZE", "2")
+    requests = []
+
+    async def handler(request):
+        requests.append(request.url.path)
+        await asyncio.sleep(0.05)
+        if request.url.path.endswith("/bulk"):
+            return httpx.Response(201, json={"issues": [{"key": "OPS-1"}, {"key": "OPS-2"}], "errors": []})
+        return httpx.Response(201, json={})
+
+    batcher = _batcher(monkeypatch, handler)
+
+    async def scenario():
+        first = asyncio.create_task(batcher.create_incident_ticket(_incident(1)))
+        comment = asyncio.create_task(batcher.add_comment("OPS-7", "Action ACT-1 approved"))
+        await asyncio.sleep(0)
+        # The second create fills the batch and flushes it; its caller gives up mid-request
+        timed_out = False
+        try:
+            await asyncio.wait_for(batcher.create_incident_ticket(_incident(2)), 0.01)
+        except asyncio.TimeoutError:
+            timed_out = True
+        results = await asyncio.gather(first, comment)
+        await batcher.aclose()
+        return timed_out, results
+
+    timed_out, results = asyncio.run(scenario())
+
+    assert timed_out
+    assert results == ["OPS-1", True]
+    assert sorted(requests) == ["/rest/api/3/issue/OPS-7/comment", "/rest/api/3/issue/bulk"]
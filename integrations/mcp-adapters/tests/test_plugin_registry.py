@@ -0,0 +1,83 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from plugin_registry import PluginRegistry  # noqa: E402
+
+
+def _write_manifest(path, plugin_id, tool_names):
+    path.write_text(json.dumps({
+        "plugin_id": plugin_id,
+        "tools": [{"name": name, "description": f"{name} tool"} for name in tool_names],
+    }))
+
+
+def _registry(plugin_dir):
+    built = []
+
+    def factory(tool):
+        built.append(tool.name)
+        return tool.name
+
+    return PluginRegistry(plugin_dir, tool_factory=factory, static_tools=["send_slack_alert"]), built
+
+
+def test_tool_list_is_prebuilt_and_only_rebuilt_on_change(tmp_path):
+    _write_manifest(tmp_path / "ops.json", "ops", ["Page Oncall"])
+    registry, built = _registry(tmp_path)
+
+    assert registry.refresh() is True
+    listing = registry.tool_list
+    assert listing == ["send_slack_alert", "ops.page_oncall"]
+
+    assert registry.refresh() is False
+    assert registry.tool_list is listing
+    assert built == ["ops.page_oncall"]
+
+
+def test_only_modified_manifests_are_reparsed(tmp_path):
+    ops = tmp_path / "ops.json"
+    status = tmp_path / "status.json"
+    _write_manifest(ops, "ops", ["page_oncall"])
+    _write_manifest(status, "status", ["open_incident"])
+    registry, _ = _registry(tmp_path)
+    registry.refresh()
+    status_tools_before = registry._manifests[status].tools
+
+    _write_manifest(ops, "ops", ["page_oncall", "ack_page"])
+    stat = ops.stat()
+    os.utime(ops, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert registry.refresh() is True
+    assert set(registry.tools) == {"ops.page_oncall", "ops.ack_page", "status.open_incident"}
+    assert registry._manifests[status].tools is status_tools_before
+    assert registry.version == 2
+
+
+def test_touched_but_unchanged_manifest_does_not_reload(tmp_path):
+    ops = tmp_path / "ops.json"
+    _write_manifest(ops, "ops", ["page_oncall"])
+    registry, _ = _registry(tmp_path)
+    registry.refresh()
+
+    stat = ops.stat()
+    os.utime(ops, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert registry.refresh() is False
+    assert registry.version == 1
+
+
+def test_removed_manifest_unloads_tools(tmp_path):
+    ops = tmp_path / "ops.json"
+    _write_manifest(ops, "ops", ["page_oncall"])
+    registry, _ = _registry(tmp_path)
+    registry.refresh()
+
+    ops.unlink()
+
+    assert registry.refresh() is True
+    assert registry.tools == {}
+    assert registry.tool_list == ["send_slack_alert"]
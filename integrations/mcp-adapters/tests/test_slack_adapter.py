@@ -0,0 +1,85 @@
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from slack_adapter.slack_adapter import SlackAdapter  # noqa: E402
+
+
+def _incident(status="open", actions=None):
+    return {
+        "incident_id": "INC-1",
+        "service": "payment-service",
+        "severity": "high",
+        "status": status,
+        "metrics": {"error_rate": 0.2, "p99_latency_ms": 900},
+        "slack_message": {"channel": "C123", "ts": "1700000000.000100"},
+        "actions": actions or [],
+    }
+
+
+def test_rapid_updates_are_coalesced_into_one_chat_update(monkeypatch):
+    monkeypatch.setenv("SLACK_BOT_TOKEN", "xoxb-test")
+    monkeypatch.setenv("SLACK_UPDATE_DEBOUNCE_SECONDS", "0.01")
+    adapter = SlackAdapter()
+    adapter._update_via_api = AsyncMock(return_value=True)
+
+    loads = []
+
+    def loader(snapshot):
+        async def _load():
+            loads.append(snapshot)
+            return snapshot
+        return _load
+
+    async def scenario():
+        adapter.schedule_incident_update("INC-1", loader(_incident("open")))
+        adapter.schedule_incident_update("INC-1", loader(_incident("investigating")))
+        adapter.schedule_incident_update(
+            "INC-1",
+            loader(_incident("investigating", [{"title": "Rollback", "state": "approved"}])),
+        )
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+
+    assert len(loads) == 1
+    adapter._update_via_api.assert_awaited_once()
+    channel, ts, blocks = adapter._update_via_api.await_args.args
+    assert (channel, ts) == ("C123", "1700000000.000100")
+    rendered = str(blocks)
+    assert "INVESTIGATING" in rendered
+    assert "Rollback: *approved*" in rendered
+
+
+def test_update_skipped_without_message_reference(monkeypatch):
+    monkeypatch.setenv("SLACK_BOT_TOKEN", "xoxb-test")
+    adapter = SlackAdapter()
+    adapter._update_via_api = AsyncMock(return_value=True)
+
+    incident = _incident()
+    incident.pop("slack_message")
+
+    assert asyncio.run(adapter.update_incident_message(incident)) is False
+    adapter._update_via_api.assert_not_awaited()
+
+
+def test_message_references_are_bounded_and_recent_ones_kept(monkeypatch):
+    monkeypatch.setenv("SLACK_BOT_TOKEN", "xoxb-test")
+    monkeypatch.setenv("SLACK_MESSAGE_REF_CACHE_SIZE", "2")
+    adapter = SlackAdapter()
+    adapter._post_message = AsyncMock(side_effect=lambda channel, blocks: {"channel": channel, "ts": str(len(blocks))})
+    adapter._update_via_api = AsyncMock(return_value=True)
+
+    async def scenario():
+        for n in range(1, 4):
+            await adapter.send_incident_alert(dict(_incident(), incident_id=f"INC-{n}"))
+        # Touching INC-2 keeps it over INC-3 when INC-4 is added
+        await adapter.update_incident_message(dict(_incident(), incident_id="INC-2", slack_message=None))
+        await adapter.send_incident_alert(dict(_incident(), incident_id="INC-4"))
+
+    asyncio.run(scenario())
+
+    assert list(adapter._message_refs) == ["INC-2", "INC-4"]
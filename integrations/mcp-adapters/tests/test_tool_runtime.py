@@ -0,0 +1,70 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from tool_runtime import ToolRuntime  # noqa: E402
+
+
+def test_calls_beyond_the_limit_wait_for_a_slot():
+    runtime = ToolRuntime(default_max_concurrency=2, default_timeout=5)
+    running = []
+    peak = []
+
+    async def call():
+        running.append(1)
+        peak.append(len(running))
+        await asyncio.sleep(0.02)
+        running.pop()
+        return "ok"
+
+    async def scenario():
+        return await asyncio.gather(*(runtime.run("create_jira_ticket", call) for _ in range(5)))
+
+    assert asyncio.run(scenario()) == ["ok"] * 5
+    assert max(peak) == 2
+
+    stats = runtime.snapshot()["create_jira_ticket"]
+    assert stats["calls"] == stats["successes"] == 5
+    assert stats["in_flight"] == 0
+    assert stats["queue_wait_ms"]["max"] > 0
+
+
+def test_slow_tool_times_out_without_blocking_other_tools():
+    runtime = ToolRuntime(overrides={"send_slack_alert": {"timeout_seconds": 0.05}})
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    async def fast():
+        return "listed"
+
+    async def scenario():
+        slow_call = asyncio.create_task(runtime.run("send_slack_alert", slow))
+        assert await runtime.run("ops.lookup", fast) == "listed"
+        with pytest.raises(TimeoutError, match="send_slack_alert"):
+            await slow_call
+
+    asyncio.run(scenario())
+
+    snapshot = runtime.snapshot()
+    assert snapshot["send_slack_alert"]["timeouts"] == 1
+    assert snapshot["send_slack_alert"]["timeout_seconds"] == 0.05
+    assert snapshot["ops.lookup"]["successes"] == 1
+
+
+def test_failures_are_counted_and_reraised():
+    runtime = ToolRuntime()
+
+    async def broken():
+        raise RuntimeError("jira down")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(runtime.run("create_jira_ticket", broken))
+
+    stats = runtime.snapshot()["create_jira_ticket"]
+    assert (stats["failures"], stats["successes"]) == (1, 0)
+    assert stats["latency_ms"]["max"] is not None
@@ -0,0 +1,131 @@
+"""Per-tool execution limits for the MCP server.
+
+``ToolRuntime`` bounds how many calls of a tool run at once, applies a per-tool
+timeout (covering the wait for a slot) and records call latency.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Optional
+
+from loguru import logger
+
+
+@dataclass
+class ToolLimits:
+    max_concurrency: int
+    timeout_seconds: float
+
+
+class ToolCallStats:
+    """Call counters and a rolling latency window for a single tool."""
+
+    def __init__(self, latency_window: int = 500):
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self.latencies_ms: Deque[float] = deque(maxlen=latency_window)
+        self.queue_waits_ms: Deque[float] = deque(maxlen=latency_window)
+
+    @staticmethod
+    def _summary(samples) -> dict[str, Any]:
+        ordered = sorted(samples)
+        if not ordered:
+            return {"avg": None, "p50": None, "p95": None, "max": None}
+        return {
+            "avg": round(sum(ordered) / len(ordered), 2),
+            "p50": round(ordered[int(0.5 * (len(ordered) - 1))], 2),
+            "p95": round(ordered[int(0.95 * (len(ordered) - 1))], 2),
+            "max": round(ordered[-1], 2),
+        }
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "in_flight": self.in_flight,
+            "latency_ms": self._summary(self.latencies_ms),
+            "queue_wait_ms": self._summary(self.queue_waits_ms),
+        }
+
+
+class ToolRuntime:
+    """Per-tool concurrency limits, timeouts and latency stats."""
+
+    def __init__(
+        self,
+        default_max_concurrency: Optional[int] = None,
+        default_timeout: Optional[float] = None,
+        overrides: Optional[dict[str, dict[str, Any]]] = None,
+    ):
+        self.default_limits = ToolLimits(
+            max_concurrency=default_max_concurrency or int(os.getenv("MCP_TOOL_MAX_CONCURRENCY", "8")),
+            timeout_seconds=default_timeout or float(os.getenv("MCP_TOOL_TIMEOUT_SECONDS", "30")),
+        )
+        if overrides is None:
+            # e.g. {"create_jira_ticket": {"max_concurrency": 4, "timeout_seconds": 20}}
+            overrides = json.loads(os.getenv("MCP_TOOL_LIMITS", "{}") or "{}")
+        self._overrides = overrides
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._stats: dict[str, ToolCallStats] = {}
+
+    def limits_for(self, name: str) -> ToolLimits:
+        override = self._overrides.get(name, {})
+        return ToolLimits(
+            max_concurrency=int(override.get("max_concurrency", self.default_limits.max_concurrency)),
+            timeout_seconds=float(override.get("timeout_seconds", self.default_limits.timeout_seconds)),
+        )
+
+    async def run(self, name: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a tool call within its concurrency slot and timeout."""
+        limits = self.limits_for(name)
+        semaphore = self._semaphores.get(name)
+        if semaphore is None:
+            semaphore = self._semaphores[name] = asyncio.Semaphore(limits.max_concurrency)
+        stats = self._stats.setdefault(name, ToolCallStats())
+        stats.calls += 1
+
+        started = time.perf_counter()
+
+        async def acquire_and_call():
+            async with semaphore:
+                stats.queue_waits_ms.append((time.perf_counter() - started) * 1000)
+                stats.in_flight += 1
+                try:
+                    return await call()
+                finally:
+                    stats.in_flight -= 1
+
+        try:
+            # The timeout covers queueing for a slot as well as the call itself
+            result = await asyncio.wait_for(acquire_and_call(), timeout=limits.timeout_seconds)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            logger.error(f"MCP tool {name} timed out after {limits.timeout_seconds}s")
+            raise TimeoutError(f"Tool {name} timed out after {limits.timeout_seconds}s") from None
+        except Exception:
+            stats.failures += 1
+            raise
+        finally:
+            stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+
+        stats.successes += 1
+        return result
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            name: {
+                "max_concurrency": self.limits_for(name).max_concurrency,
+                "timeout_seconds": self.limits_for(name).timeout_seconds,
+                **stats.snapshot(),
+            }
+            for name, stats in self._stats.items()
+        }
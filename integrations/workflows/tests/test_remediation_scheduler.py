@@ -0,0 +1,85 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from workflow_adapter import RemediationScheduler  # noqa: E402
+
+
+class _ManualTracker:
+    """Tracker stand-in whose executions finish only when the test says so."""
+
+    def __init__(self):
+        self.started = []
+        self._completions = {}
+
+    def submit(self, incident_id, action, on_complete=None):
+        self.started.append(action["action_id"])
+        self._completions[action["action_id"]] = (incident_id, action, on_complete)
+
+    async def finish(self, action_id, succeeded=True):
+        incident_id, action, on_complete = self._completions.pop(action_id)
+        await on_complete(incident_id, action, {"succeeded": succeeded, "status": "completed"})
+
+
+def _action(action_id, action_type="rollback", risk_score=0.5):
+    return {"action_id": action_id, "action_type": action_type, "risk_score": risk_score}
+
+
+def test_conflicting_actions_for_a_service_are_serialized():
+    tracker = _ManualTracker()
+    scheduler = RemediationScheduler(tracker)
+
+    async def scenario():
+        scheduler.submit("INC-1", "payments", _action("A1", "rollback"))
+        scheduler.submit("INC-2", "payments", _action("A2", "scale_out"))
+        scheduler.submit("INC-3", "auth", _action("A3", "rollback"))
+        assert tracker.started == ["A1", "A3"]
+        assert [item["action_id"] for item in scheduler.snapshot()["queued"]] == ["A2"]
+
+        await tracker.finish("A1")
+        assert tracker.started == ["A1", "A3", "A2"]
+
+    asyncio.run(scenario())
+
+
+def test_parallel_safe_types_only_serialize_per_type(monkeypatch):
+    monkeypatch.setenv("REMEDIATION_PARALLEL_SAFE_TYPES", "cache_warmup,documentation")
+    tracker = _ManualTracker()
+    scheduler = RemediationScheduler(tracker)
+
+    scheduler.submit("INC-1", "payments", _action("W1", "cache_warmup"))
+    scheduler.submit("INC-1", "payments", _action("D1", "documentation"))
+    scheduler.submit("INC-2", "payments", _action("W2", "cache_warmup"))
+    scheduler.submit("INC-2", "payments", _action("R1", "rollback"))
+
+    assert tracker.started == ["W1", "D1"]
+
+
+def test_global_cap_and_queue_ordering(monkeypatch):
+    monkeypatch.setenv("REMEDIATION_MAX_CONCURRENT", "1")
+    tracker = _ManualTracker()
+    scheduler = RemediationScheduler(tracker)
+
+    async def scenario():
+        scheduler.submit("INC-1", "svc-a", _action("A1", risk_score=0.9))
+        scheduler.submit("INC-2", "svc-b", _action("B1", risk_score=0.8))
+        scheduler.submit("INC-3", "svc-c", _action("C1", risk_score=0.1))
+        scheduler.submit("INC-4", "svc-d", _action("D1", risk_score=0.8))
+
+        queued = [item["action_id"] for item in scheduler.snapshot()["queued"]]
+        assert queued == ["C1", "B1", "D1"]
+
+        await tracker.finish("A1")
+        await tracker.finish("C1")
+        assert tracker.started == ["A1", "C1", "B1"]
+
+    asyncio.run(scenario())
+
+
+def test_duplicate_submission_is_ignored():
+    scheduler = RemediationScheduler(_ManualTracker())
+
+    assert scheduler.submit("INC-1", "payments", _action("A1")) is True
+    assert scheduler.submit("INC-1", "payments", _action("A1")) is False
@@ -0,0 +1,68 @@
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from workflow_adapter import WorkflowExecutionTracker  # noqa: E402
+
+
+class _FakeFlowsAdapter:
+    def __init__(self, final_statuses):
+        self.final_statuses = final_statuses
+        self.status_calls = []
+        self.polls_until_done = 2
+
+    async def trigger_remediation(self, incident_id, action):
+        return {"status": "triggered", "execution_id": f"exec-{action['action_id']}"}
+
+    async def get_execution_statuses(self, execution_ids):
+        self.status_calls.append(list(execution_ids))
+        if len(self.status_calls) < self.polls_until_done:
+            return {eid: {"execution_id": eid, "status": "running"} for eid in execution_ids}
+        return {
+            eid: {"execution_id": eid, "status": self.final_statuses[eid]}
+            for eid in execution_ids
+        }
+
+
+def test_executions_are_polled_together_and_reach_terminal_state(monkeypatch):
+    monkeypatch.setenv("WORKFLOW_POLL_INTERVAL_SECONDS", "0.01")
+    adapter = _FakeFlowsAdapter({"exec-A1": "completed", "exec-A2": "failed", "exec-A3": "completed"})
+    tracker = WorkflowExecutionTracker(adapter)
+    outcomes = {}
+
+    async def on_complete(incident_id, action, outcome):
+        outcomes[action["action_id"]] = outcome
+
+    async def scenario():
+        tasks = [
+            tracker.submit("INC-1", {"action_id": action_id, "action_type": "rollback"}, on_complete)
+            for action_id in ("A1", "A2", "A3")
+        ]
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+
+    assert {k: v["succeeded"] for k, v in outcomes.items()} == {"A1": True, "A2": False, "A3": True}
+    assert outcomes["A2"]["status"] == "failed"
+    # One shared poller: every poll covers all in-flight executions in one request
+    assert all(len(batch) == 3 for batch in adapter.status_calls)
+    snapshot = tracker.snapshot()
+    assert snapshot["status_requests"] == snapshot["status_polls"] == len(adapter.status_calls)
+    assert snapshot["succeeded"] == 2 and snapshot["failed"] == 1
+    assert snapshot["in_flight"] == 0
+
+
+def test_execution_times_out(monkeypatch):
+    monkeypatch.setenv("WORKFLOW_POLL_INTERVAL_SECONDS", "0.01")
+    monkeypatch.setenv("WORKFLOW_EXECUTION_TIMEOUT_SECONDS", "0.05")
+    adapter = _FakeFlowsAdapter({})
+    adapter.polls_until_done = 10**6
+    tracker = WorkflowExecutionTracker(adapter)
+
+    outcome = asyncio.run(tracker.execute("INC-1", {"action_id": "A1"}))
+
+    assert outcome["succeeded"] is False
+    assert outcome["status"] == "timed_out"
+    assert tracker.snapshot()["timed_out"] == 1
@@ -1,8 +1,17 @@
 import os
+import time
+import asyncio
+import itertools
 import httpx
-from datetime import datetime
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from loguru import logger
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Callable, Awaitable
+
+# Elastic Flows execution statuses that end an execution
+SUCCESS_STATUSES = {"completed", "succeeded", "success"}
+FAILURE_STATUSES = {"failed", "error", "cancelled", "canceled", "timed_out"}
 
 class WorkflowAdapter:
     """
@@ -70,6 +79,27 @@ class WorkflowAdapter:
             logger.error(f"Error calling Elastic Flow API: {e}")
             return {"status": "error", "message": str(e)}
 
+    async def get_execution_statuses(self, execution_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch the status of several Elastic Flows executions in one request.
+        """
+        url = f"{self.kibana_url}/api/flows/v1/executions"
+        headers = {
+            "Authorization": f"ApiKey {self.api_key}",
+            "kbn-xsrf": "true"
+        }
+
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            response = await client.get(url, params={"ids": ",".join(execution_ids)}, headers=headers)
+            response.raise_for_status()
+            data = response.json()
+
+        return {
+            execution["execution_id"]: execution
+            for execution in data.get("executions", [])
+            if execution.get("execution_id")
+        }
+
     async def _mock_workflow_run(self, incident_id: str, action: Dict[str, Any]) -> Dict[str, Any]:
         """
         Simulate a successful workflow execution.
@@ -86,5 +116,336 @@ class WorkflowAdapter:
             ]
         }
 
+
+class WorkflowExecutionTracker:
+    """
+    Tracks remediation executions from trigger to terminal state.
+
+    Running executions are held by strong references, and all in-flight Elastic
+    Flows executions are polled together by one shared poller on a fixed schedule
+    instead of one poller per execution.
+    """
+    def __init__(self, adapter: Optional[WorkflowAdapter] = None):
+        self.adapter = adapter or WorkflowAdapter()
+        self.poll_interval = float(os.getenv("WORKFLOW_POLL_INTERVAL_SECONDS", "5"))
+        self.poll_batch_size = int(os.getenv("WORKFLOW_POLL_BATCH_SIZE", "50"))
+        self.execution_timeout = float(os.getenv("WORKFLOW_EXECUTION_TIMEOUT_SECONDS", "900"))
+
+        self._tasks: set = set()
+        # execution_id -> future resolved by the shared poller with the final status payload
+        self._awaiting_status: Dict[str, asyncio.Future] = {}
+        self._poller: Optional[asyncio.Task] = None
+
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.status_polls = 0
+        self.status_requests = 0
+        self.latencies_ms = deque(maxlen=500)
+
+    def submit(
+        self,
+        incident_id: str,
+        action: Dict[str, Any],
+        on_complete: Optional[Callable[[str, Dict[str, Any], Dict[str, Any]], Awaitable[None]]] = None,
+    ) -> asyncio.Task:
+        """
+        Start an execution in the background and call on_complete(incident_id, action, outcome)
+        once it reaches a terminal state.
+        """
+        task = asyncio.create_task(self._run(incident_id, action, on_complete))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _run(self, incident_id, action, on_complete):
+        outcome = await self.execute(incident_id, action)
+        if on_complete:
+            try:
+                await on_complete(incident_id, action, outcome)
+            except Exception as e:
+                logger.error(f"Workflow completion handler failed for {incident_id}/{action.get('action_id')}: {e}")
+
+    async def execute(self, incident_id: str, action: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Trigger the remediation and wait for its terminal state.
+
+        Returns {"succeeded": bool, "status": str, "execution_id": str|None, "duration_ms": float, ...}
+        """
+        self.submitted += 1
+        started = time.perf_counter()
+
+        try:
+            result = await self.adapter.trigger_remediation(incident_id, action)
+        except Exception as e:
+            result = {"status": "error", "message": str(e)}
+
+        status = (result.get("status") or "unknown").lower()
+        execution_id = result.get("execution_id")
+
+        if status == "triggered" and execution_id:
+            status, result = await self._wait_for_terminal_status(execution_id, result)
+
+        succeeded = status in SUCCESS_STATUSES
+        duration_ms = (time.perf_counter() - started) * 1000
+        self.latencies_ms.append(duration_ms)
+        if succeeded:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+        logger.info(
+            f"Workflow for {incident_id}/{action.get('action_id')} finished with status "
+            f"{status} in {duration_ms:.0f}ms"
+        )
+        return {
+            "succeeded": succeeded,
+            "status": status,
+            "execution_id": execution_id,
+            "duration_ms": round(duration_ms, 2),
+            "source": result.get("source"),
+            "error": result.get("error") or result.get("message"),
+        }
+
+    async def _wait_for_terminal_status(self, execution_id: str, trigger_result: Dict[str, Any]):
+        future = asyncio.get_running_loop().create_future()
+        self._awaiting_status[execution_id] = future
+        self._ensure_poller()
+        try:
+            final = await asyncio.wait_for(future, timeout=self.execution_timeout)
+            return (final.get("status") or "unknown").lower(), {**trigger_result, **final}
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            logger.error(f"Workflow execution {execution_id} did not finish within {self.execution_timeout}s")
+            return "timed_out", {**trigger_result, "error": "execution timed out"}
+        finally:
+            self._awaiting_status.pop(execution_id, None)
+
+    def _ensure_poller(self):
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll_loop())
+
+    async def _poll_loop(self):
+        while self._awaiting_status:
+            await asyncio.sleep(self.poll_interval)
+            execution_ids = [eid for eid, fut in self._awaiting_status.items() if not fut.done()]
+            if not execution_ids:
+                continue
+
+            self.status_polls += 1
+            batches = [
+                execution_ids[i:i + self.poll_batch_size]
+                for i in range(0, len(execution_ids), self.poll_batch_size)
+            ]
+            results = await asyncio.gather(
+                *(self.adapter.get_execution_statuses(batch) for batch in batches),
+                return_exceptions=True,
+            )
+            self.status_requests += len(batches)
+
+            for batch, statuses in zip(batches, results):
+                if isinstance(statuses, Exception):
+                    logger.warning(f"Failed to poll {len(batch)} workflow executions: {statuses}")
+                    continue
+                for execution_id, execution in statuses.items():
+                    status = (execution.get("status") or "").lower()
+                    future = self._awaiting_status.get(execution_id)
+                    if future and not future.done() and status in SUCCESS_STATUSES | FAILURE_STATUSES:
+                        future.set_result(execution)
+
+    async def aclose(self):
+        """Cancel the shared poller and any running executions"""
+        tasks = list(self._tasks) + ([self._poller] if self._poller else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies_ms)
+        return {
+            "in_flight": len(self._tasks),
+            "awaiting_status": len(self._awaiting_status),
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "status_polls": self.status_polls,
+            "status_requests": self.status_requests,
+            "latency_ms": {
+                "avg": round(sum(latencies) / len(latencies), 2) if latencies else None,
+                "p95": round(latencies[int(0.95 * (len(latencies) - 1))], 2) if latencies else None,
+                "max": round(latencies[-1], 2) if latencies else None,
+            },
+        }
+
+
+@dataclass
+class QueuedRemediation:
+    """A remediation waiting for (or holding) an execution slot."""
+    incident_id: str
+    service: str
+    action: Dict[str, Any]
+    on_complete: Optional[Callable[[str, Dict[str, Any], Dict[str, Any]], Awaitable[None]]]
+    risk_score: float
+    approved_at: float
+    sequence: int
+    started_at: Optional[float] = None
+    exclusive: bool = True
+    approved_at_iso: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+    @property
+    def action_id(self) -> str:
+        return self.action.get("action_id")
+
+    @property
+    def action_type(self) -> str:
+        return (self.action.get("action_type") or "unknown").lower()
+
+    @property
+    def order_key(self):
+        # Lowest risk first, then first approved
+        return (self.risk_score, self.approved_at, self.sequence)
+
+    def describe(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "incident_id": self.incident_id,
+            "action_id": self.action_id,
+            "action_type": self.action_type,
+            "service": self.service,
+            "risk_score": self.risk_score,
+            "approved_at": self.approved_at_iso,
+            "waited_seconds": round((self.started_at or now) - self.approved_at, 3),
+            "running_seconds": round(now - self.started_at, 3) if self.started_at else None,
+        }
+
+
+class RemediationScheduler:
+    """
+    Serializes conflicting remediations and caps global concurrency.
+
+    Per service, at most one exclusive action (rollback, scale_up, ...) runs at a
+    time and nothing else runs alongside it. Action types listed as parallel-safe
+    may run next to each other, but never two of the same type for one service.
+    Everything else waits in a queue ordered by risk score, then approval time.
+    """
+    def __init__(self, tracker: Optional[WorkflowExecutionTracker] = None):
+        self.tracker = tracker or get_workflow_tracker()
+        self.max_concurrent = int(os.getenv("REMEDIATION_MAX_CONCURRENT", "4"))
+        self.parallel_safe_types = {
+            action_type.strip().lower()
+            for action_type in os.getenv("REMEDIATION_PARALLEL_SAFE_TYPES", "documentation,cache_warmup").split(",")
+            if action_type.strip()
+        }
+
+        self._queue: List[QueuedRemediation] = []
+        self._running: Dict[tuple, QueuedRemediation] = {}
+        self._sequence = itertools.count()
+
+        self.completed = 0
+        self.queue_waits_ms = deque(maxlen=500)
+
+    def submit(
+        self,
+        incident_id: str,
+        service: Optional[str],
+        action: Dict[str, Any],
+        on_complete: Optional[Callable[[str, Dict[str, Any], Dict[str, Any]], Awaitable[None]]] = None,
+    ) -> bool:
+        """
+        Queue an approved action. Returns False if it is already queued or running.
+        """
+        key = (incident_id, action.get("action_id"))
+        if key in self._running or any((item.incident_id, item.action_id) == key for item in self._queue):
+            logger.warning(f"Remediation {key} is already scheduled, ignoring duplicate submission")
+            return False
+
+        item = QueuedRemediation(
+            incident_id=incident_id,
+            service=service or "unknown",
+            action=action,
+            on_complete=on_complete,
+            risk_score=float(action.get("risk_score") if action.get("risk_score") is not None else 1.0),
+            approved_at=time.time(),
+            sequence=next(self._sequence),
+        )
+        item.exclusive = item.action_type not in self.parallel_safe_types
+        self._queue.append(item)
+        self._dispatch()
+        return True
+
+    def _can_start(self, item: QueuedRemediation) -> bool:
+        same_service = [running for running in self._running.values() if running.service == item.service]
+        if item.exclusive:
+            return not same_service
+        return not any(running.exclusive or running.action_type == item.action_type for running in same_service)
+
+    def _dispatch(self):
+        self._queue.sort(key=lambda queued: queued.order_key)
+        for item in list(self._queue):
+            if len(self._running) >= self.max_concurrent:
+                break
+            if not self._can_start(item):
+                continue
+
+            self._queue.remove(item)
+            item.started_at = time.time()
+            self.queue_waits_ms.append((item.started_at - item.approved_at) * 1000)
+            self._running[(item.incident_id, item.action_id)] = item
+            logger.info(
+                f"Starting {item.action_type} for {item.service} ({item.incident_id}/{item.action_id}), "
+                f"{len(self._running)}/{self.max_concurrent} slots in use, {len(self._queue)} queued"
+            )
+            self.tracker.submit(item.incident_id, item.action, on_complete=self._make_completion(item))
+
+    def _make_completion(self, item: QueuedRemediation):
+        async def _on_complete(incident_id, action, outcome):
+            # Free the slot and start waiting work before slower completion bookkeeping
+            self._running.pop((item.incident_id, item.action_id), None)
+            self.completed += 1
+            self._dispatch()
+            if item.on_complete:
+                await item.on_complete(incident_id, action, outcome)
+        return _on_complete
+
+    def snapshot(self) -> Dict[str, Any]:
+        waits = sorted(self.queue_waits_ms)
+        return {
+            "max_concurrent": self.max_concurrent,
+            "parallel_safe_types": sorted(self.parallel_safe_types),
+            "running": [item.describe() for item in self._running.values()],
+            "queued": [
+                {"position": position, **item.describe()}
+                for position, item in enumerate(sorted(self._queue, key=lambda queued: queued.order_key), start=1)
+            ],
+            "completed": self.completed,
+            "queue_wait_ms": {
+                "avg": round(sum(waits) / len(waits), 2) if waits else None,
+                "max": round(waits[-1], 2) if waits else None,
+            },
+        }
+
+
 def get_workflow_adapter():
     return WorkflowAdapter()
+
+
+_tracker_instance = None
+_scheduler_instance = None
+
+
+def get_workflow_tracker() -> WorkflowExecutionTracker:
+    """Get the process-wide workflow execution tracker."""
+    global _tracker_instance
+    if _tracker_instance is None:
+        _tracker_instance = WorkflowExecutionTracker()
+    return _tracker_instance
+
+
+def get_remediation_scheduler() -> RemediationScheduler:
+    """Get the process-wide remediation scheduler."""
+    global _scheduler_instance
+    if _scheduler_instance is None:
+        _scheduler_instance = RemediationScheduler(get_workflow_tracker())
+    return _scheduler_instance
@@ -1,12 +1,19 @@
 import os
+import sys
 import asyncio
 import json
 from datetime import datetime
-from elasticsearch import AsyncElasticsearch
+from pathlib import Path
 from loguru import logger
 
+try:
+    from shared.es_client import create_client
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parents[1]))
+    from shared.es_client import create_client
+
 ES_HOST = os.getenv("ES_HOST", "http://localhost:9200")
-es = AsyncElasticsearch(hosts=[ES_HOST])
+es = create_client("seed-runbooks", hosts=[ES_HOST])
 
 SAMPLE_RUNBOOKS = [
     {
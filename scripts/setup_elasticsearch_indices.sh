@@ -19,73 +19,11 @@ fi
 echo "[DONE] Elasticsearch is reachable"
 echo ""
 
-# 1. Incidents Index Template
-echo "Creating .incidents-datapulse-* index template..."
-curl -X PUT "$ES_HOST/_index_template/incidents_datapulse_template" \
-  -H 'Content-Type: application/json' \
-  -d'{
-  "index_patterns": [".incidents-datapulse-*"],
-  "template": {
-    "settings": {
-      "index": {
-        "number_of_shards": 1,
-        "number_of_replicas": 1,
-        "lifecycle.name": "incidents_policy"
-      }
-    },
-    "mappings": {
-      "properties": {
-        "incident_id": { "type": "keyword" },
-        "severity": { "type": "keyword" },
-        "status": { "type": "keyword" },
-        "title": { "type": "text" },
-        "service": { "type": "keyword" },
-        "detected_at": { "type": "date" },
-        "created_at": { "type": "date" },
-        "assigned_to": { "type": "keyword" },
-        "integrations": {
-          "properties": {
-            "slack": {
-              "properties": {
-                "channel": { "type": "keyword" },
-                "thread_ts": { "type": "keyword" }
-              }
-            },
-            "jira": {
-              "properties": {
-                "ticket_key": { "type": "keyword" },
-                "status": { "type": "keyword" }
-              }
-            }
-          }
-        },
-        "agent_conversations": { "type": "keyword" },
-        "resolution": {
-          "properties": {
-            "root_cause": { "type": "text" },
-            "resolved_at": { "type": "date" },
-            "resolution_time_seconds": { "type": "integer" },
-            "resolved_by": { "type": "keyword" }
-          }
-        },
-        "evidence": {
-          "type": "nested",
-          "properties": {
-            "type": { "type": "keyword" },
-            "ref": { "type": "keyword" },
-            "snippet": { "type": "text" }
-          }
-        },
-        "metrics": {
-          "properties": {
-            "error_rate": { "type": "float" },
-            "p99_latency_ms": { "type": "float" }
-          }
-        }
-      }
-    }
-  }
-}' && echo " [DONE]" || echo " [ERROR]"
+# 1. Incidents and audit indices: index templates, ILM rollover policies and write
+#    aliases are owned by the API gateway (it also installs them at startup)
+echo "Creating incident/audit index templates, ILM policies and write aliases..."
+ES_HOST="$ES_HOST" python3 "$(dirname "$0")/../backend/api_gateway/src/index_bootstrap.py" \
+  && echo " [DONE]" || echo " [ERROR]"
 
 # 2. Agent Conversations Index
 echo "Creating .agent-conversations-* index template..."
@@ -149,50 +87,6 @@ curl -X PUT "$ES_HOST/_index_template/agent_conversations_template" \
   }
 }' && echo " [DONE]" || echo " [ERROR]"
 
-# 3. Audit Log Index
-echo "Creating .audit-datapulse-* index template..."
-curl -X PUT "$ES_HOST/_index_template/audit_datapulse_template" \
-  -H 'Content-Type: application/json' \
-  -d'{
-  "index_patterns": [".audit-datapulse-*"],
-  "template": {
-    "settings": {
-      "index.lifecycle.name": "audit_policy",
-      "index.number_of_shards": 1
-    },
-    "mappings": {
-      "properties": {
-        "@timestamp": { "type": "date" },
-        "event_id": { "type": "keyword" },
-        "agent_id": { "type": "keyword" },
-        "incident_id": { "type": "keyword" },
-        "user": { "type": "keyword" },
-        "action": { "type": "keyword" },
-        "target": {
-          "properties": {
-            "type": { "type": "keyword" },
-            "id": { "type": "keyword" }
-          }
-        },
-        "details": {
-          "properties": {
-            "from_version": { "type": "keyword" },
-            "to_version": { "type": "keyword" },
-            "confidence": { "type": "float" },
-            "evidence": { "type": "keyword" }
-          }
-        },
-        "approval_status": { "type": "keyword" },
-        "approved_by": { "type": "keyword" },
-        "approved_at": { "type": "date" },
-        "execution_status": { "type": "keyword" },
-        "execution_duration_ms": { "type": "integer" },
-        "error": { "type": "text" }
-      }
-    }
-  }
-}' && echo " [DONE]" || echo " [ERROR]"
-
 # 4. Deployments Index
 echo "Creating deployments-* index template..."
 curl -X PUT "$ES_HOST/_index_template/deployments_template" \
@@ -0,0 +1 @@
+"""Code shared by the DataPulse agents, gateway and MCP server."""
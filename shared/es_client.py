@@ -0,0 +1,283 @@
+"""
+The Elasticsearch client every DataPulse service uses, built in one place.
+
+``create_client(service)`` replaces the bare ``AsyncElasticsearch(hosts=[ES_HOST])``
+each module used to construct. Its settings come from the environment:
+
+    ES_HOST, ES_API_KEY                 where to connect and how to authenticate
+    ES_CONNECTIONS_PER_NODE             HTTP connection pool size per node
+    ES_HTTP_COMPRESS                    gzip request bodies (bulk loads, large reports)
+    ES_REQUEST_TIMEOUT_SECONDS          per-request timeout
+    ES_MAX_RETRIES                      retries of transient failures
+    ES_RETRY_ON_TIMEOUT                 whether timeouts count as transient
+    ES_RETRY_BACKOFF_SECONDS            first retry delay, doubled per retry ...
+    ES_RETRY_BACKOFF_MAX_SECONDS        ... up to this cap
+    ES_SNIFF, ES_SNIFF_INTERVAL_SECONDS discover cluster nodes on start and on node failure
+    ES_SLOW_REQUEST_MS                  log calls slower than this (default 1000, 0 disables)
+
+The transport retries immediately, so its own retries are turned off and the
+returned ``ManagedElasticsearch`` retries instead, with exponential backoff
+and jitter: connection errors, timeouts and 429/502/503/504 responses.
+Writes that are not idempotent (``index`` without an id, creates, ``bulk``)
+are only retried on 429, which Elasticsearch returns before applying anything.
+
+Latency hooks are called once per API call, retries included, as
+``hook(service, operation, seconds, error)``: hooks registered with
+``add_latency_hook`` for every client (the gateway's Prometheus histograms),
+plus each client's own (the slow-request log).
+Every client is tracked so ``close_clients()`` (or the ``lifespan`` context
+for FastAPI apps) closes their connection pools on shutdown.
+"""
+import asyncio
+import os
+import random
+import time
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from shared.serialization import use_fast_json
+
+# (service, operation, seconds, error or None)
+LatencyHook = Callable[[str, str, float, Optional[BaseException]], None]
+
+RETRY_ON_STATUS = (429, 502, 503, 504)
+# Namespaced APIs (es.indices.create, ...) get the same retries and hooks as top-level calls
+NAMESPACES = frozenset({"cluster", "esql", "ilm", "indices", "ingest", "tasks"})
+
+_latency_hooks: List[LatencyHook] = []
+_clients: "weakref.WeakSet[ManagedElasticsearch]" = weakref.WeakSet()
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).strip().lower() in {"1", "true", "yes", "on"}
+
+
+@dataclass
+class ClientSettings:
+    hosts: List[str] = field(default_factory=lambda: ["http://elasticsearch:9200"])
+    api_key: Optional[str] = None
+    connections_per_node: int = 20
+    http_compress: bool = True
+    request_timeout: float = 30.0
+    max_retries: int = 3
+    retry_on_timeout: bool = True
+    backoff: float = 0.5
+    backoff_max: float = 10.0
+    sniff: bool = False
+    sniff_interval: float = 60.0
+    slow_request_ms: float = 1000.0
+
+    @classmethod
+    def from_env(cls) -> "ClientSettings":
+        return cls(
+            hosts=[host.strip() for host in os.getenv("ES_HOST", "http://elasticsearch:9200").split(",") if host.strip()],
+            api_key=os.getenv("ES_API_KEY") or None,
+            connections_per_node=int(os.getenv("ES_CONNECTIONS_PER_NODE", "20")),
+            http_compress=_env_flag("ES_HTTP_COMPRESS", "true"),
+            request_timeout=float(os.getenv("ES_REQUEST_TIMEOUT_SECONDS", "30")),
+            max_retries=int(os.getenv("ES_MAX_RETRIES", "3")),
+            retry_on_timeout=_env_flag("ES_RETRY_ON_TIMEOUT", "true"),
+            backoff=float(os.getenv("ES_RETRY_BACKOFF_SECONDS", "0.5")),
+            backoff_max=float(os.getenv("ES_RETRY_BACKOFF_MAX_SECONDS", "10")),
+            sniff=_env_flag("ES_SNIFF", "false"),
+            sniff_interval=float(os.getenv("ES_SNIFF_INTERVAL_SECONDS", "60")),
+            slow_request_ms=float(os.getenv("ES_SLOW_REQUEST_MS", "1000")),
+        )
+
+    def client_options(self) -> Dict[str, Any]:
+        """Keyword arguments for AsyncElasticsearch."""
+        options: Dict[str, Any] = {
+            "hosts": self.hosts,
+            "connections_per_node": self.connections_per_node,
+            "http_compress": self.http_compress,
+            "request_timeout": self.request_timeout,
+            # Retried with backoff by ManagedElasticsearch instead
+            "max_retries": 0,
+            "retry_on_timeout": False,
+        }
+        if self.api_key:
+            options["api_key"] = self.api_key
+        if self.sniff:
+            # Sniffing returns the nodes' publish addresses; leave it off behind Elastic Cloud or a proxy
+            options.update(
+                sniff_on_start=True,
+                sniff_on_node_failure=True,
+                min_delay_between_sniffing=self.sniff_interval,
+            )
+        return options
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Delay before retry ``attempt`` (0-based): exponential, capped, with jitter in its upper half."""
+        delay = min(self.backoff_max, self.backoff * 2 ** attempt)
+        return random.uniform(delay / 2, delay)
+
+
+@lru_cache(maxsize=1)
+def _transient_errors() -> Tuple[tuple, tuple]:
+    """(connection error types, timeout types), imported on first failure."""
+    try:
+        from elastic_transport import ConnectionError as TransportConnectionError, ConnectionTimeout
+    except ImportError:  # test doubles without the transport package
+        return (), ()
+    return (TransportConnectionError,), (ConnectionTimeout,)
+
+
+def _idempotent(operation: str, args: tuple, kwargs: Dict[str, Any]) -> bool:
+    # A create whose first attempt landed fails its retry with a 409, indistinguishable from a real conflict
+    if operation == "create" or kwargs.get("op_type") == "create":
+        return False
+    if operation == "index":
+        return kwargs.get("id") is not None
+    if operation == "perform_request":
+        method = args[0] if args else kwargs.get("method", "")
+        path = args[1] if len(args) > 1 else kwargs.get("path", "")
+        return method in ("GET", "HEAD") or str(path).rstrip("/").endswith(("/_query", "/_search"))
+    return operation != "bulk"
+
+
+def is_retryable(exc: BaseException, operation: str, args: tuple, kwargs: Dict[str, Any],
+                 retry_on_timeout: bool = True) -> bool:
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or (status in RETRY_ON_STATUS and _idempotent(operation, args, kwargs))
+    if not _idempotent(operation, args, kwargs):
+        return False
+    connection_errors, timeouts = _transient_errors()
+    if isinstance(exc, timeouts):
+        return retry_on_timeout
+    return isinstance(exc, connection_errors)
+
+
+def add_latency_hook(hook: LatencyHook):
+    """Call ``hook(service, operation, seconds, error)`` after every API call of every client."""
+    _latency_hooks.append(hook)
+
+
+def remove_latency_hook(hook: LatencyHook):
+    if hook in _latency_hooks:
+        _latency_hooks.remove(hook)
+
+
+def slow_request_logger(threshold_ms: float) -> LatencyHook:
+    """Hook logging calls that took at least ``threshold_ms``."""
+
+    def log_slow(service: str, operation: str, seconds: float, error: Optional[BaseException]):
+        if seconds * 1000 >= threshold_ms:
+            outcome = f" ({type(error).__name__})" if error else ""
+            logger.warning(f"[{service}] Slow Elasticsearch {operation}: {seconds * 1000:.0f} ms{outcome}")
+
+    return log_slow
+
+
+class ManagedElasticsearch:
+    """Proxy over an async Elasticsearch client adding retries with backoff and latency hooks.
+
+    API methods, including those of the namespaced clients (``indices``,
+    ``esql``, ...), are retried and reported under their name; ``options()``
+    returns a managed client too; other attributes pass through untouched.
+    """
+
+    def __init__(self, client: Any, service: str, settings: ClientSettings, prefix: str = "",
+                 hooks: Sequence[LatencyHook] = ()):
+        self._client = client
+        self._service = service
+        self._settings = settings
+        self._prefix = prefix
+        self._hooks = tuple(hooks)
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if name in NAMESPACES and not self._prefix:
+            return ManagedElasticsearch(attr, self._service, self._settings, prefix=f"{name}.", hooks=self._hooks)
+        if not callable(attr) or name.startswith("_"):
+            return attr
+        if name == "options":
+            return lambda **options: ManagedElasticsearch(
+                attr(**options), self._service, self._settings, hooks=self._hooks
+            )
+
+        operation = self._prefix + name
+
+        async def call(*args, **kwargs):
+            settings = self._settings
+            started = time.perf_counter()
+            error = None
+            try:
+                attempt = 0
+                while True:
+                    try:
+                        return await attr(*args, **kwargs)
+                    except Exception as exc:
+                        if attempt >= settings.max_retries or not is_retryable(
+                            exc, operation, args, kwargs, settings.retry_on_timeout
+                        ):
+                            raise
+                        delay = settings.backoff_delay(attempt)
+                        attempt += 1
+                        logger.warning(
+                            f"[{self._service}] Elasticsearch {operation} failed ({type(exc).__name__}: {exc}), "
+                            f"retry {attempt}/{settings.max_retries} in {delay:.2f}s"
+                        )
+                        await asyncio.sleep(delay)
+            except Exception as exc:
+                error = exc
+                raise
+            finally:
+                self._observe(operation, time.perf_counter() - started, error)
+
+        return call
+
+    def _observe(self, operation: str, seconds: float, error: Optional[BaseException]):
+        for hook in (*_latency_hooks, *self._hooks):
+            try:
+                hook(self._service, operation, seconds, error)
+            except Exception as e:
+                logger.warning(f"Elasticsearch latency hook {hook!r} failed: {e}")
+
+    async def close(self):
+        _clients.discard(self)
+        closer = getattr(self._client, "close", None)
+        if closer is None:
+            return
+        try:
+            result = closer()
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            # Clients bound to an event loop that has since closed cannot be closed cleanly
+            logger.debug(f"[{self._service}] Closing Elasticsearch client failed: {e}")
+
+    def __repr__(self) -> str:
+        return f"<ManagedElasticsearch {self._service} {self._client!r}>"
+
+
+def create_client(service: str, settings: Optional[ClientSettings] = None, **options) -> ManagedElasticsearch:
+    """Build the tuned client for ``service``; ``options`` override the AsyncElasticsearch arguments."""
+    from elasticsearch import AsyncElasticsearch
+
+    settings = settings or ClientSettings.from_env()
+    kwargs = {**settings.client_options(), **options}
+    client = AsyncElasticsearch(**kwargs)
+    use_fast_json(client)
+    hooks = [slow_request_logger(settings.slow_request_ms)] if settings.slow_request_ms else []
+    managed = ManagedElasticsearch(client, service, settings, hooks=hooks)
+    _clients.add(managed)
+    return managed
+
+
+async def close_clients():
+    """Close every client created by create_client that is still open."""
+    for client in list(_clients):
+        await client.close()
+
+
+@asynccontextmanager
+async def lifespan(_app):
+    """FastAPI lifespan closing the service's Elasticsearch clients on shutdown."""
+    yield
+    await close_clients()
@@ -0,0 +1,33 @@
+from .async_query import (
+    delete_async_query,
+    execute_esql_async,
+    get_async_query,
+    submit_async_query,
+)
+from .columnar import ColumnarResult, RowView, execute_esql_columnar
+from .library import (
+    ESQL_TOOLS_DIR,
+    EsqlQueryLibrary,
+    EsqlResult,
+    EsqlTemplate,
+    execute_esql,
+    format_duration,
+    load_template,
+)
+
+__all__ = [
+    "ColumnarResult",
+    "ESQL_TOOLS_DIR",
+    "EsqlQueryLibrary",
+    "EsqlResult",
+    "EsqlTemplate",
+    "RowView",
+    "delete_async_query",
+    "execute_esql",
+    "execute_esql_async",
+    "execute_esql_columnar",
+    "format_duration",
+    "get_async_query",
+    "load_template",
+    "submit_async_query",
+]
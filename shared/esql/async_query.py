@@ -0,0 +1,116 @@
+"""ES|QL async query API helper.
+
+A query is submitted to ``/_query/async`` with ``wait_for_completion_timeout``
+so fast queries still answer inline. Slower ones keep running server-side for
+up to ``keep_alive`` while we long-poll for the result with short requests,
+so no connection is held open for the whole query and client request
+timeouts do not kill it. Queries that overrun the overall timeout, or whose
+caller is cancelled, are cancelled server-side.
+
+The async API needs Elasticsearch 8.13 or later; on older clusters (such as
+the local 8.11 stack) ``EsqlQueryLibrary`` falls back to synchronous queries.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from loguru import logger
+
+from .columnar import ColumnarResult
+from .results import JSON_HEADERS, EsqlResult, limit_query, response_body, result_from_response
+
+ESQL_ASYNC_WAIT_SECONDS = float(os.getenv("ESQL_ASYNC_WAIT_SECONDS", "2"))
+ESQL_ASYNC_KEEP_ALIVE = os.getenv("ESQL_ASYNC_KEEP_ALIVE", "5m")
+ESQL_ASYNC_TIMEOUT_SECONDS = float(os.getenv("ESQL_ASYNC_TIMEOUT_SECONDS", "300"))
+
+
+def _time_value(seconds: float) -> str:
+    return f"{max(int(seconds * 1000), 1)}ms"
+
+
+async def submit_async_query(
+    es,
+    query: str,
+    params: Optional[List[Dict[str, Any]]] = None,
+    wait_seconds: float = ESQL_ASYNC_WAIT_SECONDS,
+    keep_alive: str = ESQL_ASYNC_KEEP_ALIVE,
+    columnar: bool = False,
+) -> Dict[str, Any]:
+    """Submit a query; the response holds the result or an id to poll."""
+    body: Dict[str, Any] = {
+        "query": query,
+        "wait_for_completion_timeout": _time_value(wait_seconds),
+        "keep_alive": keep_alive,
+        "keep_on_completion": False,
+    }
+    if columnar:
+        body["columnar"] = True
+    if params:
+        body["params"] = params
+    resp = await es.perform_request(
+        "POST", "/_query/async", params={"format": "json"}, headers=JSON_HEADERS, body=body
+    )
+    return response_body(resp)
+
+
+async def get_async_query(es, query_id: str, wait_seconds: float = ESQL_ASYNC_WAIT_SECONDS) -> Dict[str, Any]:
+    """Long-poll a running query for up to wait_seconds."""
+    resp = await es.perform_request(
+        "GET",
+        f"/_query/async/{query_id}",
+        params={"wait_for_completion_timeout": _time_value(wait_seconds)},
+        headers={"accept": "application/json"},
+    )
+    return response_body(resp)
+
+
+async def delete_async_query(es, query_id: str):
+    """Cancel a running query, or free a stored result."""
+    try:
+        await es.perform_request("DELETE", f"/_query/async/{query_id}", headers={"accept": "application/json"})
+    except Exception as exc:
+        logger.debug(f"Could not delete ES|QL async query {query_id}: {exc}")
+
+
+async def execute_esql_async(
+    es,
+    query: str,
+    params: Optional[List[Dict[str, Any]]] = None,
+    max_rows: Optional[int] = None,
+    wait_seconds: float = ESQL_ASYNC_WAIT_SECONDS,
+    keep_alive: str = ESQL_ASYNC_KEEP_ALIVE,
+    timeout: float = ESQL_ASYNC_TIMEOUT_SECONDS,
+    columnar: bool = False,
+) -> Union[EsqlResult, ColumnarResult]:
+    """Run a query through the async API and return its result."""
+    started = time.perf_counter()
+    deadline = time.monotonic() + timeout
+
+    data = await submit_async_query(es, limit_query(query, max_rows), params, wait_seconds, keep_alive, columnar)
+    query_id = data.get("id")
+    polls = 0
+
+    try:
+        while data.get("is_running"):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"ES|QL async query {query_id} still running after {timeout}s")
+            data = await get_async_query(es, query_id, min(wait_seconds, remaining))
+            polls += 1
+    except BaseException:
+        # Timed out, cancelled or failed while running: stop the work server-side
+        if query_id:
+            await asyncio.shield(delete_async_query(es, query_id))
+        raise
+
+    if query_id:
+        # Completed after we started polling: the result is stored until keep_alive, drop it now
+        await delete_async_query(es, query_id)
+        logger.debug(f"ES|QL async query {query_id} completed after {polls} polls")
+
+    took_ms = (time.perf_counter() - started) * 1000
+    if columnar:
+        return ColumnarResult.from_columnar_json(data, max_rows, took_ms)
+    return result_from_response(data, max_rows, took_ms)
@@ -0,0 +1,260 @@
+"""Column-oriented ES|QL results.
+
+Synchronous queries are requested in Arrow format when pyarrow is installed
+and kept as the returned Arrow table, so slicing and filtering are zero-copy
+and aggregations run in pyarrow.compute. Without pyarrow (or if the cluster
+cannot answer in Arrow), and for queries run through the async API, the
+``columnar`` JSON layout is used instead, one list per column. Either way rows
+are exposed as lazy views rather than a dict per row.
+"""
+
+import operator
+import time
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from loguru import logger
+
+from .results import JSON_HEADERS, limit_query, response_body
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.ipc
+except ImportError:  # optional dependency
+    pa = pc = None
+
+ARROW_MIMETYPE = "application/vnd.apache.arrow.stream"
+
+_OPS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+_ARROW_OPS = {
+    "==": "equal",
+    "!=": "not_equal",
+    ">": "greater",
+    ">=": "greater_equal",
+    "<": "less",
+    "<=": "less_equal",
+}
+_AGGREGATES = {"sum", "mean", "min", "max", "count"}
+
+# Set once the cluster or client turns out not to speak Arrow
+_arrow_unavailable = False
+
+
+class RowView(Mapping):
+    """Read-only view of one row; values are fetched from the columns on access."""
+
+    __slots__ = ("_result", "_index")
+
+    def __init__(self, result: "ColumnarResult", index: int):
+        self._result = result
+        self._index = index
+
+    def __getitem__(self, name: str) -> Any:
+        return self._result._value(name, self._index)
+
+    def __iter__(self):
+        return iter(self._result.columns)
+
+    def __len__(self) -> int:
+        return len(self._result.columns)
+
+    def __repr__(self) -> str:
+        return f"RowView({dict(self)!r})"
+
+
+class ColumnarResult:
+    """ES|QL result held column by column, backed by Arrow or per-column lists."""
+
+    def __init__(
+        self,
+        columns: List[str],
+        data: Any,
+        truncated: bool = False,
+        took_ms: float = 0.0,
+        source: str = "elasticsearch",
+    ):
+        self.columns = columns
+        # A pyarrow.Table, or a dict of column name -> list of values
+        self._data = data
+        self.truncated = truncated
+        self.took_ms = took_ms
+        self.source = source
+
+    @classmethod
+    def from_arrow(cls, table, max_rows: Optional[int] = None, took_ms: float = 0.0) -> "ColumnarResult":
+        truncated = max_rows is not None and table.num_rows > max_rows
+        if truncated:
+            table = table.slice(0, max_rows)
+        return cls(list(table.column_names), table, truncated, round(took_ms, 2))
+
+    @classmethod
+    def from_columnar_json(cls, data: Dict[str, Any], max_rows: Optional[int] = None,
+                           took_ms: float = 0.0) -> "ColumnarResult":
+        columns = [column["name"] for column in data.get("columns", [])]
+        # With "columnar": true, values holds one list per column
+        values = data.get("values") or [[] for _ in columns]
+        num_rows = len(values[0]) if values else 0
+        truncated = max_rows is not None and num_rows > max_rows
+        if truncated:
+            values = [column[:max_rows] for column in values]
+        return cls(columns, dict(zip(columns, values)), truncated, round(took_ms, 2))
+
+    @property
+    def is_arrow(self) -> bool:
+        return pa is not None and isinstance(self._data, pa.Table)
+
+    @property
+    def num_rows(self) -> int:
+        if self.is_arrow:
+            return self._data.num_rows
+        return len(self._data[self.columns[0]]) if self.columns else 0
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def column(self, name: str) -> Sequence[Any]:
+        """The column's values (an Arrow ChunkedArray or a list)."""
+        if self.is_arrow:
+            return self._data.column(name)
+        return self._data[name]
+
+    def _value(self, name: str, index: int) -> Any:
+        if self.is_arrow:
+            return self._data.column(name)[index].as_py()
+        return self._data[name][index]
+
+    def filter(self, name: str, op: str, value: Any) -> "ColumnarResult":
+        """Rows where ``column <op> value``, e.g. ``filter("error_rate", ">", 0.05)``."""
+        if op not in _OPS:
+            raise ValueError(f"Unsupported filter operator: {op}")
+        if self.is_arrow:
+            mask = getattr(pc, _ARROW_OPS[op])(self._data.column(name), value)
+            data = self._data.filter(pc.fill_null(mask, False))
+        else:
+            compare = _OPS[op]
+            keep = [i for i, v in enumerate(self._data[name]) if v is not None and compare(v, value)]
+            data = {column: [values[i] for i in keep] for column, values in self._data.items()}
+        return ColumnarResult(self.columns, data, self.truncated, self.took_ms, self.source)
+
+    def aggregate(self, name: str, fn: str) -> Any:
+        """sum/mean/min/max/count over a column, ignoring nulls."""
+        if fn not in _AGGREGATES:
+            raise ValueError(f"Unsupported aggregation: {fn}")
+        if self.is_arrow:
+            column = self._data.column(name)
+            return getattr(pc, fn)(column).as_py()
+
+        values = [v for v in self._data[name] if v is not None]
+        if fn == "count":
+            return len(values)
+        if not values:
+            return None
+        if fn == "mean":
+            return sum(values) / len(values)
+        return {"sum": sum, "min": min, "max": max}[fn](values)
+
+    def slice(self, offset: int, length: int) -> "ColumnarResult":
+        """Rows ``offset`` to ``offset + length`` (zero-copy for Arrow)."""
+        if self.is_arrow:
+            data = self._data.slice(offset, length)
+        else:
+            data = {column: values[offset:offset + length] for column, values in self._data.items()}
+        return ColumnarResult(self.columns, data, self.truncated, self.took_ms, self.source)
+
+    def rows(self) -> Iterator[RowView]:
+        return (RowView(self, index) for index in range(self.num_rows))
+
+    def first(self) -> Optional[RowView]:
+        return RowView(self, 0) if self.num_rows else None
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        if self.is_arrow:
+            return self._data.to_pylist()
+        return [dict(row) for row in self.rows()]
+
+
+def _register_arrow_serializer(es) -> bool:
+    """Teach the client's transport to hand back Arrow streams as tables."""
+    serializers = getattr(getattr(es, "transport", None), "serializers", None)
+    registry = getattr(serializers, "serializers", None)
+    if registry is None:
+        return False
+    if ARROW_MIMETYPE not in registry:
+        from elastic_transport import Serializer
+
+        class ArrowStreamSerializer(Serializer):
+            mimetype = ARROW_MIMETYPE
+
+            def loads(self, data: bytes):
+                return pyarrow.ipc.open_stream(data).read_all()
+
+            def dumps(self, data) -> bytes:
+                raise TypeError("Arrow request bodies are not supported")
+
+        registry[ARROW_MIMETYPE] = ArrowStreamSerializer()
+    return True
+
+
+async def _execute_arrow(es, query: str, params, max_rows) -> ColumnarResult:
+    if not _register_arrow_serializer(es):
+        raise RuntimeError("client has no pluggable serializers")
+    body: Dict[str, Any] = {"query": query}
+    if params:
+        body["params"] = params
+
+    started = time.perf_counter()
+    resp = await es.perform_request(
+        "POST",
+        "/_query",
+        params={"format": "arrow"},
+        headers={"accept": ARROW_MIMETYPE, "content-type": "application/json"},
+        body=body,
+    )
+    table = response_body(resp)
+    if hasattr(table, "read_all"):
+        # Newer clients ship their own serializer that returns a stream reader
+        table = table.read_all()
+    if not isinstance(table, pa.Table):
+        raise RuntimeError(f"unexpected Arrow response type {type(table).__name__}")
+    return ColumnarResult.from_arrow(table, max_rows, (time.perf_counter() - started) * 1000)
+
+
+async def execute_esql_columnar(
+    es,
+    query: str,
+    params: Optional[List[Dict[str, Any]]] = None,
+    max_rows: Optional[int] = None,
+    use_arrow: Optional[bool] = None,
+) -> ColumnarResult:
+    """Run a query and keep the result column-oriented (Arrow when available)."""
+    global _arrow_unavailable
+    query = limit_query(query, max_rows)
+
+    if use_arrow is None:
+        use_arrow = pa is not None and not _arrow_unavailable
+    arrow_error = None
+    if use_arrow:
+        try:
+            return await _execute_arrow(es, query, params, max_rows)
+        except Exception as exc:
+            arrow_error = exc
+
+    body: Dict[str, Any] = {"query": query, "columnar": True}
+    if params:
+        body["params"] = params
+    started = time.perf_counter()
+    resp = await es.perform_request("POST", "/_query", params={"format": "json"}, headers=JSON_HEADERS, body=body)
+
+    if arrow_error is not None:
+        # JSON worked where Arrow did not, so the format (not the query) is the problem
+        _arrow_unavailable = True
+        logger.warning(f"ES|QL Arrow format unavailable, using columnar JSON: {arrow_error}")
+    return ColumnarResult.from_columnar_json(response_body(resp), max_rows, (time.perf_counter() - started) * 1000)
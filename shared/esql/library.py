@@ -0,0 +1,356 @@
+"""ES|QL query library backed by the tools/esql templates.
+
+Templates are loaded and validated once. Placeholders are bound through
+ES|QL's native ``params`` instead of string interpolation: ``"${name}"`` and
+bare ``${name}`` become ``?name``, while time spans after ``NOW() -`` (which
+ES|QL cannot take as parameters) are validated and inlined. Results are
+cached per (query, params, time bucket), and identical queries already in
+flight share one request.
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from loguru import logger
+
+from .async_query import execute_esql_async
+from .columnar import ColumnarResult, execute_esql_columnar
+from .results import JSON_HEADERS, EsqlResult, limit_query, response_body, result_from_response
+
+ESQL_TOOLS_DIR = Path(os.getenv("ESQL_TOOLS_DIR", Path(__file__).resolve().parents[2] / "tools" / "esql"))
+ESQL_CACHE_BUCKET_SECONDS = float(os.getenv("ESQL_CACHE_BUCKET_SECONDS", "30"))
+
+# Set once the cluster turns out to predate the ES|QL async API (Elasticsearch 8.13)
+_async_unavailable = False
+ESQL_CACHE_MAX_ENTRIES = int(os.getenv("ESQL_CACHE_MAX_ENTRIES", "256"))
+
+# `"${name}"` (a string literal) or bare `${name}`
+_PLACEHOLDER = re.compile(r'"\$\{(\w+)\}"|\$\{(\w+)\}')
+_TIME_ARITHMETIC = re.compile(r"[-+]\s*$")
+_DURATION = re.compile(r"^\s*(\d+)\s*([a-zA-Z]+)\s*$")
+_DURATION_UNITS = {
+    "ms": "milliseconds", "millisecond": "milliseconds", "milliseconds": "milliseconds",
+    "s": "seconds", "sec": "seconds", "second": "seconds", "seconds": "seconds",
+    "m": "minutes", "min": "minutes", "minute": "minutes", "minutes": "minutes",
+    "h": "hours", "hour": "hours", "hours": "hours",
+    "d": "days", "day": "days", "days": "days",
+    "w": "weeks", "week": "weeks", "weeks": "weeks",
+}
+_SCHEMA_TYPES = {"string", "number", "integer", "boolean"}
+
+
+def format_duration(value: Any) -> str:
+    """Turn a short duration such as ``15m`` into an ES|QL time span literal."""
+    match = _DURATION.match(str(value))
+    unit = _DURATION_UNITS.get(match.group(2).lower()) if match else None
+    if unit is None:
+        raise ValueError(f"Invalid duration: {value!r}")
+    return f"{int(match.group(1))} {unit}"
+
+
+def _coerce(name: str, value: Any, param_type: str) -> Any:
+    try:
+        if param_type == "number":
+            if isinstance(value, bool):
+                raise ValueError
+            return float(value)
+        if param_type == "integer":
+            if isinstance(value, bool):
+                raise ValueError
+            return int(value)
+        if param_type == "boolean":
+            if isinstance(value, str):
+                return value.strip().lower() in ("true", "1", "yes")
+            return bool(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Argument {name} must be a {param_type}") from None
+    return str(value)
+
+
+@dataclass
+class EsqlTemplate:
+    """A parameterised ES|QL query in the tools/esql format."""
+
+    query: str
+    params: Dict[str, Dict[str, Any]]
+    id: str = ""
+    description: str = ""
+    fingerprint: str = field(init=False)
+
+    def __post_init__(self):
+        referenced = {quoted or bare for quoted, bare in _PLACEHOLDER.findall(self.query)}
+        undeclared = referenced - set(self.params)
+        if undeclared:
+            raise ValueError(f"Query references undeclared params: {', '.join(sorted(undeclared))}")
+        self.fingerprint = hashlib.sha256(
+            json.dumps([self.query, self.params], sort_keys=True).encode()
+        ).hexdigest()[:16]
+
+    @classmethod
+    def from_definition(cls, definition: Dict[str, Any], **overrides) -> "EsqlTemplate":
+        """Build a template from a tools/esql definition."""
+        configuration = definition.get("configuration", {})
+        if not configuration.get("query"):
+            raise ValueError(f"ES|QL template {definition.get('id', '?')} has no query")
+        return cls(
+            query=configuration["query"],
+            params=configuration.get("params", {}),
+            id=definition.get("id", ""),
+            description=definition.get("description", ""),
+            **overrides,
+        )
+
+    def input_schema(self) -> Dict[str, Any]:
+        """JSON schema for the template arguments, derived from the declared params."""
+        properties: Dict[str, Any] = {}
+        required = []
+        for name, spec in self.params.items():
+            param_type = spec.get("type", "string")
+            prop: Dict[str, Any] = {"type": param_type if param_type in _SCHEMA_TYPES else "string"}
+            if "description" in spec:
+                prop["description"] = spec["description"]
+            if "default" in spec:
+                prop["default"] = spec["default"]
+            else:
+                required.append(name)
+            properties[name] = prop
+
+        schema: Dict[str, Any] = {"type": "object", "properties": properties}
+        if required:
+            schema["required"] = required
+        return schema
+
+    def normalize_arguments(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply defaults and coerce types; undeclared arguments are dropped."""
+        normalized = {}
+        for name, spec in self.params.items():
+            if arguments.get(name) is not None:
+                value = arguments[name]
+            elif "default" in spec:
+                value = spec["default"]
+            else:
+                raise ValueError(f"Missing required argument: {name}")
+            normalized[name] = _coerce(name, value, spec.get("type", "string"))
+        return normalized
+
+    def bind(self, arguments: Dict[str, Any]) -> Tuple[str, List[Dict[str, Any]]]:
+        """Return the query text and its named ES|QL parameters."""
+        values = self.normalize_arguments(arguments)
+        params: List[Dict[str, Any]] = []
+        bound = set()
+
+        def substitute(match: re.Match) -> str:
+            quoted, bare = match.groups()
+            name = quoted or bare
+            if bare and _TIME_ARITHMETIC.search(match.string, 0, match.start()):
+                return format_duration(values[name])
+            if name not in bound:
+                bound.add(name)
+                params.append({name: values[name]})
+            return f"?{name}"
+
+        return _PLACEHOLDER.sub(substitute, self.query), params
+
+
+def load_template(path: Path) -> EsqlTemplate:
+    return EsqlTemplate.from_definition(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+async def execute_esql(
+    es,
+    query: str,
+    params: Optional[List[Dict[str, Any]]] = None,
+    max_rows: Optional[int] = None,
+) -> EsqlResult:
+    """Run an ES|QL query with bound params, optionally capped at max_rows."""
+    query = limit_query(query, max_rows)
+
+    started = time.perf_counter()
+    esql = getattr(es, "esql", None)
+    if esql is not None:
+        resp = await esql.query(query=query, params=params or None, format="json")
+    else:
+        # Clients older than 8.12 have no esql namespace
+        body: Dict[str, Any] = {"query": query}
+        if params:
+            body["params"] = params
+        resp = await es.perform_request("POST", "/_query", params={"format": "json"}, headers=JSON_HEADERS, body=body)
+
+    return result_from_response(response_body(resp), max_rows, (time.perf_counter() - started) * 1000)
+
+
+async def _execute_async_or_sync(client, query: str, params, max_rows, columnar: bool):
+    """Run through the async API, falling back to a synchronous query where it does not exist."""
+    global _async_unavailable
+    async_error = None
+    if not _async_unavailable:
+        try:
+            return await execute_esql_async(client, query, params, max_rows, columnar=columnar)
+        except Exception as exc:
+            # Clusters before 8.13 answer /_query/async with a 404 (or a 400 for the unknown path)
+            if getattr(exc, "status_code", None) not in (400, 404):
+                raise
+            async_error = exc
+
+    if columnar:
+        result = await execute_esql_columnar(client, query, params, max_rows)
+    else:
+        result = await execute_esql(client, query, params, max_rows)
+    if async_error is not None:
+        # The synchronous query worked, so the API (not the query) is the problem
+        _async_unavailable = True
+        logger.warning(f"ES|QL async API unavailable, running queries synchronously: {async_error}")
+    return result
+
+
+def _with_source(result, source: str):
+    # Shallow copy: the cached columns/rows are shared, only the label differs
+    labelled = copy.copy(result)
+    labelled.source = source
+    return labelled
+
+
+class EsqlQueryLibrary:
+    """Validated tools/esql templates plus a time-bucketed result cache."""
+
+    def __init__(
+        self,
+        client_factory: Optional[Callable[[], Any]] = None,
+        esql_dir: Path = ESQL_TOOLS_DIR,
+        bucket_seconds: float = ESQL_CACHE_BUCKET_SECONDS,
+        max_entries: int = ESQL_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.client_factory = client_factory
+        self.esql_dir = Path(esql_dir)
+        self.bucket_seconds = bucket_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self.templates: Dict[str, EsqlTemplate] = {}
+        self._cache: "OrderedDict[tuple, EsqlResult]" = OrderedDict()
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self.queries = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+
+    def load(self) -> "EsqlQueryLibrary":
+        """Load and validate every template; invalid templates fail loudly."""
+        templates = {}
+        for path in sorted(self.esql_dir.glob("*.json")):
+            try:
+                template = load_template(path)
+            except (OSError, ValueError) as exc:
+                raise ValueError(f"Invalid ES|QL template {path.name}: {exc}") from exc
+            templates[template.id or path.stem] = template
+        self.templates = templates
+        logger.info(f"Loaded {len(templates)} ES|QL templates from {self.esql_dir}")
+        return self
+
+    def get(self, template_id: str) -> EsqlTemplate:
+        try:
+            return self.templates[template_id]
+        except KeyError:
+            raise KeyError(f"Unknown ES|QL template: {template_id}") from None
+
+    async def query(
+        self,
+        template: Union[str, EsqlTemplate],
+        arguments: Optional[Dict[str, Any]] = None,
+        *,
+        es=None,
+        max_rows: Optional[int] = None,
+        bucket_seconds: Optional[float] = None,
+        run_async: bool = False,
+        columnar: bool = False,
+    ) -> Union[EsqlResult, ColumnarResult]:
+        """Bind and run a template; identical queries in the same time bucket hit the cache.
+
+        ``run_async`` submits through the ES|QL async query API, for queries
+        over wide windows that may outlive a single request. ``columnar``
+        returns a ColumnarResult (Arrow-backed when pyarrow is installed).
+        """
+        if isinstance(template, str):
+            template = self.get(template)
+        query, params = template.bind(arguments or {})
+
+        request_key = (query, json.dumps(params, sort_keys=True, default=str), max_rows, columnar)
+        bucket_seconds = self.bucket_seconds if bucket_seconds is None else bucket_seconds
+        cache_key = None
+        if bucket_seconds > 0:
+            cache_key = (*request_key, bucket_seconds, int(self.clock() // bucket_seconds))
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                self.cache_hits += 1
+                return _with_source(cached, "cache")
+
+        pending = self._inflight.get(request_key)
+        if pending is not None:
+            self.coalesced += 1
+            try:
+                return _with_source(await asyncio.shield(pending), "coalesced")
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The caller running the query was cancelled, not this one: run it here instead
+                self.coalesced -= 1
+                return await self.query(
+                    template, arguments, es=es, max_rows=max_rows, bucket_seconds=bucket_seconds,
+                    run_async=run_async, columnar=columnar,
+                )
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[request_key] = future
+        try:
+            client = es if es is not None else self.client_factory()
+            if run_async:
+                result = await _execute_async_or_sync(client, query, params, max_rows, columnar)
+            elif columnar:
+                result = await execute_esql_columnar(client, query, params, max_rows)
+            else:
+                result = await execute_esql(client, query, params, max_rows)
+            self.queries += 1
+        except Exception as exc:
+            logger.warning(f"ES|QL query {template.id or template.fingerprint} failed: {exc}")
+            future.set_exception(exc)
+            # Mark retrieved so an uncontended failure is not reported twice
+            future.exception()
+            raise
+        except BaseException:
+            # Cancelled: waiters must not wait forever on a result that will never come
+            future.cancel()
+            raise
+        finally:
+            self._inflight.pop(request_key, None)
+
+        future.set_result(result)
+        if cache_key is not None:
+            self._store(cache_key, result)
+        return result
+
+    def _store(self, key: tuple, result: EsqlResult):
+        current_bucket = key[-1]
+        # Results from past buckets can never be hit again
+        for stale in [k for k in self._cache if k[-2] == key[-2] and k[-1] < current_bucket]:
+            del self._cache[stale]
+        self._cache[key] = result
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "templates": sorted(self.templates),
+            "queries": self.queries,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "cache_entries": len(self._cache),
+        }
@@ -0,0 +1,36 @@
+"""ES|QL result container shared by the sync and async query paths."""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+JSON_HEADERS = {"accept": "application/json", "content-type": "application/json"}
+
+
+@dataclass
+class EsqlResult:
+    columns: List[str]
+    rows: List[List[Any]]
+    truncated: bool = False
+    took_ms: float = 0.0
+    source: str = "elasticsearch"
+
+    def records(self) -> List[Dict[str, Any]]:
+        return [dict(zip(self.columns, row)) for row in self.rows]
+
+
+def limit_query(query: str, max_rows: Optional[int]) -> str:
+    if max_rows is None:
+        return query
+    # One row past the cap tells us whether the result was cut off
+    return f"{query}\n| LIMIT {max_rows + 1}"
+
+
+def response_body(resp) -> Dict[str, Any]:
+    return getattr(resp, "body", resp)
+
+
+def result_from_response(data: Dict[str, Any], max_rows: Optional[int], took_ms: float) -> EsqlResult:
+    columns = [column["name"] for column in data.get("columns", [])]
+    rows = data.get("values", [])
+    truncated = max_rows is not None and len(rows) > max_rows
+    return EsqlResult(columns, rows[:max_rows] if truncated else rows, truncated, round(took_ms, 2))
@@ -0,0 +1,122 @@
+"""
+JSON encoding shared by the gateway, the agents and their Elasticsearch clients.
+
+Incident documents, analyst reports with evidence and saved conversations are
+the largest payloads in the system and each one is encoded several times on
+its way through (HTTP between services, Elasticsearch requests, API
+responses). When orjson is installed it does the encoding, several times
+faster than the standard library and with datetimes, UUIDs and dataclasses
+handled natively; otherwise the standard library is used with the same
+output conventions (compact separators, UTF-8, unknown types as ``str``), so
+callers never depend on which one is active.
+"""
+import json
+from datetime import date
+from typing import Any, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    from starlette.responses import JSONResponse
+except ImportError:  # only needed by services that serve HTTP
+    JSONResponse = None
+
+JSON_HEADERS = {"content-type": "application/json"}
+
+
+def _default(value: Any) -> Any:
+    # Only reached for types orjson does not handle itself; match its output for the rest
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def dumps(value: Any, sort_keys: bool = False) -> bytes:
+    """Compact UTF-8 JSON; values JSON cannot represent are encoded as str."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(value, default=_default, option=option)
+    return json.dumps(
+        value, default=_default, sort_keys=sort_keys, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def dumps_str(value: Any, sort_keys: bool = False) -> str:
+    return dumps(value, sort_keys=sort_keys).decode("utf-8")
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_body(payload: Any, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Keyword arguments for an httpx request carrying payload as pre-encoded JSON.
+
+    Use as ``client.post(url, **json_body(payload))`` in place of ``json=payload``.
+    """
+    return {"content": dumps(payload), "headers": {**JSON_HEADERS, **(headers or {})}}
+
+
+if JSONResponse is not None:
+
+    class FastJSONResponse(JSONResponse):
+        """JSONResponse rendered with the shared encoder.
+
+        As the app's default response class it only replaces the final
+        encoding step; endpoints returning large documents can also return
+        it directly, which skips FastAPI's jsonable_encoder pass as well.
+        """
+
+        def render(self, content: Any) -> bytes:
+            return dumps(content)
+
+
+def es_serializers() -> Dict[str, Any]:
+    """Serializers for every JSON mimetype the Elasticsearch client negotiates."""
+    from elasticsearch.serializer import (
+        CompatibilityModeJsonSerializer,
+        CompatibilityModeNdjsonSerializer,
+        JsonSerializer,
+        NdjsonSerializer,
+    )
+
+    class _FastEncoding:
+        # Keeps the client's own default() for numpy/pandas/Decimal values
+        def json_dumps(self, data: Any) -> bytes:
+            if orjson is not None:
+                return orjson.dumps(data, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+            return super().json_dumps(data)
+
+        def json_loads(self, data: bytes) -> Any:
+            return loads(data)
+
+    serializers = {}
+    for base in (JsonSerializer, NdjsonSerializer, CompatibilityModeJsonSerializer, CompatibilityModeNdjsonSerializer):
+        serializer = type(f"Fast{base.__name__}", (_FastEncoding, base), {})()
+        serializers[serializer.mimetype] = serializer
+    return serializers
+
+
+def use_fast_json(es) -> bool:
+    """Switch an Elasticsearch client's JSON (de)serialization to the shared encoder.
+
+    Returns False for clients without pluggable serializers (e.g. test doubles).
+    """
+    serializers = getattr(getattr(es, "transport", None), "serializers", None)
+    registry = getattr(serializers, "serializers", None)
+    if not isinstance(registry, dict):
+        return False
+    try:
+        fast = es_serializers()
+    except ImportError:
+        return False
+    registry.update(fast)
+    serializers.default_serializer = fast["application/json"]
+    return True
@@ -0,0 +1,139 @@
+import asyncio
+import sys
+import types
+from pathlib import Path
+
+import pytest
+from elastic_transport import ConnectionTimeout
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from shared import es_client  # noqa: E402
+from shared.es_client import ClientSettings, add_latency_hook, close_clients, create_client, remove_latency_hook  # noqa: E402
+
+
+class ApiError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class FakeClient:
+    """Stands in for AsyncElasticsearch: fails each API call with the queued errors first."""
+
+    def __init__(self, **options):
+        self.options = options
+        self.errors = []
+        self.calls = []
+        self.closed = False
+        self.indices = types.SimpleNamespace(create=self._api("indices.create"))
+
+    def _api(self, name):
+        async def call(*args, **kwargs):
+            self.calls.append(name)
+            if self.errors:
+                raise self.errors.pop(0)
+            return {"result": name}
+
+        return call
+
+    def __getattr__(self, name):
+        return self._api(name)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_es(monkeypatch):
+    monkeypatch.setitem(sys.modules, "elasticsearch", types.SimpleNamespace(AsyncElasticsearch=FakeClient))
+
+
+@pytest.fixture
+def latencies():
+    observed = []
+
+    def hook(service, operation, seconds, error):
+        observed.append((service, operation, type(error).__name__ if error else None))
+
+    add_latency_hook(hook)
+    yield observed
+    remove_latency_hook(hook)
+
+
+def test_client_is_built_from_the_environment(fake_es, monkeypatch):
+    monkeypatch.setenv("ES_HOST", "https://es-1:9200, https://es-2:9200")
+    monkeypatch.setenv("ES_API_KEY", "secret")
+    monkeypatch.setenv("ES_CONNECTIONS_PER_NODE", "50")
+    monkeypatch.setenv("ES_SNIFF", "true")
+
+    client = create_client("sentinel")._client
+    assert client.options == {
+        "hosts": ["https://es-1:9200", "https://es-2:9200"],
+        "api_key": "secret",
+        "connections_per_node": 50,
+        "http_compress": True,
+        "request_timeout": 30.0,
+        "max_retries": 0,
+        "retry_on_timeout": False,
+        "sniff_on_start": True,
+        "sniff_on_node_failure": True,
+        "min_delay_between_sniffing": 60.0,
+    }
+    assert create_client("seed", hosts=["http://localhost:9200"])._client.options["hosts"] == ["http://localhost:9200"]
+
+
+def test_transient_failures_are_retried_and_reported_once(fake_es, latencies):
+    es = create_client("resolver", ClientSettings(backoff=0.001))
+    es._client.errors = [ConnectionTimeout("timed out"), ApiError(503)]
+
+    assert asyncio.run(es.search(index="runbooks-knowledge")) == {"result": "search"}
+    assert es._client.calls == ["search"] * 3
+    assert latencies == [("resolver", "search", None)]
+
+    es._client.errors = [ApiError(429), ApiError(404)]
+    with pytest.raises(ApiError):
+        asyncio.run(es.indices.create(index="runbooks-knowledge"))
+    assert es._client.calls[3:] == ["indices.create"] * 2
+    assert latencies[-1] == ("resolver", "indices.create", "ApiError")
+
+
+def test_non_idempotent_writes_are_not_retried_on_timeout(fake_es, latencies):
+    es = create_client("api-gateway", ClientSettings(backoff=0.001, max_retries=2))
+
+    es._client.errors = [ConnectionTimeout("timed out")]
+    with pytest.raises(ConnectionTimeout):
+        asyncio.run(es.index(index=".incidents", document={}))
+    es._client.errors = [ConnectionTimeout("timed out")]
+    asyncio.run(es.index(index=".incidents", id="INC-1", document={}))
+    # Rejected before anything was written
+    es._client.errors = [ApiError(429)]
+    asyncio.run(es.index(index=".incidents", document={}))
+
+    # A retried create that had landed would conflict with itself
+    es._client.errors = [ConnectionTimeout("timed out")]
+    with pytest.raises(ConnectionTimeout):
+        asyncio.run(es.index(index=".slack-interactions", id="cb-1", op_type="create", document={}))
+    es._client.errors = [ConnectionTimeout("timed out")]
+    with pytest.raises(ConnectionTimeout):
+        asyncio.run(es.create(index=".slack-interactions", id="cb-1", document={}))
+
+    es._client.errors = [ApiError(503)] * 3
+    with pytest.raises(ApiError):
+        asyncio.run(es.get(index=".incidents", id="INC-1"))
+    assert es._client.calls == ["index"] * 6 + ["create"] + ["get"] * 3
+
+
+def test_backoff_doubles_up_to_the_cap_with_jitter():
+    settings = ClientSettings(backoff=0.5, backoff_max=3.0)
+    for attempt, ceiling in enumerate([0.5, 1.0, 2.0, 3.0, 3.0]):
+        for _ in range(20):
+            assert ceiling / 2 <= settings.backoff_delay(attempt) <= ceiling
+
+
+def test_close_clients_closes_every_open_client(fake_es):
+    clients = [create_client("analyst"), create_client("analyst")]
+
+    asyncio.run(close_clients())
+    assert all(client._client.closed for client in clients)
+    assert not set(clients) & set(es_client._clients)
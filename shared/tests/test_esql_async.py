@@ -0,0 +1,130 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from shared.esql import EsqlQueryLibrary, execute_esql_async  # noqa: E402
+
+DONE = {"is_running": False, "columns": [{"name": "service.name"}], "values": [["payment"], ["auth"]]}
+
+
+class FakeAsyncES:
+    """Answers the async query API; the query finishes after `polls_needed` GETs."""
+
+    def __init__(self, polls_needed=0, poll_delay=0.0):
+        self.polls_needed = polls_needed
+        self.poll_delay = poll_delay
+        self.calls = []
+
+    async def perform_request(self, method, path, params=None, headers=None, body=None):
+        self.calls.append((method, path, params, body))
+        if method == "POST":
+            if self.polls_needed == 0:
+                return dict(DONE)
+            return {"id": "Q1", "is_running": True}
+        if method == "GET":
+            await asyncio.sleep(self.poll_delay)
+            self.polls_needed -= 1
+            if self.polls_needed <= 0:
+                return dict(DONE, id="Q1")
+            return {"id": "Q1", "is_running": True}
+        return {"acknowledged": True}
+
+    def methods(self):
+        return [method for method, *_ in self.calls]
+
+
+def test_fast_query_answers_inline_without_polling():
+    es = FakeAsyncES()
+
+    result = asyncio.run(execute_esql_async(es, "FROM logs", [{"service": "x"}], max_rows=1, wait_seconds=0.5))
+
+    assert es.methods() == ["POST"]
+    method, path, params, body = es.calls[0]
+    assert path == "/_query/async"
+    assert body["wait_for_completion_timeout"] == "500ms"
+    assert body["params"] == [{"service": "x"}]
+    assert body["query"].endswith("| LIMIT 2")
+    assert result.rows == [["payment"]] and result.truncated
+
+
+def test_running_query_is_polled_then_its_stored_result_freed():
+    es = FakeAsyncES(polls_needed=3)
+
+    result = asyncio.run(execute_esql_async(es, "FROM logs", wait_seconds=0.01))
+
+    assert es.methods() == ["POST", "GET", "GET", "GET", "DELETE"]
+    assert es.calls[1][1] == "/_query/async/Q1"
+    assert result.columns == ["service.name"] and len(result.rows) == 2
+
+
+def test_overrunning_query_is_cancelled_server_side():
+    es = FakeAsyncES(polls_needed=1000, poll_delay=0.01)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(execute_esql_async(es, "FROM logs", wait_seconds=0.01, timeout=0.05))
+
+    assert es.methods()[-1] == "DELETE"
+    assert es.calls[-1][1] == "/_query/async/Q1"
+
+
+def test_cancelled_caller_cancels_the_query():
+    es = FakeAsyncES(polls_needed=1000, poll_delay=0.01)
+
+    async def scenario():
+        task = asyncio.create_task(execute_esql_async(es, "FROM logs", wait_seconds=0.01))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+
+    assert es.methods()[-1] == "DELETE"
+
+
+def test_library_routes_heavy_queries_through_the_async_api():
+    es = FakeAsyncES(polls_needed=1)
+    library = EsqlQueryLibrary(client_factory=lambda: es).load()
+
+    result = asyncio.run(library.query("search_runbooks", {"query": "pool exhausted"}, run_async=True))
+
+    assert es.calls[0][1] == "/_query/async"
+    assert es.calls[0][3]["params"] == [{"query": "pool exhausted"}]
+    assert result.source == "elasticsearch"
+
+
+class ApiError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+def test_clusters_without_the_async_api_fall_back_to_sync_queries(monkeypatch):
+    from shared.esql import library as library_module
+
+    monkeypatch.setattr(library_module, "_async_unavailable", False)
+    paths = []
+
+    class PreAsyncES:
+        async def perform_request(self, method, path, params=None, headers=None, body=None):
+            paths.append(path)
+            if path.startswith("/_query/async"):
+                raise ApiError(404)
+            return {"columns": DONE["columns"], "values": DONE["values"]}
+
+    library = EsqlQueryLibrary(client_factory=PreAsyncES, bucket_seconds=0).load()
+
+    async def scenario():
+        first = await library.query("search_runbooks", {"query": "pool exhausted"}, run_async=True)
+        second = await library.query("search_runbooks", {"query": "disk full"}, run_async=True)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first.rows == second.rows == [["payment"], ["auth"]]
+    # Only the first query tries the async API
+    assert paths == ["/_query/async", "/_query", "/_query"]
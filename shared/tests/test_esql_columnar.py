@@ -0,0 +1,106 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from shared.esql import ColumnarResult, EsqlQueryLibrary, execute_esql_columnar  # noqa: E402
+from shared.esql import columnar  # noqa: E402
+
+COLUMNAR = {
+    "columns": [{"name": "service.name"}, {"name": "error_rate"}, {"name": "p99_latency"}],
+    "values": [["payment", "auth", "cart"], [0.2, None, 0.01], [1500, 200, 900]],
+}
+
+
+class FakeES:
+    """Answers only JSON; having no transport, Arrow is never negotiated."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def perform_request(self, method, path, params=None, headers=None, body=None):
+        self.calls.append((method, path, params, body))
+        if path == "/_query/async":
+            return dict(COLUMNAR, is_running=False)
+        return dict(COLUMNAR)
+
+
+def test_columnar_json_keeps_one_list_per_column():
+    es = FakeES()
+
+    result = asyncio.run(execute_esql_columnar(es, "FROM metrics", [{"service": "x"}], max_rows=2))
+
+    method, path, params, body = es.calls[-1]
+    assert path == "/_query" and params == {"format": "json"}
+    assert body["columnar"] is True and body["params"] == [{"service": "x"}]
+    assert body["query"].endswith("| LIMIT 3")
+    assert not result.is_arrow
+    assert result.num_rows == 2 and result.truncated
+    assert list(result.column("service.name")) == ["payment", "auth"]
+
+
+def test_filter_and_aggregate_skip_nulls():
+    result = ColumnarResult.from_columnar_json(COLUMNAR)
+
+    hot = result.filter("error_rate", ">", 0.05)
+    assert hot.num_rows == 1 and hot.first()["service.name"] == "payment"
+    assert result.filter("p99_latency", "<=", 900).column("service.name") == ["auth", "cart"]
+
+    assert result.aggregate("error_rate", "count") == 2
+    assert result.aggregate("error_rate", "max") == 0.2
+    assert result.aggregate("p99_latency", "mean") == pytest.approx(866.67, abs=0.01)
+    assert result.filter("error_rate", ">", 1).aggregate("error_rate", "sum") is None
+
+    with pytest.raises(ValueError):
+        result.filter("error_rate", "~", 1)
+    with pytest.raises(ValueError):
+        result.aggregate("error_rate", "median")
+
+
+def test_rows_are_lazy_views_over_the_columns():
+    result = ColumnarResult.from_columnar_json(COLUMNAR)
+
+    row = result.first()
+    assert list(row) == ["service.name", "error_rate", "p99_latency"]
+    assert row["p99_latency"] == 1500 and row.get("team") is None
+    assert [r["service.name"] for r in result.rows()] == ["payment", "auth", "cart"]
+    assert result.to_records()[1] == {"service.name": "auth", "error_rate": None, "p99_latency": 200}
+    assert ColumnarResult.from_columnar_json({"columns": [], "values": []}).first() is None
+
+
+def test_library_columnar_queries_cache_separately_from_row_queries():
+    es = FakeES()
+    library = EsqlQueryLibrary(client_factory=lambda: es, bucket_seconds=30, clock=lambda: 1000.0).load()
+    arguments = {"service_name": "payment-service"}
+
+    async def scenario():
+        rows = await library.query("detect_anomalies", arguments)
+        first = await library.query("detect_anomalies", arguments, columnar=True)
+        again = await library.query("detect_anomalies", arguments, columnar=True)
+        via_async = await library.query("detect_anomalies", arguments, run_async=True, columnar=True, bucket_seconds=0)
+        return rows, first, again, via_async
+
+    rows, first, again, via_async = asyncio.run(scenario())
+
+    assert len(es.calls) == 3
+    assert not isinstance(rows, ColumnarResult)
+    assert isinstance(first, ColumnarResult) and first.source == "elasticsearch"
+    assert again.source == "cache" and again.first()["service.name"] == "payment"
+    assert es.calls[-1][1] == "/_query/async" and es.calls[-1][3]["columnar"] is True
+    assert via_async.num_rows == 3
+
+
+@pytest.mark.skipif(columnar.pa is None, reason="pyarrow not installed")
+def test_arrow_tables_are_sliced_and_filtered_in_place():
+    pa = columnar.pa
+    table = pa.table({"service.name": ["payment", "auth", "cart"], "error_rate": [0.2, None, 0.01]})
+
+    result = ColumnarResult.from_arrow(table, max_rows=2)
+
+    assert result.is_arrow and result.truncated and result.num_rows == 2
+    assert result.filter("error_rate", ">", 0.05).to_records() == [{"service.name": "payment", "error_rate": 0.2}]
+    assert result.aggregate("error_rate", "count") == 1
+    assert result.first()["service.name"] == "payment"
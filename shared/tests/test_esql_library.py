@@ -0,0 +1,106 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from shared.esql import EsqlQueryLibrary, EsqlTemplate  # noqa: E402
+
+
+class FakeES:
+    def __init__(self):
+        self.requests = []
+
+    async def perform_request(self, method, path, params=None, headers=None, body=None):
+        self.requests.append(body)
+        await asyncio.sleep(0.01)
+        return {"columns": [{"name": "service.name"}, {"name": "error_rate"}], "values": [["payment", 0.2]]}
+
+
+def _library(now):
+    es = FakeES()
+    library = EsqlQueryLibrary(client_factory=lambda: es, bucket_seconds=30, clock=lambda: now[0]).load()
+    return library, es
+
+
+def test_all_repo_templates_load_and_bind_with_native_params():
+    library, _ = _library([0.0])
+
+    assert {"detect_anomalies", "search_runbooks", "check_recent_deployments"} <= set(library.templates)
+
+    query, params = library.get("detect_anomalies").bind({"service_name": 'pay"ment'})
+    assert 'service.name == ?service_name' in query
+    assert "NOW() - 15 minutes" in query
+    assert "error_rate > ?error_threshold OR p99_latency > ?latency_threshold" in query
+    assert params == [
+        {"service_name": 'pay"ment'},
+        {"error_threshold": 0.05},
+        {"latency_threshold": 500.0},
+    ]
+
+    # A parameter used twice is bound once
+    query, params = library.get("search_runbooks").bind({"query": "db pool"})
+    assert query.count("?query") == 2 and params == [{"query": "db pool"}]
+
+
+def test_invalid_template_fails_at_load(tmp_path):
+    (tmp_path / "broken.json").write_text('{"id": "broken", "configuration": {"query": "FROM x | WHERE a == ${b}"}}')
+
+    with pytest.raises(ValueError, match="broken.json"):
+        EsqlQueryLibrary(esql_dir=tmp_path).load()
+
+
+def test_results_are_cached_per_time_bucket():
+    now = [1000.0]
+    library, es = _library(now)
+    arguments = {"service_name": "payment-service", "time_window": "15m"}
+
+    async def scenario():
+        first = await library.query("detect_anomalies", arguments)
+        second = await library.query("detect_anomalies", dict(arguments, error_threshold="0.05"))
+        now[0] += 30
+        third = await library.query("detect_anomalies", arguments)
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+
+    assert [first.source, second.source, third.source] == ["elasticsearch", "cache", "elasticsearch"]
+    assert second.records() == [{"service.name": "payment", "error_rate": 0.2}]
+    assert len(es.requests) == 2
+    assert es.requests[0]["params"][0] == {"service_name": "payment-service"}
+    # The entry from the expired bucket was dropped
+    assert library.snapshot()["cache_entries"] == 1
+
+
+def test_identical_inflight_queries_share_one_request():
+    library, es = _library([0.0])
+    template = EsqlTemplate(query='FROM logs | WHERE service.name == "${service}"', params={"service": {}})
+
+    async def scenario():
+        return await asyncio.gather(*(
+            library.query(template, {"service": "cart"}, bucket_seconds=0) for _ in range(3)
+        ))
+
+    results = asyncio.run(scenario())
+
+    assert len(es.requests) == 1
+    assert sorted(result.source for result in results) == ["coalesced", "coalesced", "elasticsearch"]
+
+
+def test_coalesced_callers_rerun_a_query_whose_caller_was_cancelled():
+    library, es = _library([0.0])
+    template = EsqlTemplate(query="FROM logs", params={})
+
+    async def scenario():
+        first = asyncio.create_task(library.query(template, bucket_seconds=0))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(library.query(template, bucket_seconds=0))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        return await asyncio.wait_for(second, 1)
+
+    assert asyncio.run(scenario()).source == "elasticsearch"
+    assert len(es.requests) == 2
+    assert library.snapshot()["coalesced"] == 0
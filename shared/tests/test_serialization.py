@@ -0,0 +1,65 @@
+import json
+import sys
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from shared import serialization  # noqa: E402
+from shared.serialization import FastJSONResponse, dumps, json_body, loads, use_fast_json  # noqa: E402
+
+DOC = {
+    "incident_id": "INC-1",
+    "created_at": datetime(2026, 1, 1, 12, 30, tzinfo=timezone.utc),
+    "correlation_id": uuid.UUID(int=7),
+    "tags": {"payments"},
+    "service": "paiement-é",
+    "analyst_report": {"confidence": 0.92, "evidence": [{"snippet": "timeout"}]},
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def encoder(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(serialization, "orjson", None)
+    elif serialization.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+def test_both_encoders_produce_the_same_document(encoder):
+    decoded = loads(dumps(DOC))
+
+    assert decoded["created_at"] == "2026-01-01T12:30:00+00:00"
+    assert decoded["correlation_id"] == "00000000-0000-0000-0000-000000000007"
+    assert decoded["tags"] == ["payments"]
+    assert decoded["service"] == "paiement-é"
+    assert dumps({"b": 1, "a": {"d": 1, "c": 2}}, sort_keys=True) == b'{"a":{"c":2,"d":1},"b":1}'
+
+
+def test_http_payloads_and_responses_are_pre_encoded(encoder):
+    kwargs = json_body({"incident_id": "INC-1"}, headers={"x-request-id": "abc"})
+
+    assert json.loads(kwargs["content"]) == {"incident_id": "INC-1"}
+    assert kwargs["headers"] == {"content-type": "application/json", "x-request-id": "abc"}
+    assert FastJSONResponse({"n": 1}).body == b'{"n":1}'
+
+
+def test_elasticsearch_client_serializers_are_replaced(encoder, monkeypatch):
+    if not hasattr(sys.modules.get("elasticsearch"), "__path__"):
+        # Some agent tests install a bare elasticsearch stub; this test needs the real client
+        monkeypatch.delitem(sys.modules, "elasticsearch", raising=False)
+    elasticsearch = pytest.importorskip("elasticsearch")
+    es = elasticsearch.AsyncElasticsearch(hosts=["http://localhost:9200"])
+
+    assert use_fast_json(es)
+    serializers = es.transport.serializers
+    body = serializers.dumps({"at": DOC["created_at"], "cost": Decimal("1.5")}, "application/vnd.elasticsearch+json")
+    assert json.loads(body) == {"at": "2026-01-01T12:30:00+00:00", "cost": 1.5}
+    assert serializers.dumps([{"index": {}}, {"a": 1}], "application/x-ndjson") == b'{"index":{}}\n{"a":1}\n'
+    assert serializers.loads(b'{"took":3}', "application/json; charset=UTF-8") == {"took": 3}
+    assert not use_fast_json(object())
@@ -0,0 +1,128 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from shared import tracing  # noqa: E402
+from shared.serialization import loads  # noqa: E402
+from shared.tracing import CLIENT, SERVER, TracedElasticsearch, Tracer, TracingMiddleware  # noqa: E402
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    path = tmp_path / "traces-{service}.jsonl"
+    tracing.configure(str(path), flush_interval=60)
+    yield path
+    tracing.configure(None)
+
+
+def exported(path, service):
+    tracing._exporter.flush()
+    spans = []
+    for line in Path(str(path).replace("{service}", service)).read_text().splitlines():
+        for resource in loads(line)["resourceSpans"]:
+            assert resource["resource"]["attributes"] == [
+                {"key": "service.name", "value": {"stringValue": service}}
+            ]
+            for scope in resource["scopeSpans"]:
+                spans.extend(scope["spans"])
+    return {span["name"]: span for span in spans}
+
+
+def attributes(span):
+    return {item["key"]: next(iter(item["value"].values())) for item in span["attributes"]}
+
+
+def test_spans_nest_and_share_the_trace_derived_from_the_correlation_id(trace_file):
+    tracer = Tracer("sentinel")
+    with tracer.span("report", CLIENT, correlation_id="autodetect-1") as root:
+        headers = tracing.inject({"content-type": "application/json"})
+        with tracer.span("inner", attributes={"incident_id": "INC-1"}):
+            pass
+
+    spans = exported(trace_file, "sentinel")
+    assert root.trace_id == tracing.trace_id_for("autodetect-1")
+    assert spans["inner"]["traceId"] == spans["report"]["traceId"] == root.trace_id
+    assert spans["inner"]["parentSpanId"] == spans["report"]["spanId"]
+    assert "parentSpanId" not in spans["report"]
+    assert attributes(spans["inner"]) == {"incident_id": "INC-1", "correlation_id": "autodetect-1"}
+    assert spans["report"]["kind"] == CLIENT
+    assert int(spans["report"]["endTimeUnixNano"]) >= int(spans["report"]["startTimeUnixNano"])
+
+    assert headers["content-type"] == "application/json"
+    assert headers["traceparent"] == f"00-{root.trace_id}-{root.span_id}-01"
+    assert headers["baggage"] == "correlation_id=autodetect-1"
+    remote = tracing.extract(headers)
+    assert (remote.trace_id, remote.span_id, remote.correlation_id) == (root.trace_id, root.span_id, "autodetect-1")
+
+
+def test_failures_are_recorded_and_reraised(trace_file):
+    tracer = Tracer("analyst")
+    with pytest.raises(RuntimeError):
+        with tracer.span("send_report_to_gateway", CLIENT):
+            raise RuntimeError("gateway down")
+
+    span = exported(trace_file, "analyst")["send_report_to_gateway"]
+    assert span["status"] == {"code": tracing.STATUS_ERROR, "message": "gateway down"}
+    assert attributes(span)["exception.type"] == "RuntimeError"
+
+
+def test_tracing_off_exports_nothing_and_injects_no_headers(tmp_path):
+    tracing.configure(None)
+    tracer = Tracer("resolver")
+    with tracer.span("resolve") as span:
+        span.set_attribute("ignored", True)
+        assert tracing.inject() == {}
+    assert span is tracing.NOOP_SPAN
+    assert tracing.extract({"traceparent": "not-a-traceparent"}) is None
+
+
+def test_middleware_continues_the_callers_trace_and_es_calls_become_children(trace_file):
+    from fastapi import FastAPI
+
+    tracer = Tracer("api-gateway")
+
+    class Client:
+        async def index(self, index, document):
+            return {"result": "created"}
+
+    es = TracedElasticsearch(Client(), tracer)
+    app = FastAPI()
+    app.add_middleware(TracingMiddleware, tracer=tracer)
+
+    @app.post("/incidents/{incident_id}")
+    async def create(incident_id: str):
+        await es.index(index=".incidents", document={"incident_id": incident_id})
+        return {"ok": True}
+
+    @app.get("/healthz")
+    async def health():
+        return {"ok": True}
+
+    caller = Tracer("sentinel")
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gateway") as client:
+            with caller.span("report", CLIENT, correlation_id="corr-9") as parent:
+                await client.post("/incidents/INC-7", headers=tracing.inject())
+            await client.get("/healthz")
+            # Outside any trace ES calls are not spans
+            await es.index(index=".incidents", document={})
+        return parent
+
+    parent = asyncio.run(scenario())
+
+    spans = exported(trace_file, "api-gateway")
+    assert set(spans) == {"POST /incidents/{incident_id}", "elasticsearch.index"}
+    server, es_call = spans["POST /incidents/{incident_id}"], spans["elasticsearch.index"]
+    assert server["kind"] == SERVER
+    assert server["traceId"] == parent.trace_id == tracing.trace_id_for("corr-9")
+    assert server["parentSpanId"] == parent.span_id
+    assert attributes(server)["http.status_code"] == "200"
+    assert attributes(server)["correlation_id"] == "corr-9"
+    assert es_call["parentSpanId"] == server["spanId"]
+    assert attributes(es_call)["db.elasticsearch.index"] == ".incidents"
@@ -0,0 +1,395 @@
+"""
+Distributed tracing across the incident pipeline, keyed by correlation_id.
+
+A span is one timed unit of work (an HTTP request served, a call to another
+service, an Elasticsearch request, an Agent Builder stream). The current span
+lives in a context variable, so spans opened inside it, including in tasks it
+starts, become its children without being passed around.
+
+Context crosses service boundaries as W3C trace context: ``inject()`` returns
+a ``traceparent`` header for the current span plus a ``baggage`` header with
+the correlation_id, and ``TracingMiddleware`` continues them on the receiving
+side. A trace started with a correlation_id (the Sentinel's report) takes its
+trace id from it, so every span of an incident's run, Sentinel to Resolver,
+shares one trace id derived from the correlation_id, and every span carries
+the correlation_id as an attribute.
+
+Finished spans are queued and written by a background thread to
+``TRACE_EXPORT_PATH`` as OTLP/JSON lines (one ExportTraceServiceRequest per
+line, the format the OpenTelemetry Collector's ``otlpjsonfile`` receiver
+reads; ``{service}`` in the path gives each service its own file). With no
+path set, tracing is off: spans are a shared no-op and nothing is queued.
+Exporting never blocks a request; past ``TRACE_MAX_QUEUE`` pending spans new
+ones are dropped and counted.
+"""
+import atexit
+import hashlib
+import os
+import re
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence
+from urllib.parse import quote, unquote
+
+from shared.serialization import dumps
+
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")
+TRACE_FLUSH_SECONDS = float(os.getenv("TRACE_FLUSH_SECONDS", "1.0"))
+TRACE_MAX_QUEUE = int(os.getenv("TRACE_MAX_QUEUE", "10000"))
+
+# OTLP span kinds
+INTERNAL, SERVER, CLIENT = 1, 2, 3
+STATUS_OK, STATUS_ERROR = 1, 2
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+def trace_id_for(correlation_id: str) -> str:
+    """Trace id shared by every span of the run started under this correlation_id."""
+    return hashlib.sha256(correlation_id.encode("utf-8")).hexdigest()[:32]
+
+
+class SpanContext:
+    """What identifies a span to its children: trace, span and correlation ids."""
+
+    __slots__ = ("trace_id", "span_id", "correlation_id")
+
+    def __init__(self, trace_id: str, span_id: str, correlation_id: Optional[str] = None):
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.correlation_id = correlation_id
+
+
+class Span(SpanContext):
+    __slots__ = ("name", "service", "kind", "parent_id", "start_ns", "end_ns", "attributes", "status", "message")
+
+    def __init__(self, name: str, service: str, kind: int, parent: Optional[SpanContext],
+                 correlation_id: Optional[str] = None, attributes: Optional[Dict[str, Any]] = None):
+        correlation_id = correlation_id or (parent.correlation_id if parent else None)
+        if parent is not None:
+            trace_id = parent.trace_id
+        elif correlation_id:
+            trace_id = trace_id_for(correlation_id)
+        else:
+            trace_id = secrets.token_hex(16)
+        super().__init__(trace_id, secrets.token_hex(8), correlation_id)
+        self.name = name
+        self.service = service
+        self.kind = kind
+        self.parent_id = parent.span_id if parent else None
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = dict(attributes or {})
+        if correlation_id:
+            self.attributes["correlation_id"] = correlation_id
+        self.status = 0
+        self.message = ""
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException):
+        self.status = STATUS_ERROR
+        self.message = str(exc)[:500]
+        self.attributes["exception.type"] = type(exc).__name__
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status, "message": self.message} if self.status else {},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class _NoopSpan:
+    """Handed out while tracing is off, so call sites never check."""
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def record_exception(self, exc: BaseException):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current: ContextVar[Optional[SpanContext]] = ContextVar("datapulse_current_span", default=None)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+class SpanExporter:
+    """Queues finished spans; a daemon thread appends them to the trace file(s) as OTLP/JSON."""
+
+    def __init__(self, path: str, flush_interval: float = 1.0, max_queue: int = 10000):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.dropped = 0
+        self._queue: Deque[Span] = deque()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def export(self, span: Span):
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            return
+        self._queue.append(span)
+        if self._thread is None:
+            self._start()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _run(self):
+        while not self._wake.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            spans = []
+            while self._queue:
+                spans.append(self._queue.popleft())
+            if not spans:
+                return
+            by_service: Dict[str, List[Span]] = {}
+            for span in spans:
+                by_service.setdefault(span.service, []).append(span)
+            for service, service_spans in by_service.items():
+                self._write(service, service_spans)
+
+    def _write(self, service: str, spans: Sequence[Span]):
+        request = {
+            "resourceSpans": [{
+                "resource": {"attributes": _otlp_attributes({"service.name": service})},
+                "scopeSpans": [{"scope": {"name": "datapulse"}, "spans": [span.to_otlp() for span in spans]}],
+            }]
+        }
+        path = self.path.replace("{service}", service)
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # One append per batch keeps lines from different writers whole
+            with open(path, "ab") as handle:
+                handle.write(dumps(request) + b"\n")
+        except OSError:
+            self.dropped += len(spans)
+
+    def shutdown(self):
+        self._wake.set()
+        self.flush()
+
+
+_exporter: Optional[SpanExporter] = (
+    SpanExporter(TRACE_EXPORT_PATH, TRACE_FLUSH_SECONDS, TRACE_MAX_QUEUE) if TRACE_EXPORT_PATH else None
+)
+
+
+def configure(path: Optional[str], flush_interval: float = TRACE_FLUSH_SECONDS,
+              max_queue: int = TRACE_MAX_QUEUE) -> Optional[SpanExporter]:
+    """Replace the exporter (None turns tracing off); pending spans of the old one are written first."""
+    global _exporter
+    if _exporter is not None:
+        _exporter.shutdown()
+    _exporter = SpanExporter(path, flush_interval, max_queue) if path else None
+    return _exporter
+
+
+def enabled() -> bool:
+    return _exporter is not None
+
+
+def current_context() -> Optional[SpanContext]:
+    return _current.get()
+
+
+def current_span():
+    """The active span to annotate, or the no-op span."""
+    span = _current.get()
+    return span if isinstance(span, Span) else NOOP_SPAN
+
+
+def inject(headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Headers carrying the current trace context to another service (none while tracing is off)."""
+    headers = dict(headers or {})
+    context = _current.get()
+    if context is not None:
+        headers["traceparent"] = f"00-{context.trace_id}-{context.span_id}-01"
+        if context.correlation_id:
+            headers["baggage"] = f"correlation_id={quote(context.correlation_id, safe='')}"
+    return headers
+
+
+def extract(headers: Dict[str, str]) -> Optional[SpanContext]:
+    """The remote parent from incoming ``traceparent``/``baggage`` headers (lower-case keys), if valid."""
+    match = _TRACEPARENT.match(headers.get("traceparent", "").strip())
+    if not match:
+        return None
+    correlation_id = None
+    for member in headers.get("baggage", "").split(","):
+        key, _, value = member.partition("=")
+        if key.strip() == "correlation_id":
+            correlation_id = unquote(value.split(";", 1)[0].strip()) or None
+    return SpanContext(match.group(1), match.group(2), correlation_id)
+
+
+class Tracer:
+    """Opens spans for one service."""
+
+    def __init__(self, service: str):
+        self.service = service
+
+    def start(self, name: str, kind: int = INTERNAL, parent: Optional[SpanContext] = None,
+              correlation_id: Optional[str] = None, attributes: Optional[Dict[str, Any]] = None) -> Span:
+        """Start a span without activating it; pair with ``finish``. Prefer ``span()``."""
+        return Span(name, self.service, kind, parent if parent is not None else _current.get(),
+                    correlation_id, attributes)
+
+    @staticmethod
+    def finish(span: Span):
+        span.end_ns = time.time_ns()
+        if span.status == 0:
+            span.status = STATUS_OK
+        exporter = _exporter
+        if exporter is not None:
+            exporter.export(span)
+
+    @contextmanager
+    def span(self, name: str, kind: int = INTERNAL, correlation_id: Optional[str] = None,
+             attributes: Optional[Dict[str, Any]] = None, child_only: bool = False) -> Iterator[Any]:
+        """Active span around a block; exceptions mark it failed and propagate.
+
+        ``child_only`` spans are skipped outside a trace, for calls (datastore
+        requests, polling loops) that are only interesting as part of one.
+        """
+        if _exporter is None or (child_only and _current.get() is None):
+            yield NOOP_SPAN
+            return
+        span = self.start(name, kind, correlation_id=correlation_id, attributes=attributes)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.record_exception(exc)
+            raise
+        finally:
+            _current.reset(token)
+            self.finish(span)
+
+
+class TracedElasticsearch:
+    """Proxy over an async Elasticsearch client opening a client span per API call within a trace.
+
+    Non-callable attributes (``indices``, ``transport``) pass through untraced.
+    """
+
+    def __init__(self, client: Any, tracer: Tracer):
+        self._client = client
+        self._tracer = tracer
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if not callable(attr) or name.startswith("_"):
+            return attr
+
+        async def traced(*args, **kwargs):
+            if _exporter is None or _current.get() is None:
+                return await attr(*args, **kwargs)
+            attributes = {"db.system": "elasticsearch", "db.operation": name}
+            if isinstance(kwargs.get("index"), str):
+                attributes["db.elasticsearch.index"] = kwargs["index"]
+            if name == "perform_request" and len(args) >= 2:
+                attributes["http.method"], attributes["url.path"] = args[0], args[1]
+            with self._tracer.span(f"elasticsearch.{name}", CLIENT, attributes=attributes):
+                return await attr(*args, **kwargs)
+
+        return traced
+
+
+class TracingMiddleware:
+    """ASGI middleware opening a server span per request, continuing the caller's trace context.
+
+    The span ends with the last response body chunk, so background tasks that
+    run after the response (the agents' investigations) show up as its
+    children without stretching it.
+    """
+
+    def __init__(self, app, tracer: Tracer, exclude: Sequence[str] = ("/healthz", "/readyz", "/metrics")):
+        self.app = app
+        self.tracer = tracer
+        self.exclude = tuple(exclude)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or _exporter is None or scope["path"].startswith(self.exclude):
+            await self.app(scope, receive, send)
+            return
+
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope.get("headers", [])}
+        span = self.tracer.start(
+            f"{scope['method']} {scope['path']}",
+            SERVER,
+            parent=extract(headers),
+            attributes={"http.method": scope["method"], "url.path": scope["path"]},
+        )
+        token = _current.set(span)
+        finished = False
+
+        def finish():
+            nonlocal finished
+            if not finished:
+                finished = True
+                route = scope.get("route")
+                if route is not None and getattr(route, "path", None):
+                    # Route templates keep span names bounded, like the request metrics' labels
+                    span.name = f"{scope['method']} {route.path}"
+                    span.attributes["http.route"] = route.path
+                self.tracer.finish(span)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                span.attributes["http.status_code"] = message["status"]
+                if message["status"] >= 500:
+                    span.status = STATUS_ERROR
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except BaseException as exc:
+            span.record_exception(exc)
+            raise
+        finally:
+            _current.reset(token)
+            finish()
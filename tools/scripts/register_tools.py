@@ -2,36 +2,43 @@
 """
 Tool Registration Script for Elastic Agent Builder
 
-This script registers all ES|QL tools with Agent Builder API.
-These tools will be available to the Incident Investigator agent.
+Syncs the ES|QL tool catalog with the Agent Builder API. Tool definitions come
+from TOOLS below and from the templates in tools/esql/*.json. The registered
+set is fetched once, desired and registered tools are compared by content
+hash, and only the differing tools are created, updated or deleted
+(concurrently). Only tools under the managed "custom." prefix are touched.
 
 Usage:
     export KIBANA_URL="https://your-cluster.kb.region.cloud.es.io:9243"
     export ELASTIC_API_KEY="your_api_key_here"
-    python3 register_tools.py
+    python3 register_tools.py              # sync and print the plan + timings
+    python3 register_tools.py --dry-run    # print the plan only
+    python3 register_tools.py --list       # sync, then list registered tools
 """
 
+import argparse
+import asyncio
+import hashlib
 import httpx
 import os
+import re
 import sys
 import json
-from typing import List, Dict, Any
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
 
 
 # Environment variables
-KIBANA_URL = os.getenv("KIBANA_URL")
+KIBANA_URL = (os.getenv("KIBANA_URL") or "").rstrip('/')
 ELASTIC_API_KEY = os.getenv("ELASTIC_API_KEY")
 
-if not KIBANA_URL or not ELASTIC_API_KEY:
-    print("[ERROR] ERROR: Missing environment variables")
-    print("   Required: KIBANA_URL, ELASTIC_API_KEY")
-    print("")
-    print("   Example:")
-    print('   export KIBANA_URL="https://your-cluster.kb.us-east-1.aws.found.io:9243"')
-    print('   export ELASTIC_API_KEY="your_agent_builder_api_key"')
-    sys.exit(1)
-
-KIBANA_URL = KIBANA_URL.rstrip('/')
+ESQL_TOOLS_DIR = Path(__file__).resolve().parents[1] / "esql"
+TOOLS_ENDPOINT = "/api/agent_builder/tools"
+MANAGED_PREFIX = "custom."
+# Fields we own; anything else the API returns (readonly, schema, ...) is ignored when diffing
+SYNCED_FIELDS = ("type", "description", "configuration", "tags")
 
 
 # Tool definitions
@@ -174,103 +181,281 @@ TOOLS: List[Dict[str, Any]] = [
 ]
 
 
-def register_tools():
-    """Register all tools with Agent Builder API."""
-    
-    headers = {
+# `"${name}"` (a string literal) or bare `${name}` in tools/esql templates
+_PLACEHOLDER = re.compile(r'"\$\{(\w+)\}"|\$\{(\w+)\}')
+# `NOW() - ${time_window}`: a time span, which ES|QL cannot take as a plain parameter
+_TIME_ARITHMETIC = re.compile(r"[-+]\s*$")
+_DURATION = re.compile(r"^\s*(\d+)\s*([a-zA-Z]+)\s*$")
+_DURATION_UNITS = {"ms": "milliseconds", "s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def _time_span(value: Any) -> Any:
+    """'15m' -> '15 minutes', the form TO_TIMEDURATION accepts."""
+    match = _DURATION.match(str(value))
+    if not match:
+        return value
+    unit = _DURATION_UNITS.get(match.group(2).lower(), match.group(2))
+    return f"{match.group(1)} {unit}"
+
+
+def convert_esql_template(template: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a tools/esql template into an Agent Builder tool definition.
+
+    Placeholders become native ?params; time spans are passed as strings and
+    converted with TO_TIMEDURATION.
+    """
+    configuration = template.get("configuration", {})
+    params = {name: dict(spec) for name, spec in configuration.get("params", {}).items()}
+
+    def substitute(match: re.Match) -> str:
+        quoted, bare = match.groups()
+        name = quoted or bare
+        if bare and _TIME_ARITHMETIC.search(match.string, 0, match.start()):
+            spec = params.setdefault(name, {"type": "string"})
+            if "default" in spec:
+                spec["default"] = _time_span(spec["default"])
+            return f"TO_TIMEDURATION(?{name})"
+        return f"?{name}"
+
+    tool_id = template["id"]
+    return {
+        "id": tool_id if tool_id.startswith(MANAGED_PREFIX) else f"{MANAGED_PREFIX}{tool_id}",
+        "type": template.get("type", "esql"),
+        "description": template.get("description", ""),
+        "configuration": {
+            "query": _PLACEHOLDER.sub(substitute, configuration.get("query", "")),
+            "params": params,
+        },
+        "tags": template.get("tags", ["esql", "datapulse"]),
+    }
+
+
+def load_desired_tools(esql_dir: Path = ESQL_TOOLS_DIR) -> Dict[str, Dict[str, Any]]:
+    """Tool definitions from TOOLS and tools/esql, keyed by id.
+
+    TOOLS entries are written for Agent Builder directly and win over a
+    converted template with the same id.
+    """
+    desired: Dict[str, Dict[str, Any]] = {}
+    for path in sorted(Path(esql_dir).glob("*.json")):
+        tool = convert_esql_template(json.loads(path.read_text(encoding="utf-8")))
+        desired[tool["id"]] = tool
+    for tool in TOOLS:
+        if tool["id"] in desired:
+            print(f"[INFO] {tool['id']}: TOOLS definition overrides tools/esql template")
+        desired[tool["id"]] = tool
+    return desired
+
+
+def content_hash(tool: Dict[str, Any]) -> str:
+    """Hash of the synced fields, stable across key order and whitespace."""
+    synced = {key: tool.get(key) for key in SYNCED_FIELDS}
+    synced["tags"] = sorted(synced["tags"] or [])
+    return hashlib.sha256(json.dumps(synced, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+@dataclass
+class SyncPlan:
+    create: List[Dict[str, Any]] = field(default_factory=list)
+    update: List[Dict[str, Any]] = field(default_factory=list)
+    delete: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+
+    @property
+    def changes(self) -> int:
+        return len(self.create) + len(self.update) + len(self.delete)
+
+
+def plan_sync(
+    desired: Dict[str, Dict[str, Any]],
+    registered: Dict[str, Dict[str, Any]],
+    delete_orphans: bool = True,
+) -> SyncPlan:
+    """Diff desired against registered tools by content hash."""
+    plan = SyncPlan()
+    for tool_id, tool in sorted(desired.items()):
+        current = registered.get(tool_id)
+        if current is None:
+            plan.create.append(tool)
+        elif content_hash(current) != content_hash(tool):
+            plan.update.append(tool)
+        else:
+            plan.unchanged.append(tool_id)
+
+    if delete_orphans:
+        plan.delete = sorted(
+            tool_id for tool_id in registered
+            if tool_id.startswith(MANAGED_PREFIX) and tool_id not in desired
+        )
+    return plan
+
+
+def print_plan(plan: SyncPlan):
+    print(f"[PLAN] create={len(plan.create)} update={len(plan.update)} "
+          f"delete={len(plan.delete)} unchanged={len(plan.unchanged)}")
+    for tool in plan.create:
+        print(f"   + {tool['id']}")
+    for tool in plan.update:
+        print(f"   ~ {tool['id']}")
+    for tool_id in plan.delete:
+        print(f"   - {tool_id}")
+
+
+def _headers() -> Dict[str, str]:
+    return {
         "Authorization": f"ApiKey {ELASTIC_API_KEY}",
         "Content-Type": "application/json",
         "kbn-xsrf": "true"  # Required for Kibana API
     }
-    
-    success_count = 0
-    failed_tools = []
-    
-    print(f"[CONFIG] Registering {len(TOOLS)} tools with Agent Builder...")
+
+
+async def fetch_registered_tools(client: httpx.AsyncClient) -> Dict[str, Dict[str, Any]]:
+    """Fetch the registered tool set in a single call."""
+    response = await client.get(TOOLS_ENDPOINT)
+    response.raise_for_status()
+    data = response.json()
+    tools = data.get("results", []) if isinstance(data, dict) else data
+    return {tool["id"]: tool for tool in tools if tool.get("id")}
+
+
+async def _apply(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, action: str,
+                 tool_id: str, request) -> Tuple[str, str, Optional[str], float]:
+    async with semaphore:
+        started = time.perf_counter()
+        try:
+            response = await request()
+            error = None if response.status_code in (200, 201, 204) else \
+                f"HTTP {response.status_code}: {response.text[:200]}"
+        except httpx.RequestError as e:
+            error = f"Network error: {e}"
+        return action, tool_id, error, (time.perf_counter() - started) * 1000
+
+
+async def apply_plan(client: httpx.AsyncClient, plan: SyncPlan, concurrency: int = 8) -> List[Tuple[str, str, Optional[str], float]]:
+    """Run all planned creates/updates/deletes concurrently."""
+    semaphore = asyncio.Semaphore(concurrency)
+    operations = []
+    for tool in plan.create:
+        operations.append(_apply(client, semaphore, "create", tool["id"],
+                                 lambda tool=tool: client.post(TOOLS_ENDPOINT, json=tool)))
+    for tool in plan.update:
+        # id and type are immutable; the update body carries the rest
+        body = {key: tool[key] for key in SYNCED_FIELDS if key in tool and key != "type"}
+        operations.append(_apply(client, semaphore, "update", tool["id"],
+                                 lambda tool=tool, body=body: client.put(f"{TOOLS_ENDPOINT}/{tool['id']}", json=body)))
+    for tool_id in plan.delete:
+        operations.append(_apply(client, semaphore, "delete", tool_id,
+                                 lambda tool_id=tool_id: client.delete(f"{TOOLS_ENDPOINT}/{tool_id}")))
+    return await asyncio.gather(*operations)
+
+
+async def sync_tools(dry_run: bool = False, delete_orphans: bool = True, concurrency: int = 8) -> int:
+    """Sync the tool catalog with Agent Builder; returns a process exit code."""
+    print(f"[CONFIG] Syncing tools with Agent Builder...")
     print(f"   Kibana URL: {KIBANA_URL}")
     print("")
-    
-    for tool in TOOLS:
-        tool_id = tool["id"]
-        url = f"{KIBANA_URL}/api/agent_builder/tools"
-        
+
+    started = time.perf_counter()
+    desired = load_desired_tools()
+
+    async with httpx.AsyncClient(base_url=KIBANA_URL, headers=_headers(), timeout=30.0) as client:
         try:
-            response = httpx.post(
-                url,
-                json=tool,
-                headers=headers,
-                timeout=30.0
-            )
-            
-            if response.status_code in [200, 201]:
-                print(f"[DONE] {tool_id}")
-                success_count += 1
-            else:
-                print(f"[ERROR] {tool_id} - HTTP {response.status_code}")
-                print(f"   Error: {response.text[:200]}")
-                failed_tools.append(tool_id)
-        
-        except httpx.RequestError as e:
-            print(f"[ERROR] {tool_id} - Network error: {e}")
-            failed_tools.append(tool_id)
+            registered = await fetch_registered_tools(client)
         except Exception as e:
-            print(f"[ERROR] {tool_id} - Unexpected error: {e}")
-            failed_tools.append(tool_id)
-    
+            print(f"[ERROR] Failed to fetch registered tools: {e}")
+            return 1
+        fetched = time.perf_counter()
+
+        plan = plan_sync(desired, registered, delete_orphans=delete_orphans)
+        print_plan(plan)
+        print(f"   ({len(desired)} defined, {len(registered)} registered, "
+              f"fetched in {(fetched - started) * 1000:.0f}ms)")
+
+        if dry_run or not plan.changes:
+            print("")
+            print("[DONE] Dry run, nothing applied" if dry_run else "[DONE] Tool catalog already in sync")
+            return 0
+
+        print("")
+        results = await apply_plan(client, plan, concurrency=concurrency)
+
+    failed = []
+    for action, tool_id, error, elapsed_ms in results:
+        if error:
+            print(f"[ERROR] {action} {tool_id} ({elapsed_ms:.0f}ms) - {error}")
+            failed.append(tool_id)
+        else:
+            print(f"[DONE] {action} {tool_id} ({elapsed_ms:.0f}ms)")
+
     print("")
     print("="*60)
-    print(f"[DONE] Successfully registered: {success_count}/{len(TOOLS)} tools")
-    
-    if failed_tools:
-        print(f"[ERROR] Failed tools: {', '.join(failed_tools)}")
+    print(f"[DONE] Applied {len(results) - len(failed)}/{len(results)} changes "
+          f"in {(time.perf_counter() - started):.2f}s")
+
+    if failed:
+        print(f"[ERROR] Failed tools: {', '.join(failed)}")
         print("")
         print("Troubleshooting:")
         print("1. Ensure Agent Builder is enabled in Kibana > Management > Stack Management")
         print("2. Verify API key has 'manage_agent_builder' privilege")
         print("3. Check if the /api/agent_builder/tools endpoint exists")
         return 1
-    else:
-        print("")
-        print("[SUCCESS] All tools registered successfully!")
-        print("")
-        print("Next steps:")
-        print("1. Verify tools appear in Kibana > Agent Builder > Tools")
-        print(f"2. Assign tools to 'incident-investigator' agent")
-        print("3. Test agent conversation with incident data")
-        return 0
+
+    print("")
+    print("[SUCCESS] Tool catalog synced!")
+    print("")
+    print("Next steps:")
+    print("1. Verify tools appear in Kibana > Agent Builder > Tools")
+    print(f"2. Assign tools to 'incident-investigator' agent")
+    print("3. Test agent conversation with incident data")
+    return 0
 
 
 def list_registered_tools():
     """List all currently registered tools."""
-    
-    headers = {
-        "Authorization": f"ApiKey {ELASTIC_API_KEY}",
-        "kbn-xsrf": "true"
-    }
-    
-    url = f"{KIBANA_URL}/api/agent_builder/tools"
-    
+
+    async def fetch():
+        async with httpx.AsyncClient(base_url=KIBANA_URL, headers=_headers(), timeout=30.0) as client:
+            return await fetch_registered_tools(client)
+
     try:
-        response = httpx.get(url, headers=headers, timeout=30.0)
-        
-        if response.status_code == 200:
-            tools = response.json()
-            print(f"\n[INFO] Currently registered tools: {len(tools)}")
-            for tool in tools:
-                print(f"   - {tool.get('id', 'unknown')}")
-        else:
-            print(f"[ERROR] Failed to list tools: HTTP {response.status_code}")
-    
+        tools = asyncio.run(fetch())
+        print(f"\n[INFO] Currently registered tools: {len(tools)}")
+        for tool_id in sorted(tools):
+            print(f"   - {tool_id}")
     except Exception as e:
         print(f"[ERROR] Error listing tools: {e}")
 
 
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Sync DataPulse ES|QL tools with Elastic Agent Builder")
+    parser.add_argument("--dry-run", action="store_true", help="print the plan without applying it")
+    parser.add_argument("--no-delete", action="store_true",
+                        help=f"keep registered {MANAGED_PREFIX}* tools that are no longer defined")
+    parser.add_argument("--concurrency", type=int, default=8, help="parallel API requests (default: 8)")
+    parser.add_argument("--list", action="store_true", help="list registered tools after syncing")
+    args = parser.parse_args()
+
+    if not KIBANA_URL or not ELASTIC_API_KEY:
+        print("[ERROR] ERROR: Missing environment variables")
+        print("   Required: KIBANA_URL, ELASTIC_API_KEY")
+        print("")
+        print("   Example:")
+        print('   export KIBANA_URL="https://your-cluster.kb.us-east-1.aws.found.io:9243"')
+        print('   export ELASTIC_API_KEY="your_agent_builder_api_key"')
+        return 1
+
+    exit_code = asyncio.run(sync_tools(
+        dry_run=args.dry_run,
+        delete_orphans=not args.no_delete,
+        concurrency=args.concurrency,
+    ))
+
+    if exit_code == 0 and args.list:
+        list_registered_tools()
+
+    return exit_code
+
+
 if __name__ == "__main__":
-    exit_code = register_tools()
-    
-    if exit_code == 0:
-        # Optionally list all tools
-        if "--list" in sys.argv:
-            list_registered_tools()
-    
-    sys.exit(exit_code)
+    sys.exit(main())
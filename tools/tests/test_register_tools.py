@@ -0,0 +1,85 @@
+import asyncio
+import copy
+import json
+import sys
+from pathlib import Path
+
+import httpx
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import register_tools  # noqa: E402
+from register_tools import (  # noqa: E402
+    apply_plan,
+    convert_esql_template,
+    fetch_registered_tools,
+    load_desired_tools,
+    plan_sync,
+)
+
+
+def test_esql_templates_are_converted_to_native_params():
+    tool = convert_esql_template(json.loads(
+        (register_tools.ESQL_TOOLS_DIR / "check_recent_deployments.json").read_text()
+    ))
+
+    assert tool["id"] == "custom.check_recent_deployments"
+    query = tool["configuration"]["query"]
+    assert "service.name == ?service_name" in query
+    assert "NOW() - TO_TIMEDURATION(?time_window)" in query
+    assert "${" not in query
+    assert tool["configuration"]["params"]["time_window"]["default"] == "1 hours"
+
+
+def test_plan_only_touches_changed_managed_tools():
+    desired = load_desired_tools()
+    registered = {tool_id: {**copy.deepcopy(tool), "readonly": False} for tool_id, tool in desired.items()}
+
+    changed_id = "custom.search_runbooks"
+    registered[changed_id]["description"] = "stale"
+    missing_id = "custom.check_recent_incidents"
+    del registered[missing_id]
+    registered["custom.retired_tool"] = {"id": "custom.retired_tool", "type": "esql"}
+    registered["platform.core.search"] = {"id": "platform.core.search", "type": "builtin"}
+    # Same content in a different key order is not a change
+    registered["custom.detect_anomalies"]["tags"].reverse()
+
+    plan = plan_sync(desired, registered)
+
+    assert [tool["id"] for tool in plan.create] == [missing_id]
+    assert [tool["id"] for tool in plan.update] == [changed_id]
+    assert plan.delete == ["custom.retired_tool"]
+    assert len(plan.unchanged) == len(desired) - 2
+
+    assert plan_sync(desired, registered, delete_orphans=False).delete == []
+
+
+def test_sync_fetches_once_and_applies_changes_concurrently():
+    desired = load_desired_tools()
+    calls = []
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request):
+        nonlocal in_flight, peak
+        calls.append((request.method, request.url.path))
+        if request.method == "GET":
+            return httpx.Response(200, json={"results": [{"id": "custom.retired_tool", "type": "esql"}]})
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(204 if request.method == "DELETE" else 200, json={})
+
+    async def scenario():
+        async with httpx.AsyncClient(base_url="http://kibana", transport=httpx.MockTransport(handler)) as client:
+            registered = await fetch_registered_tools(client)
+            return await apply_plan(client, plan_sync(desired, registered), concurrency=4)
+
+    results = asyncio.run(scenario())
+
+    assert [method for method, _ in calls].count("GET") == 1
+    assert sum(1 for action, *_ in results if action == "create") == len(desired)
+    assert ("DELETE", "/api/agent_builder/tools/custom.retired_tool") in calls
+    assert all(error is None for _, _, error, _ in results)
+    assert 1 < peak <= 4